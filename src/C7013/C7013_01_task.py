@@ -1,11 +1,11 @@
 # 標準ライブラリインポート
 import os
+from typing import TYPE_CHECKING
 
 # サードパーティライブラリインポート
 import numpy as np
 import pandas as pd
 import inject
-import pymssql
 import json5
 
 # プロジェクトライブラリインポート
@@ -14,7 +14,9 @@ from .task import BaseTask, TaskResult
 from .dao.crmdb_dao import CrmDBDao
 from .dto.dcrm_sdk import Entity, EntityReference, OptionSetValue
 from .dcrm_helper import DcrmHelper
-from .C7013_04_addresscode_prediction_task import C7013_04_addresscode_prediction_task
+from .keyword_matcher import get_keyword_matcher
+if TYPE_CHECKING:
+    from .C7013_04_addresscode_prediction_task import C7013_04_addresscode_prediction_task
 
 class C7013_01_task(BaseTask):
     '''
@@ -30,28 +32,94 @@ class C7013_01_task(BaseTask):
     STATUS_COMMISSION_SELECTION: int = 1
 
     @inject.autoparams()
-    def __init__(self, crmDbDao: CrmDBDao, dcrmHelper: DcrmHelper):
+    def __init__(self, crmDbDao: CrmDBDao):
         '''
         初期化関数
+        Dynamics CRMへの接続は初回使用時に行う。
         '''
 
         self.__dao: CrmDBDao = crmDbDao
-        self.__conn: pymssql.Connection = self.__dao.conn()
-        self.__helper: DcrmHelper = dcrmHelper
-        self.__helper.Conn()
+        self.__helper: DcrmHelper = None
 
-        self.__addresscode_prediction_task: C7013_04_addresscode_prediction_task = C7013_04_addresscode_prediction_task()
+        self.__addresscode_prediction_task: 'C7013_04_addresscode_prediction_task' = None
+
+        # 担当エリア索引({自動差配設定GUID: 担当エリアの住所コード集合})
+        self.__handle_area_index: dict = None
 
         self.__result: TaskResult = TaskResult()
 
         # 親クラスの初期化関数を呼び出す
         super().__init__()
 
+    @property
+    def _helper(self) -> DcrmHelper:
+        '''
+        Dynamics CRM Helper(初回使用時に接続する)
+        '''
+
+        if self.__helper is None:
+            helper: DcrmHelper = inject.instance(DcrmHelper)
+            helper.Conn()
+            self.__helper = helper
+
+        return self.__helper
+
+    @property
+    def _addresscode_prediction_task(self) -> 'C7013_04_addresscode_prediction_task':
+        '''
+        住所コード特定タスク(初回使用時に住所コード特定モデルを読み込む)
+        tensorflowの読込に時間がかかるため、モジュールも初回使用時に読み込む
+        '''
+
+        if self.__addresscode_prediction_task is None:
+            from .C7013_04_addresscode_prediction_task import C7013_04_addresscode_prediction_task
+            self.__addresscode_prediction_task = C7013_04_addresscode_prediction_task()
+
+        return self.__addresscode_prediction_task
+
+    @property
+    def _handle_area_index(self) -> dict:
+        '''
+        担当エリア索引(初回使用時に有効な自動差配設定の担当エリアを全件読み込む)
+        '''
+
+        if self.__handle_area_index is None:
+            handle_area_index = {}
+            for autoagentid_guid, addresscode in self._select_all_handle_area().itertuples(index=False):
+                if addresscode is None:
+                    continue
+                # SQL Serverの比較と同様に、GUIDは大文字小文字、住所コードは末尾の空白を区別しない
+                handle_area_index.setdefault(str(autoagentid_guid).lower(), set()).add(addresscode.rstrip())
+            self.logger.debug('担当エリア索引を読み込みました。自動差配設定数：%d', len(handle_area_index))
+            self.__handle_area_index = handle_area_index
+
+        return self.__handle_area_index
+
+    def clear_cache(self) -> None:
+        '''
+        実行毎に読み直す担当エリア索引を破棄します。
+        '''
+
+        self.__handle_area_index = None
+
+    def load_models(self) -> None:
+        '''
+        住所コード特定モデルを読み込みます。読込済の場合は読み直します。
+        読込に失敗した場合は読込済のモデルを引き続き使用します。
+        '''
+
+        from .C7013_04_addresscode_prediction_task import C7013_04_addresscode_prediction_task
+        self.__addresscode_prediction_task = C7013_04_addresscode_prediction_task()
+
     def execute(self, input_data: pd.DataFrame) -> TaskResult:
         '''
         自動差配ユニットに取り次がれた取次を抽出し、
         取次区分判定や必須チェック等の事前チェックを行う。
         また新設置場所から住所コードの特定を行う。
+
+        Args:
+            input_data: 事前チェック対象の取次情報（マイクロバッチ）。
+                        Noneの場合は自動差配対象の取次を全件抽出する。
         '''
         self.logger.info(f'タスクを実行します。')
 
@@ -67,6 +135,7 @@ class C7013_01_task(BaseTask):
         # → C7013_01_batchで実施
 
         # 変数・リソース初期化
+        self.__result = TaskResult()
         autoagent_commission_class_list = []
         autoagent_untargeted_keyword_dict = {}
         new_commission_len = 0
@@ -84,7 +153,11 @@ class C7013_01_task(BaseTask):
         # ================================
 
         # 取次情報取得
-        new_commission_df = self._select_autoagent_target_commission()
+        if input_data is None:
+            new_commission_df = self._select_autoagent_target_commission()
+        else:
+            # マイクロバッチ指定時は渡された取次情報のみを処理する
+            new_commission_df = input_data.reset_index(drop=True)
         new_commission_len = len(new_commission_df)
         self.logger.debug('取次情報抽出件数：%d', new_commission_len)
 
@@ -98,133 +171,100 @@ class C7013_01_task(BaseTask):
             return self.__result
 
         # ================================
-        # 取次情報ごとの繰返処理
+        # 事前チェック
         # ================================
 
-        new_commission_dict = new_commission_df.to_dict(orient='records')
-        for index, row in enumerate(new_commission_dict):
-
-            message_for_memo = None
-            commission_classification = row['commissionclassification']
-            autoagentid_guid = row['autoagentid_guid']
-            self.logger.debug('取次区分：%s, 自動差配設定(GUID)：%s', commission_classification, autoagentid_guid)
-
-            # 取次区分判定
-
-            # 自動差配対象取次区分判定
-            if pd.isna(commission_classification) or commission_classification not in autoagent_commission_class_list:
-                # 自動差配対象外取次区分時処理
-                message_for_memo = message.MSG['MSG3001']
-
-            # 必須チェック
-
-            if message_for_memo is None:
-                # 契約者名チェック
-                message_for_memo = self._check_required(row, 'contractorname', '契約者名')
-
-            if message_for_memo is None:
-                # 新設置場所チェック
-                message_for_memo = self._check_required(row, 'next_account', '新設置場所')
-
-            if message_for_memo is None:
-                # 担当者チェック
-                message_for_memo = self._check_required(row, 'personincharge', '担当者')
-
-            if message_for_memo is None:
-                # 連絡先電話番号1チェック
-                message_for_memo = self._check_required(row, 'connectiontelephonenumber1', '連絡先電話番号1')
-
-            if message_for_memo is None:
-                # 当初注文内容チェック
-                message_for_memo = self._check_required(row, 'ordercontents', '当初注文内容')
-
-            # 住所コード特定
-
-            if message_for_memo is None:
-                # 住所コード特定処理呼び出し
-                address_code = self.__addresscode_prediction_task.address2addresscode(row['next_account'])
-                self.logger.debug('住所コード：%s', address_code)
-                # 住所コード特定処理結果確認
-                if address_code is None:
-                    # 住所コード特定不能時処理
-                    message_for_memo = message.MSG['MSG3003']
-                else:
-                    new_commission_df.at[index, 'next_account_code'] = address_code
-
-            # 事業部エリアチェック
-
-            if message_for_memo is None:
-                # 担当エリア検索
-                handle_area_df = self._select_handle_area(address_code, autoagentid_guid)
-                handle_area_len = len(handle_area_df)
-                self.logger.debug('担当エリア検索結果：%d', handle_area_len)
-                # 担当エリア検索結果確認
-                if handle_area_len == 0:
-                    # 自事業部担当エリア外時処理
-                    message_for_memo = message.MSG['MSG3004']
-
-            # 自動差配対象外キーワードチェック
-
-            if message_for_memo is None:
-                # 自動差配対象外キーワード一覧存在チェック
-                self.logger.debug('自動差配対象外キーワード一覧：%s', autoagent_untargeted_keyword_dict)
-
-                if autoagentid_guid not in autoagent_untargeted_keyword_dict:
-                    # 自動差配対象外キーワード取得
-                    # データ取得
-                    autoagent_untargeted_keyword_df = self._select_autoagent_untargeted_keyword(autoagentid_guid)
-                    # データ取得結果処理
-                    autoagent_untargeted_keyword_list = autoagent_untargeted_keyword_df.iloc[:, 0].values.tolist()
-                    self.logger.debug('自動差配対象外キーワード取得結果：%s', autoagent_untargeted_keyword_list)
-                    autoagent_untargeted_keyword_dict[autoagentid_guid] = autoagent_untargeted_keyword_list
-
-                # 自動差配対象外キーワード判定
-
-                # 自動差配対象外キーワード文字列初期化
-                autoagent_untargeted_keyword_str = ''
-
-                # キーワードリスト取得
-                keyword_list = autoagent_untargeted_keyword_dict[autoagentid_guid]
-
-                # キーワードリストレコードごとの処理
-                for keyword in keyword_list:
-                    # キーワード判定
-                    if keyword in row['contents_commission']:
-                        autoagent_untargeted_keyword_str += keyword
-                self.logger.debug('自動差配対象外キーワード文字列：%s', autoagent_untargeted_keyword_str)
-
-                # キーワードリストレコードごとの処理結果判定
-                if autoagent_untargeted_keyword_str != '':
-                    # 自動差配対象外キーワードあり時処理
-                    message_for_memo = message.MSG['MSG3005'] % (autoagent_untargeted_keyword_str)
-
-            # 差配担当窓口取次
-            self.logger.debug('メモ用メッセージ：%s', message_for_memo)
-
-            if message_for_memo is not None:
-                isUpdateSuccess = False
-
-                # 取次E更新
+        # 取次毎のメモ用メッセージ(チェックを通過した取次はNone)
+        # 各チェックは列単位で判定し、先に設定されたメッセージを優先する
+        message_for_memo = pd.Series(None, index=new_commission_df.index, dtype=object)
+
+        # 取次区分判定
+
+        # 自動差配対象取次区分判定(未設定の場合も対象外)
+        is_untargeted_class = ~new_commission_df['commissionclassification'].isin(autoagent_commission_class_list)
+        message_for_memo = self._set_message_for_memo(message_for_memo, is_untargeted_class, message.MSG['MSG3001'])
+
+        # 必須チェック
+        for key, msg_arg in (
+                ('contractorname', '契約者名'),
+                ('next_account', '新設置場所'),
+                ('personincharge', '担当者'),
+                ('connectiontelephonenumber1', '連絡先電話番号1'),
+                ('ordercontents', '当初注文内容')):
+            message_for_memo = self._set_message_for_memo(
+                message_for_memo, self._is_required_error(new_commission_df[key]), message.MSG['MSG3002'] % (msg_arg))
+        self.logger.debug('取次区分判定・必須チェック対象外件数：%d', message_for_memo.notna().sum())
+
+        # 住所コード特定
+
+        # 取次区分判定・必須チェックを通過した取次の新設置場所をまとめて住所コードに変換する
+        is_target = message_for_memo.isna()
+        if is_target.any():
+            address_code_list = self._addresscode_prediction_task.addresses2addresscodes(
+                new_commission_df.loc[is_target, 'next_account'].tolist())
+            address_code = pd.Series(address_code_list, index=new_commission_df.index[is_target], dtype=object)
+            new_commission_df.loc[is_target, 'next_account_code'] = address_code
+            # 住所コード特定不能時処理
+            message_for_memo = self._set_message_for_memo(message_for_memo, is_target & address_code.isna().reindex(is_target.index, fill_value=False), message.MSG['MSG3003'])
+
+        # 事業部エリアチェック
+
+        is_target = message_for_memo.isna()
+        if is_target.any():
+            # 担当エリア検索
+            target_df = new_commission_df[is_target]
+            is_handle_area = pd.Series(
+                [self._is_handle_area(next_account_code, autoagentid_guid)
+                 for next_account_code, autoagentid_guid in zip(target_df['next_account_code'], target_df['autoagentid_guid'])],
+                index=target_df.index, dtype=bool)
+            # 自事業部担当エリア外時処理
+            message_for_memo = self._set_message_for_memo(message_for_memo, ~is_handle_area.reindex(is_target.index, fill_value=True), message.MSG['MSG3004'])
+
+        # 自動差配対象外キーワードチェック
+
+        is_target = message_for_memo.isna()
+        if is_target.any():
+            # 自動差配対象外キーワード文字列(該当なしの場合は空文字)
+            autoagent_untargeted_keyword_str = self._find_autoagent_untargeted_keyword(new_commission_df[is_target], autoagent_untargeted_keyword_dict)
+            has_keyword = (autoagent_untargeted_keyword_str != '').reindex(is_target.index, fill_value=False)
+            # 自動差配対象外キーワードあり時処理
+            message_for_memo = self._set_message_for_memo(
+                message_for_memo, has_keyword,
+                autoagent_untargeted_keyword_str[has_keyword[is_target]].map(lambda keyword_str: message.MSG['MSG3005'] % (keyword_str)))
+
+        # ================================
+        # 事前チェック対象外取次の除外
+        # ================================
+
+        is_untargeted = message_for_memo.notna()
+        untargeted_df = new_commission_df[is_untargeted]
+        new_commission_df = new_commission_df[~is_untargeted]
+        autoagent_untargeted_len = len(untargeted_df)
+        self.logger.debug('自動差配対象外件数：%d', autoagent_untargeted_len)
+
+        # 差配担当窓口取次
+
+        for row, row_message_for_memo in zip(untargeted_df.to_dict(orient='records'), message_for_memo[is_untargeted]):
+            self.logger.debug('メモ用メッセージ：%s', row_message_for_memo)
+
+            isUpdateSuccess = False
+
+            # 取次E更新
+            try:
+                isUpdateSuccess = self._update_new_commission(row)
+            # 取次E更新結果確認
+            except Exception:
+                self.__result.resultCode = const.BATCH_ERROR
+                self.logger.error(message.MSG['MSG2003'], row['commissionid_guid'])
+
+            if isUpdateSuccess:
+                # メモE登録
                 try:
-                    isUpdateSuccess = self._update_new_commission(row)
-                # 取次E更新結果確認
+                    self._insert_annotation(row, row_message_for_memo)
+                # メモE登録結果確認
                 except Exception:
                     self.__result.resultCode = const.BATCH_ERROR
-                    self.logger.error(message.MSG['MSG2003'], row['commissionid_guid'])
-
-                if isUpdateSuccess:
-                    # メモE登録
-                    try:
-                        self._insert_annotation(row, message_for_memo)
-                    # メモE登録結果確認
-                    except Exception:
-                        self.__result.resultCode = const.BATCH_ERROR
-                        self.logger.error(message.MSG['MSG2004'], row['commissionid_guid'], message_for_memo)
-
-                # 取次情報レコード除外
-                new_commission_df.drop(index, inplace=True)
-                autoagent_untargeted_len += 1
-                self.logger.debug('自動差配対象外件数：%d', autoagent_untargeted_len)
+                    self.logger.error(message.MSG['MSG2004'], row['commissionid_guid'], row_message_for_memo)
 
         # ================================
         # 取次情報CSV出力
@@ -249,9 +289,51 @@ class C7013_01_task(BaseTask):
         return self.__result
         # ↑↑ここにビジネスロジックを実装します。
 
-    def _select_autoagent_target_commission(self) -> pd.DataFrame:
+    def extract_commissionid_list(self) -> list:
+        '''
+        自動差配対象の取次GUIDを抽出時点の処理順で取得します。
+        マイクロバッチ実行時はこの一覧を分割し、extract_commissionsで取次情報を取得する。
+
+        Returns:
+            取次GUID一覧
+        '''
+
+        commissionid_list = [str(commissionid) for commissionid in self._select_autoagent_target_commissionid().iloc[:, 0].values.tolist()]
+        self.logger.debug('取次GUID抽出件数：%d', len(commissionid_list))
+
+        return commissionid_list
+
+    def extract_commissions(self, commissionid_list: list) -> pd.DataFrame:
+        '''
+        指定した取次GUIDの自動差配対象の取次情報を取得します。
+
+        Args:
+            commissionid_list: 取次GUID一覧
+        Returns:
+            取次情報DataFrame
+        '''
+
+        return self._select_autoagent_target_commission(commissionid_list)
+
+    def _select_autoagent_target_commissionid(self) -> pd.DataFrame:
+        '''
+        自動差配対象の取次GUIDを抽出します。
+        '''
+
+        sql = """
+            SELECT
+              -- 取次GUID
+              E1.new_commissionid AS commissionid_guid
+            """ + self._autoagent_target_commission_from_clause()
+
+        return pd.read_sql_query(sql, con=self.__dao.conn())
+
+    def _select_autoagent_target_commission(self, commissionid_list: list = None) -> pd.DataFrame:
         '''
         自動差配対象の取次を抽出します。
+
+        Args:
+            commissionid_list: 抽出対象の取次GUID一覧。Noneの場合は全件抽出する。
         '''
 
         sql = """
@@ -284,6 +366,27 @@ class C7013_01_task(BaseTask):
               BMB.businessunitid AS agent_window_division_guid,
               BMBM.businessunitid AS agent_window_section_guid,
               E2.new_agent_window_unit AS agent_window_unit_guid
+            """ + self._autoagent_target_commission_from_clause(commissionid_list)
+
+        return pd.read_sql_query(sql, con=self.__dao.conn())
+
+    def _autoagent_target_commission_from_clause(self, commissionid_list: list = None) -> str:
+        '''
+        自動差配対象取次抽出のFROM句以降を生成します。
+
+        Args:
+            commissionid_list: 抽出対象の取次GUID一覧。Noneの場合は絞り込まない。
+        '''
+
+        commissionid_condition = ''
+        if commissionid_list is not None:
+            if len(commissionid_list) == 0:
+                commissionid_condition = 'AND 1 = 0'
+            else:
+                commissionid_in = ', '.join(f"'{commissionid}'" for commissionid in commissionid_list)
+                commissionid_condition = f'AND E1.new_commissionid IN ({commissionid_in})'
+
+        return f"""
             FROM
               -- 取次E
               NTTEAST_MSCRM.dbo.new_commission E1
@@ -307,39 +410,56 @@ class C7013_01_task(BaseTask):
             WHERE
               E1.statecode = 0
               AND E1.new_draft = 0
+              {commissionid_condition}
             ORDER BY
               E1.modifiedon ASC
             """
 
-        return pd.read_sql_query(sql, con=self.__conn)
+    def _is_handle_area(self, next_account_code: str, autoagentid_guid: str) -> bool:
+        '''
+        住所コードが自動差配設定の担当エリアに含まれるかを判定します。
+        住所コード、大字通称、市区町村、都道府県の各単位の住所コードのいずれかが担当エリアに含まれる場合に担当エリア内とする。
+        '''
+
+        handle_areas = self._handle_area_index.get(str(autoagentid_guid).lower())
+        if not handle_areas:
+            return False
+
+        next_account_code = str(next_account_code).rstrip()
+        candidates = (
+            next_account_code,
+            next_account_code[:8] + '000',
+            next_account_code[:5] + '000000',
+            next_account_code[:2] + '000000000',
+        )
 
-    def _select_handle_area(self, next_account_code: str, autoagentid_guid: str) -> pd.DataFrame:
+        return any(candidate in handle_areas for candidate in candidates)
+
+    def _select_all_handle_area(self) -> pd.DataFrame:
         '''
-        担当エリア情報を検索します。
+        有効な自動差配設定の担当エリア情報を全件取得します。
         '''
 
-        sql = f"""
-            SELECT TOP(1)
-              1
+        sql = """
+            SELECT
+              E1.new_autoagent AS autoagentid_guid,
+              E2.new_addresscode AS addresscode
             FROM
               -- スルー取次・支店優先取次E
               NTTEAST_MSCRM.dbo.new_autoagent_thru_brnc_commission E1
               -- 担当エリアE
               INNER JOIN NTTEAST_MSCRM.dbo.new_autoagent_handle_area E2
                 ON E2.new_autoagent_thru_brnc_commission = E1.new_autoagent_thru_brnc_commissionid
-                AND E2.new_addresscode IN (
-                  '{next_account_code}',
-                  LEFT('{next_account_code}', 8) + '000',
-                  LEFT('{next_account_code}', 5) + '000000',
-                  LEFT('{next_account_code}', 2) + '000000000'
-                )
                 AND E2.statecode = 0
+              -- 自動差配設定E
+              INNER JOIN NTTEAST_MSCRM.dbo.new_autoagent E3
+                ON E3.new_autoagentid = E1.new_autoagent
+                AND E3.statecode = 0
             WHERE
-              E1.new_autoagent = '{autoagentid_guid}'
-              AND E1.statecode = 0
+              E1.statecode = 0
             """
 
-        return pd.read_sql_query(sql, con=self.__conn)
+        return pd.read_sql_query(sql, con=self.__dao.conn())
 
     def _select_autoagent_untargeted_keyword(self, autoagentid_guid: str) -> pd.DataFrame:
         '''
@@ -357,21 +477,54 @@ class C7013_01_task(BaseTask):
               AND E1.statecode = 0
             """
 
-        return pd.read_sql_query(sql, con=self.__conn)
+        return pd.read_sql_query(sql, con=self.__dao.conn())
 
-    def _check_required(self, row: dict, key: str, msg_arg: str) -> str:
+    def _set_message_for_memo(self, message_for_memo: pd.Series, mask: pd.Series, msg) -> pd.Series:
         '''
-        必須チェックを実施します。
+        メッセージ未設定かつ条件に該当する取次にメモ用メッセージを設定します。
+
+        Args:
+            message_for_memo: 取次毎のメモ用メッセージ
+            mask: 条件に該当する取次
+            msg: メモ用メッセージ(取次毎に異なる場合はSeries)
         '''
 
-        self.logger.debug('%s：%s', msg_arg, row[key])
+        return message_for_memo.mask(mask & message_for_memo.isna(), msg)
 
-        # 入力チェック
-        if pd.isna(row[key]) or not row[key]:
-            # 未入力時処理
-            return message.MSG['MSG3002'] % (msg_arg)
-        else:
-            return None
+    def _is_required_error(self, values: pd.Series) -> pd.Series:
+        '''
+        必須チェックを実施します。未入力(NaN、空文字、0)の場合にTrueを返却します。
+        '''
+
+        return values.isna() | values.isin(['', 0])
+
+    def _find_autoagent_untargeted_keyword(self, df: pd.DataFrame, autoagent_untargeted_keyword_dict: dict) -> pd.Series:
+        '''
+        取次内容に含まれる自動差配対象外キーワードを、自動差配設定毎のキーワード設定順に連結して返却します。
+
+        Args:
+            df: 取次情報DataFrame
+            autoagent_untargeted_keyword_dict: 取得済の自動差配対象外キーワード({自動差配設定GUID: キーワードリスト})
+        Returns:
+            自動差配対象外キーワード文字列(該当なしの場合は空文字)
+        '''
+
+        keyword_str = pd.Series('', index=df.index, dtype=object)
+        contents_commission = df['contents_commission'].fillna('').astype(str)
+
+        for autoagentid_guid, index in df.groupby('autoagentid_guid', sort=False).groups.items():
+            if autoagentid_guid not in autoagent_untargeted_keyword_dict:
+                # 自動差配対象外キーワード取得
+                autoagent_untargeted_keyword_df = self._select_autoagent_untargeted_keyword(autoagentid_guid)
+                autoagent_untargeted_keyword_list = autoagent_untargeted_keyword_df.iloc[:, 0].values.tolist()
+                self.logger.debug('自動差配対象外キーワード取得結果：%s %s', autoagentid_guid, autoagent_untargeted_keyword_list)
+                autoagent_untargeted_keyword_dict[autoagentid_guid] = autoagent_untargeted_keyword_list
+
+            # キーワード判定(取次内容を1回走査し、該当したキーワードを設定順に連結する)
+            matcher = get_keyword_matcher(autoagent_untargeted_keyword_dict[autoagentid_guid])
+            keyword_str[index] = [''.join(matcher.find_keywords(text)) for text in contents_commission[index]]
+
+        return keyword_str
 
     def _update_new_commission(self, row: dict) -> bool:
         '''
@@ -402,7 +555,7 @@ class C7013_01_task(BaseTask):
         entity.Attributes['new_personincharge_next_from'] = None
         entity.Attributes['new_status_commission'] = OptionSetValue(C7013_01_task.STATUS_COMMISSION_SELECTION)
 
-        self.__helper.UpdateEntity(entity)
+        self._helper.UpdateEntity(entity)
 
         return True
 
@@ -415,6 +568,6 @@ class C7013_01_task(BaseTask):
         entity.Attributes['objectid'] = EntityReference('new_commission', row['commissionid_guid'])
         entity.Attributes['notetext'] = notetext
 
-        self.__helper.CreateEntity(entity)
+        self._helper.CreateEntity(entity)
 
         return True
@@ -12,8 +12,90 @@ import jaconv
 
 # プロジェクトライブラリインポート
 from .task import BaseTask, TaskResult
+from .cleansing_rule_compiler import compile_rules
 from ..lib import const, message, utils
 
+def compile_cleansing_settings(config: dict) -> list:
+    '''
+    クレンジング設定の置換処理を正規表現オブジェクトにコンパイルします。
+    キー(置換元文字列)が設定されていない置換処理は除外し、
+    互いに依存しない連続した置換処理は1回の走査に統合する(cleansing_rule_compiler)。
+
+    Args:
+        config: クレンジング設定({'cleansing_settings': [{'patternstring', 'replacementstring'}]})
+    Returns:
+        [(置換元の正規表現オブジェクト, 置換後文字列または置換関数)]
+    '''
+
+    if not config or not config.get('cleansing_settings'):
+        return []
+
+    return compile_rules([setting for setting in config['cleansing_settings'] if setting['patternstring'] != ''])
+
+
+def cleanse_column(values: pd.Series, rules: list, to_upper_wide: bool = False, remove_newline: bool = False) -> pd.Series:
+    '''
+    列単位でクレンジングを行います。
+    未設定(NaN、None、空文字)の値はそのまま返却し、同じ値は1回のみ変換する。
+
+    Args:
+        values: クレンジング対象列
+        rules: 置換処理(compile_cleansing_settingsの返却値)
+        to_upper_wide: 大文字変換、全角文字変換を行う場合はTrue
+        remove_newline: 改行コードを削除する場合はTrue
+    Returns:
+        クレンジング後列
+    '''
+
+    result = values.astype(object)
+
+    target = values.notna() & (values != '')
+    if not target.any() or not (rules or to_upper_wide or remove_newline):
+        return result
+
+    # 重複を除いた値に対して、変換処理、改行コードの削除、置換処理の順に列単位で実施する
+    texts = pd.unique(values[target].to_numpy(dtype=object))
+    cleansed = pd.Series(texts, dtype=object)
+
+    if to_upper_wide:
+        # 全角文字変換(jaconv)は列単位の処理がないため、値毎に変換する(変換結果はキャッシュされる)
+        cleansed = cleansed.map(utils.to_upper_wide_charactor)
+
+    if remove_newline:
+        cleansed = cleansed.str.replace('\r\n', '', regex=False).str.replace('\n', '', regex=False)
+
+    for pattern, replacement in rules:
+        cleansed = cleansed.str.replace(pattern, replacement, regex=True)
+
+    result[target] = values[target].map(dict(zip(texts, cleansed.to_numpy())))
+
+    return result
+
+
+def cleanse_dataframe(df: pd.DataFrame, contractorname_rules: list, contents_commission_rules: list) -> pd.DataFrame:
+    '''
+    クレンジング対象列を列毎にクレンジングし、クレンジング後列のDataFrameを返却します。
+
+    Args:
+        df: クレンジング対象列を含むDataFrame
+        contractorname_rules: 契約者名の置換処理(compile_cleansing_settingsの返却値)
+        contents_commission_rules: 取次内容の置換処理(compile_cleansing_settingsの返却値)
+    Returns:
+        クレンジング後列のDataFrame
+    '''
+
+    return pd.DataFrame({
+        # 契約者名：置換処理
+        'contractorname_cleansing': cleanse_column(df['contractorname'], contractorname_rules),
+        # 取次内容：変換処理(大文字変換、全角文字変換)、改行コードの削除、置換処理
+        'contents_commission_cleansing': cleanse_column(df['contents_commission'], contents_commission_rules, to_upper_wide=True, remove_newline=True),
+        # 会社名(情報発信元)：変換処理(大文字変換、全角文字変換)
+        'sourcecompany_cleansing': cleanse_column(df['sourcecompany'], [], to_upper_wide=True),
+        # 担当者：変換処理(大文字変換、全角文字変換)
+        'personincharge_cleansing': cleanse_column(df['personincharge'], [], to_upper_wide=True),
+    }, index=df.index)
+
+
 class C7013_02_task(BaseTask):
     '''
     データクレンジング処理を行うタスククラス
@@ -22,6 +104,10 @@ class C7013_02_task(BaseTask):
     APP_ID: str = 'C7013_02'
     # 機能名
     APP_NAME: str = 'データクレンジング'
+    # クレンジング対象列
+    CLEANSING_SOURCE_COLUMNS: list = ['contractorname', 'contents_commission', 'sourcecompany', 'personincharge']
+    # クレンジング後列
+    CLEANSING_COLUMNS: list = ['contractorname_cleansing', 'contents_commission_cleansing', 'sourcecompany_cleansing', 'personincharge_cleansing']
 
     @inject.autoparams()
     def __init__(self):
@@ -31,6 +117,34 @@ class C7013_02_task(BaseTask):
         #親クラスの初期化関数を呼び出す
         super().__init__()
 
+        # コンパイル済の契約者名の置換処理
+        self.__contractorname_rules: list = None
+        # コンパイル済の取次内容の置換処理
+        self.__contents_commission_rules: list = None
+
+    @property
+    def _contractorname_rules(self) -> list:
+        '''
+        コンパイル済の契約者名の置換処理
+        初回参照時に設定_データクレンジング_契約者名クレンジングをコンパイルする
+        '''
+
+        if self.__contractorname_rules is None:
+            self.__contractorname_rules = compile_cleansing_settings(const.CLENSING_CONFIG_NAMECONTRACTOR_NAME)
+
+        return self.__contractorname_rules
+
+    @property
+    def _contents_commission_rules(self) -> list:
+        '''
+        コンパイル済の取次内容の置換処理
+        初回参照時に設定_データクレンジング_取次内容クレンジングをコンパイルする
+        '''
+
+        if self.__contents_commission_rules is None:
+            self.__contents_commission_rules = compile_cleansing_settings(const.CLENSING_CONFIG_CONTENTS_COMMISSION)
+
+        return self.__contents_commission_rules
 
     def execute(self, input_data: pd.DataFrame)->TaskResult:
         '''
@@ -42,9 +156,14 @@ class C7013_02_task(BaseTask):
         #開始ログ出力
         self.logger.info(message.MSG['MSG0001'], C7013_02_task.APP_ID, C7013_02_task.APP_NAME)
 
-        df = input_data.copy()
-        
-        df = df.apply(self._excec, axis='columns')
+        # 入力データを複製せず、クレンジング対象列のみを列毎にクレンジングし、クレンジング後列を追加する
+        df = input_data
+
+        if not df.empty:
+            df_cleansing = cleanse_dataframe(df, self._contractorname_rules, self._contents_commission_rules)
+            for column in C7013_02_task.CLEANSING_COLUMNS:
+                df[column] = df_cleansing[column]
+            self.logger.debug(f'全角大文字変換キャッシュの参照状況：{utils.get_upper_wide_cache().stats()}')
 
         result = TaskResult(const.BATCH_SUCCESS, df, None)
 
@@ -52,74 +171,3 @@ class C7013_02_task(BaseTask):
         self.logger.info(message.MSG['MSG0002'], C7013_02_task.APP_ID, C7013_02_task.APP_NAME)
 
         return result
-    
-    def _excec(self, row: pd.Series) -> pd.Series:
-        '''
-        インプットのDataFrameの行毎のクレンジング処理を行う。
-        '''
-        # 契約者名(クレンジング後)初期化
-        contractorname_cleansing = row['contractorname']
-
-        if not pd.isna(contractorname_cleansing) and contractorname_cleansing != '' and const.CLENSING_CONFIG_NAMECONTRACTOR_NAME.get('cleansing_settings'):
-
-            # 置換処理実施
-            for key in const.CLENSING_CONFIG_NAMECONTRACTOR_NAME['cleansing_settings']:
-                
-                #キー(置換元文字列)が設定されていた場合
-                if key['patternstring'] != '':
-                    beforeStr = key['patternstring']
-                    afterStr = key['replacementstring']
-                    contractorname_cleansing = re.sub(beforeStr, afterStr, contractorname_cleansing)
-
-        # 契約者名(クレンジング後)保存
-        row['contractorname_cleansing'] = contractorname_cleansing
-
-
-        # 取次内容(クレンジング後)初期化
-        contents_commission_cleansing = row['contents_commission']
-
-        if not pd.isna(contents_commission_cleansing) and contents_commission_cleansing != '':
-
-            # 変換処理(大文字変換、全角文字変換)
-            contents_commission_cleansing = utils.to_upper_wide_charactor(contents_commission_cleansing)
-
-            # 改行コードの削除
-            contents_commission_cleansing = contents_commission_cleansing.replace('\r\n', '').replace('\n', '')
-
-            if const.CLENSING_CONFIG_CONTENTS_COMMISSION.get('cleansing_settings'):
-
-                # 置換処理実施
-                for key in const.CLENSING_CONFIG_CONTENTS_COMMISSION['cleansing_settings']:
-                
-                    #キー(置換元文字列)が設定されていた場合
-                    if key['patternstring'] != '':
-                        beforeStr = key['patternstring']
-                        afterStr = key['replacementstring']
-                        contents_commission_cleansing = re.sub(beforeStr, afterStr, contents_commission_cleansing)
-        
-        # 取次内容(クレンジング後)保存
-        row['contents_commission_cleansing'] = contents_commission_cleansing
-        
-
-        # 会社名(情報発信元)(クレンジング後)初期化
-        sourcecompany_cleansing = row['sourcecompany']
-
-        if not pd.isna(sourcecompany_cleansing) and sourcecompany_cleansing != '':
-            # 変換処理(大文字変換、全角文字変換)
-            sourcecompany_cleansing = utils.to_upper_wide_charactor(sourcecompany_cleansing)
-        
-        # クレンジング済み会社名(情報発信元)保存
-        row['sourcecompany_cleansing'] = sourcecompany_cleansing
-
-        
-        # 担当者(クレンジング後)(クレンジング後)初期化
-        personincharge_cleansing = row['personincharge']
-
-        if not pd.isna(personincharge_cleansing) and personincharge_cleansing != '':
-            # 変換処理(大文字変換、全角文字変換)
-            personincharge_cleansing = utils.to_upper_wide_charactor(personincharge_cleansing)
-        
-        # クレンジング済み担当者保存
-        row['personincharge_cleansing'] = personincharge_cleansing
-
-        return row
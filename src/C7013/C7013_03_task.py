@@ -11,8 +11,11 @@ import jaconv
 
 # プロジェクトライブラリインポート
 from . import const, message
+from .rank_utils import RankFlagMatrix
 from .task import BaseTask, TaskResult
 from .dao.crmdb_dao import CrmDBDao
+from .keyword_matcher import get_keyword_matcher, KeywordRegexScanner
+from .keyword_bundle import load_keyword_bundle, get_keyword_bundle_config
 
 # キーワード設定ファイル名
 KEYWORD_SET = 'keyword_'
@@ -64,6 +67,23 @@ CALCULATION_PATTERN = [1,1,1,1,1,1,1,1,1,1,
                        4,4,4,4,4,4,4,4,4,4,
                        4]
 
+
+def get_keyword_file_names() -> dict:
+    '''
+    キーワード設定ファイル名の一覧を返却します。
+
+    Returns:
+        {キーワード設定ファイル名: キーワードを正規表現として使用するか(算出パターン１、４のキーワード)}
+    '''
+    file_names = {}
+    for num in range(1, MAX_KEYWORD_SET + 1):
+        file_names[KEYWORD_SET + '{:0=2}'.format(num) + EXTENSION] = CALCULATION_PATTERN[num - 1] == 1
+    for num in range(1, MAX_RSV_KEYWORD_SET + 1):
+        file_names[RSV + '{:0=2}'.format(num) + KEYWORD1 + EXTENSION] = True
+        file_names[RSV + '{:0=2}'.format(num) + KEYWORD2 + EXTENSION] = True
+        file_names[RSV + '{:0=2}'.format(num) + ORDERCONTENTS_SET + EXTENSION] = False
+    return file_names
+
 class C7013_03_task(BaseTask):
     '''
     ランク判定用フラグ追加を行うタスククラス
@@ -83,6 +103,8 @@ class C7013_03_task(BaseTask):
             dao: CrmDBDao
         '''
         self.__dao = dao
+        # キーワードバンドル(キーワードバンドルを使用しない場合はNone)
+        self.__keyword_bundle = None
         #親クラスの初期化関数を呼び出す
         super().__init__()
 
@@ -99,19 +121,20 @@ class C7013_03_task(BaseTask):
         # 処理開始メッセージ出力
         self.logger.info(message.MSG['MSG0001'], C7013_03_task.APP_ID, C7013_03_task.APP_NAME)
 
-        df = input_data.copy()
+        # 入力データは複製・変更せず、ランク判定用フラグはフラグ行列としてタスク結果に設定する
+        df = input_data
 
         # ランク判定用フラグ追加処理
         # 3.キーワードリスト、算出パターンを取得
         dic_keyword = self._read_keyword(df)
 
         # 4.キーワード設定ファイル辞書からフラグ追加処理
-        self._add_flag(df, dic_keyword)
+        rank_flags = self._add_flag(df, dic_keyword)
 
         # 処理終了メッセージ出力
         self.logger.info(message.MSG['MSG0002'], C7013_03_task.APP_ID, C7013_03_task.APP_NAME)
         
-        taskResult = TaskResult(const.BATCH_SUCCESS, df, None)
+        taskResult = TaskResult(const.BATCH_SUCCESS, df, None, rankFlags=rank_flags)
         return taskResult
 
     def _get_keyword_list_from_path(self, fpath):
@@ -133,6 +156,21 @@ class C7013_03_task(BaseTask):
 
         return result
 
+    def _get_keyword_list(self, file_name):
+        '''
+        キーワード設定ファイル名のキーワードリストを返却
+        キーワードバンドルを読込済の場合はバンドルから、それ以外はファイルから読み込む
+
+        Args:
+                file_name: キーワード設定ファイル名
+        Returns:
+                []: キーワードリスト
+        '''
+        if self.__keyword_bundle is None:
+            return self._get_keyword_list_from_path(self._get_keyword_file_path() / file_name)
+
+        return self.__keyword_bundle.get(file_name)
+
     def _get_new_autoagent(self, df):
         '''
         特定ベンダ名を取得し一覧を作成する
@@ -240,6 +278,13 @@ class C7013_03_task(BaseTask):
                 }
         '''
         dic_keyword = {}
+
+        # キーワード設定ファイルはキーワードバンドル(更新されていないファイルは読み込まないキャッシュ)から取得する
+        if get_keyword_bundle_config()['enabled']:
+            self.__keyword_bundle = load_keyword_bundle(self._get_keyword_file_path(), get_keyword_file_names())
+        else:
+            self.__keyword_bundle = None
+
         # keyword_01.txt ～ keyword_40.txtの読み込み
         # フラグ１～４０までの処理を定義
         for num in range(1, MAX_KEYWORD_SET + 1):
@@ -247,12 +292,11 @@ class C7013_03_task(BaseTask):
 
             # キーワード設定ファイル名をセット
             keyword_set_file_name = KEYWORD_SET + '{:0=2}'.format(num) + EXTENSION
-            keyword_set_file_path = self._get_keyword_file_path() / keyword_set_file_name
 
             key = ADD_COLUMN_NAME + '{:0=2}'.format(num)
 
             dic_sub[DIC_KEY_PATTERN] = CALCULATION_PATTERN[num - 1]
-            dic_sub[DIC_KEY_KEYWOED_1] = self._get_keyword_list_from_path(keyword_set_file_path)
+            dic_sub[DIC_KEY_KEYWOED_1] = self._get_keyword_list(keyword_set_file_name)
             dic_keyword[key] = dic_sub
         
         # フラグ４１の処理を定義
@@ -271,20 +315,16 @@ class C7013_03_task(BaseTask):
             rsv_keyword_set_file_name_2 = RSV + '{:0=2}'.format(num) + KEYWORD2 + EXTENSION
             rsv_ordercontents_set_file_name = RSV + '{:0=2}'.format(num) + ORDERCONTENTS_SET + EXTENSION
 
-            rsv_keyword_set_file_path_1 = self._get_keyword_file_path() / rsv_keyword_set_file_name_1
-            rsv_keyword_set_file_path_2 = self._get_keyword_file_path() / rsv_keyword_set_file_name_2
-            rsv_ordercontents_set_file_path = self._get_keyword_file_path() / rsv_ordercontents_set_file_name
-
             key = ADD_COLUMN_NAME + '{:0=2}'.format(num + MAX_KEYWORD_SET + 1)
             dic_sub = {}
 
             dic_sub[DIC_KEY_PATTERN] = CALCULATION_PATTERN[num + MAX_KEYWORD_SET]
             # 予備キーワードファイル1
-            dic_sub[DIC_KEY_KEYWOED_1] = self._get_keyword_list_from_path(rsv_keyword_set_file_path_1)
+            dic_sub[DIC_KEY_KEYWOED_1] = self._get_keyword_list(rsv_keyword_set_file_name_1)
             # 予備キーワードファイル2
-            dic_sub[DIC_KEY_KEYWOED_2] = self._get_keyword_list_from_path(rsv_keyword_set_file_path_2)
+            dic_sub[DIC_KEY_KEYWOED_2] = self._get_keyword_list(rsv_keyword_set_file_name_2)
             # 予備当初注文内容ファイル
-            dic_sub[DIC_KEY_KEYWOED_3] = self._get_keyword_list_from_path(rsv_ordercontents_set_file_path)
+            dic_sub[DIC_KEY_KEYWOED_3] = self._get_keyword_list(rsv_ordercontents_set_file_name)
             dic_keyword[key] = dic_sub
         return dic_keyword
 
@@ -295,30 +335,72 @@ class C7013_03_task(BaseTask):
         Args:
             df：クレンジング済情報DataFrame
             dic_keyword：キーワード設定ファイル辞書
+        Returns:
+            ランク判定用フラグ行列(dfの行順)
         '''
+        # 算出パターン１、４の取次内容(クレンジング済)のキーワード判定は、全フラグ分をまとめて1回の走査で行う
+        dic_match = self._scan_commission(df, dic_keyword)
+
+        # ランク判定用フラグはDataFrameに列として追加せず、フラグ行列に算出する
+        rank_flags = RankFlagMatrix.zeros(len(df))
+
         for key in dic_keyword:
             pattern = dic_keyword[key][DIC_KEY_PATTERN]
             if pattern == 1:
                 # 算出パターン１
-                self._caluculation_pattern_1(df, key, dic_keyword[key].get(DIC_KEY_KEYWOED_1))
+                self._caluculation_pattern_1(df, rank_flags, key, dic_match[(key, DIC_KEY_KEYWOED_1)])
             elif pattern == 2:
                 # 算出パターン２
-                self._caluculation_pattern_2(df, key, dic_keyword[key].get(DIC_KEY_KEYWOED_1))
+                self._caluculation_pattern_2(df, rank_flags, key, dic_keyword[key].get(DIC_KEY_KEYWOED_1))
             elif pattern == 3:
                 # 算出パターン３
-                self._caluculation_pattern_3(df, key, dic_keyword[key].get(DIC_KEY_NEW_AUTOAGENT))
+                self._caluculation_pattern_3(df, rank_flags, key, dic_keyword[key].get(DIC_KEY_NEW_AUTOAGENT))
             elif pattern == 4:
                 # 算出パターン４
-                self._caluculation_pattern_4(df, key, 
+                self._caluculation_pattern_4(df, rank_flags, key, 
                                             dic_keyword[key].get(DIC_KEY_KEYWOED_1),
                                             dic_keyword[key].get(DIC_KEY_KEYWOED_2),
-                                            dic_keyword[key].get(DIC_KEY_KEYWOED_3))
+                                            dic_keyword[key].get(DIC_KEY_KEYWOED_3),
+                                            dic_match[(key, DIC_KEY_KEYWOED_1)],
+                                            dic_match[(key, DIC_KEY_KEYWOED_2)])
             elif pattern == 5:
                 # 算出パターン５
-                self._caluculation_pattern_5(df, key, dic_keyword[key].get(DIC_KEY_KEYWOED_1))
+                self._caluculation_pattern_5(df, rank_flags, key, dic_keyword[key].get(DIC_KEY_KEYWOED_1))
 
+        return rank_flags
 
-    def _caluculation_pattern_1(self, df, column, keyword_list):
+    def _scan_commission(self, df, dic_keyword):
+        '''
+        算出パターン１、４のキーワード(正規表現)一覧毎に、取次内容(クレンジング済)に1件以上含まれるかを判定する
+
+        全フラグのキーワードを重複を除いてコンパイルし、取次内容毎に一致するキーワード一覧の集合を1回の走査で求める。
+        同じ取次内容は1回のみ判定する。
+
+        Args:
+            df：クレンジング済情報DataFrame
+            dic_keyword：キーワード設定ファイル辞書
+        Returns:
+            {(ランク判定用フラグ名, キーワード設定ファイルのkey): 1件以上含まれるかのSeries}
+        '''
+        groups = {}
+        for key in dic_keyword:
+            pattern = dic_keyword[key][DIC_KEY_PATTERN]
+            if pattern == 1:
+                groups[(key, DIC_KEY_KEYWOED_1)] = dic_keyword[key].get(DIC_KEY_KEYWOED_1)
+            elif pattern == 4:
+                groups[(key, DIC_KEY_KEYWOED_1)] = dic_keyword[key].get(DIC_KEY_KEYWOED_1)
+                groups[(key, DIC_KEY_KEYWOED_2)] = dic_keyword[key].get(DIC_KEY_KEYWOED_2)
+
+        if self.__keyword_bundle is None:
+            scanner = KeywordRegexScanner(groups)
+        else:
+            # キーワードバンドルのコンパイル済の正規表現、必ず含まれる文字列を再利用する
+            scanner = KeywordRegexScanner(groups, self.__keyword_bundle.compiled_patterns, self.__keyword_bundle.required_literals)
+        dic_result = scanner.scan_texts(df[COMMISSION_CLEANSING])
+
+        return {name: pd.Series(result, index=df.index) for name, result in dic_result.items()}
+
+    def _caluculation_pattern_1(self, df, rank_flags, column, s_match):
         '''
         算出パターン１
 
@@ -331,21 +413,14 @@ class C7013_03_task(BaseTask):
 
         Args:
             df：クレンジング済情報DataFrame
+            rank_flags：ランク判定用フラグ行列
             column：フラグ追加カラム名
-            keyword_list：キーワード設定ファイルより取得した正規表現一覧
+            s_match：キーワード設定ファイルより取得した正規表現が1件以上含まれるか(_scan_commission)
         '''
-        #初期値にFalseで追加
-        df[column] = False
-
-        if len(df[COMMISSION_CLEANSING]) != df[COMMISSION_CLEANSING].isnull().sum():
-            for row in keyword_list:
-                # 設定されたキーワードが1度でも含まれればTrue
-                df[column] = df[column] | df[COMMISSION_CLEANSING].str.contains(row)
-
-        # booleanをintに変換
-        df[column] *= 1
+        # 設定されたキーワードが1度でも含まれればTrue
+        rank_flags[column] = s_match.to_numpy()
 
-    def _caluculation_pattern_2(self, df, column, keyword_list):
+    def _caluculation_pattern_2(self, df, rank_flags, column, keyword_list):
         '''
         算出パターン２
 
@@ -358,20 +433,20 @@ class C7013_03_task(BaseTask):
 
         Args:
             df：クレンジング済情報DataFrame
+            rank_flags：ランク判定用フラグ行列
             column：フラグ追加カラム名
             keyword_list：キーワード設定ファイルより取得したキーワード一覧
         '''
         #初期値にFalseで追加
-        df[column] = False
+        s_flag = pd.Series(False, index=df.index)
 
         for row in keyword_list:
             # 設定されたキーワードが1度でも一致すればTrue
-            df[column] = df[column] | ( df[SOURCECOMPANY_CLEANSING] == row)
+            s_flag = s_flag | ( df[SOURCECOMPANY_CLEANSING] == row)
 
-        # booleanをintに変換
-        df[column] *= 1
+        rank_flags[column] = s_flag.to_numpy()
 
-    def _caluculation_pattern_3(self, df, column, dic_new_autoagent):
+    def _caluculation_pattern_3(self, df, rank_flags, column, dic_new_autoagent):
         '''
         算出パターン３
 
@@ -386,44 +461,36 @@ class C7013_03_task(BaseTask):
 
         Args:
             df：クレンジング済情報DataFrame
+            rank_flags：ランク判定用フラグ行列
             column：フラグ追加カラム名
             dic_new_autoagent：自動差配設定(GUID)をkeyにした特定ベンダ一覧
         '''
         #初期値にFalseで追加
-        df[column] = False
+        s_flag = pd.Series(False, index=df.index)
         
-        s_commission = df[column].copy()
-        s_personincharge = df[column].copy()
-
-        commission_is_not_all_NaN = False
-        personincharge_is_not_all_NaN = False
-
-        if len(df[COMMISSION_CLEANSING]) != df[COMMISSION_CLEANSING].isnull().sum():
-            commission_is_not_all_NaN = True
-        if len(df[PERSONINCHARGE_CLEANSING]) != df[PERSONINCHARGE_CLEANSING].isnull().sum():
-            personincharge_is_not_all_NaN = True
+        # 取次内容(クレンジング済)、担当者(クレンジング済)は全角スペースのみ除去して比較する
+        # 特定ベンダ名に.+:?等の正規表現のメタ文字が含まれる可能性があるので文字列として判定する
+        # (全てNaNの列は.strで参照できないため、文字列の場合のみ除去する)
+        s_commission = df[COMMISSION_CLEANSING].map(lambda text: text.replace('　', '') if isinstance(text, str) else text)
+        s_personincharge = df[PERSONINCHARGE_CLEANSING].map(lambda text: text.replace('　', '') if isinstance(text, str) else text)
 
         for key in dic_new_autoagent:
             # 対象は同一の自動差配設定(GUID)のみ
             s_target = df[AUTOAGENTID_GUID] == key
-            for row in dic_new_autoagent[key].itertuples():
-                # 特定ベンダ名に.+:?等の正規表現のメタ文字が含まれる可能性があるのでregex=Falseとする
-                # （全角化しているので正規表現で検索しても結果は変わらない）
-                # 取次内容(クレンジング済)の検索（全角スペースのみ除去して比較）
-                if commission_is_not_all_NaN:
-                    s_commission = s_commission | df[COMMISSION_CLEANSING].str.replace('　','').str.contains(row.new_autoagent_specific_vendor, regex=False)
-                # 担当者(クレンジング済)の検索（全角スペースのみ除去して比較）
-                if personincharge_is_not_all_NaN:
-                    s_personincharge = s_personincharge | df[PERSONINCHARGE_CLEANSING].str.replace('　','').str.contains(row.new_autoagent_specific_vendor, regex=False)
-            
-            df[column] = df[column] | (s_target & (s_commission | s_personincharge))
-            s_commission[:] = False
-            s_personincharge[:] = False
-
-        # booleanをintに変換
-        df[column] *= 1
-
-    def _caluculation_pattern_4(self, df, column, keyword_1_list, keyword_2_list, keyword_3_list):
+            if not s_target.any():
+                continue
+            # 特定ベンダ名一覧を1回の走査で判定する
+            matcher = get_keyword_matcher(dic_new_autoagent[key][NEW_AUTOAGENT_SPECIFIC_VENDOR].tolist())
+            s_match = pd.Series(
+                [matcher.contains_any(commission) or matcher.contains_any(personincharge)
+                 for commission, personincharge in zip(s_commission[s_target], s_personincharge[s_target])],
+                index=s_target[s_target].index, dtype=bool)
+
+            s_flag = s_flag | s_match.reindex(df.index, fill_value=False)
+
+        rank_flags[column] = s_flag.to_numpy()
+
+    def _caluculation_pattern_4(self, df, rank_flags, column, keyword_1_list, keyword_2_list, keyword_3_list, s_match_1, s_match_2):
         '''
         算出パターン４
         
@@ -440,23 +507,21 @@ class C7013_03_task(BaseTask):
         
         Args:
             df：クレンジング済情報DataFrame
+            rank_flags：ランク判定用フラグ行列
             column：フラグ追加カラム名
             keyword_1_list：予備キーワード設定ファイル１より取得した正規表現一覧
             keyword_2_list：予備キーワード設定ファイル２より取得した正規表現一覧
             keyword_3_list：予備当初注文内容ファイル
+            s_match_1：予備キーワード設定ファイル１の正規表現が1件以上含まれるか(_scan_commission)
+            s_match_2：予備キーワード設定ファイル２の正規表現が1件以上含まれるか(_scan_commission)
         '''
-        #初期値にFalseで追加
-        df[column] = False
-
-        # 作業用にSeriesとして抜き出す
-        s_work_1 = df[column].copy()
-        s_work_2 = df[column].copy()
-        s_work_3 = df[column].copy()
+        # 作業用のSeriesを初期値Falseで作成
+        s_work_1 = pd.Series(False, index=df.index)
+        s_work_2 = pd.Series(False, index=df.index)
+        s_work_3 = pd.Series(False, index=df.index)
 
         # 全て設定なしの場合、フラグ0で後続は実行しない
         if len(keyword_1_list) == 0 and len(keyword_2_list) == 0 and len(keyword_3_list) == 0:
-            # booleanをintに変換
-            df[column] *= 1
             return
 
         # A.予備Nキーワードファイル1
@@ -464,22 +529,16 @@ class C7013_03_task(BaseTask):
             # 設定値なしの場合は判定条件外のためTrueを設定
             s_work_1[:] = True
         else:
-            if len(df[COMMISSION_CLEANSING]) != df[COMMISSION_CLEANSING].isnull().sum():
-                # 取次内容に予備Nキーワード1ファイルに設定されたキーワード1件以上含むか
-                for row in keyword_1_list:
-                    s_work_1 = s_work_1 | df[COMMISSION_CLEANSING].str.contains(row)
+            # 取次内容に予備Nキーワード1ファイルに設定されたキーワード1件以上含むか
+            s_work_1 = s_match_1
 
         # B.予備Nキーワードファイル2
         if len(keyword_2_list) == 0:
             # 設定値なしの場合は判定条件外のためTrueを設定
             s_work_2[:] = True
         else:
-            if len(df[COMMISSION_CLEANSING]) != df[COMMISSION_CLEANSING].isnull().sum():
-                # 設定されたキーワードが1件以上含まれるか
-                for row in keyword_2_list:
-                    s_work_2 = s_work_2 | df[COMMISSION_CLEANSING].str.contains(row)
             # 結果の反転（＝取次内容に予備Nキーワード2ファイルに設定されたキーワード１件も含まれていない）
-            s_work_2 = ~s_work_2
+            s_work_2 = ~s_match_2
 
         # C.予備N当初注文内容ファイル
         if len(keyword_3_list) == 0:
@@ -492,12 +551,9 @@ class C7013_03_task(BaseTask):
                 if row.isdecimal():
                     s_work_3 = s_work_3 | (df[ORDERCONTENTS] == int(row))
 
-        df[column] = s_work_1 & s_work_2 & s_work_3
-        
-        # booleanをintに変換
-        df[column] *= 1
+        rank_flags[column] = (s_work_1 & s_work_2 & s_work_3).to_numpy()
 
-    def _caluculation_pattern_5(self, df, column, keyword_list):
+    def _caluculation_pattern_5(self, df, rank_flags, column, keyword_list):
         '''
         算出パターン５
 
@@ -510,16 +566,16 @@ class C7013_03_task(BaseTask):
 
         Args:
             df：クレンジング済情報DataFrame
+            rank_flags：ランク判定用フラグ行列
             column：フラグ追加カラム名
             keyword_list：キーワード設定ファイルより取得した取次区分ピックリスト値
         '''
         #初期値にFalseで追加
-        df[column] = False
+        s_flag = pd.Series(False, index=df.index)
 
         for row in keyword_list:
             if row.isdecimal():
                 # 設定されたキーワードが1度でも一致すればTrue
-                df[column] = df[column] | ( df[COMMISSIONCLASSIFICATION] == int(row) )
+                s_flag = s_flag | ( df[COMMISSIONCLASSIFICATION] == int(row) )
 
-        # booleanをintに変換
-        df[column] *= 1
+        rank_flags[column] = s_flag.to_numpy()
@@ -91,48 +91,80 @@ class C7013_04_addresscode_prediction_task(BaseTask):
             住所コード（11桁）
         '''
 
-        if not address:
-            return None
+        return self.addresses2addresscodes([address], batch_size=1)[0]
 
-        # 住所のクレンジング処理を実施する
-        cleansed_address = address_cleansing(address)
-        # 文字列を統一化する
-        nomalized_address = unification_text(cleansed_address)
-        nomalized_address = azchm_hypen_inverse_convert(nomalized_address)
-        nomalized_address = azchm_after_address_truncate(nomalized_address)
-        self.logger.debug(f'address:{address} nomalized_address:{nomalized_address}')
-
-        tdfkn_cd = extract_tdfkn_from_address(nomalized_address)[1]
-        self.logger.debug(f'tdfkn_cd:{tdfkn_cd}')
-        if tdfkn_cd == 'ZZ':
-            return None
-        predict = self._scyosn_cd_helper.predict(tdfkn_cd_list=np.array([[tdfkn_cd]]), addr_nm_list=np.array([nomalized_address]))
-        scyosn_cd = predict[0][0]
-        self.logger.debug(f'scyosn_cd:{scyosn_cd}')
-        if scyosn_cd == 'ZZZ':
-            return None
-
-        predict = self._oaza_tshum_cd_helper.predict(
-            tdfkn_cd_list=np.array([[tdfkn_cd]]),
-            scyosn_cd_list=np.array([[scyosn_cd]]),
-            addr_nm_list=np.array([nomalized_address]))
-        oaza_tshum_cd = predict[0][0]
-        self.logger.debug(f'oaza_tshum_cd:{oaza_tshum_cd}')
-        if oaza_tshum_cd == 'ZZZ':
-            return None
-
-        predict = self._azchm_cd_helper.predict(
-            tdfkn_cd_list=np.array([[tdfkn_cd]]),
-            scyosn_cd_list=np.array([[scyosn_cd]]),
-            oaza_tshum_cd_list=np.array([[oaza_tshum_cd]]),
-            addr_nm_list=np.array([nomalized_address]))
-        azchm_cd = predict[0][0]
-        self.logger.debug(f'azchm_cd:{azchm_cd}')
-        if azchm_cd == 'ZZZ':
-            return None
-
-        addresscode = f'{tdfkn_cd}{scyosn_cd}{oaza_tshum_cd}{azchm_cd}'
-        return addresscode
+    def addresses2addresscodes(self, addresses: list, batch_size: int = None) -> list:
+        '''
+        複数の住所を住所コードに一括変換します。
+        住所の正規化後、市区町村コード・大字通称コード・字丁目コードの順に、
+        前段の予測で変換できた住所のみをまとめて予測する。同じ住所は1回のみ予測する。
+        変換できなかった住所には、Noneを返却します
+
+        Args:
+            addresses: 住所の文字列のリスト
+            batch_size: 予測のバッチサイズ。省略時は設定ファイルのaddresscode_config.predict_batch_size
+
+        Returns:
+            住所コード（11桁）のリスト（addressesと同じ順序）
+        '''
+
+        if batch_size is None:
+            batch_size = const.APP_CONFIG['addresscode_config'].get('predict_batch_size', 256)
+
+        # 住所毎の変換結果（変換対象外の住所はNone）
+        addresscode_dict = {}
+        unique_addresses = list(dict.fromkeys(address for address in addresses if address and isinstance(address, str)))
+
+        # 住所のクレンジング処理、文字列の統一化を実施し、都道府県コードを抽出する
+        nomalized_addresses = []
+        tdfkn_cds = []
+        targets = []
+        for address in unique_addresses:
+            cleansed_address = address_cleansing(address)
+            nomalized_address = unification_text(cleansed_address)
+            nomalized_address = azchm_hypen_inverse_convert(nomalized_address)
+            nomalized_address = azchm_after_address_truncate(nomalized_address)
+            tdfkn_cd = extract_tdfkn_from_address(nomalized_address)[1]
+            self.logger.debug(f'address:{address} nomalized_address:{nomalized_address} tdfkn_cd:{tdfkn_cd}')
+            if tdfkn_cd == 'ZZ':
+                continue
+            nomalized_addresses.append(nomalized_address)
+            tdfkn_cds.append(tdfkn_cd)
+            targets.append(address)
+
+        addr_nm_list = np.array(nomalized_addresses)
+        tdfkn_cd_list = np.array(tdfkn_cds).reshape(-1, 1)
+
+        # 市区町村コード予測
+        if len(targets) > 0:
+            scyosn_cd_list = self._scyosn_cd_helper.predict(
+                tdfkn_cd_list=tdfkn_cd_list, addr_nm_list=addr_nm_list, batch_size=batch_size, verbose=0)
+            mask = scyosn_cd_list[:, 0] != 'ZZZ'
+            targets = [address for address, is_target in zip(targets, mask) if is_target]
+            addr_nm_list, tdfkn_cd_list, scyosn_cd_list = addr_nm_list[mask], tdfkn_cd_list[mask], scyosn_cd_list[mask]
+
+        # 大字通称コード予測
+        if len(targets) > 0:
+            oaza_tshum_cd_list = self._oaza_tshum_cd_helper.predict(
+                tdfkn_cd_list=tdfkn_cd_list, scyosn_cd_list=scyosn_cd_list, addr_nm_list=addr_nm_list, batch_size=batch_size, verbose=0)
+            mask = oaza_tshum_cd_list[:, 0] != 'ZZZ'
+            targets = [address for address, is_target in zip(targets, mask) if is_target]
+            addr_nm_list, tdfkn_cd_list, scyosn_cd_list, oaza_tshum_cd_list = \
+                addr_nm_list[mask], tdfkn_cd_list[mask], scyosn_cd_list[mask], oaza_tshum_cd_list[mask]
+
+        # 字丁目コード予測
+        if len(targets) > 0:
+            azchm_cd_list = self._azchm_cd_helper.predict(
+                tdfkn_cd_list=tdfkn_cd_list, scyosn_cd_list=scyosn_cd_list, oaza_tshum_cd_list=oaza_tshum_cd_list,
+                addr_nm_list=addr_nm_list, batch_size=batch_size, verbose=0)
+            for address, tdfkn_cd, scyosn_cd, oaza_tshum_cd, azchm_cd in zip(
+                    targets, tdfkn_cd_list[:, 0], scyosn_cd_list[:, 0], oaza_tshum_cd_list[:, 0], azchm_cd_list[:, 0]):
+                if azchm_cd != 'ZZZ':
+                    addresscode_dict[address] = f'{tdfkn_cd}{scyosn_cd}{oaza_tshum_cd}{azchm_cd}'
+
+        self.logger.debug('住所コード一括変換 住所数：%d 変換件数：%d', len(unique_addresses), len(addresscode_dict))
+
+        return [addresscode_dict.get(address) if isinstance(address, str) else None for address in addresses]
 
     def _join_addresscode(self, row: pd.Series) -> str:
         '''
@@ -1,6 +1,7 @@
 # 標準ライブラリインポート
 
 # サードパーティライブラリインポート
+import numpy as np
 import pandas as pd
 import inject
 
@@ -8,6 +9,136 @@ import inject
 from . import rank_utils
 from .task import BaseTask
 
+
+class ForcedCorrectionRule(object):
+    '''
+    フラグ強制補正ルール
+
+    当初注文内容とランク判定用フラグの条件に該当する行の、全てのランク判定用フラグをクリアしてから設定値を設定する。
+    '''
+
+    def __init__(self, no: str, name: str, ordercontents: list, conditions: dict, settings: dict):
+        '''
+        コンストラクタ
+
+        Args:
+            no: ルール番号
+            name: ルール名
+            ordercontents: 対象の当初注文内容の一覧。Noneの場合は当初注文内容を条件としない
+            conditions: ランク判定用フラグの条件({フラグ名: 値})
+            settings: クリア後に設定するランク判定用フラグの値({フラグ名: 値})
+        '''
+
+        self.no: str = no
+        self.name: str = name
+        self.ordercontents: list = ordercontents
+        self.conditions: dict = conditions
+        self.settings: dict = settings
+
+    def mask(self, flag_values: np.ndarray, ordercontents: np.ndarray) -> np.ndarray:
+        '''
+        ルールの条件に該当する行を判定します。
+        欠損値(NaN)のフラグ、当初注文内容はいずれの値とも一致しないものとする。
+
+        Args:
+            flag_values: ランク判定用フラグ行列(行数×71、rank_utils.rank_flag_columnsの順)
+            ordercontents: 当初注文内容の配列
+        Returns:
+            該当するかのbool配列
+        '''
+
+        mask = np.ones(len(flag_values), dtype=bool)
+        if self.ordercontents is not None:
+            mask &= pd.Series(ordercontents).isin(self.ordercontents).to_numpy()
+        for column, value in self.conditions.items():
+            mask &= flag_values[:, rank_utils.rank_flag_positions[column]] == value
+
+        return mask
+
+
+# 強制補正の対象となる当初注文内容
+_ORDERCONTENTS_NEW_CHANGE_INQUIRY = [
+    rank_utils.ordercontents_dict['新設'],
+    rank_utils.ordercontents_dict['変更'],
+    rank_utils.ordercontents_dict['問い合せ'],
+]
+
+# フラグ強制補正ルール(判定順。1行に対して最初に該当したルールのみ適用する)
+FORCED_CORRECTION_RULES = [
+    # No32 Ｂフレ マイグレ（アウトバウンド）
+    ForcedCorrectionRule('No32', 'Ｂフレ マイグレ（アウトバウンド）', _ORDERCONTENTS_NEW_CHANGE_INQUIRY,
+                         {'rank_flag33': 1, 'rank_flag24': 1, 'rank_flag07': 0},
+                         {'rank_flag33': 1, 'rank_flag24': 1, 'rank_flag07': 0}),
+    # No33 ADSL マイグレ（アウトバウンド）
+    ForcedCorrectionRule('No33', 'ADSL マイグレ（アウトバウンド）', _ORDERCONTENTS_NEW_CHANGE_INQUIRY,
+                         {'rank_flag33': 1, 'rank_flag06': 1, 'rank_flag07': 0},
+                         {'rank_flag33': 1, 'rank_flag06': 1, 'rank_flag07': 0}),
+    # No35 パートナーセンタからの取次
+    ForcedCorrectionRule('No35', 'パートナーセンタからの取次', None,
+                         {'rank_flag35': 1},
+                         {'rank_flag35': 1}),
+    # No40 アップセルNGベンダ名義・申込
+    ForcedCorrectionRule('No40', 'アップセルNGベンダ名義・申込', None,
+                         {'rank_flag41': 1},
+                         {'rank_flag41': 1}),
+    # No16 現場事務所系・イベント系(ブースモデルルーム等)への注文
+    ForcedCorrectionRule('No16', '現場事務所系・イベント系(ブースモデルルーム等)への注文', [
+                             rank_utils.ordercontents_dict['新設'],
+                             rank_utils.ordercontents_dict['増設'],
+                             rank_utils.ordercontents_dict['変更'],
+                             rank_utils.ordercontents_dict['問い合せ'],
+                         ],
+                         {'rank_flag21': 0, 'rank_flag39': 1},
+                         {'rank_flag21': 0, 'rank_flag39': 1}),
+]
+
+
+def match_forced_correction_rules(flag_values: np.ndarray, ordercontents: np.ndarray) -> list:
+    '''
+    行毎に適用するフラグ強制補正ルールを判定します。
+    ルールの判定順に、前のルールに該当しなかった行のみを対象とする。
+
+    Args:
+        flag_values: ランク判定用フラグ行列(行数×71、rank_utils.rank_flag_columnsの順)
+        ordercontents: 当初注文内容の配列
+    Returns:
+        FORCED_CORRECTION_RULESの順に、ルールを適用する行のbool配列のリスト
+    '''
+
+    remaining = np.ones(len(flag_values), dtype=bool)
+    masks = []
+    for rule in FORCED_CORRECTION_RULES:
+        mask = rule.mask(flag_values, ordercontents) & remaining
+        remaining &= ~mask
+        masks.append(mask)
+
+    return masks
+
+
+def apply_forced_correction(flag_values: np.ndarray, ordercontents: np.ndarray) -> list:
+    '''
+    ランク判定用フラグ行列にフラグ強制補正を適用します(フラグ行列を直接更新する)。
+    rank_utils.RankFlagMatrixのvaluesにも適用できる。
+
+    Args:
+        flag_values: ランク判定用フラグ行列(行数×71、rank_utils.rank_flag_columnsの順)
+        ordercontents: 当初注文内容の配列
+    Returns:
+        FORCED_CORRECTION_RULESの順に、ルールを適用した行のbool配列のリスト
+    '''
+
+    # 全てのルールの判定を補正前のフラグで行ってから補正する(1行に適用するルールは1つのため、行単位の判定と結果は同じ)
+    masks = match_forced_correction_rules(flag_values, ordercontents)
+    for rule, mask in zip(FORCED_CORRECTION_RULES, masks):
+        if not mask.any():
+            continue
+        flag_values[mask, :] = 0
+        for column, value in rule.settings.items():
+            flag_values[mask, rank_utils.rank_flag_positions[column]] = value
+
+    return masks
+
+
 class C7013_04_rank_flag_forced_correction_task(BaseTask):
     '''
     フラグ強制補正を行うタスククラス
@@ -21,138 +152,54 @@ class C7013_04_rank_flag_forced_correction_task(BaseTask):
         #親クラスの初期化関数を呼び出す
         super().__init__()
 
-    def execute(self, input_data: pd.DataFrame) -> pd.DataFrame:
+    def correct(self, rank_flags: rank_utils.RankFlagMatrix, ordercontents: np.ndarray) -> rank_utils.RankFlagMatrix:
         '''
-        フラグを強制補正を行う
+        ランク判定用フラグ行列にフラグ強制補正を行う
+        入力のフラグ行列は変更せず、補正済のフラグ行列を返却する。
+
         Args:
-            input_data: 入力DataFrame
+            rank_flags: ランク判定用フラグ行列
+            ordercontents: 当初注文内容の配列
         Returns:
-            強制補正済みDataFrame
+            強制補正済みランク判定用フラグ行列
         '''
         self.logger.info(f'フラグ強制補正タスクを実行します。')
 
-        output_data = input_data.apply(self.set_force_flag, axis=1)
+        corrected = rank_flags.copy()
+        masks = apply_forced_correction(corrected.values, ordercontents)
+        for rule, mask in zip(FORCED_CORRECTION_RULES, masks):
+            if mask.any():
+                self.logger.debug(f'フラグ強制補正 {rule.no} {rule.name}：{int(mask.sum())}件')
 
-        return output_data
+        return corrected
 
-    def set_force_flag(self, row: pd.Series) -> pd.Series:
+    def execute(self, input_data: pd.DataFrame) -> pd.DataFrame:
         '''
-        フラグを強制敵に設定する
+        フラグを強制補正を行う
+        フラグ強制補正ルール(FORCED_CORRECTION_RULES)の条件を列単位で判定し、該当する行をまとめて補正する。
+        入力DataFrameは変更しない。
 
         Args:
-            row: ランク判定用データフレームの１行
-        '''
-
-        # No32 Ｂフレ マイグレ（アウトバウンド）
-        if self.is_rule_no32(row):
-            rank_utils.clear_all_rank_flag(row)
-            self.set_rule_no32(row)
-        # No33 ADSL マイグレ（アウトバウンド）
-        elif self.is_rule_no33(row):
-            rank_utils.clear_all_rank_flag(row)
-            self.set_rule_no33(row)
-        # No35 パートナーセンタからの取次
-        elif self.is_rule_no35(row):
-            rank_utils.clear_all_rank_flag(row)
-            self.set_rule_no35(row)
-        # No40 アップセルNGベンダ名義・申込
-        elif self.is_rule_no40(row):
-            rank_utils.clear_all_rank_flag(row)
-            self.set_rule_no40(row)
-        # No16 現場事務所系・イベント系(ブースモデルルーム等)への注文
-        elif self.is_rule_no16(row):
-            rank_utils.clear_all_rank_flag(row)
-            self.set_rule_no16(row)
-
-        return row
-
-    def is_rule_no32(self, row: pd.Series) -> int:
-        '''
-        NO32：Ｂフレ マイグレ（アウトバウンド）
-        '''
-        if row['ordercontents'] in [
-                rank_utils.ordercontents_dict['新設'],
-                rank_utils.ordercontents_dict['変更'],
-                rank_utils.ordercontents_dict['問い合せ'],
-            ]:
-            if row['rank_flag33'] == 1 and row['rank_flag24'] == 1 and row['rank_flag07'] == 0:
-                return 1
-        return 0
-
-    def set_rule_no32(self, row: pd.Series) -> None:
-        '''
-        NO32：Ｂフレ マイグレ（アウトバウンド）
-        '''
-        row['rank_flag33'] = 1
-        row['rank_flag24'] = 1
-        row['rank_flag07'] = 0
-
-    def is_rule_no33(self, row: pd.Series) -> int:
-        '''
-        NO33：ADSL マイグレ（アウトバウンド）
-        '''
-        if row['ordercontents'] in [
-                rank_utils.ordercontents_dict['新設'],
-                rank_utils.ordercontents_dict['変更'],
-                rank_utils.ordercontents_dict['問い合せ'],
-            ]:
-            if row['rank_flag33'] == 1 and row['rank_flag06'] == 1 and row['rank_flag07'] == 0:
-                return 1
-        return 0
-
-    def set_rule_no33(self, row: pd.Series) -> None:
-        '''
-        NO33：ADSL マイグレ（アウトバウンド）
-        '''
-        row['rank_flag33'] = 1
-        row['rank_flag06'] = 1
-        row['rank_flag07'] = 0
-
-    def is_rule_no35(self, row: pd.Series) -> int:
-        '''
-        NO35：パートナーセンタからの取次
+            input_data: 入力DataFrame
+        Returns:
+            強制補正済みDataFrame
         '''
-        if row['rank_flag35'] == 1:
-            return 1
-        return 0
+        self.logger.info(f'フラグ強制補正タスクを実行します。')
 
-    def set_rule_no35(self, row: pd.Series) -> None:
-        '''
-        NO35：パートナーセンタからの取次
-        '''
-        row['rank_flag35'] = 1
+        output_data = input_data.copy()
+        if output_data.empty:
+            return output_data
 
-    def is_rule_no40(self, row: pd.Series) -> int:
-        '''
-        NO40：アップセルNGベンダ名義・申込
-        '''
-        if row['rank_flag41'] == 1:
-            return 1
-        return 0
+        # 判定はランク判定用フラグ行列で行い、補正は該当する行・列のみ更新する(列の型は変えない)
+        flag_values = output_data[rank_utils.rank_flag_columns].to_numpy()
+        masks = match_forced_correction_rules(flag_values, output_data['ordercontents'].to_numpy())
 
-    def set_rule_no40(self, row: pd.Series) -> None:
-        '''
-        NO40：アップセルNGベンダ名義・申込
-        '''
-        row['rank_flag41'] = 1
+        for rule, mask in zip(FORCED_CORRECTION_RULES, masks):
+            if not mask.any():
+                continue
+            output_data.loc[mask, rank_utils.rank_flag_columns] = 0
+            for column, value in rule.settings.items():
+                output_data.loc[mask, column] = value
+            self.logger.debug(f'フラグ強制補正 {rule.no} {rule.name}：{int(mask.sum())}件')
 
-    def is_rule_no16(self, row: pd.Series) -> int:
-        '''
-        NO16：現場事務所系・イベント系(ブースモデルルーム等)への注文
-        '''
-        if row['ordercontents'] in [
-                rank_utils.ordercontents_dict['新設'],
-                rank_utils.ordercontents_dict['増設'],
-                rank_utils.ordercontents_dict['変更'],
-                rank_utils.ordercontents_dict['問い合せ'],
-            ]:
-            if row['rank_flag21'] == 0 and row['rank_flag39'] == 1:
-                return 1
-        return 0
-
-    def set_rule_no16(self, row: pd.Series) -> None:
-        '''
-        NO16：現場事務所系・イベント系(ブースモデルルーム等)への注文
-        '''
-        row['rank_flag21'] = 0
-        row['rank_flag39'] = 1
+        return output_data
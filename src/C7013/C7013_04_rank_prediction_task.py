@@ -1,5 +1,6 @@
 # 標準ライブラリインポート
 import os
+from typing import TYPE_CHECKING, Union
 
 # サードパーティライブラリインポート
 import numpy as np
@@ -14,7 +15,13 @@ from .task import BaseTask
 from .task import TaskResult
 from . import onehot_utils
 from . import rank_utils
-from .rank_model_helper import RankModelHelper
+from .rank_numpy_model import NumpyRankModel
+if TYPE_CHECKING:
+    from .rank_model_helper import RankModelHelper
+
+# ランク判定モデルの推論バックエンド(keras：RankModelHelper、numpy：NumpyRankModel)
+RANK_BACKEND_KERAS: str = 'keras'
+RANK_BACKEND_NUMPY: str = 'numpy'
 
 class C7013_04_rank_prediction_task(BaseTask):
     '''
@@ -26,22 +33,53 @@ class C7013_04_rank_prediction_task(BaseTask):
         '''
         初期化関数
         '''
-        self.__rank_model_helper: RankModelHelper = None
+        self.__rank_model_helper: Union['RankModelHelper', NumpyRankModel] = None
         # 親クラスの初期化関数を呼び出す
         super().__init__()
 
+    @staticmethod
+    def get_rank_backend() -> str:
+        '''
+        ランク判定モデルの推論バックエンドを取得します(設定ファイルのrank_config.backend、既定値：keras)。
+        numpyの場合はtensorflowを読み込まず、RankModelHelper.export_numpy_modelで出力したrank_model.npzで推論する。
+        '''
+
+        return const.APP_CONFIG.get('rank_config', {}).get('backend', RANK_BACKEND_KERAS)
+
     @property
-    def _rank_model_helper(self) -> RankModelHelper:
+    def _rank_model_helper(self) -> Union['RankModelHelper', NumpyRankModel]:
         '''
-        ランクモデルヘルパー
+        ランクモデルヘルパー(推論バックエンドがnumpyの場合はNumPy版ランク判定モデル)
         '''
 
         if not self.__rank_model_helper:
-            self.__rank_model_helper: RankModelHelper = RankModelHelper()
-            self.__rank_model_helper.load_models()
+            self.__rank_model_helper = self._create_rank_model_helper()
 
         return self.__rank_model_helper
 
+    def _create_rank_model_helper(self) -> Union['RankModelHelper', NumpyRankModel]:
+        '''
+        推論バックエンドに応じてランクモデルを読み込みます。
+        tensorflowの読込に時間がかかるため、kerasの場合のみモジュールを読み込む
+        '''
+
+        if self.get_rank_backend() == RANK_BACKEND_NUMPY:
+            return NumpyRankModel.load()
+
+        from .rank_model_helper import RankModelHelper
+        rank_model_helper: RankModelHelper = RankModelHelper()
+        rank_model_helper.load_models()
+
+        return rank_model_helper
+
+    def load_models(self) -> None:
+        '''
+        ランクモデルを読み込みます。読込済の場合は読み直します。
+        読込に失敗した場合は読込済のモデルを引き続き使用します。
+        '''
+
+        self.__rank_model_helper = self._create_rank_model_helper()
+
     def execute(self, input_data: pd.DataFrame) -> pd.DataFrame:
         '''
             ランク判定用モデルを読込、ランクを付与します。
@@ -53,13 +91,26 @@ class C7013_04_rank_prediction_task(BaseTask):
         '''
         self.logger.info(f'ランク付与タスクを実行します。')
 
-        input_data_one_hot = rank_utils.input_data_transform(input_data)
+        input_data['rank_system'] = self.predict(input_data)
+        return input_data
+
+    def predict(self, input_data: pd.DataFrame, rank_flags: rank_utils.RankFlagMatrix = None) -> np.ndarray:
+        '''
+            ランクを判定します。入力DataFrameは変更しない。
+
+        Args:
+            input_data: 入力DataFrame(当初注文内容)
+            rank_flags: ランク判定用フラグ行列。省略時はinput_dataのランク判定用フラグ列から作成する
+        Returns:
+            ランクの配列(0:該当なしはNone)
+        '''
+
+        input_data_one_hot = rank_utils.input_data_transform(input_data, rank_flags)
         batch_size = const.APP_CONFIG['rank_config']['batch_size']
         result = self._rank_model_helper.predict(input_data_one_hot, batch_size)
 
         # 0:該当なしをNoneに置換する
-        result = result.astype(np.object)
+        result = result.astype(object)
         result[result == 0] = None
 
-        input_data['rank_system'] = result
-        return input_data
+        return result
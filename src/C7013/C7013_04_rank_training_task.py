@@ -38,8 +38,13 @@ class C7013_04_rank_training_task(BaseTask):
         self.logger.info(f'タスクを実行します。')
 
         # ランク判定用モデルを構築する
+        # 統合ランク判定モデルを使用する場合は、全ランクを1つのモデルで1回の学習で訓練する
+        combined = RankModelHelper.use_combined_model()
         rank_model_helper: RankModelHelper = RankModelHelper()
-        rank_model_helper.assembly_model()
+        if combined:
+            rank_model_helper.assembly_combined_model()
+        else:
+            rank_model_helper.assembly_model()
         
         # ランク判定用モデルを学習する
         epochs = const.APP_CONFIG['rank_config']['epochs']
@@ -48,7 +53,10 @@ class C7013_04_rank_training_task(BaseTask):
 
         self.logger.debug(f'Training Rank Model batch_size={batch_size}, epochs={epochs}, workers={workers}')
 
-        rank_model_helper.fit_model_from_file(training_file_path, validation_file_path, epochs=epochs, batch_size=batch_size, workers=workers)
+        if combined:
+            rank_model_helper.fit_combined_model_from_file(training_file_path, validation_file_path, epochs=epochs, batch_size=batch_size, workers=workers)
+        else:
+            rank_model_helper.fit_model_from_file(training_file_path, validation_file_path, epochs=epochs, batch_size=batch_size, workers=workers)
 
         # ランク判定用モデルを保存する
         rank_model_helper.save_models(save_path)
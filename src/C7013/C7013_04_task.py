@@ -5,7 +5,7 @@ import pandas as pd
 import inject
 
 # プロジェクトライブラリインポート
-from . import const
+from . import const, rank_utils
 from .task import BaseTask
 from .task import TaskResult
 from .C7013_04_rank_flag_forced_correction_task import C7013_04_rank_flag_forced_correction_task
@@ -17,6 +17,9 @@ class C7013_04_task(BaseTask):
         ランク判定を行うタスククラス
     '''
 
+    # ランク判定用フラグ行列を使用する
+    USES_RANK_FLAGS: bool = True
+
     @inject.autoparams()
     def __init__(
         self,
@@ -36,12 +39,20 @@ class C7013_04_task(BaseTask):
         # 親クラスの初期化関数を呼び出す
         super().__init__()
 
-    def execute(self, input_data: pd.DataFrame) -> TaskResult:
+    def load_models(self) -> None:
+        '''
+        ランク判定モデルを読み込みます。読込済の場合は読み直します。
+        '''
+
+        self._rank_prediction_task.load_models()
+
+    def execute(self, input_data: pd.DataFrame, rank_flags: rank_utils.RankFlagMatrix = None) -> TaskResult:
         '''
         取次情報とランク判定用フラグを元にランク判定を行う。
 
         Args:
             input_data: 入力DataFrame
+            rank_flags: ランク判定用フラグ行列。省略時はinput_dataのランク判定用フラグ列から作成する
         Returns:
             ランク付与済みDataFrame
         '''
@@ -53,12 +64,12 @@ class C7013_04_task(BaseTask):
                 input_data['rank_system'] = None
             return TaskResult(resultCode=const.BATCH_SUCCESS, resultData=input_data)
 
-        output_data = input_data.copy()
+        # 持ち回り用DataFrameは複製せず、ランク判定用フラグ行列に対してフラグ強制補正を行う(入力のフラグ行列は変更しない)
+        if rank_flags is None:
+            rank_flags = rank_utils.RankFlagMatrix.from_dataframe(input_data)
         # フラグ強制補正
-        input_data = self._rank_flag_forced_correction_task.execute(input_data)
+        rank_flags = self._rank_flag_forced_correction_task.correct(rank_flags, input_data['ordercontents'].to_numpy())
         # ランク判定
-        input_data = self._rank_prediction_task.execute(input_data)
-        
-        output_data['rank_system'] = input_data['rank_system']
+        input_data['rank_system'] = self._rank_prediction_task.predict(input_data, rank_flags)
 
-        return TaskResult(resultCode=const.BATCH_SUCCESS, resultData=output_data)
+        return TaskResult(resultCode=const.BATCH_SUCCESS, resultData=input_data)
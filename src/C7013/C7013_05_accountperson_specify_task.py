@@ -48,7 +48,8 @@ class C7013_05_accountperson_specify_task(BaseTask):
         Returns:
             TaskResult: タスク結果クラス
         '''
-        df = input_data.copy()
+        # 入力データを複製せず、アカウント担当者列を追加する
+        df = input_data
 
         # 初期登録
         # アカウント担当者のユーザ(GUID)
@@ -11,6 +11,7 @@ import jaconv
 from . import const
 from .task import BaseTask, TaskResult
 from .dao.crmdb_dao import CrmDBDao
+from .keyword_matcher import get_keyword_matcher
 
 # 施策キーワード
 POLICY_KEYWORDS = 'policy_keywords'
@@ -47,7 +48,8 @@ class C7013_05_policy_keyword_assignment_task(BaseTask):
         Returns:
             TaskResult: タスク結果クラス
         '''
-        df = input_data.copy()
+        # 入力データを複製せず、施策キーワード列を追加する
+        df = input_data
 
         # 初期登録
         # 施策キーワード
@@ -64,18 +66,28 @@ class C7013_05_policy_keyword_assignment_task(BaseTask):
         Args:
             df: ランク付与済情報DataFrame
         '''
+        # 自動差配設定(GUID)毎の施策キーワード一覧の判定用KeywordMatcherと登録値一覧
         dic_keyword ={}
+        policy_keywords_list = []
 
-        for index, row in df.iterrows():
-            if not pd.isna(row.autoagentid_guid):
-                if not row.autoagentid_guid in dic_keyword:
-                    dic_keyword[row.autoagentid_guid] = self._get_df_keyword(row.autoagentid_guid)
+        for autoagentid_guid, contents_commission_cleansing in zip(df['autoagentid_guid'], df['contents_commission_cleansing']):
+            if pd.isna(autoagentid_guid):
+                policy_keywords_list.append("")
+                continue
 
-                policy_keywords = self._set_policy_keywords(row, dic_keyword[row.autoagentid_guid])
-                # 施策キーワードを切り捨てて設定（100文字まで）
-                df.at[index, POLICY_KEYWORDS] = policy_keywords[:MAX_KEYWORD_LENGTH]
+            if not autoagentid_guid in dic_keyword:
+                df_keyword = self._get_df_keyword(autoagentid_guid)
+                dic_keyword[autoagentid_guid] = (
+                    get_keyword_matcher(df_keyword[NEW_AUTOAGENT_POLICY_KEYWORD].tolist()),
+                    df_keyword['new_policy_word'].tolist())
 
-    def _set_policy_keywords(self, row, df_keyword):
+            policy_keywords = self._set_policy_keywords(contents_commission_cleansing, *dic_keyword[autoagentid_guid])
+            # 施策キーワードを切り捨てて設定（100文字まで）
+            policy_keywords_list.append(policy_keywords[:MAX_KEYWORD_LENGTH])
+
+        df[POLICY_KEYWORDS] = policy_keywords_list
+
+    def _set_policy_keywords(self, contents_commission_cleansing, matcher, policy_word_list):
         '''
         施策キーワード設定
 
@@ -87,24 +99,22 @@ class C7013_05_policy_keyword_assignment_task(BaseTask):
         判定を行う場合は、全角化および大文字化した状態で比較する。
 
         Args:
-            row: ランク付与済情報DataFrame（1レコード）
-            df_keyword: 施策キーワード一覧
+            contents_commission_cleansing: 取次内容（クレンジング済み）
+            matcher: 施策キーワード一覧のKeywordMatcher
+            policy_word_list: 施策キーワード一覧の登録値
         Returns:
             str: 登録値連結文字列
         '''
         match_list = []
 
-        if pd.isna(row.contents_commission_cleansing):
-            # 取次内容（クレンジング済み）がnanの場合は空文字を返却
-            return ""
-
-        for row_keyword in df_keyword.itertuples():
-            # 取次内容（クレンジング済み）に施策キーワード一覧のキーワードが存在するか
-            if row_keyword.new_autoagent_policy_keyword in row.contents_commission_cleansing:
-                if not row_keyword.new_policy_word in match_list:
-                    # 同一登録値が複数含まれる場合には１つ目の登録値にする
-                    if row_keyword.new_policy_word:
-                        match_list.append(row_keyword.new_policy_word)  
+        # 取次内容（クレンジング済み）がnanの場合は該当なし(空文字を返却)
+        # 取次内容（クレンジング済み）を1回走査し、施策キーワード一覧の順に登録値を取得する
+        for position in matcher.find(contents_commission_cleansing):
+            policy_word = policy_word_list[position]
+            if not policy_word in match_list:
+                # 同一登録値が複数含まれる場合には１つ目の登録値にする
+                if policy_word:
+                    match_list.append(policy_word)
 
         return '：'.join(match_list)
 
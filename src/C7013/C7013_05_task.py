@@ -52,7 +52,8 @@ class C7013_05_task(BaseTask):
         # 処理開始メッセージ出力
         self.logger.info(message.MSG['MSG0001'], C7013_05_task.APP_ID, C7013_05_task.APP_NAME)
 
-        df = input_data.copy()
+        # 入力データを複製せず、各サブタスクで列を追加する
+        df = input_data
         # アカウント特定
         task_result_accountperson = self.__accountperson_specify_task.execute(df)
         # 施策キーワード設定
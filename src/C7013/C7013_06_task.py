@@ -7,7 +7,6 @@ import csv
 import numpy as np
 import pandas as pd
 import inject
-import pymssql
 
 # プロジェクトライブラリインポート
 from . import const, message
@@ -15,6 +14,7 @@ from .task import BaseTask, TaskResult
 from .dao.crmdb_dao import CrmDBDao
 from .dto.dcrm_sdk import Entity, EntityReference, OptionSetValue
 from .dcrm_helper import DcrmHelper
+from .checkpoint import RowJournal
 
 class C7013_06_task(BaseTask):
     '''
@@ -80,21 +80,34 @@ class C7013_06_task(BaseTask):
         'agent_window_unit_guid': ''
     }
 
+    # 取次保存情報の列
+    COMMISSION_DATA_COLUMNS: list = [
+        'agent_category',
+        'to_agent_comprehensivecompany_guid',
+        'to_agent_division_guid',
+        'to_agent_section_guid',
+        'to_agent_unit_guid',
+        'agent_amount',
+        'agent_object_unit_guid_list',
+        'new_agentrate_instant_list',
+        'is_created_opportunity',
+        'annotation_message'
+    ]
+
     # エラーCSVファイル名の接頭語
     ERROR_CSV_FILE_NAME_PREFIX: str = 'C7013_06_Err_'
     # エラーCSVファイル名の拡張子
     ERROR_CSV_FILE_NAME_EXT: str = '.csv'
 
     @inject.autoparams()
-    def __init__(self, crmDbDao: CrmDBDao, dcrmHelper: DcrmHelper):
+    def __init__(self, crmDbDao: CrmDBDao):
         '''
         初期化関数
+        Dynamics CRMへの接続は初回使用時に行う。
         '''
 
         self.__dao: CrmDBDao = crmDbDao
-        self.__conn: pymssql.Connection = self.__dao.conn()
-        self.__helper: DcrmHelper = dcrmHelper
-        self.__helper.Conn()
+        self.__helper: DcrmHelper = None
 
         self.__result: TaskResult = TaskResult()
         self.__output_data: pd.DataFrame = None
@@ -103,10 +116,27 @@ class C7013_06_task(BaseTask):
         # 親クラスの初期化関数を呼び出す
         super().__init__()
 
-    def execute(self, input_data: pd.DataFrame) -> TaskResult:
+    @property
+    def _helper(self) -> DcrmHelper:
+        '''
+        Dynamics CRM Helper(初回使用時に接続する)
+        '''
+
+        if self.__helper is None:
+            helper: DcrmHelper = inject.instance(DcrmHelper)
+            helper.Conn()
+            self.__helper = helper
+
+        return self.__helper
+
+    def execute(self, input_data: pd.DataFrame, journal: RowJournal = None) -> TaskResult:
         '''
         スルー取次、ノータッチ取次、支店優先取次、通常差配の優先順位で差配先を決定し、取次を行う。
         また、ノータッチ取次、支店優先取次、通常差配の場合、提案プロジェクトの作成を行う。
+
+        Args:
+            input_data: アカウント/施策キーワード付与済情報
+            journal: 取次単位のジャーナル。指定時は処理済の取次をスキップし、処理した取次を記録する。
         '''
 
         self.logger.info(f'タスクを実行します。')
@@ -123,6 +153,9 @@ class C7013_06_task(BaseTask):
         # → C7013_06_batchで実施
 
         # 変数・リソース初期化
+        # マイクロバッチ単位で繰り返し呼び出されるため、前回の処理結果を引き継がない
+        self.__result = TaskResult()
+        self.__error_list = []
         sysdate = datetime.datetime.now()
         today_str = f'{sysdate:%Y/%m/%d}'
 
@@ -160,257 +193,287 @@ class C7013_06_task(BaseTask):
         input_data_dict = input_data.to_dict(orient='records')
 
         for index, row in enumerate(input_data_dict):
+            commissionid_guid = row['commissionid_guid']
 
-            message_for_memo = None
-            self.logger.debug('index = %d', index)
+            if journal is not None and journal.is_processed(commissionid_guid):
+                # 前回実行で処理済の取次は取次保存情報のみ復元する
+                self.logger.debug('処理済の取次のためスキップします。取次(GUID)：%s', commissionid_guid)
+                self._restore_commission_data(index, journal.get(commissionid_guid))
+                continue
 
-            # 該当ランク確認
-            rank_system = row['rank_system']
-            self.logger.debug('ランク(システム)：%s', rank_system)
+            error_count = len(self.__error_list)
+            self._agent_commission(index, row, teamid, today_str, sysdate_utc_dict)
 
-            # 上記条件に一致した場合
-            if pd.isna(rank_system):
-                message_for_memo = message.MSG['MSG3006']
-                # 取次保存
-                if self._update_commission(row, row, None, None, None, message_for_memo):
-                    self._set_commission_data(index, None, C7013_06_task.AGENT_TO_DICT_EMPTY, [], [], [], C7013_06_task.IS_CREATED_OPPORTUNITY_NO, message_for_memo)
-                continue
-            # 上記条件に一致しなかった場合
+            if journal is not None and len(self.__error_list) == error_count:
+                # 処理済として取次保存情報を記録する
+                # エラーとなった取次は記録せず、再開時に再処理してエラーCSVに出力する
+                journal.record(commissionid_guid, self._get_commission_data(index))
 
-            # スルー取次判断
+        # ================================
+        # 自動差配済情報CSV出力
+        # ================================
 
-            # BI本部、支店BIアカウントによる差配
-            bi_account_agent_df = self._select_bi_account_agent(row['accountperson_incharge_guid'], rank_system)
-            bi_account_agent_len = len(bi_account_agent_df)
-            self.logger.debug('BI本部、支店BIアカウントによる差配情報取得件数：%d', bi_account_agent_len)
+        # 自動差配済情報CSV出力
+        # → C7013_06_batchで実施
 
-            if 0 < bi_account_agent_len:
-                # BI本部、支店BIアカウントによる差配の取次情報保持
-                bi_account_agent_dict = bi_account_agent_df.iloc[0].to_dict()
-                # 取次保存
-                if self._update_commission(row, bi_account_agent_dict, C7013_06_task.BCC_STATUS_COMMISSION_NO, C7013_06_task.BCC_UNSUPPORTED_REASON_ACCOUNT, C7013_06_task.AGENT_CATEGORY_THROUGH, message_for_memo):
-                    self._set_commission_data(index, C7013_06_task.AGENT_CATEGORY_THROUGH, bi_account_agent_dict, [], [], [], C7013_06_task.IS_CREATED_OPPORTUNITY_NO, message_for_memo)
-                continue
+        # エラーCSV出力
+        if self.__error_list:
+            file_name = f'{C7013_06_task.ERROR_CSV_FILE_NAME_PREFIX}{sysdate:%Y%m%d%H%M%S}{C7013_06_task.ERROR_CSV_FILE_NAME_EXT}'
+            self.logger.debug('エラーCSVファイル名：%s', file_name)
+            error_df = pd.DataFrame.from_dict(self.__error_list)
+            # 同一時刻に出力済みのエラーCSVが存在する場合は追記する
+            is_exists = os.path.exists(const.APP_DATA_PATH / file_name)
+            error_df.to_csv(const.APP_DATA_PATH / file_name, sep=',', header=not is_exists, index=False, mode='a' if is_exists else 'w', encoding='utf-8', quoting=csv.QUOTE_ALL, line_terminator='\r\n')
+            self.__result.resultCode = const.BATCH_ERROR
 
-            # 訪問希望差配
-            primary_correspondence_way = row['primarycorrespondenceway']
-            self.logger.debug('対応方法：%s', primary_correspondence_way)
+        # ================================
+        # 終了処理
+        # ================================
 
-            # 読込CSVの対応方法が"2"(訪問)の場合
-            if not pd.isna(primary_correspondence_way) and primary_correspondence_way == C7013_06_task.PRIMARYCORRESPONDENCEWAY_APPOINT:
-                appoint_agent_df = self._select_appoint_agent(row['autoagentid_guid'], row['next_account_code'], rank_system)
-                appoint_agent_len = len(appoint_agent_df)
-                self.logger.debug('訪問希望差配情報取得件数：%d', appoint_agent_len)
+        # 処理終了メッセージ出力
+        if self.__result.resultCode == const.BATCH_SUCCESS:
+            self.logger.info(message.MSG['MSG0002'], C7013_06_task.APP_ID, C7013_06_task.APP_NAME)
+        elif self.__result.resultCode == const.BATCH_ERROR:
+            self.logger.error(message.MSG['MSG2002'], C7013_06_task.APP_ID, C7013_06_task.APP_NAME)
+        else:
+            self.logger.warning(message.MSG['MSG1002'], C7013_06_task.APP_ID, C7013_06_task.APP_NAME)
 
-                if 0 < appoint_agent_len:
-                    # 訪問希望差配の取次情報保持
-                    appoint_agent_dict = appoint_agent_df.iloc[0].to_dict()
-                    # 取次保存
-                    if self._update_commission(row, appoint_agent_dict, C7013_06_task.BCC_STATUS_COMMISSION_NO, C7013_06_task.BCC_UNSUPPORTED_REASON_APPOINT, C7013_06_task.AGENT_CATEGORY_THROUGH, message_for_memo):
-                        self._set_commission_data(index, C7013_06_task.AGENT_CATEGORY_THROUGH, appoint_agent_dict, [], [], [], C7013_06_task.IS_CREATED_OPPORTUNITY_NO, message_for_memo)
-                    continue
-            # 読込CSVの対応方法が"2"(訪問)以外の場合
+        # 戻り値返却
+        self.__result.resultData = self.__output_data
 
-            # ノータッチ取次判断
+        return self.__result
+        # ↑↑ここにビジネスロジックを実装します。
 
-            # ノータッチ取次情報取得
-            notouch_commission_df = self._select_notouch_commission(row['autoagentid_guid'], row['accountperson_incharge_guid'], rank_system)
-            notouch_commission_len = len(notouch_commission_df)
-            self.logger.debug('ノータッチ取次情報取得件数：%d', notouch_commission_len)
+    def _agent_commission(self, index: int, row: dict, teamid: str, today_str: str, sysdate_utc_dict: dict) -> None:
+        '''
+        取次1件の差配先を決定し、取次を行う。
+
+        Args:
+            index: 行番号
+            row: アカウント/施策キーワード付与済情報の1行
+            teamid: 全国公開チーム
+            today_str: システム日付
+            sysdate_utc_dict: 通常差配用日付情報
+        '''
 
-            if 0 < notouch_commission_len:
-                # ノータッチ取次判断の取次情報保持
-                notouch_commission_dict = notouch_commission_df.iloc[0].to_dict()
-                # 提案プロジェクト作成
-                if self._insert_opportunity(row, teamid, today_str):
-                    # 取次保存
-                    if self._update_commission(row, notouch_commission_dict, C7013_06_task.BCC_STATUS_COMMISSION_NO, None, C7013_06_task.AGENT_CATEGORY_NOTOUCH, message_for_memo):
-                        self._set_commission_data(index, C7013_06_task.AGENT_CATEGORY_NOTOUCH, notouch_commission_dict, [], [], [], C7013_06_task.IS_CREATED_OPPORTUNITY_YES, message_for_memo)
-                continue
 
-            # 支店優先取次判断
+        message_for_memo = None
+        self.logger.debug('index = %d', index)
 
-            # 支店優先取次情報の取得
-            priority_commission_df = self._select_priority_commission(row['autoagentid_guid'], row['next_account_code'], rank_system)
-            priority_commission_len = len(priority_commission_df)
-            self.logger.debug('支店優先取次情報取得件数：%d', priority_commission_len)
+        # 該当ランク確認
+        rank_system = row['rank_system']
+        self.logger.debug('ランク(システム)：%s', rank_system)
+
+        # 上記条件に一致した場合
+        if pd.isna(rank_system):
+            message_for_memo = message.MSG['MSG3006']
+            # 取次保存
+            if self._update_commission(row, row, None, None, None, message_for_memo):
+                self._set_commission_data(index, None, C7013_06_task.AGENT_TO_DICT_EMPTY, [], [], [], C7013_06_task.IS_CREATED_OPPORTUNITY_NO, message_for_memo)
+            return
+        # 上記条件に一致しなかった場合
+
+        # スルー取次判断
+
+        # BI本部、支店BIアカウントによる差配
+        bi_account_agent_df = self._select_bi_account_agent(row['accountperson_incharge_guid'], rank_system)
+        bi_account_agent_len = len(bi_account_agent_df)
+        self.logger.debug('BI本部、支店BIアカウントによる差配情報取得件数：%d', bi_account_agent_len)
+
+        if 0 < bi_account_agent_len:
+            # BI本部、支店BIアカウントによる差配の取次情報保持
+            bi_account_agent_dict = bi_account_agent_df.iloc[0].to_dict()
+            # 取次保存
+            if self._update_commission(row, bi_account_agent_dict, C7013_06_task.BCC_STATUS_COMMISSION_NO, C7013_06_task.BCC_UNSUPPORTED_REASON_ACCOUNT, C7013_06_task.AGENT_CATEGORY_THROUGH, message_for_memo):
+                self._set_commission_data(index, C7013_06_task.AGENT_CATEGORY_THROUGH, bi_account_agent_dict, [], [], [], C7013_06_task.IS_CREATED_OPPORTUNITY_NO, message_for_memo)
+            return
+
+        # 訪問希望差配
+        primary_correspondence_way = row['primarycorrespondenceway']
+        self.logger.debug('対応方法：%s', primary_correspondence_way)
+
+        # 読込CSVの対応方法が"2"(訪問)の場合
+        if not pd.isna(primary_correspondence_way) and primary_correspondence_way == C7013_06_task.PRIMARYCORRESPONDENCEWAY_APPOINT:
+            appoint_agent_df = self._select_appoint_agent(row['autoagentid_guid'], row['next_account_code'], rank_system)
+            appoint_agent_len = len(appoint_agent_df)
+            self.logger.debug('訪問希望差配情報取得件数：%d', appoint_agent_len)
+
+            if 0 < appoint_agent_len:
+                # 訪問希望差配の取次情報保持
+                appoint_agent_dict = appoint_agent_df.iloc[0].to_dict()
+                # 取次保存
+                if self._update_commission(row, appoint_agent_dict, C7013_06_task.BCC_STATUS_COMMISSION_NO, C7013_06_task.BCC_UNSUPPORTED_REASON_APPOINT, C7013_06_task.AGENT_CATEGORY_THROUGH, message_for_memo):
+                    self._set_commission_data(index, C7013_06_task.AGENT_CATEGORY_THROUGH, appoint_agent_dict, [], [], [], C7013_06_task.IS_CREATED_OPPORTUNITY_NO, message_for_memo)
+                return
+        # 読込CSVの対応方法が"2"(訪問)以外の場合
+
+        # ノータッチ取次判断
+
+        # ノータッチ取次情報取得
+        notouch_commission_df = self._select_notouch_commission(row['autoagentid_guid'], row['accountperson_incharge_guid'], rank_system)
+        notouch_commission_len = len(notouch_commission_df)
+        self.logger.debug('ノータッチ取次情報取得件数：%d', notouch_commission_len)
+
+        if 0 < notouch_commission_len:
+            # ノータッチ取次判断の取次情報保持
+            notouch_commission_dict = notouch_commission_df.iloc[0].to_dict()
+            # 提案プロジェクト作成
+            if self._insert_opportunity(row, teamid, today_str):
+                # 取次保存
+                if self._update_commission(row, notouch_commission_dict, C7013_06_task.BCC_STATUS_COMMISSION_NO, None, C7013_06_task.AGENT_CATEGORY_NOTOUCH, message_for_memo):
+                    self._set_commission_data(index, C7013_06_task.AGENT_CATEGORY_NOTOUCH, notouch_commission_dict, [], [], [], C7013_06_task.IS_CREATED_OPPORTUNITY_YES, message_for_memo)
+            return
+
+        # 支店優先取次判断
+
+        # 支店優先取次情報の取得
+        priority_commission_df = self._select_priority_commission(row['autoagentid_guid'], row['next_account_code'], rank_system)
+        priority_commission_len = len(priority_commission_df)
+        self.logger.debug('支店優先取次情報取得件数：%d', priority_commission_len)
+
+        if 0 < priority_commission_len:
+            # 支店優先取次判断の取次情報保持
+            priority_commission_dict = priority_commission_df.iloc[0].to_dict()
+            # 提案プロジェクト作成
+            if self._insert_opportunity(row, teamid, today_str):
+                # 取次保存
+                if self._update_commission(row, priority_commission_dict, C7013_06_task.BCC_STATUS_COMMISSION_NO, None, C7013_06_task.AGENT_CATEGORY_PRIORITY, message_for_memo):
+                    self._set_commission_data(index, C7013_06_task.AGENT_CATEGORY_PRIORITY, priority_commission_dict, [], [], [], C7013_06_task.IS_CREATED_OPPORTUNITY_YES, message_for_memo)
+            return
 
-            if 0 < priority_commission_len:
-                # 支店優先取次判断の取次情報保持
-                priority_commission_dict = priority_commission_df.iloc[0].to_dict()
-                # 提案プロジェクト作成
-                if self._insert_opportunity(row, teamid, today_str):
-                    # 取次保存
-                    if self._update_commission(row, priority_commission_dict, C7013_06_task.BCC_STATUS_COMMISSION_NO, None, C7013_06_task.AGENT_CATEGORY_PRIORITY, message_for_memo):
-                        self._set_commission_data(index, C7013_06_task.AGENT_CATEGORY_PRIORITY, priority_commission_dict, [], [], [], C7013_06_task.IS_CREATED_OPPORTUNITY_YES, message_for_memo)
-                continue
+        # 第三者申込判断
+        third_person_application = row['third_person_application']
+        self.logger.debug('第三者申込：%s', third_person_application)
 
-            # 第三者申込判断
-            third_person_application = row['third_person_application']
-            self.logger.debug('第三者申込：%s', third_person_application)
-
-            # 第三者申込対象判断
-            if third_person_application == C7013_06_task.THIRD_PERSON_APPLICATION_YES:
-                # 差配先ユニット特定
-                is_third_person_application = True
-
-                # 第三者申込判断の差配対象ユニット一覧取得
-                third_person_application_agent_unit_df = self._select_third_person_application_agent_unit(row['autoagentid_guid'], rank_system)
-                third_person_application_agent_unit_len = len(third_person_application_agent_unit_df)
-                self.logger.debug('第三者申込差配先ユニット一覧取得件数：%d', third_person_application_agent_unit_len)
-
-                if 0 < third_person_application_agent_unit_len:
-                    # 第三者申込判断の差配先の決定
-                    third_person_application_agent_unit_list = third_person_application_agent_unit_df.iloc[:, 0].values.tolist()
-                    third_person_application_agent_df = self._select_agent(row['unit_guid'], row['agent_window_unit_guid'], third_person_application_agent_unit_list, sysdate_utc_dict, rank_system)
-                    third_person_application_agent_len = len(third_person_application_agent_df)
-                    self.logger.debug('差配先取得（第三者申込）件数：%d', third_person_application_agent_len)
-
-                    if 0 < third_person_application_agent_len:
-                        # 第三者申込判断の取次情報保持
-                        third_person_application_agent_dict = third_person_application_agent_df.iloc[0].to_dict()
-                        # 提案プロジェクト作成
-                        if self._insert_opportunity(row, teamid, today_str):
-                            # 取次保存
-                            if self._update_commission(row, third_person_application_agent_dict, C7013_06_task.BCC_STATUS_COMMISSION_YES, None, C7013_06_task.AGENT_CATEGORY_NORMAL, message_for_memo):
-                                third_person_application_agent_amount_list = third_person_application_agent_df['agent_amount'].values.tolist()
-                                third_person_application_agent_object_list = third_person_application_agent_df['agent_window_unit_guid'].values.tolist()
-                                third_person_application_agent_rate_list = third_person_application_agent_df['agentrate_instant'].values.tolist()
-                                self._set_commission_data(index, C7013_06_task.AGENT_CATEGORY_NORMAL, third_person_application_agent_dict, third_person_application_agent_amount_list, third_person_application_agent_object_list, third_person_application_agent_rate_list, C7013_06_task.IS_CREATED_OPPORTUNITY_YES, message_for_memo)
-                        continue
-                    else:
-                        is_third_person_application = False
+        # 第三者申込対象判断
+        if third_person_application == C7013_06_task.THIRD_PERSON_APPLICATION_YES:
+            # 差配先ユニット特定
+            is_third_person_application = True
+
+            # 第三者申込判断の差配対象ユニット一覧取得
+            third_person_application_agent_unit_df = self._select_third_person_application_agent_unit(row['autoagentid_guid'], rank_system)
+            third_person_application_agent_unit_len = len(third_person_application_agent_unit_df)
+            self.logger.debug('第三者申込差配先ユニット一覧取得件数：%d', third_person_application_agent_unit_len)
+
+            if 0 < third_person_application_agent_unit_len:
+                # 第三者申込判断の差配先の決定
+                third_person_application_agent_unit_list = third_person_application_agent_unit_df.iloc[:, 0].values.tolist()
+                third_person_application_agent_df = self._select_agent(row['unit_guid'], row['agent_window_unit_guid'], third_person_application_agent_unit_list, sysdate_utc_dict, rank_system)
+                third_person_application_agent_len = len(third_person_application_agent_df)
+                self.logger.debug('差配先取得（第三者申込）件数：%d', third_person_application_agent_len)
+
+                if 0 < third_person_application_agent_len:
+                    # 第三者申込判断の取次情報保持
+                    third_person_application_agent_dict = third_person_application_agent_df.iloc[0].to_dict()
+                    # 提案プロジェクト作成
+                    if self._insert_opportunity(row, teamid, today_str):
+                        # 取次保存
+                        if self._update_commission(row, third_person_application_agent_dict, C7013_06_task.BCC_STATUS_COMMISSION_YES, None, C7013_06_task.AGENT_CATEGORY_NORMAL, message_for_memo):
+                            third_person_application_agent_amount_list = third_person_application_agent_df['agent_amount'].values.tolist()
+                            third_person_application_agent_object_list = third_person_application_agent_df['agent_window_unit_guid'].values.tolist()
+                            third_person_application_agent_rate_list = third_person_application_agent_df['agentrate_instant'].values.tolist()
+                            self._set_commission_data(index, C7013_06_task.AGENT_CATEGORY_NORMAL, third_person_application_agent_dict, third_person_application_agent_amount_list, third_person_application_agent_object_list, third_person_application_agent_rate_list, C7013_06_task.IS_CREATED_OPPORTUNITY_YES, message_for_memo)
+                    return
                 else:
                     is_third_person_application = False
+            else:
+                is_third_person_application = False
 
-                # 窓口担当へ取次(第三者申込判断)
-                if not is_third_person_application:
-                    message_for_memo = message.MSG['MSG3007']
-                    # 取次保存
-                    if self._update_commission(row, row, None, None, None, message_for_memo):
-                        self._set_commission_data(index, None, C7013_06_task.AGENT_TO_DICT_EMPTY, [], [], [], C7013_06_task.IS_CREATED_OPPORTUNITY_NO, message_for_memo)
-                    continue
-
-            # コラボ回線判断
-            colab_line = row['colab_line']
-            self.logger.debug('コラボ回線：%s', colab_line)
-
-            # コラボ回線対象判断
-            if colab_line == C7013_06_task.COLAB_LINE_YES:
-                # 差配先ユニット特定
-                is_colab_line = True
-
-                # コラボ回線判断の差配対象ユニット一覧取得
-                colab_line_agent_unit_df = self._select_colab_line_agent_unit(row['autoagentid_guid'], rank_system)
-                colab_line_agent_unit_len = len(colab_line_agent_unit_df)
-                self.logger.debug('コラボ回線差配先ユニット一覧取得件数：%d', colab_line_agent_unit_len)
-
-                if 0 < colab_line_agent_unit_len:
-                    # コラボ回線判断の差配先の決定
-                    colab_line_agent_unit_list = colab_line_agent_unit_df.iloc[:, 0].values.tolist()
-                    colab_line_agent_df = self._select_agent(row['unit_guid'], row['agent_window_unit_guid'], colab_line_agent_unit_list, sysdate_utc_dict, rank_system)
-                    colab_line_agent_len = len(colab_line_agent_df)
-                    self.logger.debug('差配先取得（コラボ回線）件数：%d', colab_line_agent_len)
-
-                    if 0 < colab_line_agent_len:
-                        # コラボ回線判断の取次情報保持
-                        colab_line_agent_dict = colab_line_agent_df.iloc[0].to_dict()
-                        # 提案プロジェクト作成
-                        if self._insert_opportunity(row, teamid, today_str):
-                            # 取次保存
-                            if self._update_commission(row, colab_line_agent_dict, C7013_06_task.BCC_STATUS_COMMISSION_YES, None, C7013_06_task.AGENT_CATEGORY_NORMAL, message_for_memo):
-                                colab_line_agent_amount_list = colab_line_agent_df['agent_amount'].values.tolist()
-                                colab_line_agent_object_list = colab_line_agent_df['agent_window_unit_guid'].values.tolist()
-                                colab_line_agent_rate_list = colab_line_agent_df['agentrate_instant'].values.tolist()
-                                self._set_commission_data(index, C7013_06_task.AGENT_CATEGORY_NORMAL, colab_line_agent_dict, colab_line_agent_amount_list, colab_line_agent_object_list, colab_line_agent_rate_list, C7013_06_task.IS_CREATED_OPPORTUNITY_YES, message_for_memo)
-                        continue
-                    else:
-                        is_colab_line = False
-                else:
-                    is_colab_line = False
-
-                # 窓口担当へ取次(コラボ回線判断)
-                if not is_colab_line:
-                    message_for_memo = message.MSG['MSG3007']
-                    # 取次保存
-                    if self._update_commission(row, row, None, None, None, message_for_memo):
-                        self._set_commission_data(index, None, C7013_06_task.AGENT_TO_DICT_EMPTY, [], [], [], C7013_06_task.IS_CREATED_OPPORTUNITY_NO, message_for_memo)
-                    continue
+            # 窓口担当へ取次(第三者申込判断)
+            if not is_third_person_application:
+                message_for_memo = message.MSG['MSG3007']
+                # 取次保存
+                if self._update_commission(row, row, None, None, None, message_for_memo):
+                    self._set_commission_data(index, None, C7013_06_task.AGENT_TO_DICT_EMPTY, [], [], [], C7013_06_task.IS_CREATED_OPPORTUNITY_NO, message_for_memo)
+                return
 
-            # ランクによる取次判断
+        # コラボ回線判断
+        colab_line = row['colab_line']
+        self.logger.debug('コラボ回線：%s', colab_line)
 
+        # コラボ回線対象判断
+        if colab_line == C7013_06_task.COLAB_LINE_YES:
             # 差配先ユニット特定
-            is_rank = True
-
-            # 差配対象ユニット一覧の抽出
-            rank_agent_unit_df = self._select_rank_agent_unit(row['autoagentid_guid'], rank_system)
-            rank_agent_unit_len = len(rank_agent_unit_df)
-            self.logger.debug('ランクによる取次差配先ユニット一覧取得件数：%d', rank_agent_unit_len)
-
-            if 0 < rank_agent_unit_len:
-                # ランクによる取次判断の差配先の決定
-                rank_agent_unit_list = rank_agent_unit_df.iloc[:, 0].values.tolist()
-                rank_agent_df = self._select_agent(row['unit_guid'], row['agent_window_unit_guid'], rank_agent_unit_list, sysdate_utc_dict, rank_system)
-                rank_agent_len = len(rank_agent_df)
-                self.logger.debug('差配先取得（ランク）件数：%d', rank_agent_len)
-
-                if 0 < rank_agent_len:
-                    # ランクによる取次判断の取次情報保持
-                    rank_agent_dict = rank_agent_df.iloc[0].to_dict()
+            is_colab_line = True
+
+            # コラボ回線判断の差配対象ユニット一覧取得
+            colab_line_agent_unit_df = self._select_colab_line_agent_unit(row['autoagentid_guid'], rank_system)
+            colab_line_agent_unit_len = len(colab_line_agent_unit_df)
+            self.logger.debug('コラボ回線差配先ユニット一覧取得件数：%d', colab_line_agent_unit_len)
+
+            if 0 < colab_line_agent_unit_len:
+                # コラボ回線判断の差配先の決定
+                colab_line_agent_unit_list = colab_line_agent_unit_df.iloc[:, 0].values.tolist()
+                colab_line_agent_df = self._select_agent(row['unit_guid'], row['agent_window_unit_guid'], colab_line_agent_unit_list, sysdate_utc_dict, rank_system)
+                colab_line_agent_len = len(colab_line_agent_df)
+                self.logger.debug('差配先取得（コラボ回線）件数：%d', colab_line_agent_len)
+
+                if 0 < colab_line_agent_len:
+                    # コラボ回線判断の取次情報保持
+                    colab_line_agent_dict = colab_line_agent_df.iloc[0].to_dict()
                     # 提案プロジェクト作成
                     if self._insert_opportunity(row, teamid, today_str):
                         # 取次保存
-                        if self._update_commission(row, rank_agent_dict, C7013_06_task.BCC_STATUS_COMMISSION_YES, None, C7013_06_task.AGENT_CATEGORY_NORMAL, message_for_memo):
-                            rank_agent_amount_list = rank_agent_df['agent_amount'].values.tolist()
-                            rank_agent_object_list = rank_agent_df['agent_window_unit_guid'].values.tolist()
-                            rank_agent_rate_list = rank_agent_df['agentrate_instant'].values.tolist()
-                            self._set_commission_data(index, C7013_06_task.AGENT_CATEGORY_NORMAL, rank_agent_dict, rank_agent_amount_list, rank_agent_object_list, rank_agent_rate_list, C7013_06_task.IS_CREATED_OPPORTUNITY_YES, message_for_memo)
-                    continue
+                        if self._update_commission(row, colab_line_agent_dict, C7013_06_task.BCC_STATUS_COMMISSION_YES, None, C7013_06_task.AGENT_CATEGORY_NORMAL, message_for_memo):
+                            colab_line_agent_amount_list = colab_line_agent_df['agent_amount'].values.tolist()
+                            colab_line_agent_object_list = colab_line_agent_df['agent_window_unit_guid'].values.tolist()
+                            colab_line_agent_rate_list = colab_line_agent_df['agentrate_instant'].values.tolist()
+                            self._set_commission_data(index, C7013_06_task.AGENT_CATEGORY_NORMAL, colab_line_agent_dict, colab_line_agent_amount_list, colab_line_agent_object_list, colab_line_agent_rate_list, C7013_06_task.IS_CREATED_OPPORTUNITY_YES, message_for_memo)
+                    return
                 else:
-                    is_rank = False
+                    is_colab_line = False
             else:
-                is_rank = False
+                is_colab_line = False
 
-            # 窓口担当へ取次(ランクによる取次判断)
-            if not is_rank:
+            # 窓口担当へ取次(コラボ回線判断)
+            if not is_colab_line:
                 message_for_memo = message.MSG['MSG3007']
                 # 取次保存
                 if self._update_commission(row, row, None, None, None, message_for_memo):
                     self._set_commission_data(index, None, C7013_06_task.AGENT_TO_DICT_EMPTY, [], [], [], C7013_06_task.IS_CREATED_OPPORTUNITY_NO, message_for_memo)
-                continue
+                return
 
-        # ================================
-        # 自動差配済情報CSV出力
-        # ================================
+        # ランクによる取次判断
 
-        # 自動差配済情報CSV出力
-        # → C7013_06_batchで実施
+        # 差配先ユニット特定
+        is_rank = True
 
-        # エラーCSV出力
-        if self.__error_list:
-            file_name = f'{C7013_06_task.ERROR_CSV_FILE_NAME_PREFIX}{sysdate:%Y%m%d%H%M%S}{C7013_06_task.ERROR_CSV_FILE_NAME_EXT}'
-            self.logger.debug('エラーCSVファイル名：%s', file_name)
-            error_df = pd.DataFrame.from_dict(self.__error_list)
-            error_df.to_csv(const.APP_DATA_PATH / file_name, sep=',', header=True, index=False, mode='w', encoding='utf-8', quoting=csv.QUOTE_ALL, line_terminator='\r\n')
-            self.__result.resultCode = const.BATCH_ERROR
+        # 差配対象ユニット一覧の抽出
+        rank_agent_unit_df = self._select_rank_agent_unit(row['autoagentid_guid'], rank_system)
+        rank_agent_unit_len = len(rank_agent_unit_df)
+        self.logger.debug('ランクによる取次差配先ユニット一覧取得件数：%d', rank_agent_unit_len)
 
-        # ================================
-        # 終了処理
-        # ================================
+        if 0 < rank_agent_unit_len:
+            # ランクによる取次判断の差配先の決定
+            rank_agent_unit_list = rank_agent_unit_df.iloc[:, 0].values.tolist()
+            rank_agent_df = self._select_agent(row['unit_guid'], row['agent_window_unit_guid'], rank_agent_unit_list, sysdate_utc_dict, rank_system)
+            rank_agent_len = len(rank_agent_df)
+            self.logger.debug('差配先取得（ランク）件数：%d', rank_agent_len)
 
-        # 処理終了メッセージ出力
-        if self.__result.resultCode == const.BATCH_SUCCESS:
-            self.logger.info(message.MSG['MSG0002'], C7013_06_task.APP_ID, C7013_06_task.APP_NAME)
-        elif self.__result.resultCode == const.BATCH_ERROR:
-            self.logger.error(message.MSG['MSG2002'], C7013_06_task.APP_ID, C7013_06_task.APP_NAME)
+            if 0 < rank_agent_len:
+                # ランクによる取次判断の取次情報保持
+                rank_agent_dict = rank_agent_df.iloc[0].to_dict()
+                # 提案プロジェクト作成
+                if self._insert_opportunity(row, teamid, today_str):
+                    # 取次保存
+                    if self._update_commission(row, rank_agent_dict, C7013_06_task.BCC_STATUS_COMMISSION_YES, None, C7013_06_task.AGENT_CATEGORY_NORMAL, message_for_memo):
+                        rank_agent_amount_list = rank_agent_df['agent_amount'].values.tolist()
+                        rank_agent_object_list = rank_agent_df['agent_window_unit_guid'].values.tolist()
+                        rank_agent_rate_list = rank_agent_df['agentrate_instant'].values.tolist()
+                        self._set_commission_data(index, C7013_06_task.AGENT_CATEGORY_NORMAL, rank_agent_dict, rank_agent_amount_list, rank_agent_object_list, rank_agent_rate_list, C7013_06_task.IS_CREATED_OPPORTUNITY_YES, message_for_memo)
+                return
+            else:
+                is_rank = False
         else:
-            self.logger.warning(message.MSG['MSG1002'], C7013_06_task.APP_ID, C7013_06_task.APP_NAME)
-
-        # 戻り値返却
-        self.__result.resultData = self.__output_data
+            is_rank = False
 
-        return self.__result
-        # ↑↑ここにビジネスロジックを実装します。
+        # 窓口担当へ取次(ランクによる取次判断)
+        if not is_rank:
+            message_for_memo = message.MSG['MSG3007']
+            # 取次保存
+            if self._update_commission(row, row, None, None, None, message_for_memo):
+                self._set_commission_data(index, None, C7013_06_task.AGENT_TO_DICT_EMPTY, [], [], [], C7013_06_task.IS_CREATED_OPPORTUNITY_NO, message_for_memo)
+            return
 
     def _select_nationwide_release(self) -> pd.DataFrame:
         '''
@@ -429,7 +492,7 @@ class C7013_06_task(BaseTask):
               E1.name = '全国公開'
             """
 
-        return pd.read_sql_query(sql, con=self.__conn)
+        return pd.read_sql_query(sql, con=self.__dao.conn())
 
     def _select_bi_account_agent(self, accountperson_incharge_guid: str, rank_system: int) -> pd.DataFrame:
         '''
@@ -489,7 +552,7 @@ class C7013_06_task(BaseTask):
               BU.businessunitid ASC
             """
 
-        return pd.read_sql_query(sql, con=self.__conn)
+        return pd.read_sql_query(sql, con=self.__dao.conn())
 
     def _select_appoint_agent(self, autoagentid_guid: str, next_account_code: str, rank_system: int) -> pd.DataFrame:
         '''
@@ -547,7 +610,7 @@ class C7013_06_task(BaseTask):
               E2.new_addresscode DESC
             """
 
-        return pd.read_sql_query(sql, con=self.__conn)
+        return pd.read_sql_query(sql, con=self.__dao.conn())
 
     def _select_notouch_commission(self, autoagentid_guid: str, accountperson_incharge_guid: str, rank_system: int) -> pd.DataFrame:
         '''
@@ -599,7 +662,7 @@ class C7013_06_task(BaseTask):
               BU.businessunitid ASC
             """
 
-        return pd.read_sql_query(sql, con=self.__conn)
+        return pd.read_sql_query(sql, con=self.__dao.conn())
 
     def _select_priority_commission(self, autoagentid_guid: str, next_account_code: str, rank_system: int) -> pd.DataFrame:
         '''
@@ -657,7 +720,7 @@ class C7013_06_task(BaseTask):
               E2.new_addresscode DESC
             """
 
-        return pd.read_sql_query(sql, con=self.__conn)
+        return pd.read_sql_query(sql, con=self.__dao.conn())
 
     def _select_agent(self, unit_guid: str, agent_window_unit_guid: str, new_unit_to_list: list, sysdate_utc_dict: dict, rank_system: int) -> pd.DataFrame:
         '''
@@ -767,7 +830,7 @@ class C7013_06_task(BaseTask):
               agent_priority_value ASC
             """
 
-        return pd.read_sql_query(sql, con=self.__conn)
+        return pd.read_sql_query(sql, con=self.__dao.conn())
 
     def _select_third_person_application_agent_unit(self, autoagentid_guid: str, rank_system: int) -> pd.DataFrame:
         '''
@@ -795,7 +858,7 @@ class C7013_06_task(BaseTask):
               ) > 0
             """
 
-        return pd.read_sql_query(sql, con=self.__conn)
+        return pd.read_sql_query(sql, con=self.__dao.conn())
 
     def _select_colab_line_agent_unit(self, autoagentid_guid: str, rank_system: int) -> pd.DataFrame:
         '''
@@ -823,7 +886,7 @@ class C7013_06_task(BaseTask):
               ) > 0
             """
 
-        return pd.read_sql_query(sql, con=self.__conn)
+        return pd.read_sql_query(sql, con=self.__dao.conn())
 
     def _select_rank_agent_unit(self, autoagentid_guid: str, rank_system: int) -> pd.DataFrame:
         '''
@@ -859,7 +922,7 @@ class C7013_06_task(BaseTask):
               ) = 1
             """
 
-        return pd.read_sql_query(sql, con=self.__conn)
+        return pd.read_sql_query(sql, con=self.__dao.conn())
 
     def _select_sysdate_utc(self) -> pd.DataFrame:
         '''
@@ -877,7 +940,7 @@ class C7013_06_task(BaseTask):
               DATEADD(HOUR, 15, LEFT(CONVERT(VARCHAR, GETUTCDATE(), 111), 10)) AS current_day_1500_utc
             """
 
-        return pd.read_sql_query(sql, con=self.__conn)
+        return pd.read_sql_query(sql, con=self.__dao.conn())
 
     def _insert_opportunity(self, row: dict, teamid: str, today_str: str) -> bool:
         '''
@@ -905,7 +968,7 @@ class C7013_06_task(BaseTask):
             entity.Attributes['new_commodity_paper_flg'] = OptionSetValue(C7013_06_task.COMMODITY_PAPER_FLG_UNNECESSARY)
             entity.Attributes['new_commission'] = EntityReference('new_commission', commissionid_guid)
 
-            self.__helper.CreateEntity(entity)
+            self._helper.CreateEntity(entity)
 
         except Exception:
             self.logger.error(message.MSG['MSG2008'], commissionid_guid)
@@ -974,7 +1037,7 @@ class C7013_06_task(BaseTask):
             entity.Attributes['new_account_person'] = None if pd.isna(accountperson_incharge_name) else accountperson_incharge_name
             entity.Attributes['new_autoagent_policy_keyword'] = None if pd.isna(policy_keywords) else policy_keywords
 
-            self.__helper.UpdateEntity(entity)
+            self._helper.UpdateEntity(entity)
 
         except Exception:
             self.logger.error(message.MSG['MSG2003'], commissionid_guid)
@@ -991,7 +1054,7 @@ class C7013_06_task(BaseTask):
                 entity.Attributes['objectid'] = EntityReference('new_commission', commissionid_guid)
                 entity.Attributes['notetext'] = notetext
 
-                self.__helper.CreateEntity(entity)
+                self._helper.CreateEntity(entity)
 
             except Exception:
                 self.logger.error(message.MSG['MSG2004'], commissionid_guid, notetext)
@@ -1047,3 +1110,22 @@ class C7013_06_task(BaseTask):
         self.__output_data.at[index, 'is_created_opportunity'] = '' if pd.isna(is_created_opportunity) else is_created_opportunity
         # メモEへのメッセージ
         self.__output_data.at[index, 'annotation_message'] = '' if pd.isna(annotation_message) else annotation_message
+
+    def _get_commission_data(self, row_num: int) -> dict:
+        '''
+        取次保存情報を取得する。取次保存情報が未設定の列は含めない。
+        '''
+
+        index = self.__output_data.index[row_num]
+
+        return {column: self.__output_data.at[index, column] for column in C7013_06_task.COMMISSION_DATA_COLUMNS if column in self.__output_data.columns and not pd.isna(self.__output_data.at[index, column])}
+
+    def _restore_commission_data(self, row_num: int, commission_data: dict):
+        '''
+        取次保存情報を復元する。
+        '''
+
+        index = self.__output_data.index[row_num]
+
+        for column, value in commission_data.items():
+            self.__output_data.at[index, column] = value
@@ -11,6 +11,7 @@ import inject
 # プロジェクトライブラリインポート
 from .task import BaseTask, TaskResult
 from .dao.sqlite_dao import SqliteDao
+from .rank_utils import RankFlagMatrix
 from . import const, message
 
 # DataFrameカラム名
@@ -50,6 +51,8 @@ class C7013_07_task(BaseTask):
     APP_ID: str = 'C7013_07'
     # 機能名
     APP_NAME: str = 'データ蓄積'
+    # ランク判定用フラグ行列を使用する
+    USES_RANK_FLAGS: bool = True
 
     @inject.autoparams()
     def __init__(self, sqlite_dao:SqliteDao):
@@ -63,12 +66,13 @@ class C7013_07_task(BaseTask):
         #親クラスの初期化関数を呼び出す
         super().__init__()
 
-    def execute(self, input_data:pd.DataFrame)->TaskResult:
+    def execute(self, input_data:pd.DataFrame, rank_flags:RankFlagMatrix = None)->TaskResult:
         '''
         学習データを蓄積
 
         Args:
             input_data: 自動差配済情報DataFrame
+            rank_flags: ランク判定用フラグ行列(input_dataの行順)。省略時はinput_dataのランク判定用フラグ列を蓄積する
         Returns:
             TaskResult: タスク結果クラス
         '''
@@ -77,6 +81,10 @@ class C7013_07_task(BaseTask):
 
         df = input_data.copy()
 
+        if rank_flags is not None:
+            # ランク判定用フラグはフラグ行列の値をcustom_tableのランク判定用フラグ列として蓄積する
+            rank_flags.assign_to(df)
+
         if not JIDOU_SAHAI_REV in df.columns:
             # 自動差配リビジョン
             jidou_sahai_rev = const.APP_CONFIG['global_config']['jidou_sahai_rev']
@@ -123,8 +131,9 @@ class C7013_07_task(BaseTask):
             self.__sqlite_dao.delete_custom_table_by_commissionid_guid(df)
             df.to_sql("custom_table", conn, if_exists='append', index=False)
             conn.commit()
-        
-        conn.close()
+
+        # SqliteDaoはシングルトンのため、接続を直接閉じずにDaoから閉じる(次のマイクロバッチ・実行で再接続する)
+        self.__sqlite_dao.close()
 
     def _convert_GUID_to_str(self, df):
         """
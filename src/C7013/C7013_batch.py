@@ -0,0 +1,95 @@
+'''
+C7013_取次自動差配 バッチ
+
+自動差配処理(C7013_task)を1回実行し、処理結果コードを終了コードとして返却する。
+--resumeを指定した場合は、チェックポイントから前回の実行を未完了のタスクから再開する。
+
+実行例:
+    python -m C7013.C7013_batch
+    python -m C7013.C7013_batch --resume
+    python -m C7013.C7013_batch --resume --run-id 20241017101500
+'''
+
+# 標準ライブラリインポート
+import sys
+import argparse
+
+# サードパーティライブラリインポート
+import inject
+
+# プロジェクトライブラリインポート
+from . import const
+from .batch import BaseBatch
+from .C7013_task import C7013_task
+
+
+class C7013_batch(BaseBatch):
+    '''
+    C7013_取次自動差配 バッチクラス
+    '''
+
+    # 機能ID
+    APP_ID: str = 'C7013'
+    # 機能名
+    APP_NAME: str = '取次自動差配'
+
+    def __init__(self, task: C7013_task = None):
+        '''
+        コンストラクタ
+
+        Args:
+            task: 自動差配タスク。省略時は実行時に生成する(常駐ワーカーはモデルを読込済のタスクを指定する)
+        '''
+
+        super().__init__(C7013_batch.APP_ID, C7013_batch.APP_NAME)
+        # 自動差配タスク
+        self.__task: C7013_task = task
+
+    @staticmethod
+    def parse_args(argv: list = None) -> argparse.Namespace:
+        '''
+        プログラム引数を解析する。
+
+        Args:
+            argv: プログラム引数、省略時はsys.argv
+        '''
+
+        parser = argparse.ArgumentParser(description=f'{C7013_batch.APP_ID}_{C7013_batch.APP_NAME}')
+        BaseBatch.add_resume_arguments(parser)
+
+        return parser.parse_args(argv)
+
+    def execute(self, args: argparse.Namespace) -> int:
+        '''
+        自動差配処理を実行する。
+
+        Args:
+            args: プログラム引数(run_id、resume)
+        Returns:
+            処理結果コード
+        '''
+
+        if not self.beginBatchExeclusion():
+            self.logger.warning('他のバッチが実行中のため、処理を終了します。機能ID：%s', self.appId)
+            return const.BATCH_WARNING
+
+        result = const.BATCH_ERROR
+        try:
+            task = self.__task if self.__task is not None else C7013_task()
+            result = task.execute(run_id=args.run_id, resume=args.resume).resultCode
+        except Exception:
+            self.logger.exception('自動差配処理で例外が発生しました。')
+        finally:
+            self.endBatchExeclusion(result)
+
+        return result
+
+
+def main():
+    inject.configure_once()
+    args = C7013_batch.parse_args()
+    sys.exit(C7013_batch().execute(args))
+
+
+if __name__ == '__main__':
+    main()
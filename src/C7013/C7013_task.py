@@ -1,5 +1,7 @@
 # 標準ライブラリインポート
 import os
+import datetime
+from typing import TYPE_CHECKING
 
 # サードパーティライブラリインポート
 import numpy as np
@@ -8,174 +10,517 @@ import inject
 
 # プロジェクトライブラリインポート
 from ..lib import const, message, utils
-from .task import BaseTask, TaskResult
+from .task import BaseTask, TaskResult, TaskMetrics
+from .pipeline_context import PipelineContext
+from .checkpoint import StageCheckpoint
+from .pipeline_executor import PipelinedExecutor
 from .C7013_01_task import C7013_01_task
 from .C7013_02_task import C7013_02_task
 from .C7013_03_task import C7013_03_task
-from .C7013_04_task import C7013_04_task
 from .C7013_05_task import C7013_05_task
 from .C7013_06_task import C7013_06_task
 from .C7013_07_task import C7013_07_task
+if TYPE_CHECKING:
+    from .C7013_04_task import C7013_04_task
 
 class C7013_task(BaseTask):
     '''
     '''
 
-    @inject.autoparams()
-    def __init__(
-        self,
-        task_01: C7013_01_task,
-        task_02: C7013_02_task,
-        task_03: C7013_03_task,
-        task_04: C7013_04_task,
-        task_05: C7013_05_task,
-        task_06: C7013_06_task,
-        task_07: C7013_07_task,
-        ):
+    # マイクロバッチのキーの接頭辞
+    CHUNK_KEY_PREFIX = 'chunk'
+    # 実行レポートファイル名接頭辞
+    RUN_REPORT_FILE_NAME_PREFIX = 'C7013_RunReport_'
+    # 実行レポートファイル名拡張子
+    RUN_REPORT_FILE_NAME_EXT = '.json'
+
+    def __init__(self):
         '''
+        初期化関数
+        各タスクは初回使用時に生成するため、対象取次が0件の場合は
+        データ抽出/事前チェック以外のタスク(モデル読込・外部接続を含む)を生成しない。
         '''
 
-        self.__task_01: C7013_01_task = task_01
-        self.__task_02: C7013_02_task = task_02
-        self.__task_03: C7013_03_task = task_03
-        self.__task_04: C7013_04_task = task_04
-        self.__task_05: C7013_05_task = task_05
-        self.__task_06: C7013_06_task = task_06
-        self.__task_07: C7013_07_task = task_07
+        self.__task_01: C7013_01_task = None
+        self.__task_02: C7013_02_task = None
+        self.__task_03: C7013_03_task = None
+        self.__task_04: 'C7013_04_task' = None
+        self.__task_05: C7013_05_task = None
+        self.__task_06: C7013_06_task = None
+        self.__task_07: C7013_07_task = None
 
         #親クラスの初期化関数を呼び出す
         super().__init__()
 
-    def execute(self) -> TaskResult:
+    @property
+    def _task_01(self) -> C7013_01_task:
+        '''
+        データ抽出/事前チェックタスク
+        '''
+
+        if self.__task_01 is None:
+            self.__task_01 = inject.instance(C7013_01_task)
+
+        return self.__task_01
+
+    @property
+    def _task_02(self) -> C7013_02_task:
+        '''
+        データクレンジングタスク
+        '''
+
+        if self.__task_02 is None:
+            self.__task_02 = inject.instance(C7013_02_task)
+
+        return self.__task_02
+
+    @property
+    def _task_03(self) -> C7013_03_task:
+        '''
+        ランク判定用フラグ追加タスク
+        '''
+
+        if self.__task_03 is None:
+            self.__task_03 = inject.instance(C7013_03_task)
+
+        return self.__task_03
+
+    @property
+    def _task_04(self) -> 'C7013_04_task':
+        '''
+        ランク判定タスク
+        tensorflowの読込に時間がかかるため、モジュールも初回使用時に読み込む
+        '''
+
+        if self.__task_04 is None:
+            from .C7013_04_task import C7013_04_task
+            self.__task_04 = inject.instance(C7013_04_task)
+
+        return self.__task_04
+
+    @property
+    def _task_05(self) -> C7013_05_task:
+        '''
+        アカウント特定/施策キーワード設定タスク
+        '''
+
+        if self.__task_05 is None:
+            self.__task_05 = inject.instance(C7013_05_task)
+
+        return self.__task_05
+
+    @property
+    def _task_06(self) -> C7013_06_task:
+        '''
+        自動差配タスク
+        '''
+
+        if self.__task_06 is None:
+            self.__task_06 = inject.instance(C7013_06_task)
+
+        return self.__task_06
+
+    @property
+    def _task_07(self) -> C7013_07_task:
+        '''
+        学習データ蓄積タスク
+        '''
+
+        if self.__task_07 is None:
+            self.__task_07 = inject.instance(C7013_07_task)
+
+        return self.__task_07
+
+    def load_models(self) -> None:
+        '''
+        住所コード特定モデル、ランク判定モデルを読み込みます。読込済の場合は読み直します。
+        常駐ワーカーの起動時とモデルファイルの更新時に呼び出す。
+        '''
+
+        self._task_01.load_models()
+        self._task_04.load_models()
+
+    def execute(self, run_id: str = None, resume: bool = False) -> TaskResult:
         '''
         C7013_取次自動差配 メインタスク
+
+        設定ファイルのpipeline_config.chunk_sizeに1以上が指定された場合、
+        取次をマイクロバッチ単位で抽出し、マイクロバッチ毎に全タスクを実行する。
+        さらにpipeline_config.pipeline_depthに1以上が指定された場合、
+        ランク判定までの前段処理とアカウント特定以降の後段処理を別スレッドで並行実行する。
+        チェックポイントが有効な場合、各タスクの出力を実行ID毎に保存し、
+        再開時は未完了のタスクから(自動差配は未処理の取次から)処理を再開する。
+
+        Args:
+            run_id: 実行ID。省略時は新規に採番する(再開時は未完了の最新の実行)
+            resume: 前回の実行を再開するか
+        '''
+
+        self.logger.debug(f'タスクを実行します。')
+
+        # チェックポイント
+        checkpoint = self._open_checkpoint(run_id, resume)
+
+        # 担当エリア等の参照データは実行毎に読み直す
+        self._task_01.clear_cache()
+
+        # マイクロバッチ件数
+        chunk_size = const.APP_CONFIG.get('pipeline_config', {}).get('chunk_size', 0)
+        if checkpoint is not None and checkpoint.chunk_size is not None:
+            # 再開時は前回実行時のマイクロバッチ件数で分割する
+            chunk_size = checkpoint.chunk_size
+
+        if not chunk_size or chunk_size <= 0:
+            # 全件一括で実行
+            taskResult, is_continue = self._execute_chunk(None, checkpoint, self._chunk_key(0))
+            if checkpoint is not None and is_continue:
+                checkpoint.complete()
+            return taskResult
+
+        # 取次自動差配処理結果
+        result = const.BATCH_SUCCESS
+
+        # 戻り値初期化
+        taskResultForReturn = TaskResult()
+
+        # 対象取次GUID一覧(再開時は前回抽出時点の一覧)
+        if checkpoint is not None and checkpoint.commissionid_list is not None:
+            commissionid_list = checkpoint.commissionid_list
+        else:
+            commissionid_list = self._task_01.extract_commissionid_list()
+            if checkpoint is not None:
+                checkpoint.save_commissionid_list(commissionid_list, chunk_size)
+
+        # 未処理のマイクロバッチ(取次GUID一覧, キー)
+        # 対象0件の場合も空のマイクロバッチを事前チェックに渡し、処理結果を返却させる
+        chunks = []
+        for chunk_num, start in enumerate(range(0, max(len(commissionid_list), 1), chunk_size)):
+            chunk_key = self._chunk_key(chunk_num)
+            if checkpoint is not None and checkpoint.is_chunk_completed(chunk_key):
+                self.logger.info('マイクロバッチ%d件目は処理済のためスキップします。', chunk_num + 1)
+                continue
+            chunks.append((commissionid_list[start:start + chunk_size], chunk_key))
+
+        # 前段処理(データ抽出/事前チェック～ランク判定)
+        produce = lambda chunk: self._execute_cpu_stages(chunk[0], checkpoint, chunk[1])
+        # 後段処理(アカウント特定/施策キーワード設定～学習データ蓄積)
+        consume = lambda stage_result: self._execute_io_stages(stage_result, checkpoint)
+
+        # 後段処理待ちのマイクロバッチの上限数
+        pipeline_depth = const.APP_CONFIG.get('pipeline_config', {}).get('pipeline_depth', 0)
+
+        if pipeline_depth and pipeline_depth > 0:
+            # マイクロバッチNの後段処理中にマイクロバッチN+1の前段処理を行う
+            self.logger.debug('パイプライン実行します。後段処理待ちの上限数：%d', pipeline_depth)
+            chunk_results = PipelinedExecutor(pipeline_depth).run(chunks, produce, consume)
+        else:
+            chunk_results = []
+            for chunk in chunks:
+                self.logger.debug('マイクロバッチ%sを実行します。件数：%d', chunk[1], len(chunk[0]))
+                chunk_results.append(consume(produce(chunk)[0]))
+                if not chunk_results[-1][1]:
+                    # 異常終了の場合には以降のマイクロバッチを処理せずに終了
+                    break
+
+        is_continue = len(chunk_results) == len(chunks) and all(chunk_is_continue for _, chunk_is_continue in chunk_results)
+        for taskResult, _ in chunk_results:
+            result = self._merge_result_code(result, taskResult.resultCode)
+
+        if checkpoint is not None and is_continue:
+            checkpoint.complete()
+
+        # 内部処理結果の値を設定して処理終了
+        taskResultForReturn.resultCode = result
+
+        return taskResultForReturn
+
+    def _execute_chunk(self, commissionid_list: list = None, checkpoint: StageCheckpoint = None, chunk_key: str = None) -> tuple:
+        '''
+        取次情報に対してデータ抽出/事前チェックから学習データ蓄積までのタスクを実行します。
+
+        Args:
+            commissionid_list: 取次GUID一覧。Noneの場合は事前チェックで自動差配対象の取次を全件抽出する。
+            checkpoint: チェックポイント。Noneの場合はチェックポイントを保存しない。
+            chunk_key: マイクロバッチのキー
+        Returns:
+            (タスク結果, 後続のマイクロバッチを処理可能か)
         '''
-        
+
+        stage_result, _ = self._execute_cpu_stages(commissionid_list, checkpoint, chunk_key)
+
+        return self._execute_io_stages(stage_result, checkpoint)
+
+    def _execute_cpu_stages(self, commissionid_list: list, checkpoint: StageCheckpoint, chunk_key: str) -> tuple:
+        '''
+        データ抽出/事前チェックからランク判定までのタスク(前段処理)を実行します。
+
+        Args:
+            commissionid_list: 取次GUID一覧。Noneの場合は事前チェックで自動差配対象の取次を全件抽出する。
+            checkpoint: チェックポイント。Noneの場合はチェックポイントを保存しない。
+            chunk_key: マイクロバッチのキー
+        Returns:
+            ((マイクロバッチのキー, タスク結果, 持ち回り用コンテキスト, 後続のマイクロバッチを処理可能か), 後続のマイクロバッチを処理可能か)
+            後段処理が不要な場合、持ち回り用コンテキストはNone
+        '''
+
         # 取次自動差配処理結果
         result = const.BATCH_SUCCESS
-        
+
         # 戻り値初期化
         taskResult = TaskResult()
         taskResultForReturn = TaskResult()
-        
+
         # 持ち回り用DataFrame初期化
         df_tmp = None
-        
-        self.logger.debug(f'タスクを実行します。')
-        
+        # ランク判定用フラグ行列初期化
+        rank_flags = None
+
+        # 完了済タスク(再開時)
+        completed_stages = checkpoint.completed_stages(chunk_key) if checkpoint is not None else {}
+        if completed_stages:
+            # 最後に完了したタスクの出力から再開する
+            last_stage = list(completed_stages)[-1]
+            self.logger.info('チェックポイントから再開します。実行ID：%s, マイクロバッチ：%s, 完了済タスク：%s', checkpoint.run_id, chunk_key, last_stage)
+            df_tmp = checkpoint.load(chunk_key, last_stage)
+            rank_flags = checkpoint.load_rank_flags(chunk_key, last_stage)
+            for resultCode in completed_stages.values():
+                result = self._merge_result_code(result, resultCode)
+
         # ================================
         # データ抽出/事前チェック呼出し
         # ================================
-        
-        # 「データ抽出/事前チェック」処理呼出し
-        taskResult = self.__task_01.execute(None)
-        df_tmp = taskResult.resultData
-        
-        # 「データ抽出/事前チェック」処理結果確認
-        result = taskResult.resultCode
-        
+
+        if not self._is_stage_completed(self._task_01, completed_stages):
+            # 「データ抽出/事前チェック」処理呼出し
+            input_data = None if commissionid_list is None else self._task_01.extract_commissions(commissionid_list)
+            taskResult = self._task_01.execute(input_data)
+            df_tmp = taskResult.resultData
+
+            # 「データ抽出/事前チェック」処理結果確認
+            result = taskResult.resultCode
+            self._save_checkpoint(checkpoint, chunk_key, self._task_01, taskResult)
+
         # 取次情報DataFrame件数確認
         if df_tmp is None or len(df_tmp) == 0:
             # 0件の場合にはここで処理終了
-            return taskResult
-        
-        # ================================
-        # データクレンジング呼出し
-        # ================================
-        
-        # 「データクレンジング」処理呼出し
-        taskResult = self.__task_02.execute(df_tmp)
-        df_tmp = taskResult.resultData
-        
-        # 「データクレンジング」処理結果確認
-        if taskResult.resultCode == const.BATCH_ERROR:
-            # 異常終了の場合には結果に異常を設定して処理終了
-            taskResultForReturn.resultCode = taskResult.resultCode
-            return taskResultForReturn
-        elif taskResult.resultCode == const.BATCH_WARNING and result != const.BATCH_ERROR:
-            # 警告終了の場合には 内部処理結果が異常以外の場合のみ上書きで処理続行
-            result = taskResult.resultCode
-            
-        # ================================
-        # ランク判定用フラグ追加呼出し
-        # ================================
-        
-        # 「ランク判定用フラグ追加」処理呼出し
-        taskResult = self.__task_03.execute(df_tmp)
-        df_tmp = taskResult.resultData
-        
-        # 「ランク判定用フラグ追加」処理結果確認
-        if taskResult.resultCode == const.BATCH_ERROR:
-            # 異常終了の場合には結果に異常を設定して処理終了
-            taskResultForReturn.resultCode = taskResult.resultCode
-            return taskResultForReturn
-        elif taskResult.resultCode == const.BATCH_WARNING and result != const.BATCH_ERROR:
-            # 警告終了の場合には 内部処理結果が異常以外の場合のみ上書きで処理続行
-            result = taskResult.resultCode
+            if checkpoint is not None:
+                checkpoint.complete_chunk(chunk_key)
+            taskResult.resultCode = result
+            return (chunk_key, taskResult, None, True), True
+
+        # 以降のタスクは持ち回り用DataFrameを複製せず、列の追加のみを行う
+        context = PipelineContext(df_tmp, type(self._task_01).__name__, rank_flags)
 
         # ================================
-        # ランク判定呼出し
+        # データクレンジング/ランク判定用フラグ追加/ランク判定呼出し
         # ================================
-        # 「ランク判定」処理呼出し
-        taskResult = self.__task_04.execute(df_tmp)
-        df_tmp = taskResult.resultData
-        
-        # 「ランク判定」処理結果確認
-        if taskResult.resultCode == const.BATCH_ERROR:
-            # 異常終了の場合には結果に異常を設定して処理終了
-            taskResultForReturn.resultCode = taskResult.resultCode
-            return taskResultForReturn
-        elif taskResult.resultCode == const.BATCH_WARNING and result != const.BATCH_ERROR:
-            # 警告終了の場合には 内部処理結果が異常以外の場合のみ上書きで処理続行
-            result = taskResult.resultCode
-        
+
+        result, is_continue = self._execute_stages(context, (self._task_02, self._task_03, self._task_04), result, checkpoint, chunk_key, completed_stages)
+        taskResultForReturn.resultCode = result
+
+        if not is_continue:
+            return (chunk_key, taskResultForReturn, None, False), False
+
+        return (chunk_key, taskResultForReturn, context, True), True
+
+    def _execute_io_stages(self, stage_result: tuple, checkpoint: StageCheckpoint) -> tuple:
+        '''
+        アカウント特定/施策キーワード設定から学習データ蓄積までのタスク(後段処理)を実行します。
+
+        Args:
+            stage_result: 前段処理の結果(マイクロバッチのキー, タスク結果, 持ち回り用コンテキスト, 後続のマイクロバッチを処理可能か)
+            checkpoint: チェックポイント。Noneの場合はチェックポイントを保存しない。
+        Returns:
+            (タスク結果, 後続のマイクロバッチを処理可能か)
+        '''
+
+        chunk_key, taskResult, context, is_continue = stage_result
+
+        if context is None:
+            # 前段処理で処理終了した場合
+            return taskResult, is_continue
+
+        # 取次自動差配処理結果
+        result = taskResult.resultCode
+
+        # 戻り値初期化
+        taskResultForReturn = TaskResult()
+
+        # 完了済タスク(再開時)
+        completed_stages = checkpoint.completed_stages(chunk_key) if checkpoint is not None else {}
+
         # ================================
         # アカウント特定/施策キーワード設定呼出し
         # ================================
-        # 「アカウント特定/施策キーワード設定」処理呼出し
-        taskResult = self.__task_05.execute(df_tmp)
-        df_tmp = taskResult.resultData
-        
-        # 「アカウント特定/施策キーワード設定」処理結果確認
-        if taskResult.resultCode == const.BATCH_ERROR:
-            # 異常終了の場合には結果に異常を設定して処理終了
-            taskResultForReturn.resultCode = taskResult.resultCode
-            return taskResultForReturn
-        elif taskResult.resultCode == const.BATCH_WARNING and result != const.BATCH_ERROR:
-            # 警告終了の場合には 内部処理結果が異常以外の場合のみ上書きで処理続行
-            result = taskResult.resultCode
- 
+
+        result, is_continue = self._execute_stages(context, (self._task_05,), result, checkpoint, chunk_key, completed_stages)
+
+        if not is_continue:
+            taskResultForReturn.resultCode = result
+            return taskResultForReturn, False
+
         # ================================
         # 自動差配呼出し
         # ================================
-        # 「自動差配」処理呼出し
-        taskResult = self.__task_06.execute(df_tmp)
-        df_tmp = taskResult.resultData
-        
-        # 「自動差配」処理結果確認
-        if taskResult.resultCode == const.BATCH_ERROR:
+        if not self._is_stage_completed(self._task_06, completed_stages):
+            # 「自動差配」処理呼出し
+            # チェックポイント有効時は取次単位のジャーナルにより処理済の取次を再処理しない
+            journal = checkpoint.journal(chunk_key, type(self._task_06).__name__) if checkpoint is not None else None
+            taskResult = context.execute(self._task_06, journal=journal)
+
+            # 「自動差配」処理結果確認
             # 異常終了の場合には結果に異常を設定して処理続行
-            result = taskResult.resultCode
-        elif taskResult.resultCode == const.BATCH_WARNING and result != const.BATCH_ERROR:
-            # 警告終了の場合には 内部処理結果が異常以外の場合のみ上書きで処理続行
-            result = taskResult.resultCode
+            result = self._merge_result_code(result, taskResult.resultCode)
+
+            if taskResult.resultData is None:
+                # 差配結果が存在しない場合は学習データ蓄積を行わずに処理終了
+                taskResultForReturn.resultCode = result
+                return taskResultForReturn, False
+
+            self._save_checkpoint(checkpoint, chunk_key, self._task_06, taskResult, context)
 
         # ================================
         # 学習データ蓄積呼出し
         # ================================
         # 「学習データ蓄積」処理呼出し
-        taskResult = self.__task_07.execute(df_tmp)
-        
+        taskResult = context.execute(self._task_07)
+
         # 「学習データ蓄積」処理結果確認
-        if taskResult.resultCode == const.BATCH_ERROR:
-            # 異常終了の場合には結果に異常を設定する
-            result = taskResult.resultCode
-        elif taskResult.resultCode == const.BATCH_WARNING and result != const.BATCH_ERROR:
-            # 警告終了の場合には 内部処理結果が異常以外の場合のみ上書きで処理続行
-            result = taskResult.resultCode
+        result = self._merge_result_code(result, taskResult.resultCode)
+
+        if checkpoint is not None:
+            checkpoint.complete_chunk(chunk_key)
 
         # 内部処理結果の値を設定して処理終了
         taskResultForReturn.resultCode = result
-        
-        return taskResultForReturn
 
+        return taskResultForReturn, True
+
+    def _execute_stages(self, context: PipelineContext, tasks: tuple, result: int, checkpoint: StageCheckpoint, chunk_key: str, completed_stages: dict) -> tuple:
+        '''
+        異常終了時に処理を中断するタスクを順に実行します。完了済のタスクは実行しない。
+
+        Args:
+            context: 持ち回り用コンテキスト
+            tasks: 実行するタスク
+            result: 内部処理結果
+            checkpoint: チェックポイント
+            chunk_key: マイクロバッチのキー
+            completed_stages: 完了済タスク
+        Returns:
+            (内部処理結果, 処理を継続可能か)
+        '''
+
+        for task in tasks:
+            if self._is_stage_completed(task, completed_stages):
+                continue
+
+            # 各処理呼出し
+            taskResult = context.execute(task)
+
+            # 各処理結果確認
+            if taskResult.resultCode == const.BATCH_ERROR:
+                # 異常終了の場合には結果に異常を設定して処理終了
+                return taskResult.resultCode, False
+
+            # 警告終了の場合には 内部処理結果が異常以外の場合のみ上書きで処理続行
+            result = self._merge_result_code(result, taskResult.resultCode)
+            self._save_checkpoint(checkpoint, chunk_key, task, taskResult, context)
+
+        return result, True
+
+    def _open_checkpoint(self, run_id: str, resume: bool) -> StageCheckpoint:
+        '''
+        チェックポイントを開きます。
+        設定ファイルのpipeline_config.checkpoint_enabledが無効、かつ実行ID・再開の指定がない場合はNoneを返却します。
+
+        Args:
+            run_id: 実行ID
+            resume: 前回の実行を再開するか
+        Returns:
+            チェックポイント
+        '''
+
+        checkpoint_enabled = const.APP_CONFIG.get('pipeline_config', {}).get('checkpoint_enabled', False)
+        if not checkpoint_enabled and not resume and run_id is None:
+            return None
+
+        if resume and run_id is None:
+            run_id = StageCheckpoint.latest_incomplete_run_id()
+            if run_id is None:
+                self.logger.info('再開対象の実行が存在しないため、新規に実行します。')
+
+        if run_id is not None:
+            checkpoint = StageCheckpoint(run_id)
+            if not checkpoint.completed:
+                self.logger.info('実行ID：%s', run_id)
+                return checkpoint
+            self.logger.info('実行ID：%s は完了済のため、新規に実行します。', run_id)
+
+        checkpoint = StageCheckpoint(StageCheckpoint.new_run_id())
+        self.logger.info('実行ID：%s', checkpoint.run_id)
+
+        return checkpoint
+
+    def _chunk_key(self, chunk_num: int) -> str:
+        '''
+        マイクロバッチのキーを取得します。
+        '''
+
+        return f'{C7013_task.CHUNK_KEY_PREFIX}{chunk_num + 1:05}'
+
+    def _is_stage_completed(self, task: BaseTask, completed_stages: dict) -> bool:
+        '''
+        タスクが完了済か判定します。
+        '''
+
+        return type(task).__name__ in completed_stages
+
+    def _save_checkpoint(self, checkpoint: StageCheckpoint, chunk_key: str, task: BaseTask, taskResult: TaskResult,
+                         context: PipelineContext = None) -> None:
+        '''
+        タスクの出力をチェックポイントとして保存します。チェックポイントが無効の場合は何もしない。
+        持ち回り用コンテキストを指定した場合は、ランク判定用フラグ行列も保存する。
+        '''
+
+        if checkpoint is None or taskResult.resultData is None:
+            return
+
+        rank_flags = context.rank_flags if context is not None else None
+        checkpoint.save(chunk_key, type(task).__name__, taskResult.resultData, taskResult.resultCode, rank_flags)
+
+    def _merge_result_code(self, result: int, resultCode: int) -> int:
+        '''
+        処理結果コードを集約します。
+        異常終了は常に上書きし、警告終了は内部処理結果が異常以外の場合のみ上書きする。
+
+        Args:
+            result: 内部処理結果
+            resultCode: タスクの処理結果コード
+        Returns:
+            集約後の処理結果コード
+        '''
+
+        if resultCode == const.BATCH_ERROR:
+            return resultCode
+        elif resultCode == const.BATCH_WARNING and result != const.BATCH_ERROR:
+            return resultCode
+
+        return result
+
+    def _write_run_report(self, metrics: TaskMetrics) -> None:
+        '''
+        各タスクの計測情報を実行レポート(JSON)として出力します。
+
+        Args:
+            metrics: 計測情報
+        '''
+
+        file_name = f'{C7013_task.RUN_REPORT_FILE_NAME_PREFIX}{datetime.datetime.now():%Y%m%d%H%M%S}{C7013_task.RUN_REPORT_FILE_NAME_EXT}'
+        self.logger.debug('実行レポートファイル名：%s', file_name)
+
+        try:
+            metrics.write_json(const.APP_DATA_PATH / file_name)
+        except OSError as e:
+            # 実行レポートの出力失敗では処理結果を変更しない
+            self.logger.warning('実行レポートの出力に失敗しました。%s', e)
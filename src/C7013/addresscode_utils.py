@@ -15,13 +15,13 @@ from collections import defaultdict
 # サードパーティライブラリインポート
 import numpy as np
 import pandas as pd
-from jaconv import h2z
 from kanjize import int2kanji
 import janome.tokenizer
 
 # プロジェクトライブラリインポート
 from . import const
 from . import utils
+from .cleansing_rule_compiler import compile_rules
 
 tdfkn_cd_dict = {'北海道': '01',
                  '青森県': '02',
@@ -98,6 +98,8 @@ def extract_tdfkn_from_address(addr_nm: str) -> tuple:
 
     return (tdfkn_nm, tdfkn_cd, street_addr_nm)
 
+__address_cleansing_rules__: list = None
+
 def address_cleansing(text: str) -> str:
     '''
     住所をクレンジングする
@@ -108,12 +110,17 @@ def address_cleansing(text: str) -> str:
     Returns:
         クレンジングした文字列
     '''
+    global __address_cleansing_rules__
     if not text:
         return text
 
+    # 初回実行時に住所クレンジング設定の置換処理を統合・コンパイルする
+    if __address_cleansing_rules__ == None:
+        __address_cleansing_rules__ = compile_rules(const.CLENSING_CONFIG_ADDRESS['cleansing_settings'])
+
     result = text
-    for key in const.CLENSING_CONFIG_ADDRESS['cleansing_settings']:
-        result = sub(key['patternstring'], key['replacementstring'], result)
+    for pattern, replacement in __address_cleansing_rules__:
+        result = pattern.sub(replacement, result)
     return result
 
 def unification_text(text: str) -> str:
@@ -132,8 +139,8 @@ def unification_text(text: str) -> str:
     if not text:
         return ""
 
-    # 全角変換
-    text = h2z(text.upper(), digit=True, ascii=True)
+    # 全角変換(変換結果はキャッシュを使用する)
+    text = utils.to_upper_wide_charactor(text)
     # ハイフン文字を統一
     text = sub(r"(ー|－|‐|―)", "－", text)
     # 空白及び改行削除
@@ -9,6 +9,7 @@ from abc import ABC
 from abc import abstractmethod
 
 # サードパーティライブラリインポート
+import inject
 
 # プロジェクトライブラリインポート
 from . import const
@@ -115,7 +116,7 @@ class BaseBatch(ABC):
         '''
         バッチの排他処理を開始する
         '''
-        with CrmDBDao() as dao:
+        with inject.instance(CrmDBDao) as dao:
             self._rglt_info = dao.try_get_locked_rglt_info(self.appId, 100)
             if self._rglt_info:
                 # 更新完了でコミット実施
@@ -131,7 +132,7 @@ class BaseBatch(ABC):
         if not self._rglt_info:
             return False
 
-        with CrmDBDao() as dao:
+        with inject.instance(CrmDBDao) as dao:
             self._rglt_info.SPR1 = 0
             self._rglt_info.SPR2 = str(result)
             self._rglt_info.SPR3 = spr3
@@ -180,6 +181,17 @@ class BaseBatch(ABC):
 
         return True
 
+    @staticmethod
+    def add_resume_arguments(parser: argparse.ArgumentParser) -> None:
+        '''
+        チェックポイントからの再開用のプログラム引数を追加する。
+        --resume: 前回の実行を未完了のタスクから再開する
+        --run-id: 再開する(または新規に保存する)チェックポイントの実行ID
+        '''
+
+        parser.add_argument('--resume', action='store_true', help='前回の実行を未完了のタスクから再開する')
+        parser.add_argument('--run-id', dest='run_id', default=None, help='チェックポイントの実行ID')
+
     @abstractmethod
     def execute(self, args: argparse.Namespace) -> int:
         '''
@@ -0,0 +1,86 @@
+'''
+住所コード特定の一括変換ベンチマーク
+
+住所コードマスタの住所に番地を付与した新設置場所を件数の規模毎に生成し、
+1件ずつの変換(address2addresscode)と一括変換(addresses2addresscodes)の所要時間を計測する。
+両者の変換結果が一致することも確認する。
+
+住所コード特定モデルを使用するため、学習済モデルを配置した環境で実行する。
+
+実行例:
+    python -m C7013.benchmark.addresscode_batch_benchmark
+    python -m C7013.benchmark.addresscode_batch_benchmark --rows 1000 10000 --batch-size 512
+'''
+
+# 標準ライブラリインポート
+import time
+import random
+import argparse
+
+# プロジェクトライブラリインポート
+from ..offline import tsql
+from ..offline import injector
+from ..offline.config import get_offline_config
+from . import synthetic_data_generator
+
+# 計測する件数の規模
+SCALES = [1000, 10000]
+
+
+def generate_addresses(rows: int, seed: int = 0, addresscode_file_path=None) -> list:
+    '''
+    住所コードマスタの住所に番地を付与した新設置場所を生成します。
+
+    Args:
+        rows: 件数
+        seed: 乱数のシード値
+        addresscode_file_path: 住所コードCSVファイルパス
+    Returns:
+        新設置場所のリスト
+    '''
+
+    db_path = get_offline_config()['db_path']
+    injector.create_database(db_path)
+    conn = tsql.connect(db_path)
+    try:
+        addresses = synthetic_data_generator.load_address_master(conn, addresscode_file_path)['addr_nm'].tolist()
+    finally:
+        conn.close()
+
+    rand = random.Random(seed)
+
+    return [rand.choice(addresses) + f'{rand.randint(1, 30)}-{rand.randint(1, 20)}' for _ in range(rows)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description='住所コード特定の一括変換ベンチマーク')
+    parser.add_argument('--rows', type=int, nargs='+', default=SCALES, help='件数(複数指定可)')
+    parser.add_argument('--batch-size', type=int, help='予測のバッチサイズ(既定値：設定ファイルのaddresscode_config.predict_batch_size)')
+    parser.add_argument('--seed', type=int, default=0, help='乱数のシード値')
+    parser.add_argument('--addresscode-file', help='住所コードCSVファイルパス')
+    args = parser.parse_args()
+
+    from ..C7013_04_addresscode_prediction_task import C7013_04_addresscode_prediction_task
+    task = C7013_04_addresscode_prediction_task()
+
+    for rows in args.rows:
+        addresses = generate_addresses(rows, args.seed, args.addresscode_file)
+
+        start = time.perf_counter()
+        row_results = [task.address2addresscode(address) for address in addresses]
+        row_elapsed = time.perf_counter() - start
+
+        start = time.perf_counter()
+        batch_results = task.addresses2addresscodes(addresses, args.batch_size)
+        batch_elapsed = time.perf_counter() - start
+
+        mismatch = sum(row_result != batch_result for row_result, batch_result in zip(row_results, batch_results))
+
+        print(f'件数：{rows:>8,}件')
+        print(f'  1件ずつ変換：{row_elapsed:10.3f}秒 ({rows / row_elapsed:10,.1f}件/秒)')
+        print(f'  一括変換    ：{batch_elapsed:10.3f}秒 ({rows / batch_elapsed:10,.1f}件/秒) 高速化：{row_elapsed / batch_elapsed:.1f}倍')
+        print(f'  変換結果の不一致：{mismatch}件')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,197 @@
+'''
+データクレンジングの列単位処理の検証・ベンチマーク
+
+件数の規模毎に合成した取次(契約者名、取次内容、会社名(情報発信元)、担当者)に対して、
+従来の行単位のクレンジング(cleanse_row)と列単位のクレンジング(C7013_02_task.cleanse_dataframe)を実行し、
+クレンジング後列が完全に一致することを確認して所要時間を出力する。
+
+クレンジング設定は設定ファイル(contractorname_cleansing.json、contents_commission_cleansing.json)を使用する。
+設定ファイルが存在しない場合は、後方参照やメタ文字を含む検証用のクレンジング設定を使用する。
+
+実行例:
+    python -m C7013.benchmark.cleansing_benchmark
+    python -m C7013.benchmark.cleansing_benchmark --rows 100000 1000000 --seed 1
+'''
+
+# 標準ライブラリインポート
+import re
+import sys
+import time
+import random
+import argparse
+
+# サードパーティライブラリインポート
+import numpy as np
+import pandas as pd
+
+# プロジェクトライブラリインポート
+from .. import const, utils
+from ..C7013_02_task import C7013_02_task, compile_cleansing_settings, cleanse_dataframe
+from . import synthetic_data_generator
+
+# 検証する件数の規模
+SCALES = [10000, 100000]
+
+# 設定ファイルが存在しない場合の契約者名クレンジング設定
+SAMPLE_CONTRACTORNAME_CLEANSING = {'cleansing_settings': [
+    {'patternstring': r'株式会社|（株）|\(株\)|㈱', 'replacementstring': ''},
+    {'patternstring': r'(有限|合同)会社', 'replacementstring': r'\1'},
+    {'patternstring': r'[\s　]+', 'replacementstring': ''},
+    {'patternstring': '', 'replacementstring': '未使用'},
+]}
+
+# 設定ファイルが存在しない場合の取次内容クレンジング設定
+SAMPLE_CONTENTS_COMMISSION_CLEANSING = {'cleansing_settings': [
+    {'patternstring': r'【(.+?)】', 'replacementstring': r'\1：'},
+    {'patternstring': r'ＮＴＴ(東|西)日本', 'replacementstring': r'ＮＴＴ\g<1>'},
+    {'patternstring': r'[０-９]{4}－[０-９]{4}', 'replacementstring': '＃＃＃＃'},
+    {'patternstring': '　', 'replacementstring': ''},
+    {'patternstring': '', 'replacementstring': '未使用'},
+]}
+
+# 未設定の値
+MISSING_VALUES = [None, np.nan, '']
+
+
+def cleanse_row(row: dict, contractorname_config: dict, contents_commission_config: dict) -> dict:
+    '''
+    従来の行単位のクレンジング処理(正解値の算出用)
+
+    Args:
+        row: クレンジング対象列の行({列名: 値})
+        contractorname_config: 契約者名クレンジング設定
+        contents_commission_config: 取次内容クレンジング設定
+    Returns:
+        {クレンジング後列名: 値}
+    '''
+
+    contractorname_cleansing = row['contractorname']
+    if not pd.isna(contractorname_cleansing) and contractorname_cleansing != '' and contractorname_config.get('cleansing_settings'):
+        for key in contractorname_config['cleansing_settings']:
+            if key['patternstring'] != '':
+                contractorname_cleansing = re.sub(key['patternstring'], key['replacementstring'], contractorname_cleansing)
+
+    contents_commission_cleansing = row['contents_commission']
+    if not pd.isna(contents_commission_cleansing) and contents_commission_cleansing != '':
+        contents_commission_cleansing = utils.to_upper_wide_charactor(contents_commission_cleansing)
+        contents_commission_cleansing = contents_commission_cleansing.replace('\r\n', '').replace('\n', '')
+        if contents_commission_config.get('cleansing_settings'):
+            for key in contents_commission_config['cleansing_settings']:
+                if key['patternstring'] != '':
+                    contents_commission_cleansing = re.sub(key['patternstring'], key['replacementstring'], contents_commission_cleansing)
+
+    cleansed = {'contractorname_cleansing': contractorname_cleansing, 'contents_commission_cleansing': contents_commission_cleansing}
+
+    for column in ('sourcecompany', 'personincharge'):
+        value = row[column]
+        if not pd.isna(value) and value != '':
+            value = utils.to_upper_wide_charactor(value)
+        cleansed[f'{column}_cleansing'] = value
+
+    return cleansed
+
+
+def load_cleansing_configs() -> tuple:
+    '''
+    クレンジング設定を読み込みます。
+    設定ファイルが存在しない場合は検証用のクレンジング設定を返却する。
+
+    Returns:
+        (契約者名クレンジング設定, 取次内容クレンジング設定)
+    '''
+
+    try:
+        return const.CLENSING_CONFIG_NAMECONTRACTOR_NAME, const.CLENSING_CONFIG_CONTENTS_COMMISSION
+    except FileNotFoundError:
+        return SAMPLE_CONTRACTORNAME_CLEANSING, SAMPLE_CONTENTS_COMMISSION_CLEANSING
+
+
+def generate_corpus(rows: int, seed: int = 0) -> pd.DataFrame:
+    '''
+    クレンジング対象列の合成データを生成します。
+    半角英数字・半角カナ、改行コード、未設定の値を含める。
+
+    Args:
+        rows: 件数
+        seed: 乱数のシード値
+    Returns:
+        クレンジング対象列のDataFrame
+    '''
+
+    rand = random.Random(seed)
+    phrases = synthetic_data_generator.load_contents_phrases() + ['wi-fi ﾙｰﾀの交換', 'NTT東日本 の光回線', 'TEL 0120-1234-5678']
+    newlines = ['', '\n', '\r\n', '　']
+
+    def missing_or(value: str):
+        return rand.choice(MISSING_VALUES) if rand.random() < 0.05 else value
+
+    def contractorname() -> str:
+        prefix = rand.choice(synthetic_data_generator.CUSTOMER_NAME_PREFIXES + ['(株)', '㈱', '（株）'])
+        return (prefix + rand.choice(['', ' ', '　']) + rand.choice(synthetic_data_generator.CUSTOMER_NAME_WORDS)
+                + rand.choice(synthetic_data_generator.CUSTOMER_NAME_SUFFIXES))
+
+    def contents_commission() -> str:
+        contents = rand.choice(synthetic_data_generator.CONTENTS_TEMPLATES).format(rand.choice(phrases), rand.choice(phrases))
+        return contents.replace('。', '。' + rand.choice(newlines), rand.randint(0, 2))
+
+    return pd.DataFrame({
+        'contractorname': [missing_or(contractorname()) for _ in range(rows)],
+        'contents_commission': [missing_or(contents_commission()) for _ in range(rows)],
+        'sourcecompany': [missing_or(rand.choice(synthetic_data_generator.SOURCE_COMPANIES + ['ntt-me', 'ﾊﾝﾊﾞｲﾀﾞｲﾘﾃﾝ'])) for _ in range(rows)],
+        'personincharge': [missing_or(rand.choice(synthetic_data_generator.PERSON_FAMILY_NAMES) + rand.choice([' ', '　', ''])
+                                      + rand.choice(synthetic_data_generator.PERSON_GIVEN_NAMES)) for _ in range(rows)],
+    }, dtype=object)
+
+
+def count_mismatches(expected: pd.DataFrame, actual: pd.DataFrame) -> dict:
+    '''
+    クレンジング後列毎に不一致の件数を返却します。
+    未設定の値(NaN、None)同士は一致とし、それ以外は型と値が一致するものを一致とする。
+    '''
+
+    mismatches = {}
+    for column in C7013_02_task.CLEANSING_COLUMNS:
+        mismatches[column] = sum(
+            not (pd.isna(expected_value) and pd.isna(actual_value))
+            and (type(expected_value) is not type(actual_value) or expected_value != actual_value)
+            for expected_value, actual_value in zip(expected[column], actual[column])
+        )
+
+    return mismatches
+
+
+def main():
+    parser = argparse.ArgumentParser(description='データクレンジングの列単位処理の検証・ベンチマーク')
+    parser.add_argument('--rows', type=int, nargs='+', default=SCALES, help='件数(複数指定可)')
+    parser.add_argument('--seed', type=int, default=0, help='乱数のシード値')
+    args = parser.parse_args()
+
+    contractorname_config, contents_commission_config = load_cleansing_configs()
+
+    has_mismatch = False
+    for rows in args.rows:
+        df = generate_corpus(rows, args.seed)
+
+        start = time.perf_counter()
+        expected = pd.DataFrame([cleanse_row(row, contractorname_config, contents_commission_config)
+                                 for row in df[C7013_02_task.CLEANSING_SOURCE_COLUMNS].to_dict('records')], index=df.index)
+        row_elapsed = time.perf_counter() - start
+
+        start = time.perf_counter()
+        actual = cleanse_dataframe(df, compile_cleansing_settings(contractorname_config), compile_cleansing_settings(contents_commission_config))
+        column_elapsed = time.perf_counter() - start
+
+        mismatches = count_mismatches(expected, actual)
+        has_mismatch = has_mismatch or any(mismatches.values())
+
+        print(f'件数：{rows:>10,}件')
+        print(f'  行単位  ：{row_elapsed:10.3f}秒 ({rows / row_elapsed:12,.1f}件/秒)')
+        print(f'  列単位  ：{column_elapsed:10.3f}秒 ({rows / column_elapsed:12,.1f}件/秒) 高速化：{row_elapsed / column_elapsed:.1f}倍')
+        for column, mismatch in mismatches.items():
+            print(f'  {column}の不一致：{mismatch}件')
+
+    sys.exit(1 if has_mismatch else 0)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,154 @@
+'''
+クレンジング設定の置換処理の統合(cleansing_rule_compiler)の検証・ベンチマーク
+
+契約者名、取次内容、住所のクレンジング設定毎に、統合した置換処理のグループと削減した走査回数を出力し、
+統合前(設定の順にre.sub)と統合後(compile_rules)の置換結果が全て一致することを検証して所要時間を出力する。
+
+検証するテキストは以下とする。
+    ・合成した取次の契約者名、取次内容(cleansing_benchmark.generate_corpus)、住所コードマスタの住所
+    ・置換元文字列と置換後文字列をランダムに連結した、置換処理同士が干渉しやすいテキスト
+
+クレンジング設定は設定ファイルを使用する。設定ファイルが存在しない場合は検証用のクレンジング設定を使用する。
+
+実行例:
+    python -m C7013.benchmark.cleansing_rule_fusion_benchmark
+    python -m C7013.benchmark.cleansing_rule_fusion_benchmark --rows 100000 --seed 1
+'''
+
+# 標準ライブラリインポート
+import sys
+import time
+import random
+import argparse
+
+# プロジェクトライブラリインポート
+from .. import const, utils
+from ..offline import tsql
+from ..offline import injector
+from ..offline.config import get_offline_config
+from ..cleansing_rule_compiler import compile_rules, apply_sequential, apply_rules, verify_rules, fusion_report, literal_alternatives
+from . import cleansing_benchmark
+from . import synthetic_data_generator
+
+# 設定ファイルが存在しない場合の住所クレンジング設定
+SAMPLE_ADDRESS_CLEANSING = {'cleansing_settings': [
+    {'patternstring': '丁目', 'replacementstring': '－'},
+    {'patternstring': '番地', 'replacementstring': '－'},
+    {'patternstring': '番', 'replacementstring': '－'},
+    {'patternstring': '号', 'replacementstring': ''},
+    {'patternstring': 'ヶ|ヵ', 'replacementstring': 'ケ'},
+    {'patternstring': '之', 'replacementstring': 'の'},
+    {'patternstring': r'\(.*?\)', 'replacementstring': ''},
+    {'patternstring': '大字', 'replacementstring': ''},
+    {'patternstring': '字', 'replacementstring': ''},
+]}
+
+
+def load_configs() -> dict:
+    '''
+    クレンジング設定を読み込みます。
+    設定ファイルが存在しない場合は検証用のクレンジング設定を返却する。
+
+    Returns:
+        {クレンジング設定名: クレンジング設定}
+    '''
+
+    contractorname_config, contents_commission_config = cleansing_benchmark.load_cleansing_configs()
+    try:
+        address_config = const.CLENSING_CONFIG_ADDRESS
+    except FileNotFoundError:
+        address_config = SAMPLE_ADDRESS_CLEANSING
+
+    return {
+        'contractorname': contractorname_config,
+        'contents_commission': contents_commission_config,
+        'address': address_config,
+    }
+
+
+def generate_adversarial_texts(settings: list, rows: int, seed: int = 0) -> list:
+    '''
+    置換元文字列と置換後文字列をランダムに連結し、置換処理同士が干渉しやすいテキストを生成します。
+
+    Args:
+        settings: クレンジング設定の置換処理のリスト
+        rows: 件数
+        seed: 乱数のシード値
+    Returns:
+        テキストのリスト
+    '''
+
+    rand = random.Random(seed)
+    fragments = ['', ' ', '　', 'Ａ', '１', 'あ']
+    for setting in settings:
+        fragments.extend(literal_alternatives(setting['patternstring']) or [])
+        fragments.append(setting['replacementstring'])
+        # 文字列の一部分も連結し、置換元文字列の境界をまたぐ一致を検証する
+        fragments.extend(setting['patternstring'][:length] for length in range(1, len(setting['patternstring'])))
+    fragments = [fragment for fragment in fragments if '\\' not in fragment]
+
+    return [''.join(rand.choice(fragments) for _ in range(rand.randint(1, 12))) for _ in range(rows)]
+
+
+def load_texts(name: str, rows: int, seed: int = 0) -> list:
+    '''
+    クレンジング設定名毎の検証用テキストを取得します。
+    '''
+
+    if name == 'address':
+        db_path = get_offline_config()['db_path']
+        injector.create_database(db_path)
+        conn = tsql.connect(db_path)
+        try:
+            addresses = synthetic_data_generator.load_address_master(conn)['addr_nm'].tolist()
+        finally:
+            conn.close()
+        rand = random.Random(seed)
+        return [rand.choice(addresses) + f'{rand.randint(1, 30)}丁目{rand.randint(1, 20)}番地' for _ in range(rows)]
+
+    corpus = cleansing_benchmark.generate_corpus(rows, seed)[name]
+    texts = [text for text in corpus if isinstance(text, str) and text]
+    if name == 'contents_commission':
+        # 取次内容は全角大文字変換後に置換処理を実施する
+        texts = [utils.to_upper_wide_charactor(text) for text in texts]
+
+    return texts
+
+
+def main():
+    parser = argparse.ArgumentParser(description='クレンジング設定の置換処理の統合の検証・ベンチマーク')
+    parser.add_argument('--rows', type=int, default=20000, help='検証するテキストの件数')
+    parser.add_argument('--seed', type=int, default=0, help='乱数のシード値')
+    args = parser.parse_args()
+
+    has_mismatch = False
+    for name, config in load_configs().items():
+        settings = [setting for setting in (config or {}).get('cleansing_settings') or [] if setting['patternstring'] != '']
+        report = fusion_report(settings)
+
+        texts = load_texts(name, args.rows, args.seed) + generate_adversarial_texts(settings, args.rows, args.seed)
+        mismatches = verify_rules(settings, texts)
+        has_mismatch = has_mismatch or bool(mismatches)
+
+        rules = compile_rules(settings)
+        start = time.perf_counter()
+        for text in texts:
+            apply_sequential(settings, text)
+        sequential_elapsed = time.perf_counter() - start
+        start = time.perf_counter()
+        for text in texts:
+            apply_rules(rules, text)
+        fused_elapsed = time.perf_counter() - start
+
+        print(f'{name}：置換処理数：{report["rules"]} 走査回数：{report["passes"]} 削減した走査回数：{report["savedPasses"]}')
+        print(f'  統合した置換処理：{[group for group in report["groups"] if len(group) > 1]}')
+        print(f'  統合前：{sequential_elapsed:8.3f}秒 統合後：{fused_elapsed:8.3f}秒 (検証テキスト：{len(texts):,}件)')
+        print(f'  置換結果の不一致：{len(mismatches)}件')
+        for text, expected, actual in mismatches[:10]:
+            print(f'    {text!r}: 統合前={expected!r} 統合後={actual!r}')
+
+    sys.exit(1 if has_mismatch else 0)
+
+
+if __name__ == '__main__':
+    main()
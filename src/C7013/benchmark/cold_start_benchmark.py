@@ -0,0 +1,197 @@
+'''
+自動差配処理のコールドスタート計測ベンチマーク
+
+C7013_taskのモジュール読込、インスタンス生成、実行の各所要時間を計測し、
+実行後に生成済となったタスクを出力する。
+対象取次が0件の環境で実行すると、データ抽出/事前チェック以外のタスク
+(ランク判定モデル・住所コード予測モデルの読込、DCRM接続を含む)が生成されないことを確認できる。
+
+--mode bothを指定した場合(既定値)は、以下の2方式をそれぞれ別プロセスで実行し、所要時間を比較する。
+    ・遅延生成(lazy)：各タスク・モデル・DCRM接続を初回使用時に生成する(現在の処理)
+    ・事前生成(eager)：インスタンス生成時に全タスクを生成し、モデルの読込とDCRM接続を行う(遅延生成前の処理と同じ生成量)
+モジュールの読込時間を含めるため、方式毎にプロセスを起動して計測する。
+
+--offlineを指定した場合は、合成データ(synthetic_data_generator)をオフライン用DBに生成し、
+外部接続をオフライン用の代替実装に差し替えて実行する(--rowsの既定値は0件)。
+指定しない場合はDB・DCRMへの接続設定を含むアプリケーション設定が必要なため、運用環境で実行する。
+いずれもランク判定モデル・住所コード予測モデルを使用するため、学習済モデルを配置した環境で実行する。
+
+実行例:
+    python -m C7013.benchmark.cold_start_benchmark
+    python -m C7013.benchmark.cold_start_benchmark --offline
+    python -m C7013.benchmark.cold_start_benchmark --offline --rows 1000 --repeat 3
+'''
+
+# 標準ライブラリインポート
+import sys
+import json
+import time
+import pathlib
+import argparse
+import subprocess
+
+# 計測する方式
+MODE_LAZY: str = 'lazy'
+MODE_EAGER: str = 'eager'
+MODE_BOTH: str = 'both'
+# 方式の表示名
+MODE_NAMES: dict = {MODE_LAZY: '遅延生成', MODE_EAGER: '事前生成'}
+
+
+def configure_offline(db_path: pathlib.Path) -> None:
+    '''
+    外部接続をオフライン用の代替実装に差し替えます。
+    '''
+
+    import inject
+    from ..dao.crmdb_dao import CrmDBDao
+    from ..dao.nwmdb_dao import NwmDBDao
+    from ..dcrm_helper import DcrmHelper
+    from ..fastsearch_helper import FastSearchHelper
+    from ..offline.crmdb_dao import OfflineCrmDBDao
+    from ..offline.nwmdb_dao import OfflineNwmDBDao
+    from ..offline.dcrm_helper import OfflineDcrmHelper
+    from ..offline.fastsearch_helper import OfflineFastSearchHelper
+
+    def configure(binder: inject.Binder) -> None:
+        binder.bind_to_constructor(CrmDBDao, lambda: OfflineCrmDBDao(db_path))
+        binder.bind_to_constructor(NwmDBDao, lambda: OfflineNwmDBDao(db_path))
+        binder.bind_to_constructor(DcrmHelper, OfflineDcrmHelper)
+        binder.bind_to_constructor(FastSearchHelper, lambda: OfflineFastSearchHelper(db_path))
+
+    inject.clear_and_configure(configure)
+
+
+def construct_eagerly(task) -> None:
+    '''
+    遅延生成前と同じく、全タスクを生成してモデルの読込とDCRM接続を行います。
+    '''
+
+    for i in range(1, 8):
+        getattr(task, f'_task_0{i}')
+    task.load_models()
+    task._task_01._helper
+    task._task_06._helper
+
+
+def measure(mode: str) -> dict:
+    '''
+    C7013_taskのモジュール読込、インスタンス生成、実行の所要時間を計測します。
+
+    Args:
+        mode: 方式(lazy、eager)
+    Returns:
+        {'mode', 'importElapsed', 'constructElapsed', 'executeElapsed', 'resultCode', 'constructed', 'heavyModules'}
+    '''
+
+    start = time.perf_counter()
+    from ..C7013_task import C7013_task
+    import_elapsed = time.perf_counter() - start
+
+    start = time.perf_counter()
+    task = C7013_task()
+    if mode == MODE_EAGER:
+        construct_eagerly(task)
+    construct_elapsed = time.perf_counter() - start
+
+    start = time.perf_counter()
+    result = task.execute()
+    execute_elapsed = time.perf_counter() - start
+
+    return {
+        'mode': mode,
+        'importElapsed': import_elapsed,
+        'constructElapsed': construct_elapsed,
+        'executeElapsed': execute_elapsed,
+        'resultCode': result.resultCode,
+        'constructed': [f'C7013_0{i}_task' for i in range(1, 8) if getattr(task, f'_C7013_task__task_0{i}') is not None],
+        'heavyModules': [name for name in ('tensorflow', 'clr', 'pymssql') if name in sys.modules],
+    }
+
+
+def run_process(mode: str, db_path: pathlib.Path = None) -> dict:
+    '''
+    方式毎にプロセスを起動して計測します。
+
+    Returns:
+        measureの計測結果にプロセス全体の所要時間(processElapsed)を追加したもの
+    '''
+
+    command = [sys.executable, '-m', __spec__.name, '--mode', mode, '--json']
+    if db_path is not None:
+        command += ['--offline', '--db-path', str(db_path), '--no-generate']
+
+    start = time.perf_counter()
+    completed = subprocess.run(command, stdout=subprocess.PIPE, check=True, encoding='utf-8')
+    process_elapsed = time.perf_counter() - start
+
+    report = json.loads(completed.stdout.strip().splitlines()[-1])
+    report['processElapsed'] = process_elapsed
+
+    return report
+
+
+def print_report(report: dict) -> None:
+    '''
+    計測結果を出力します。
+    '''
+
+    total = report['importElapsed'] + report['constructElapsed'] + report['executeElapsed']
+    print(f'[{MODE_NAMES[report["mode"]]}]')
+    print(f'  モジュール読込      ：{report["importElapsed"]:.3f}秒')
+    print(f'  インスタンス生成    ：{report["constructElapsed"]:.3f}秒')
+    print(f'  実行                ：{report["executeElapsed"]:.3f}秒 (処理結果コード：{report["resultCode"]})')
+    print(f'  合計                ：{total:.3f}秒')
+    if 'processElapsed' in report:
+        print(f'  プロセス全体        ：{report["processElapsed"]:.3f}秒')
+    print(f'  生成済タスク        ：{", ".join(report["constructed"])}')
+    print(f'  読込済の重いモジュール：{", ".join(report["heavyModules"])}')
+
+
+def main():
+    parser = argparse.ArgumentParser(description='自動差配処理のコールドスタート計測')
+    parser.add_argument('--mode', choices=[MODE_LAZY, MODE_EAGER, MODE_BOTH], default=MODE_BOTH, help='計測する方式(既定値：both)')
+    parser.add_argument('--repeat', type=int, default=1, help='方式毎の計測回数(--mode bothの場合)')
+    parser.add_argument('--offline', action='store_true', help='オフライン用の代替実装に差し替えて実行する')
+    parser.add_argument('--rows', type=int, default=0, help='合成データの取次件数(--offlineの場合)')
+    parser.add_argument('--db-path', type=pathlib.Path, help='オフライン用DBファイルパス(既定値：設定ファイルのoffline_config.db_path)')
+    parser.add_argument('--seed', type=int, default=0, help='乱数のシード値')
+    parser.add_argument('--no-generate', action='store_true', help='合成データを生成しない(生成済のオフライン用DBを使用する)')
+    parser.add_argument('--json', action='store_true', help='計測結果をJSONで出力する')
+    args = parser.parse_args()
+
+    db_path = None
+    if args.offline:
+        from ..offline.config import get_offline_config
+        from . import synthetic_data_generator
+        db_path = args.db_path or get_offline_config()['db_path']
+        if not args.no_generate:
+            synthetic_data_generator.generate(args.rows, db_path, args.seed)
+
+    if args.mode != MODE_BOTH:
+        if db_path is not None:
+            configure_offline(db_path)
+        else:
+            import inject
+            inject.configure_once()
+        report = measure(args.mode)
+        if args.json:
+            print(json.dumps(report, ensure_ascii=False))
+        else:
+            print_report(report)
+        return
+
+    # 方式毎にプロセスを起動して計測し、最短の所要時間で比較する
+    reports = {}
+    for mode in (MODE_EAGER, MODE_LAZY):
+        runs = [run_process(mode, db_path) for _ in range(max(args.repeat, 1))]
+        reports[mode] = min(runs, key=lambda run: run['processElapsed'])
+        print_report(reports[mode])
+
+    eager, lazy = reports[MODE_EAGER], reports[MODE_LAZY]
+    print(f'プロセス全体の所要時間：事前生成 {eager["processElapsed"]:.3f}秒 遅延生成 {lazy["processElapsed"]:.3f}秒 '
+          f'短縮：{eager["processElapsed"] - lazy["processElapsed"]:.3f}秒')
+
+
+if __name__ == '__main__':
+    main()
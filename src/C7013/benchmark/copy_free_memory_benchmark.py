@@ -0,0 +1,163 @@
+'''
+タスク間のDataFrame持ち回り方式によるピークメモリ比較ベンチマーク
+
+合成データ(synthetic_data_generator)をオフライン用DBに生成し、外部接続をオフライン用の代替実装に差し替えて
+データ抽出/事前チェック(C7013_01_task)の出力を作成する。
+その出力に対してC7013_02～05タスクを以下の2方式で実行し、ピークメモリと経過時間を計測する。
+    ・従来方式：各タスクの実行前に入力DataFrameを複製する(タスク毎に全列を複製していた従来の処理と同じ複製量)
+    ・複製なし方式：持ち回り用コンテキスト(PipelineContext)で1つのDataFrameを持ち回り、各タスクは列の追加のみを行う
+両方式の出力DataFrameが一致しない場合は異常終了する。
+
+ランク判定モデル・住所コード予測モデルを使用するため、学習済モデルを配置した環境で実行する。
+
+実行例:
+    python -m C7013.benchmark.copy_free_memory_benchmark --rows 100000
+'''
+
+# 標準ライブラリインポート
+import time
+import argparse
+import pathlib
+import tracemalloc
+
+# サードパーティライブラリインポート
+import inject
+import pandas as pd
+
+# プロジェクトライブラリインポート
+from ..dao.crmdb_dao import CrmDBDao
+from ..dao.nwmdb_dao import NwmDBDao
+from ..dcrm_helper import DcrmHelper
+from ..fastsearch_helper import FastSearchHelper
+from ..offline.config import get_offline_config
+from ..pipeline_context import PipelineContext
+from ..task import TaskResult
+from . import synthetic_data_generator
+
+
+def configure_offline(db_path: pathlib.Path) -> None:
+    '''
+    外部接続をオフライン用の代替実装に差し替えます。
+    '''
+
+    from ..offline.crmdb_dao import OfflineCrmDBDao
+    from ..offline.nwmdb_dao import OfflineNwmDBDao
+    from ..offline.dcrm_helper import OfflineDcrmHelper
+    from ..offline.fastsearch_helper import OfflineFastSearchHelper
+
+    def configure(binder: inject.Binder) -> None:
+        binder.bind_to_constructor(CrmDBDao, lambda: OfflineCrmDBDao(db_path))
+        binder.bind_to_constructor(NwmDBDao, lambda: OfflineNwmDBDao(db_path))
+        binder.bind_to_constructor(DcrmHelper, OfflineDcrmHelper)
+        binder.bind_to_constructor(FastSearchHelper, lambda: OfflineFastSearchHelper(db_path))
+
+    inject.clear_and_configure(configure)
+
+
+def create_tasks() -> list:
+    '''
+    計測対象のタスク(C7013_02～05)を作成し、ランク判定モデルを読み込みます。
+    '''
+
+    from ..C7013_02_task import C7013_02_task
+    from ..C7013_03_task import C7013_03_task
+    from ..C7013_04_task import C7013_04_task
+    from ..C7013_05_task import C7013_05_task
+
+    tasks = [inject.instance(C7013_02_task), inject.instance(C7013_03_task), inject.instance(C7013_04_task), inject.instance(C7013_05_task)]
+    # モデルの読込を計測に含めないよう、事前に読み込む
+    tasks[2].load_models()
+
+    return tasks
+
+
+def create_input_data() -> pd.DataFrame:
+    '''
+    データ抽出/事前チェック(C7013_01_task)の出力を作成します。
+    '''
+
+    from ..C7013_01_task import C7013_01_task
+
+    return inject.instance(C7013_01_task).execute(None).resultData
+
+
+def run_copy(tasks: list, df: pd.DataFrame) -> pd.DataFrame:
+    '''
+    従来方式：各タスクで入力データを複製してから実行する
+    '''
+
+    rank_flags = None
+    for task in tasks:
+        kwargs = {'rank_flags': rank_flags} if task.USES_RANK_FLAGS else {}
+        task_result = task.execute(df.copy(), **kwargs)
+        if isinstance(task_result, TaskResult):
+            rank_flags = task_result.rankFlags if task_result.rankFlags is not None else rank_flags
+            task_result = task_result.resultData
+        df = task_result
+    return df
+
+
+def run_copy_free(tasks: list, df: pd.DataFrame) -> pd.DataFrame:
+    '''
+    複製なし方式：持ち回り用コンテキストで1つのDataFrameに列を追加する
+    '''
+
+    context = PipelineContext(df)
+    for task in tasks:
+        context.execute(task)
+    return context.data
+
+
+def measure(func, tasks: list, input_data: pd.DataFrame) -> tuple:
+    '''
+    関数実行中のピークメモリと経過時間を計測します。
+
+    Returns:
+        (ピークメモリ(バイト), 経過時間(秒), 出力DataFrame)
+    '''
+
+    df = input_data.copy()
+
+    tracemalloc.start()
+    tracemalloc.reset_peak()
+    base, _ = tracemalloc.get_traced_memory()
+    start = time.perf_counter()
+    result = func(tasks, df)
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return peak - base, elapsed, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description='タスク間のDataFrame持ち回り方式によるピークメモリ比較')
+    parser.add_argument('--rows', type=int, default=100000, help='取次件数')
+    parser.add_argument('--db-path', type=pathlib.Path, help='オフライン用DBファイルパス(既定値：設定ファイルのoffline_config.db_path)')
+    parser.add_argument('--seed', type=int, default=0, help='乱数のシード値')
+    parser.add_argument('--addresscode-file', help='住所コードCSVファイルパス')
+    args = parser.parse_args()
+
+    db_path = args.db_path or get_offline_config()['db_path']
+    synthetic_data_generator.generate(args.rows, db_path, args.seed, args.addresscode_file)
+
+    configure_offline(db_path)
+    try:
+        input_data = create_input_data()
+        tasks = create_tasks()
+
+        copy_peak, copy_elapsed, copy_result = measure(run_copy, tasks, input_data)
+        copy_free_peak, copy_free_elapsed, copy_free_result = measure(run_copy_free, tasks, input_data)
+    finally:
+        inject.instance(CrmDBDao).close()
+        inject.clear()
+
+    pd.testing.assert_frame_equal(copy_result, copy_free_result)
+
+    print(f'取次件数：{args.rows} 抽出件数：{len(input_data)}')
+    print(f'従来方式    ピークメモリ：{copy_peak / 1024 ** 2:10.1f}MB 経過時間：{copy_elapsed:.3f}秒')
+    print(f'複製なし方式 ピークメモリ：{copy_free_peak / 1024 ** 2:10.1f}MB 経過時間：{copy_free_elapsed:.3f}秒')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,202 @@
+'''
+フラグ強制補正の列単位処理の検証・ベンチマーク
+
+従来の行単位のフラグ強制補正(set_force_flag_row、DataFrame.apply)と、
+列単位のフラグ強制補正(C7013_04_rank_flag_forced_correction_task)の結果が一致することを、
+ランダムに生成した入力に対して検証する(プロパティベースの検証)。
+
+生成する入力は以下とする。
+    ・ランク判定用フラグ：ルールの条件に該当しやすいよう0/1を偏らせ、欠損値(NaN)、0/1以外の値を含める
+    ・当初注文内容：全てのピックリスト値、存在しない値、欠損値(NaN)を含める
+    ・列の型：uint8(ランク判定用フラグ追加後)、int64、float64(学習データCSV、欠損値を含む)
+    ・件数：0件、1件を含むランダムな件数
+フラグ値、当初注文内容は欠損値同士を一致とし、それ以外は値が一致するものを一致とする。
+
+検証後、件数の規模毎に行単位と列単位の所要時間を出力する。
+
+実行例:
+    python -m C7013.benchmark.forced_correction_benchmark
+    python -m C7013.benchmark.forced_correction_benchmark --trials 1000 --rows 100000 --seed 1
+'''
+
+# 標準ライブラリインポート
+import sys
+import time
+import argparse
+
+# サードパーティライブラリインポート
+import numpy as np
+import pandas as pd
+
+# プロジェクトライブラリインポート
+from .. import rank_utils
+from ..rank_utils import rank_flag_columns
+from ..C7013_04_rank_flag_forced_correction_task import C7013_04_rank_flag_forced_correction_task, FORCED_CORRECTION_RULES
+from ..C7013_04_rank_flag_forced_correction_task import apply_forced_correction
+
+# 計測する件数の規模
+SCALES = [10000, 100000]
+
+# 生成する当初注文内容(存在しない値を含む)
+ORDERCONTENTS_VALUES = list(rank_utils.ordercontents_dict.values()) + [3, 99]
+
+# ルールの条件に使用するフラグ
+RULE_FLAG_COLUMNS = sorted({column for rule in FORCED_CORRECTION_RULES for column in rule.conditions})
+
+
+def set_force_flag_row(row: pd.Series) -> pd.Series:
+    '''
+    従来の行単位のフラグ強制補正(正解値の算出用)
+
+    Args:
+        row: ランク判定用データフレームの１行
+    '''
+
+    new_change_inquiry = [
+        rank_utils.ordercontents_dict['新設'],
+        rank_utils.ordercontents_dict['変更'],
+        rank_utils.ordercontents_dict['問い合せ'],
+    ]
+
+    # No32 Ｂフレ マイグレ（アウトバウンド）
+    if row['ordercontents'] in new_change_inquiry and row['rank_flag33'] == 1 and row['rank_flag24'] == 1 and row['rank_flag07'] == 0:
+        rank_utils.clear_all_rank_flag(row)
+        row['rank_flag33'] = 1
+        row['rank_flag24'] = 1
+        row['rank_flag07'] = 0
+    # No33 ADSL マイグレ（アウトバウンド）
+    elif row['ordercontents'] in new_change_inquiry and row['rank_flag33'] == 1 and row['rank_flag06'] == 1 and row['rank_flag07'] == 0:
+        rank_utils.clear_all_rank_flag(row)
+        row['rank_flag33'] = 1
+        row['rank_flag06'] = 1
+        row['rank_flag07'] = 0
+    # No35 パートナーセンタからの取次
+    elif row['rank_flag35'] == 1:
+        rank_utils.clear_all_rank_flag(row)
+        row['rank_flag35'] = 1
+    # No40 アップセルNGベンダ名義・申込
+    elif row['rank_flag41'] == 1:
+        rank_utils.clear_all_rank_flag(row)
+        row['rank_flag41'] = 1
+    # No16 現場事務所系・イベント系(ブースモデルルーム等)への注文
+    elif (row['ordercontents'] in new_change_inquiry + [rank_utils.ordercontents_dict['増設']]
+            and row['rank_flag21'] == 0 and row['rank_flag39'] == 1):
+        rank_utils.clear_all_rank_flag(row)
+        row['rank_flag21'] = 0
+        row['rank_flag39'] = 1
+
+    return row
+
+
+def generate_input(rng: np.random.Generator, rows: int, dtype: str) -> pd.DataFrame:
+    '''
+    フラグ強制補正の入力をランダムに生成します。
+
+    Args:
+        rng: 乱数生成器
+        rows: 件数
+        dtype: ランク判定用フラグ列の型(uint8、int64、float64)
+    Returns:
+        当初注文内容とランク判定用フラグ列のDataFrame
+    '''
+
+    # ルールの条件に使用するフラグは1となる割合を行列毎に変え、条件の組合せを網羅しやすくする
+    density = rng.uniform(0.05, 0.95)
+    flags = {}
+    for column in rank_flag_columns:
+        values = (rng.random(rows) < (density if column in RULE_FLAG_COLUMNS else 0.1)).astype(np.float64)
+        if dtype == 'float64':
+            values[rng.random(rows) < 0.05] = np.nan
+            values[rng.random(rows) < 0.01] = 2
+        flags[column] = values.astype(dtype) if dtype != 'float64' else values
+
+    ordercontents = rng.choice(ORDERCONTENTS_VALUES, size=rows).astype(np.float64)
+    if dtype == 'float64':
+        ordercontents[rng.random(rows) < 0.05] = np.nan
+    else:
+        ordercontents = ordercontents.astype(np.int64)
+
+    return pd.DataFrame({'ordercontents': ordercontents, **flags})
+
+
+def count_mismatches(expected: pd.DataFrame, actual: pd.DataFrame) -> int:
+    '''
+    値が一致しない要素の件数を返却します。欠損値同士は一致とする。
+    '''
+
+    if list(expected.columns) != list(actual.columns) or len(expected) != len(actual):
+        return max(len(expected), len(actual), 1)
+
+    expected_values = expected.to_numpy(dtype=np.float64)
+    actual_values = actual.to_numpy(dtype=np.float64)
+
+    return int((~((expected_values == actual_values) | (np.isnan(expected_values) & np.isnan(actual_values)))).sum())
+
+
+def main():
+    parser = argparse.ArgumentParser(description='フラグ強制補正の列単位処理の検証・ベンチマーク')
+    parser.add_argument('--trials', type=int, default=300, help='ランダムな入力による検証の回数')
+    parser.add_argument('--rows', type=int, nargs='+', default=SCALES, help='所要時間を計測する件数(複数指定可)')
+    parser.add_argument('--seed', type=int, default=0, help='乱数のシード値')
+    args = parser.parse_args()
+
+    task = C7013_04_rank_flag_forced_correction_task()
+    rng = np.random.default_rng(args.seed)
+
+    # ランダムな入力による検証
+    failures = 0
+    applied = {rule.no: 0 for rule in FORCED_CORRECTION_RULES}
+    for trial in range(args.trials):
+        rows = [0, 1][trial] if trial < 2 else int(rng.integers(1, 300))
+        dtype = ['uint8', 'int64', 'float64'][trial % 3]
+        input_data = generate_input(rng, rows, dtype)
+        original = input_data.copy()
+
+        expected = input_data.apply(set_force_flag_row, axis=1) if rows > 0 else input_data.copy()
+        actual = task.execute(input_data)
+
+        mismatches = count_mismatches(expected, actual)
+        # 入力DataFrameを変更しないこと
+        mismatches += count_mismatches(original, input_data)
+
+        # ランク判定用フラグ行列への適用(apply_forced_correction)
+        flag_values = original[rank_flag_columns].to_numpy(copy=True)
+        ordercontents = original['ordercontents'].to_numpy()
+        masks = apply_forced_correction(flag_values, ordercontents)
+        mismatches += count_mismatches(expected[rank_flag_columns], pd.DataFrame(flag_values, columns=rank_flag_columns))
+        if mismatches:
+            failures += 1
+            if failures <= 5:
+                print(f'  不一致：試行{trial} 件数{rows} 型{dtype} 不一致{mismatches}件')
+
+        for rule, mask in zip(FORCED_CORRECTION_RULES, masks):
+            applied[rule.no] += int(mask.sum())
+
+    print(f'ランダムな入力による検証：{args.trials}回 不一致：{failures}回')
+    print(f'  ルール毎の適用件数：{applied}')
+
+    # 所要時間
+    for rows in args.rows:
+        input_data = generate_input(np.random.default_rng(args.seed), rows, 'uint8')
+
+        start = time.perf_counter()
+        expected = input_data.apply(set_force_flag_row, axis=1)
+        row_elapsed = time.perf_counter() - start
+
+        start = time.perf_counter()
+        actual = task.execute(input_data)
+        column_elapsed = time.perf_counter() - start
+
+        mismatches = count_mismatches(expected, actual)
+        failures += bool(mismatches)
+
+        print(f'件数：{rows:>10,}件')
+        print(f'  行単位  ：{row_elapsed:10.3f}秒 ({rows / row_elapsed:12,.1f}件/秒)')
+        print(f'  列単位  ：{column_elapsed:10.3f}秒 ({rows / column_elapsed:12,.1f}件/秒) 高速化：{row_elapsed / column_elapsed:.1f}倍')
+        print(f'  不一致：{mismatches}件')
+
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == '__main__':
+    main()
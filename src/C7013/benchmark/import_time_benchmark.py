@@ -0,0 +1,109 @@
+'''
+エントリポイント毎のモジュール読込時間計測ベンチマーク
+
+エントリポイントとなるタスクモジュール毎に別プロセスで`python -X importtime`を実行し、
+モジュール読込の合計時間と、読込時間の大きいトップレベルパッケージを出力する。
+計測結果をJSONで保存し、次回の計測時に比較対象として指定できる。
+
+実行例:
+    python -m C7013.benchmark.import_time_benchmark --output import_time.json
+    python -m C7013.benchmark.import_time_benchmark --baseline import_time.json
+'''
+
+# 標準ライブラリインポート
+import argparse
+import json
+import pathlib
+import subprocess
+import sys
+
+# エントリポイントとなるタスクモジュール
+ENTRY_POINTS = [
+    'C7013.C7013_task',
+    'C7013.C7013_04_addresscode_encoder_training_task',
+    'C7013.C7013_04_addresscode_generate_user_dictionary_task',
+    'C7013.C7013_04_addresscode_retrive_all_task',
+    'C7013.C7013_04_addresscode_training_task',
+    'C7013.C7013_04_addresscode_verification_task',
+    'C7013.C7013_04_rank_training_task',
+    'C7013.C7013_04_rank_verification_task',
+    'C7013.C7013_07_correct_answer_rate_task',
+    'C7013.C7013_07_extract_study_data_task',
+    'C7013.C7013_07_rank_reflect_task',
+]
+
+# 読込時間を確認する重いパッケージ
+HEAVY_PACKAGES = ['tensorflow', 'matplotlib', 'sklearn', 'cx_Oracle', 'pymssql', 'clr']
+
+# アプリケーションホーム
+APP_HOME_PATH: pathlib.PurePath = pathlib.Path(__file__).resolve().parents[2]
+
+
+def measure(module_name: str) -> dict:
+    '''
+    モジュールの読込時間を計測します。
+
+    Args:
+        module_name: モジュール名
+    Returns:
+        {'total': 合計時間(秒), 'packages': {トップレベルパッケージ名: 読込時間(秒)}}
+    '''
+
+    completed = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', f'import {module_name}'],
+        cwd=APP_HOME_PATH, capture_output=True, text=True, encoding='utf-8', errors='replace')
+    if completed.returncode != 0:
+        raise RuntimeError(f'{module_name} の読込に失敗しました。\n{completed.stderr[-2000:]}')
+
+    total = 0
+    packages = {}
+    for line in completed.stderr.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        self_us, _, name = line[len('import time:'):].split('|')
+        self_us = int(self_us)
+        package = name.strip().split('.')[0]
+        packages[package] = packages.get(package, 0) + self_us
+        total += self_us
+
+    return {
+        'total': total / 1e6,
+        'packages': {package: us / 1e6 for package, us in sorted(packages.items(), key=lambda item: item[1], reverse=True)},
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='エントリポイント毎のモジュール読込時間計測')
+    parser.add_argument('--entry-point', action='append', help='計測するモジュール名(省略時は全エントリポイント)')
+    parser.add_argument('--top', type=int, default=5, help='出力するトップレベルパッケージ数')
+    parser.add_argument('--output', help='計測結果の出力先JSONファイル')
+    parser.add_argument('--baseline', help='比較対象の計測結果JSONファイル')
+    args = parser.parse_args()
+
+    baseline = {}
+    if args.baseline:
+        with open(args.baseline, 'r', encoding='utf-8') as f:
+            baseline = json.load(f)
+
+    results = {}
+    for module_name in args.entry_point or ENTRY_POINTS:
+        result = measure(module_name)
+        results[module_name] = result
+
+        line = f'{module_name:<60} 合計：{result["total"]:7.3f}秒'
+        if module_name in baseline:
+            line += f' (比較対象：{baseline[module_name]["total"]:7.3f}秒)'
+        print(line)
+
+        heavy = [package for package in HEAVY_PACKAGES if package in result['packages']]
+        print(f'    読込済の重いパッケージ：{", ".join(heavy) if heavy else "なし"}')
+        for package, elapsed in list(result['packages'].items())[:args.top]:
+            print(f'    {package:<30} {elapsed:7.3f}秒')
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(results, f, ensure_ascii=False, indent=2)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,124 @@
+'''
+ランク判定モデルの推論バックエンド(keras、numpy)の検証・ベンチマーク
+
+RankModelHelper(tensorflow)とNumPy版ランク判定モデル(NumpyRankModel)に対して、以下を比較する。
+    ・予測結果：ランダムに生成した入力に対する予測確率の最大差、ランク毎の予測結果・判定したランクの不一致件数
+    ・予測時間：件数(1件～)毎の予測の所要時間
+    ・起動時間：別プロセスでのモジュール読込～モデル読込の所要時間
+NumPy版ランク判定モデル(rank_model.npz)がない場合は、RankModelHelper.export_numpy_modelで出力してから比較する。
+判定したランクが一致しない場合は異常終了する。
+
+実行例:
+    python -m C7013.benchmark.rank_backend_benchmark
+    python -m C7013.benchmark.rank_backend_benchmark --model-path model --rows 1 100 10000 --parity-rows 100000
+'''
+
+# 標準ライブラリインポート
+import sys
+import time
+import pathlib
+import argparse
+import subprocess
+
+# サードパーティライブラリインポート
+import numpy as np
+
+# プロジェクトライブラリインポート
+from .. import const
+from .. import rank_utils
+from ..rank_model_helper import RankModelHelper
+from ..rank_model_converter import generate_input_data
+from ..rank_numpy_model import NumpyRankModel, NUMPY_MODEL_FILE_NAME
+
+# 計測する件数
+SCALES = [1, 10, 100, 1000, 100000]
+
+# 別プロセスで実行するモデル読込処理(バックエンド毎)
+COLD_START_SCRIPTS = {
+    'keras': 'from C7013.rank_model_helper import RankModelHelper; RankModelHelper().load_models(pathlib.Path(sys.argv[1]))',
+    'numpy': f'from C7013.rank_numpy_model import NumpyRankModel; NumpyRankModel.load(pathlib.Path(sys.argv[1]) / "{NUMPY_MODEL_FILE_NAME}")',
+}
+
+
+def measure(func, repeat: int = 3) -> tuple:
+    '''
+    関数を繰り返し実行し、最短の所要時間と最後の実行結果を返却します。
+    '''
+
+    elapsed = None
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        current = time.perf_counter() - start
+        elapsed = current if elapsed is None else min(elapsed, current)
+
+    return elapsed, result
+
+
+def measure_cold_start(backend: str, model_path: pathlib.PurePath) -> float:
+    '''
+    別プロセスでモジュール読込～モデル読込を実行し、所要時間を返却します。
+    '''
+
+    script = f'import sys, pathlib; {COLD_START_SCRIPTS[backend]}'
+    start = time.perf_counter()
+    subprocess.run([sys.executable, '-c', script, str(model_path)],
+                   cwd=pathlib.Path(__file__).resolve().parents[2], check=True, capture_output=True)
+
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description='ランク判定モデルの推論バックエンドの検証・ベンチマーク')
+    parser.add_argument('--model-path', help='ランク判定モデルのフォルダ(既定値：アプリケーションモデルデータフォルダ)')
+    parser.add_argument('--rows', type=int, nargs='+', default=SCALES, help='予測時間を計測する件数(複数指定可)')
+    parser.add_argument('--parity-rows', type=int, default=100000, help='予測結果を比較する件数')
+    parser.add_argument('--seed', type=int, default=0, help='乱数のシード値')
+    args = parser.parse_args()
+
+    model_path = pathlib.Path(args.model_path) if args.model_path else const.APP_MODEL_PATH
+    batch_size = const.APP_CONFIG['rank_config']['batch_size']
+
+    rank_model_helper = RankModelHelper()
+    rank_model_helper.load_models(model_path)
+    if not (model_path / NUMPY_MODEL_FILE_NAME).exists():
+        rank_model_helper.export_numpy_model(model_path)
+    numpy_model = NumpyRankModel.load(model_path / NUMPY_MODEL_FILE_NAME)
+
+    # 予測結果の比較
+    input_data = generate_input_data(args.parity_rows, args.seed)
+    keras_probabilities = rank_model_helper.predict_probabilities(input_data, batch_size, verbose=0)
+    numpy_probabilities = numpy_model.predict_probabilities(input_data)
+    keras_predict = np.round(keras_probabilities).astype(np.int32)
+    numpy_predict = np.round(numpy_probabilities).astype(np.int32)
+    keras_rank = rank_utils.decide_rank(*[keras_predict[:, index:index + 1] for index in range(5)])
+    numpy_rank = rank_utils.decide_rank(*[numpy_predict[:, index:index + 1] for index in range(5)])
+
+    max_diff = float(np.max(np.abs(keras_probabilities - numpy_probabilities))) if len(input_data) else 0.0
+    rank_mismatches = int((keras_predict != numpy_predict).sum())
+    decision_mismatches = int((keras_rank != numpy_rank).sum())
+
+    print(f'予測結果の比較：{args.parity_rows:,}件')
+    print(f'  予測確率の最大差：{max_diff:.3e}')
+    print(f'  ランク毎の予測結果の不一致：{rank_mismatches}件 判定したランクの不一致：{decision_mismatches}件')
+
+    # 予測時間
+    for rows in args.rows:
+        input_data = generate_input_data(rows, args.seed)
+        keras_elapsed, _ = measure(lambda: rank_model_helper.predict(input_data, batch_size, verbose=0))
+        numpy_elapsed, _ = measure(lambda: numpy_model.predict(input_data))
+
+        print(f'件数：{rows:>10,}件')
+        print(f'  keras ：{keras_elapsed * 1000:10.2f}ミリ秒')
+        print(f'  numpy ：{numpy_elapsed * 1000:10.2f}ミリ秒 高速化：{keras_elapsed / numpy_elapsed:.1f}倍')
+
+    # 起動時間
+    for backend in COLD_START_SCRIPTS:
+        print(f'起動時間({backend})：{measure_cold_start(backend, model_path):.3f}秒')
+
+    sys.exit(1 if decision_mismatches else 0)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,237 @@
+'''
+ランク判定・One-Hotエンコードの配列処理の検証・ベンチマーク
+
+従来の要素毎の処理(ループ、辞書の走査)と、ルックアップテーブル・argmaxによる配列処理の結果が一致することを検証する。
+    ・decide_rank：ランク毎の予測結果の全組合せ(0/1、0/1以外の値を含む)
+    ・ランクのエンコード・デコード：全てのランク(0/100/200/300/400/500)、存在しない値、欠損値、数値以外
+    ・当初注文内容のエンコード・デコード：全ての当初注文内容、存在しない値、欠損値、数値以外
+    ・デコード：全てのOne-Hot、全て0、複数が1、0/1以外の値を含む行
+    ・説明変数作成(input_data_transform)、目的変数作成(target_data_transform)：ランダムに生成した入力
+検証後、件数の規模毎に従来の処理と配列処理の所要時間を出力する。
+
+実行例:
+    python -m C7013.benchmark.rank_encoder_benchmark
+    python -m C7013.benchmark.rank_encoder_benchmark --rows 10000 1000000 --seed 1
+'''
+
+# 標準ライブラリインポート
+import sys
+import time
+import argparse
+import itertools
+
+# サードパーティライブラリインポート
+import numpy as np
+import pandas as pd
+
+# プロジェクトライブラリインポート
+from .. import onehot_utils
+from .. import rank_utils
+from ..rank_utils import RankFlagMatrix, rank_dict, rank_flag_columns
+
+# 計測する件数の規模
+SCALES = [100000]
+
+# 検証するランク(存在しない値、欠損値を含む)
+RANK_VALUES = list(rank_dict.values()) + [150, -100, 600, 100.0, 100.5, np.nan]
+
+# 検証する当初注文内容(存在しない値、欠損値を含む)
+ORDERCONTENTS_VALUES = list(rank_utils.ordercontents_dict.values()) + [0, 3, 5, 16, 99, -1, 4.0, 4.5, np.nan]
+
+# 検証する数値以外の値
+OBJECT_VALUES = [None, '1', 'A', True]
+
+
+def decide_rank_loop(rank_a_predict: np.array, rank_b_predict: np.array, rank_c_predict: np.array, rank_d_predict: np.array,
+                     rank_bar_predict: np.array) -> np.array:
+    '''
+    従来の行毎のランク判定(正解値の算出用)
+    '''
+
+    result = np.zeros(len(rank_a_predict), dtype=np.int32)
+    for idx in range(len(rank_a_predict)):
+        if rank_a_predict[idx][0] == 1:
+            result[idx] = rank_dict['A']
+        elif rank_b_predict[idx][0] == 1:
+            result[idx] = rank_dict['B']
+        elif rank_c_predict[idx][0] == 1:
+            result[idx] = rank_dict['C']
+        elif rank_d_predict[idx][0] == 1:
+            result[idx] = rank_dict['D']
+        elif rank_bar_predict[idx][0] == 1:
+            result[idx] = rank_dict['-']
+        else:
+            result[idx] = rank_dict['X']
+
+    return result
+
+
+def encode_loop(values, onehot_dict: dict, onehot_zero: np.ndarray) -> np.ndarray:
+    '''
+    従来の要素毎のOne-Hotエンコード(正解値の算出用)
+    '''
+
+    result = np.zeros((len(values), len(onehot_zero)), dtype=np.int32)
+    for idx, value in enumerate(values):
+        result[idx] = onehot_dict[value] if value in onehot_dict.keys() else onehot_zero
+
+    return result
+
+
+def decode_loop(one_hot: np.ndarray, onehot_dict: dict) -> np.ndarray:
+    '''
+    従来の辞書を走査するOne-Hotデコード(正解値の算出用)
+    '''
+
+    result = np.zeros(len(one_hot), dtype=np.int64)
+    for idx, row in enumerate(one_hot):
+        for key, value in onehot_dict.items():
+            if np.all(value == row):
+                result[idx] = key
+                break
+
+    return result
+
+
+def decode_cases(width: int) -> np.ndarray:
+    '''
+    デコードの検証用のOne-Hot(全てのOne-Hot、全て0、複数が1、0/1以外の値を含む行)を作成します。
+    '''
+
+    rows = [np.zeros(width)] + list(np.eye(width))
+    rows += [np.eye(width)[0] + np.eye(width)[-1], np.ones(width), np.eye(width)[1] * 2, np.eye(width)[2] - np.eye(width)[3],
+             np.eye(width)[0] * 0.5]
+
+    return np.array(rows)
+
+
+def count_mismatches(expected: np.ndarray, actual: np.ndarray) -> int:
+    '''
+    値が一致しない要素の件数を返却します。
+    '''
+
+    if np.shape(expected) != np.shape(actual):
+        return max(len(expected), len(actual), 1)
+
+    return int((np.asarray(expected) != np.asarray(actual)).sum())
+
+
+def verify(rng: np.random.Generator) -> dict:
+    '''
+    従来の処理と配列処理の結果を比較し、検証項目毎の不一致件数を返却します。
+    '''
+
+    mismatches = {}
+
+    # ランク毎の予測結果の全組合せ(0/1以外の値を含む)
+    predicts = np.array(list(itertools.product([0, 1, 2, -1], repeat=5)), dtype=np.int32)
+    columns = [predicts[:, index:index + 1] for index in range(5)]
+    mismatches['decide_rank'] = count_mismatches(decide_rank_loop(*columns), rank_utils.decide_rank(*columns))
+    empty = [predicts[:0, index:index + 1] for index in range(5)]
+    mismatches['decide_rank(0件)'] = count_mismatches(decide_rank_loop(*empty), rank_utils.decide_rank(*empty))
+
+    # エンコード(数値の配列、数値以外を含む配列)
+    for name, values, onehot_dict, onehot_zero, encode_array in [
+            ('ランク', RANK_VALUES, onehot_utils.rank_onehot_dict, onehot_utils.rank_onehot_zero,
+             onehot_utils.rank_one_hot_encode_array),
+            ('当初注文内容', ORDERCONTENTS_VALUES, onehot_utils.ordercontents_onehot_dict, onehot_utils.ordercontents_onehot_zero,
+             onehot_utils.ordercontents_one_hot_encode_array)]:
+        numeric_values = np.array(values, dtype=np.float64)
+        int_values = np.array([value for value in values if isinstance(value, int)], dtype=np.int64)
+        object_values = np.array(values + OBJECT_VALUES, dtype=object)
+        mismatches[f'{name}のエンコード(float)'] = count_mismatches(
+            encode_loop(numeric_values, onehot_dict, onehot_zero), encode_array(numeric_values))
+        mismatches[f'{name}のエンコード(int)'] = count_mismatches(
+            encode_loop(int_values, onehot_dict, onehot_zero), encode_array(int_values))
+        mismatches[f'{name}のエンコード(object)'] = count_mismatches(
+            encode_loop(object_values, onehot_dict, onehot_zero), encode_array(object_values))
+
+    # デコード
+    for name, onehot_dict, onehot_zero, decode, decode_array in [
+            ('ランク', onehot_utils.rank_onehot_dict, onehot_utils.rank_onehot_zero,
+             onehot_utils.rank_one_hot_decode, onehot_utils.rank_one_hot_decode_array),
+            ('当初注文内容', onehot_utils.ordercontents_onehot_dict, onehot_utils.ordercontents_onehot_zero,
+             onehot_utils.ordercontents_one_hot_decode, onehot_utils.ordercontents_one_hot_decode_array)]:
+        cases = decode_cases(len(onehot_zero))
+        expected = decode_loop(cases, onehot_dict)
+        mismatches[f'{name}のデコード'] = count_mismatches(expected, decode_array(cases))
+        mismatches[f'{name}のデコード(要素毎)'] = count_mismatches(expected, np.array([decode(row) for row in cases]))
+        # エンコード→デコードで元の値に戻ること
+        keys = np.array(list(onehot_dict.keys()))
+        mismatches[f'{name}のエンコード→デコード'] = count_mismatches(keys, decode_array(encode_loop(keys, onehot_dict, onehot_zero)))
+
+    # 説明変数作成・目的変数作成
+    rows = 1000
+    input_data = pd.DataFrame({
+        'ordercontents': rng.choice(np.array(ORDERCONTENTS_VALUES, dtype=np.float64), size=rows),
+        'rank_system': rng.choice(np.array(RANK_VALUES, dtype=np.float64), size=rows),
+    })
+    rank_flags = RankFlagMatrix(rng.random((rows, len(rank_flag_columns))) < 0.1)
+    expected_input = np.concatenate((encode_loop(input_data['ordercontents'].values, onehot_utils.ordercontents_onehot_dict,
+                                                 onehot_utils.ordercontents_onehot_zero), rank_flags.values), axis=1)
+    actual_input = rank_utils.input_data_transform(input_data, rank_flags)
+    mismatches['説明変数作成'] = count_mismatches(expected_input, actual_input) + int(actual_input.dtype != expected_input.dtype)
+    mismatches['目的変数作成'] = count_mismatches(
+        encode_loop(input_data['rank_system'].values, onehot_utils.rank_onehot_dict, onehot_utils.rank_onehot_zero),
+        rank_utils.target_data_transform(input_data))
+
+    return mismatches
+
+
+def measure(func, repeat: int = 3) -> float:
+    '''
+    関数を繰り返し実行し、最短の所要時間を返却します。
+    '''
+
+    elapsed = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        current = time.perf_counter() - start
+        elapsed = current if elapsed is None else min(elapsed, current)
+
+    return elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description='ランク判定・One-Hotエンコードの配列処理の検証・ベンチマーク')
+    parser.add_argument('--rows', type=int, nargs='+', default=SCALES, help='所要時間を計測する件数(複数指定可)')
+    parser.add_argument('--seed', type=int, default=0, help='乱数のシード値')
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(args.seed)
+
+    mismatches = verify(rng)
+    for name, mismatch in mismatches.items():
+        print(f'{name}の不一致：{mismatch}件')
+    has_mismatch = any(mismatches.values())
+
+    for rows in args.rows:
+        predicts = rng.integers(0, 2, size=(rows, 5)).astype(np.int32)
+        columns = [predicts[:, index:index + 1] for index in range(5)]
+        ordercontents = rng.choice(list(rank_utils.ordercontents_dict.values()), size=rows)
+        ranks = rng.choice(list(rank_dict.values()), size=rows)
+        rank_one_hot = onehot_utils.rank_one_hot_encode_array(ranks)
+
+        results = [
+            ('ランク判定        ', lambda: decide_rank_loop(*columns), lambda: rank_utils.decide_rank(*columns)),
+            ('当初注文内容エンコード', lambda: encode_loop(ordercontents, onehot_utils.ordercontents_onehot_dict,
+                                                      onehot_utils.ordercontents_onehot_zero),
+             lambda: onehot_utils.ordercontents_one_hot_encode_array(ordercontents)),
+            ('ランクエンコード    ', lambda: encode_loop(ranks, onehot_utils.rank_onehot_dict, onehot_utils.rank_onehot_zero),
+             lambda: onehot_utils.rank_one_hot_encode_array(ranks)),
+            ('ランクデコード      ', lambda: decode_loop(rank_one_hot, onehot_utils.rank_onehot_dict),
+             lambda: onehot_utils.rank_one_hot_decode_array(rank_one_hot)),
+        ]
+
+        print(f'件数：{rows:>10,}件')
+        for name, loop_func, array_func in results:
+            loop_elapsed = measure(loop_func, repeat=1)
+            array_elapsed = measure(array_func)
+            print(f'  {name}：従来 {loop_elapsed:8.3f}秒  配列処理 {array_elapsed:8.4f}秒  高速化：{loop_elapsed / array_elapsed:.1f}倍')
+
+    sys.exit(1 if has_mismatch else 0)
+
+
+if __name__ == '__main__':
+    main()
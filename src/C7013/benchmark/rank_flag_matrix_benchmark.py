@@ -0,0 +1,168 @@
+'''
+ランク判定用フラグ行列(rank_utils.RankFlagMatrix)のメモリ・処理時間比較ベンチマーク
+
+件数の規模毎に合成したランク判定用フラグ(71個)に対して、以下を比較する。
+    ・メモリ：DataFrameの列毎のint64(従来)、uint8行列、ビット圧縮(1行9バイト)
+    ・フラグ算出：DataFrameに列毎に追加してintに変換する方式(従来)と、フラグ行列に算出してまとめて追加する方式
+    ・説明変数作成(input_data_transform)：DataFrameの列から作成する方式(従来)と、フラグ行列から作成する方式
+    ・全フラグクリア：DataFrameの列への代入と、フラグ行列への代入
+各方式の結果(フラグ値、説明変数、ビット圧縮からの復元)が一致することも確認する。
+
+実行例:
+    python -m C7013.benchmark.rank_flag_matrix_benchmark
+    python -m C7013.benchmark.rank_flag_matrix_benchmark --rows 10000 100000 --density 0.1
+'''
+
+# 標準ライブラリインポート
+import sys
+import time
+import argparse
+
+# サードパーティライブラリインポート
+import numpy as np
+import pandas as pd
+
+# プロジェクトライブラリインポート
+from .. import rank_utils
+from ..rank_utils import RankFlagMatrix, rank_flag_columns
+
+# 計測する件数の規模
+SCALES = [100000]
+
+# 当初注文内容のピックリスト値(該当なしの値を含む)
+ORDERCONTENTS_VALUES = [1, 2, 4, 7, 8, 9, 10, 11, 12, 13, 14, 15, 0]
+
+
+def generate_flags(rows: int, density: float, seed: int = 0) -> tuple:
+    '''
+    ランク判定用フラグの算出結果(フラグ毎のbool配列)と当初注文内容を生成します。
+
+    Args:
+        rows: 件数
+        density: フラグが1となる割合
+        seed: 乱数のシード値
+    Returns:
+        ({フラグ名: bool配列}, 当初注文内容の配列)
+    '''
+
+    rng = np.random.default_rng(seed)
+    flags = {column: rng.random(rows) < density for column in rank_flag_columns}
+    ordercontents = rng.choice(ORDERCONTENTS_VALUES, size=rows)
+
+    return flags, ordercontents
+
+
+def add_flags_by_column(df: pd.DataFrame, flags: dict) -> None:
+    '''
+    従来のフラグ算出結果の追加(列毎に追加してintに変換する)
+    '''
+
+    for column, values in flags.items():
+        df[column] = False
+        df[column] = df[column] | pd.Series(values, index=df.index)
+        df[column] *= 1
+
+
+def add_flags_by_matrix(df: pd.DataFrame, flags: dict) -> RankFlagMatrix:
+    '''
+    フラグ行列に算出してからまとめて追加する
+    '''
+
+    rank_flags = RankFlagMatrix.zeros(len(df))
+    for column, values in flags.items():
+        rank_flags[column] = values
+    rank_flags.assign_to(df)
+
+    return rank_flags
+
+
+def measure(func, repeat: int = 3) -> tuple:
+    '''
+    関数を繰り返し実行し、最短の所要時間と最後の実行結果を返却します。
+    '''
+
+    elapsed = None
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        current = time.perf_counter() - start
+        elapsed = current if elapsed is None else min(elapsed, current)
+
+    return elapsed, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description='ランク判定用フラグ行列のメモリ・処理時間比較ベンチマーク')
+    parser.add_argument('--rows', type=int, nargs='+', default=SCALES, help='件数(複数指定可)')
+    parser.add_argument('--density', type=float, default=0.05, help='フラグが1となる割合')
+    parser.add_argument('--seed', type=int, default=0, help='乱数のシード値')
+    args = parser.parse_args()
+
+    has_mismatch = False
+    for rows in args.rows:
+        flags, ordercontents = generate_flags(rows, args.density, args.seed)
+
+        def column_frame():
+            df = pd.DataFrame({'ordercontents': ordercontents})
+            add_flags_by_column(df, flags)
+            return df
+
+        def matrix_frame():
+            df = pd.DataFrame({'ordercontents': ordercontents})
+            return df, add_flags_by_matrix(df, flags)
+
+        column_add_elapsed, column_df = measure(column_frame)
+        matrix_add_elapsed, (matrix_df, rank_flags) = measure(matrix_frame)
+
+        # メモリ
+        column_bytes = int(column_df[rank_flag_columns].memory_usage(index=False).sum())
+        packed = rank_flags.pack()
+
+        # 説明変数作成
+        column_transform_elapsed, column_input = measure(lambda: rank_utils.input_data_transform(column_df))
+        matrix_transform_elapsed, matrix_input = measure(lambda: rank_utils.input_data_transform(matrix_df, rank_flags))
+
+        # 全フラグクリア(全体の1割の行)
+        targets = np.arange(0, rows, 10)
+
+        def clear_column():
+            df = column_df.copy()
+            start = time.perf_counter()
+            df.loc[df.index[targets], rank_flag_columns] = 0
+            return time.perf_counter() - start
+
+        def clear_matrix():
+            matrix = rank_flags.copy()
+            start = time.perf_counter()
+            matrix.values[targets, :] = 0
+            return time.perf_counter() - start
+
+        column_clear_elapsed = min(clear_column() for _ in range(3))
+        matrix_clear_elapsed = min(clear_matrix() for _ in range(3))
+
+        mismatches = {
+            'フラグ値': int((column_df[rank_flag_columns].to_numpy() != matrix_df[rank_flag_columns].to_numpy()).sum()),
+            '説明変数': int((column_input != matrix_input).sum()),
+            'ビット圧縮からの復元': int((RankFlagMatrix.unpack(packed).values != rank_flags.values).sum()),
+            '列順': int(list(column_df.columns) != list(matrix_df.columns)),
+        }
+        has_mismatch = has_mismatch or any(mismatches.values())
+
+        print(f'件数：{rows:>10,}件 (フラグが1となる割合：{args.density})')
+        print(f'  メモリ      ：int64列 {column_bytes / 1024 ** 2:8.2f}MB  uint8行列 {rank_flags.nbytes / 1024 ** 2:8.2f}MB'
+              f'  ビット圧縮 {packed.nbytes / 1024 ** 2:8.2f}MB')
+        print(f'  フラグ算出  ：列毎 {column_add_elapsed:8.3f}秒  フラグ行列 {matrix_add_elapsed:8.3f}秒'
+              f'  高速化：{column_add_elapsed / matrix_add_elapsed:.1f}倍')
+        print(f'  説明変数作成：列   {column_transform_elapsed:8.3f}秒  フラグ行列 {matrix_transform_elapsed:8.3f}秒'
+              f'  高速化：{column_transform_elapsed / matrix_transform_elapsed:.1f}倍')
+        print(f'  全フラグクリア：列 {column_clear_elapsed:8.4f}秒  フラグ行列 {matrix_clear_elapsed:8.4f}秒'
+              f'  高速化：{column_clear_elapsed / matrix_clear_elapsed:.1f}倍')
+        for name, mismatch in mismatches.items():
+            print(f'  {name}の不一致：{mismatch}件')
+
+    sys.exit(1 if has_mismatch else 0)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,473 @@
+'''
+自動差配処理のスループット計測用の合成データ生成
+
+オフライン用DB(C7013.offline)に自動差配対象の取次(new_commission)と、
+自動差配で参照する部署・自動差配設定・担当エリア・通常差配・顧客事業所等を生成する。
+取次の新設置場所は住所コードマスタの住所、取次内容はキーワード設定ファイルのキーワードを含む文章とし、
+同じシード値・件数に対して同じデータを生成する。
+
+住所コードマスタは以下の優先順で使用する。
+    1. --addresscode-file で指定した住所コードCSV(C7013_04_addresscode_retrive_all_taskの出力)
+    2. オフライン用DBに登録済の住所コード(new_addresscode)
+    3. 組込みのサンプル住所
+
+実行例:
+    python -m C7013.benchmark.synthetic_data_generator --rows 10000
+    python -m C7013.benchmark.synthetic_data_generator --rows 100000 --addresscode-file addresscode.csv
+'''
+
+# 標準ライブラリインポート
+import re
+import uuid
+import random
+import argparse
+import datetime
+
+# サードパーティライブラリインポート
+import json5
+import pandas as pd
+
+# プロジェクトライブラリインポート
+from .. import const
+from ..offline import tsql
+from ..offline import injector
+from ..offline.config import get_offline_config
+from ..offline.crmdb_dao import CRMDB_TABLES, RANK_SUFFIXES
+from ..offline.nwmdb_dao import NWMDB_TABLES
+from ..offline.fastsearch_helper import FASTSEARCH_TABLES
+
+# 生成件数の規模
+SCALES = [1000, 10000, 100000]
+
+# 組込みのサンプル住所(住所コード, 都道府県, 市区町村, 大字通称, 字丁目, 郵便番号)
+SAMPLE_ADDRESSES = [
+    ('13104001002', '東京都', '新宿区', '西新宿', '二丁目', '1600023'),
+    ('13104002001', '東京都', '新宿区', '歌舞伎町', '一丁目', '1600021'),
+    ('13101003001', '東京都', '千代田区', '大手町', '一丁目', '1000004'),
+    ('13113004003', '東京都', '渋谷区', '道玄坂', '二丁目', '1500043'),
+    ('13109005002', '東京都', '品川区', '大崎', '一丁目', '1410032'),
+    ('14103001001', '神奈川県', '横浜市西区', 'みなとみらい', '三丁目', '2200012'),
+    ('14131002002', '神奈川県', '川崎市川崎区', '駅前本町', '', '2100007'),
+    ('11101001004', '埼玉県', 'さいたま市西区', '指扇', '', '3310047'),
+    ('11103002001', '埼玉県', 'さいたま市大宮区', '桜木町', '一丁目', '3300854'),
+    ('12101001002', '千葉県', '千葉市中央区', '中央', '二丁目', '2600013'),
+    ('12204002001', '千葉県', '船橋市', '本町', '一丁目', '2730005'),
+    ('04101001003', '宮城県', '仙台市青葉区', '一番町', '三丁目', '9800811'),
+    ('01101002001', '北海道', '札幌市中央区', '北一条西', '二丁目', '0600001'),
+    ('15101001001', '新潟県', '新潟市北区', '嘉山', '', '9503321'),
+    ('20201003002', '長野県', '長野市', '大字南長野', '', '3800836'),
+    ('07201001001', '福島県', '福島市', '杉妻町', '', '9608670'),
+]
+
+# キーワード設定ファイルが存在しない場合の取次内容の語句
+SAMPLE_CONTENTS_PHRASES = [
+    'フレッツ光の新設を希望', 'ひかり電話を追加したい', 'ビジネスホンの入替を検討中', 'オフィス移転に伴う回線工事',
+    'Wi-Fi環境を整備したい', 'セキュリティ対策の相談', 'UTM導入の見積依頼', 'クラウドPBXに興味あり',
+    '複合機のリース更新', '店舗の開業準備', '光回線の速度改善', 'テレワーク環境の構築',
+]
+
+# 取次内容の定型文
+CONTENTS_TEMPLATES = [
+    '{0}。平日の日中に連絡希望。',
+    'お客様より{0}との申出あり。{1}についても相談したいとのこと。',
+    '{0}。担当者不在時は折り返し連絡。',
+    '【至急】{0}。{1}。',
+]
+
+# お客様名の語句
+CUSTOMER_NAME_PREFIXES = ['株式会社', '有限会社', '合同会社', '']
+CUSTOMER_NAME_WORDS = ['東日本', '光', '青葉', '桜', '富士', '日の出', '北斗', '若葉', '大和', '朝日', '緑川', '松本']
+CUSTOMER_NAME_SUFFIXES = ['商事', '工業', '建設', '不動産', '物産', '歯科医院', '会計事務所', 'クリニック', '食堂', '運輸']
+
+# 担当者名の姓・名
+PERSON_FAMILY_NAMES = ['佐藤', '鈴木', '高橋', '田中', '伊藤', '渡辺', '山本', '中村', '小林', '加藤']
+PERSON_GIVEN_NAMES = ['太郎', '花子', '一郎', '陽子', '健', '美咲', '大輔', '直美', '翔太', '由美']
+
+# 取次元会社
+SOURCE_COMPANIES = ['NTT東日本', 'NTTビジネスソリューションズ', 'NTT-ME', '販売代理店']
+
+# 自動差配対象外キーワード
+UNTARGETED_KEYWORDS = ['解約希望', 'クレーム']
+
+# 施策キーワード(キーワード, 施策語)
+POLICY_KEYWORDS = [('光回線', '光'), ('ひかり電話', '電話')]
+
+# 特定ベンダ
+SPECIFIC_VENDORS = ['特定ベンダ販売店', '特定ベンダ代理店']
+
+# 正規表現の記号を含むキーワード(取次内容に含めない)
+_REGEX_META_PATTERN = re.compile(r'[\\.^$*+?{}\[\]|()]')
+
+# 取次の更新日時の開始日時
+_MODIFIEDON_START = datetime.datetime(2024, 4, 1, 0, 0, 0)
+
+
+def load_address_master(conn, addresscode_file_path=None) -> pd.DataFrame:
+    '''
+    住所コードマスタを取得します。
+
+    Args:
+        conn: オフライン用DB接続
+        addresscode_file_path: 住所コードCSVファイルパス
+    Returns:
+        住所コードマスタ(addr_cd, addr_nm, tdfkn_nm, scyosn_nm, oaza_tshum_nm, azchm_nm, zip_cd)
+    '''
+
+    columns = ['addr_cd', 'addr_nm', 'tdfkn_nm', 'scyosn_nm', 'oaza_tshum_nm', 'azchm_nm', 'zip_cd']
+
+    if addresscode_file_path is not None:
+        addresses = pd.read_csv(addresscode_file_path, sep=',', encoding='utf-8', dtype=str, usecols=columns)
+    else:
+        addresses = pd.read_sql_query(
+            '''
+            SELECT
+              new_new_addressname AS addr_cd, new_addresscode AS addr_nm, new_prefecturename AS tdfkn_nm,
+              new_municipalityname AS scyosn_nm, new_largersectionalias AS oaza_tshum_nm,
+              new_sectioncityblock AS azchm_nm, new_zipcode AS zip_cd
+            FROM new_addresscode
+            WHERE LENGTH(new_new_addressname) = 11 AND new_new_addressname <> 'JTD00000000'
+            ''', con=conn)
+        if len(addresses) == 0:
+            addresses = pd.DataFrame(
+                [(code, tdfkn + scyosn + oaza + azchm, tdfkn, scyosn, oaza, azchm, zip_cd)
+                 for code, tdfkn, scyosn, oaza, azchm, zip_cd in SAMPLE_ADDRESSES],
+                columns=columns)
+
+    return addresses.fillna('').reset_index(drop=True)
+
+
+def load_contents_phrases() -> list:
+    '''
+    キーワード設定ファイル(keyword_NN.txt)から取次内容に含めるキーワードを取得します。
+    正規表現の記号を含むキーワードは除外し、ファイルが存在しない場合は組込みの語句を返却します。
+    '''
+
+    phrases = []
+    for file_path in sorted(const.APP_KEYWORD_FILE_PATH.glob('keyword_*.txt')) if const.APP_KEYWORD_FILE_PATH.exists() else []:
+        with open(file_path, 'r', encoding='utf-8') as f:
+            phrases.extend(line.strip() for line in f if line.strip() and not _REGEX_META_PATTERN.search(line.strip()))
+
+    return phrases or list(SAMPLE_CONTENTS_PHRASES)
+
+
+def load_commission_classes() -> list:
+    '''
+    自動差配対象取次区分設定(autoagent_object_class.json)から取次区分を取得します。
+    '''
+
+    file_path = const.APP_CONFIG_PATH / 'autoagent_object_class.json'
+    if not file_path.exists():
+        return [1]
+
+    with open(file_path, 'r', encoding='utf-8') as f:
+        json_file = json5.load(f)
+
+    classes = [item.get('class') for item in json_file.get('autoagent_object_class', [])]
+
+    return [item for item in classes if item is not None] or [1]
+
+
+class SyntheticDataGenerator(object):
+    '''
+    自動差配処理の合成データ生成クラス
+    '''
+
+    def __init__(self, seed: int = 0, autoagent_count: int = 4, normal_agent_count: int = 4):
+        '''
+        Args:
+            seed: 乱数のシード値
+            autoagent_count: 自動差配設定数
+            normal_agent_count: 自動差配設定毎の通常差配ユニット数
+        '''
+        self._random = random.Random(seed)
+        self._autoagent_count = autoagent_count
+        self._normal_agent_count = normal_agent_count
+        # 生成データ({テーブル名: [行]})
+        self._rows: dict = {}
+
+    def _guid(self) -> str:
+        '''
+        シード値から決まるGUIDを生成します。
+        '''
+        return str(uuid.UUID(int=self._random.getrandbits(128), version=4))
+
+    def _add(self, table_name: str, **values) -> dict:
+        '''
+        生成データに行を追加します。
+        '''
+        self._rows.setdefault(table_name, []).append(values)
+        return values
+
+    def _businessunit(self, busho_code: str) -> str:
+        '''
+        部署を追加し、部署GUIDを返却します。
+        '''
+        return self._add('businessunit', businessunitid=self._guid(), new_busho_code=busho_code)['businessunitid']
+
+    def _telephonenumber(self, area_code: str) -> str:
+        '''
+        ハイフン付の電話番号を生成します。
+        '''
+        return f'{area_code}-{self._random.randint(1000, 9999)}-{self._random.randint(1000, 9999)}'
+
+    def _person_name(self) -> str:
+        '''
+        担当者名を生成します。
+        '''
+        return self._random.choice(PERSON_FAMILY_NAMES) + ' ' + self._random.choice(PERSON_GIVEN_NAMES)
+
+    def _generate_organizations(self, prefecture_codes: list) -> list:
+        '''
+        自動差配設定毎に部署、自動差配設定、担当エリア、通常差配等を生成します。
+
+        Args:
+            prefecture_codes: 担当エリアとする都道府県コード一覧
+        Returns:
+            自動差配設定一覧
+        '''
+
+        company_code = '101'
+        company_guid = self._businessunit(company_code + '000000000')
+        autoagents = []
+
+        for num in range(1, self._autoagent_count + 1):
+            division_code = company_code + f'{num:03d}'
+            division_guid = self._businessunit(division_code + '000000')
+            section_code = division_code + '001'
+            section_guid = self._businessunit(section_code + '000')
+            # 自動差配ユニット、差配担当窓口ユニット、通常差配ユニット
+            unit_guids = [self._businessunit(section_code + f'{unit:03d}') for unit in range(1, self._normal_agent_count + 3)]
+
+            autoagent_guid = self._add('new_autoagent', new_autoagentid=self._guid(), new_autoagent_unit=unit_guids[0],
+                                       new_agent_window_unit=unit_guids[1], statecode=0)['new_autoagentid']
+
+            # 担当エリアは都道府県単位で自動差配設定に割り当てる
+            handle_prefecture_codes = prefecture_codes[num - 1::self._autoagent_count] or prefecture_codes
+            thru_brnc_guid = self._add(
+                'new_autoagent_thru_brnc_commission', new_autoagent_thru_brnc_commissionid=self._guid(), new_autoagent=autoagent_guid,
+                new_unit=unit_guids[1], statecode=0,
+                **{f'new_rank_{kind}_{suffix}': int(kind == 'account') for kind in ('account', 'appoint', 'priority') for suffix in RANK_SUFFIXES},
+            )['new_autoagent_thru_brnc_commissionid']
+            for prefecture_code in handle_prefecture_codes:
+                self._add('new_autoagent_handle_area', new_autoagent_thru_brnc_commission=thru_brnc_guid,
+                          new_addresscode=prefecture_code + '000000000', statecode=0)
+            self._add('new_autoagent_branch_account', new_autoagent_branch_accountid=self._guid(),
+                      new_autoagent_thru_brnc_commission=thru_brnc_guid, new_section=section_guid, statecode=0)
+
+            for index, unit_guid in enumerate(unit_guids[2:]):
+                self._add('new_autoagent_normal_agent', new_autoagent=autoagent_guid, new_unit=unit_guid,
+                          new_third_person_application=int(index == 0), new_colab_line=int(index == 1),
+                          new_agentrate_instant=float(index + 1), new_agentrate_instant_a=float(index + 1), statecode=0,
+                          **{f'new_rank_normal_{suffix}': 1 for suffix in RANK_SUFFIXES})
+
+            for keyword in UNTARGETED_KEYWORDS:
+                self._add('new_autoagent_untargeted_keyword', new_autoagent=autoagent_guid, new_autoagent_untargeted_keyword=keyword, statecode=0)
+            for keyword, policy_word in POLICY_KEYWORDS:
+                self._add('new_autoagent_policy_keyword', new_autoagent=autoagent_guid, new_autoagent_policy_keyword=keyword,
+                          new_policy_word=policy_word, statecode=0)
+            for vendor in SPECIFIC_VENDORS:
+                self._add('new_autoagent_specific_vendor', new_autoagent=autoagent_guid, new_autoagent_specific_vendor=vendor, statecode=0)
+
+            # BI本部、支店BIアカウントの差配対象となるアカウント担当者
+            accountperson_guids = [self._add('systemuser', systemuserid=self._guid(), new_section=section_guid)['systemuserid'] for _ in range(3)]
+
+            autoagents.append({
+                'autoagent_guid': autoagent_guid,
+                'company_guid': company_guid,
+                'division_guid': division_guid,
+                'section_guid': section_guid,
+                'unit_guid': unit_guids[0],
+                'prefecture_codes': set(handle_prefecture_codes),
+                'accountperson_guids': accountperson_guids,
+            })
+
+        self._add('team', teamid=self._guid(), name='全国公開')
+
+        return autoagents
+
+    def _generate_customers(self, addresses: pd.DataFrame, autoagents: list, count: int) -> list:
+        '''
+        顧客事業所と、電話番号・契約ID・FastSearchの検索対象を生成します。
+
+        Args:
+            addresses: 住所コードマスタ
+            autoagents: 自動差配設定一覧
+            count: 顧客事業所数
+        Returns:
+            顧客事業所一覧
+        '''
+
+        address_records = addresses.to_dict(orient='records')
+        customers = []
+
+        for num in range(1, count + 1):
+            address = self._random.choice(address_records)
+            customerid = f'{num:010d}'
+            customername = self._random.choice(CUSTOMER_NAME_PREFIXES) + self._random.choice(CUSTOMER_NAME_WORDS) \
+                + self._random.choice(CUSTOMER_NAME_SUFFIXES)
+            telephonenumber = self._telephonenumber(f'0{self._random.randint(3, 99)}')
+            contract_id = f'CAF{num:010d}'
+            autoagent = next((item for item in autoagents if address['addr_cd'][:2] in item['prefecture_codes']), autoagents[0])
+
+            account_guid = self._guid()
+            # 一部の顧客事業所はアカウント担当者未設定とする
+            accountperson_guid = self._random.choice(autoagent['accountperson_guids']) if self._random.random() < 0.9 else None
+            self._add('Account', AccountId=account_guid, new_accountpersonincharge=accountperson_guid,
+                      new_accountpersoninchargeName=self._person_name() if accountperson_guid else None,
+                      new_customerid_accountaddresscode=customerid + address['addr_cd'], StateCode=0)
+            self._add('new_telephonenumber', new_account=account_guid, new_telephonenumberhynophenate=telephonenumber.replace('-', ''), statecode=0)
+            self._add('LIST_SRCH_NO', SRCH_KEY_KBN=3, NO_CLAS_CD=4, VARI_NO=contract_id, CUST_ID=customerid, SETLOC_ADDR_CD=address['addr_cd'])
+            self._add('fastsearch_account', customerid=customerid, customername=customername, customernamesort=customername,
+                      accountaddresscode=address['addr_cd'], accountaddress=address['addr_nm'])
+
+            customers.append({
+                'customername': customername,
+                'address': address,
+                'telephonenumber': telephonenumber,
+                'contract_id': contract_id,
+            })
+
+        return customers
+
+    def _contents_commission(self, phrases: list) -> str:
+        '''
+        キーワードを含む取次内容を生成します。
+        '''
+
+        contents = self._random.choice(CONTENTS_TEMPLATES).format(self._random.choice(phrases), self._random.choice(phrases))
+        if self._random.random() < 0.03:
+            contents += self._random.choice(UNTARGETED_KEYWORDS) + 'の可能性あり。'
+
+        return contents
+
+    def _generate_commissions(self, customers: list, autoagents: list, rows: int, phrases: list, commission_classes: list) -> None:
+        '''
+        自動差配対象の取次を生成します。
+
+        Args:
+            customers: 顧客事業所一覧
+            autoagents: 自動差配設定一覧
+            rows: 取次件数
+            phrases: 取次内容に含めるキーワード
+            commission_classes: 自動差配対象取次区分
+        '''
+
+        ordercontents_list = [1, 1, 1, 2, 4, 7, 8, 9, 10, 11, 12, 13, 14, 15]
+
+        for num in range(rows):
+            customer = self._random.choice(customers)
+            address = customer['address']
+            # 大半は担当エリア内の自動差配設定に取り次ぐ
+            autoagent = next((item for item in autoagents if address['addr_cd'][:2] in item['prefecture_codes']), None)
+            if autoagent is None or self._random.random() < 0.05:
+                autoagent = self._random.choice(autoagents)
+
+            self._add(
+                'new_commission',
+                new_commissionid=self._guid(),
+                new_comprehensivecompany_to=autoagent['company_guid'],
+                new_division_to=autoagent['division_guid'],
+                new_section_to=autoagent['section_guid'],
+                new_unit_to=autoagent['unit_guid'],
+                # 一部は自動差配対象外の取次区分とする
+                new_commissionclassification=self._random.choice(commission_classes) if self._random.random() < 0.95 else 999,
+                new_sourcecompany=self._random.choice(SPECIFIC_VENDORS) if self._random.random() < 0.05 else self._random.choice(SOURCE_COMPANIES),
+                # 一部は契約者名未設定とする
+                new_contractorname=customer['customername'] if self._random.random() < 0.98 else None,
+                new_next_account=address['addr_nm'] + f'{self._random.randint(1, 30)}-{self._random.randint(1, 20)}',
+                new_third_person_application=int(self._random.random() < 0.05),
+                new_ordertelephonenumber=customer['telephonenumber'],
+                new_contract_id=customer['contract_id'] if self._random.random() < 0.5 else None,
+                new_colab_line=int(self._random.random() < 0.05),
+                new_contents_commission=self._contents_commission(phrases),
+                new_primarycorrespondenceway=self._random.randint(1, 3),
+                new_personincharge=self._person_name(),
+                new_connectiontelephonenumber1=self._telephonenumber('090'),
+                new_ordercontents=self._random.choice(ordercontents_list),
+                new_rank=None,
+                new_rank_system=None,
+                new_draft=0,
+                statecode=0,
+                modifiedon=(_MODIFIEDON_START + datetime.timedelta(seconds=num)).strftime('%Y-%m-%d %H:%M:%S'),
+            )
+
+    def generate(self, conn, rows: int, addresscode_file_path=None) -> dict:
+        '''
+        オフライン用DBの既存データを削除し、合成データを登録します。
+
+        Args:
+            conn: オフライン用DB接続
+            rows: 取次件数
+            addresscode_file_path: 住所コードCSVファイルパス
+        Returns:
+            テーブル毎の登録件数
+        '''
+
+        addresses = load_address_master(conn, addresscode_file_path)
+        prefecture_codes = sorted(set(code[:2] for code in addresses['addr_cd']))
+
+        self._rows = {}
+        for row in addresses.itertuples():
+            self._add('new_addresscode', new_new_addressname=row.addr_cd, new_addresscode=row.addr_nm, new_prefecturename=row.tdfkn_nm,
+                      new_municipalityname=row.scyosn_nm, new_largersectionalias=row.oaza_tshum_nm,
+                      new_sectioncityblock=row.azchm_nm, new_zipcode=row.zip_cd)
+
+        autoagents = self._generate_organizations(prefecture_codes)
+        customers = self._generate_customers(addresses, autoagents, max(rows // 4, 50))
+        self._generate_commissions(customers, autoagents, rows, load_contents_phrases(), load_commission_classes())
+
+        for tables in (CRMDB_TABLES, NWMDB_TABLES, FASTSEARCH_TABLES):
+            for table_name, columns in tables.items():
+                conn.execute(f'DELETE FROM {table_name}')
+                table_rows = self._rows.get(table_name, [])
+                if table_rows:
+                    column_names = [column for column, _ in columns]
+                    conn.executemany(
+                        f'INSERT INTO {table_name} ({", ".join(column_names)}) VALUES ({", ".join("?" * len(column_names))})',
+                        [tuple(row.get(column) for column in column_names) for row in table_rows])
+        conn.commit()
+
+        counts = {table_name: len(table_rows) for table_name, table_rows in self._rows.items()}
+        self._rows = {}
+
+        return counts
+
+
+def generate(rows: int, db_path=None, seed: int = 0, addresscode_file_path=None) -> dict:
+    '''
+    オフライン用DBに合成データを生成します。
+
+    Args:
+        rows: 取次件数
+        db_path: オフライン用DBファイルパス。省略時は設定ファイルのoffline_config.db_path
+        seed: 乱数のシード値
+        addresscode_file_path: 住所コードCSVファイルパス
+    Returns:
+        テーブル毎の登録件数
+    '''
+
+    db_path = db_path or get_offline_config()['db_path']
+    injector.create_database(db_path)
+
+    conn = tsql.connect(db_path)
+    try:
+        return SyntheticDataGenerator(seed).generate(conn, rows, addresscode_file_path)
+    finally:
+        conn.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='自動差配処理の合成データ生成')
+    parser.add_argument('--rows', type=int, default=SCALES[0], help=f'取次件数(規模：{", ".join(map(str, SCALES))})')
+    parser.add_argument('--db-path', help='オフライン用DBファイルパス(既定値：設定ファイルのoffline_config.db_path)')
+    parser.add_argument('--seed', type=int, default=0, help='乱数のシード値')
+    parser.add_argument('--addresscode-file', help='住所コードCSVファイルパス')
+    args = parser.parse_args()
+
+    counts = generate(args.rows, args.db_path, args.seed, args.addresscode_file)
+    for table_name, count in counts.items():
+        print(f'{table_name:40}：{count:>8}件')
+
+
+if __name__ == '__main__':
+    main()
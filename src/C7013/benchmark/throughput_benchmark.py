@@ -0,0 +1,166 @@
+'''
+自動差配処理のエンドツーエンドのスループット計測ベンチマーク
+
+件数の規模毎に合成データ(synthetic_data_generator)をオフライン用DBに生成し、
+外部接続をオフライン用の代替実装に差し替えてC7013_taskを実行する。
+タスクの計測情報(TaskMetrics)からタスク毎の経過時間、処理件数/秒、ピークRSS増加量を集計して出力する。
+
+ピークRSSはプロセス全体の値のため、規模の小さい順に実行する。
+ランク判定モデル・住所コード予測モデルを使用するため、学習済モデルを配置した環境で実行する。
+
+実行例:
+    python -m C7013.benchmark.throughput_benchmark
+    python -m C7013.benchmark.throughput_benchmark --rows 1000 10000 100000 --output throughput.json
+'''
+
+# 標準ライブラリインポート
+import json
+import time
+import argparse
+import pathlib
+
+# サードパーティライブラリインポート
+import inject
+
+# プロジェクトライブラリインポート
+from ..dao.crmdb_dao import CrmDBDao
+from ..dao.nwmdb_dao import NwmDBDao
+from ..dcrm_helper import DcrmHelper
+from ..fastsearch_helper import FastSearchHelper
+from ..offline.config import get_offline_config
+from . import synthetic_data_generator
+
+
+def summarize_stages(metrics: dict) -> list:
+    '''
+    計測情報のサブタスクをタスク名毎に集計します。
+    マイクロバッチ実行時はマイクロバッチ毎の計測情報を合算する。
+
+    Args:
+        metrics: 計測情報(TaskMetrics.to_dict)
+    Returns:
+        [{'taskName', 'depth', 'calls', 'wallTime', 'cpuTime', 'rowsIn', 'rowsOut', 'rowsPerSecond', 'peakRssDelta'}]
+    '''
+
+    stages = {}
+
+    def collect(children: list, depth: int) -> None:
+        for child in children:
+            stage = stages.setdefault(child['taskName'], {
+                'taskName': child['taskName'], 'depth': depth, 'calls': 0, 'wallTime': 0.0, 'cpuTime': 0.0,
+                'rowsIn': None, 'rowsOut': None, 'peakRssDelta': None,
+            })
+            stage['calls'] += 1
+            stage['wallTime'] += child['wallTime']
+            stage['cpuTime'] += child['cpuTime']
+            for key in ('rowsIn', 'rowsOut'):
+                if child[key] is not None:
+                    stage[key] = (stage[key] or 0) + child[key]
+            if child['peakRssDelta'] is not None:
+                stage['peakRssDelta'] = max(stage['peakRssDelta'] or 0, child['peakRssDelta'])
+            collect(child['children'], depth + 1)
+
+    collect(metrics['children'], 0)
+
+    for stage in stages.values():
+        rows = stage['rowsIn'] if stage['rowsIn'] is not None else stage['rowsOut']
+        stage['rowsPerSecond'] = rows / stage['wallTime'] if rows is not None and stage['wallTime'] > 0 else None
+
+    return list(stages.values())
+
+
+def run(rows: int, db_path: pathlib.Path, seed: int = 0, addresscode_file_path=None) -> dict:
+    '''
+    合成データを生成し、C7013_taskを実行して計測結果を返却します。
+
+    Args:
+        rows: 取次件数
+        db_path: オフライン用DBファイルパス
+        seed: 乱数のシード値
+        addresscode_file_path: 住所コードCSVファイルパス
+    Returns:
+        {'rows', 'resultCode', 'wallTime', 'rowsPerSecond', 'peakRssDelta', 'stages'}
+    '''
+
+    from ..C7013_task import C7013_task
+    from ..offline.crmdb_dao import OfflineCrmDBDao
+    from ..offline.nwmdb_dao import OfflineNwmDBDao
+    from ..offline.dcrm_helper import OfflineDcrmHelper
+    from ..offline.fastsearch_helper import OfflineFastSearchHelper
+
+    synthetic_data_generator.generate(rows, db_path, seed, addresscode_file_path)
+
+    # 規模毎に代替実装を生成し直し、前回の実行で作成・更新したエンティティを引き継がないようにする
+    def configure(binder: inject.Binder) -> None:
+        binder.bind_to_constructor(CrmDBDao, lambda: OfflineCrmDBDao(db_path))
+        binder.bind_to_constructor(NwmDBDao, lambda: OfflineNwmDBDao(db_path))
+        binder.bind_to_constructor(DcrmHelper, OfflineDcrmHelper)
+        binder.bind_to_constructor(FastSearchHelper, lambda: OfflineFastSearchHelper(db_path))
+
+    inject.clear_and_configure(configure)
+    try:
+        start = time.perf_counter()
+        result = C7013_task().execute()
+        elapsed = time.perf_counter() - start
+    finally:
+        inject.instance(CrmDBDao).close()
+        inject.clear()
+
+    metrics = result.metrics.to_dict()
+
+    return {
+        'rows': rows,
+        'resultCode': result.resultCode,
+        'wallTime': elapsed,
+        'rowsPerSecond': rows / elapsed if elapsed > 0 else None,
+        'peakRssDelta': metrics['peakRssDelta'],
+        'stages': summarize_stages(metrics),
+    }
+
+
+def _format_bytes(value) -> str:
+    '''
+    バイト数をMB単位の文字列に変換します。
+    '''
+    return f'{value / 1024 / 1024:,.1f}MB' if value is not None else '-'
+
+
+def print_report(report: dict) -> None:
+    '''
+    計測結果を出力します。
+    '''
+
+    print(f'取次件数：{report["rows"]:,}件 処理結果コード：{report["resultCode"]} 経過時間：{report["wallTime"]:.3f}秒 '
+          f'処理件数/秒：{report["rowsPerSecond"]:,.1f} ピークRSS増加量：{_format_bytes(report["peakRssDelta"])}')
+    print(f'  {"タスク":50}{"回数":>6}{"経過時間(秒)":>14}{"入力件数":>10}{"件数/秒":>12}{"ピークRSS増加量":>16}')
+    for stage in report['stages']:
+        rows_in = f'{stage["rowsIn"]:,}' if stage['rowsIn'] is not None else '-'
+        rows_per_second = f'{stage["rowsPerSecond"]:,.1f}' if stage['rowsPerSecond'] is not None else '-'
+        print(f'  {"  " * stage["depth"] + stage["taskName"]:50}{stage["calls"]:>6}{stage["wallTime"]:>14.3f}'
+              f'{rows_in:>10}{rows_per_second:>12}{_format_bytes(stage["peakRssDelta"]):>16}')
+
+
+def main():
+    parser = argparse.ArgumentParser(description='自動差配処理のエンドツーエンドのスループット計測')
+    parser.add_argument('--rows', type=int, nargs='+', default=synthetic_data_generator.SCALES, help='取次件数(複数指定可)')
+    parser.add_argument('--db-path', type=pathlib.Path, help='オフライン用DBファイルパス(既定値：設定ファイルのoffline_config.db_path)')
+    parser.add_argument('--seed', type=int, default=0, help='乱数のシード値')
+    parser.add_argument('--addresscode-file', help='住所コードCSVファイルパス')
+    parser.add_argument('--output', help='計測結果を保存するJSONファイルパス')
+    args = parser.parse_args()
+
+    db_path = args.db_path or get_offline_config()['db_path']
+
+    reports = []
+    for rows in sorted(args.rows):
+        report = run(rows, db_path, args.seed, args.addresscode_file)
+        print_report(report)
+        reports.append(report)
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(reports, f, ensure_ascii=False, indent=2)
+
+
+if __name__ == '__main__':
+    main()
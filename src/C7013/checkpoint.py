@@ -0,0 +1,444 @@
+# 標準ライブラリインポート
+import os
+import json
+import uuid
+import decimal
+import datetime
+import pathlib
+import threading
+from typing import TYPE_CHECKING
+
+# サードパーティライブラリインポート
+import numpy as np
+import pandas as pd
+
+# プロジェクトライブラリインポート
+from . import const
+if TYPE_CHECKING:
+    from .rank_utils import RankFlagMatrix
+
+# 列の型情報(UUID)
+COLUMN_TYPE_UUID: str = 'uuid'
+# 列の型情報(整数とNoneが混在するobject列)
+COLUMN_TYPE_INT_OBJECT: str = 'int_object'
+
+
+def _to_arrow_compatible(df: pd.DataFrame) -> tuple:
+    '''
+    DataFrameをParquetに出力可能な型に変換します。
+    UUIDはstrに、整数とNoneが混在するobject列はInt64に変換し、変換した列の型情報を返却します。
+
+    Args:
+        df: 変換対象DataFrame
+    Returns:
+        (変換後DataFrame, 列の型情報)
+    '''
+
+    column_types = {}
+    converted = {}
+
+    for column in df.columns:
+        if df[column].dtype != object:
+            continue
+
+        values = df[column][df[column].notna()]
+        if values.map(lambda v: isinstance(v, uuid.UUID)).any():
+            converted[column] = df[column].map(lambda v: str(v) if isinstance(v, uuid.UUID) else v)
+            column_types[column] = COLUMN_TYPE_UUID
+        elif len(values) > 0 and values.map(lambda v: isinstance(v, int) and not isinstance(v, bool)).all():
+            converted[column] = df[column].astype('Int64')
+            column_types[column] = COLUMN_TYPE_INT_OBJECT
+
+    if converted:
+        df = df.assign(**converted)
+
+    return df, column_types
+
+
+def _to_uuid(value):
+    '''
+    UUID文字列をUUIDに変換します。UUID文字列以外はそのまま返却します。
+    '''
+
+    if isinstance(value, str) and value:
+        try:
+            return uuid.UUID(value)
+        except ValueError:
+            return value
+
+    return value
+
+
+def _from_arrow_compatible(df: pd.DataFrame, column_types: dict) -> pd.DataFrame:
+    '''
+    Parquetから読み込んだDataFrameの型を出力前の型に戻します。
+
+    Args:
+        df: 読込DataFrame
+        column_types: 列の型情報
+    Returns:
+        変換後DataFrame
+    '''
+
+    for column, column_type in column_types.items():
+        if column not in df.columns:
+            continue
+
+        if column_type == COLUMN_TYPE_UUID:
+            df[column] = df[column].map(_to_uuid)
+        elif column_type == COLUMN_TYPE_INT_OBJECT:
+            values = df[column].astype(object)
+            df[column] = values.where(values.notna(), None)
+
+    return df
+
+
+def _json_default(value):
+    '''
+    JSONに出力できない値を文字列に変換します。
+    '''
+
+    if isinstance(value, (uuid.UUID, decimal.Decimal, datetime.datetime, datetime.date)):
+        return str(value)
+
+    return repr(value)
+
+
+class RowJournal(object):
+    '''
+    行単位の処理済情報を記録するジャーナルクラス
+
+    処理済の行のキーと処理結果を1行1JSONで追記し、再開時に処理済の行を判定する。
+    '''
+
+    def __init__(self, file_path: pathlib.PurePath):
+        '''
+        コンストラクタ
+
+        Args:
+            file_path: ジャーナルファイルパス
+        '''
+
+        # ジャーナルファイルパス
+        self.__file_path: pathlib.PurePath = file_path
+        # 処理済の行(キー:処理結果)
+        self.__processed: dict = {}
+
+        if os.path.exists(file_path):
+            with open(file_path, 'r', encoding='utf-8') as f:
+                for line in f:
+                    line = line.strip()
+                    if not line:
+                        continue
+                    try:
+                        record = json.loads(line)
+                    except json.JSONDecodeError:
+                        # 書込中に中断された最終行は未処理として扱う
+                        continue
+                    self.__processed[record['key']] = record['values']
+
+    def __len__(self) -> int:
+        return len(self.__processed)
+
+    def is_processed(self, key: str) -> bool:
+        '''
+        処理済の行かどうか判定します。
+        '''
+
+        return str(key) in self.__processed
+
+    def get(self, key: str) -> dict:
+        '''
+        処理済の行の処理結果を取得します。
+        '''
+
+        return self.__processed.get(str(key))
+
+    def record(self, key: str, values: dict) -> None:
+        '''
+        行を処理済として記録します。
+
+        Args:
+            key: 行のキー
+            values: 処理結果
+        '''
+
+        line = json.dumps({'key': str(key), 'values': values}, ensure_ascii=False, default=_json_default)
+        with open(self.__file_path, 'a', encoding='utf-8') as f:
+            f.write(line + '\n')
+            f.flush()
+            os.fsync(f.fileno())
+
+        self.__processed[str(key)] = values
+
+
+class StageCheckpoint(object):
+    '''
+    ステージチェックポイントクラス
+
+    実行ID毎のフォルダに、マイクロバッチ毎の各タスクの出力をParquet形式で保存し、
+    マニフェスト(JSON)に完了したタスクを記録する。
+    ランク判定用フラグ行列は1行9バイトにビット圧縮してnpy形式で保存する。
+    '''
+
+    # チェックポイントフォルダ名
+    CHECKPOINT_FOLDER_NAME: str = 'checkpoint'
+    # マニフェストファイル名
+    MANIFEST_FILE_NAME: str = 'manifest.json'
+    # チェックポイントファイルの拡張子
+    CHECKPOINT_FILE_EXT: str = '.parquet'
+    # ジャーナルファイルの拡張子
+    JOURNAL_FILE_EXT: str = '_journal.jsonl'
+    # ランク判定用フラグ行列ファイルの拡張子
+    RANK_FLAGS_FILE_EXT: str = '_rank_flags.npy'
+
+    def __init__(self, run_id: str, base_path: pathlib.PurePath = None):
+        '''
+        コンストラクタ
+
+        Args:
+            run_id: 実行ID
+            base_path: チェックポイントフォルダ。省略時はアプリケーションデータフォルダ配下
+        '''
+
+        # 実行ID
+        self.__run_id: str = run_id
+        # 実行ID毎のチェックポイントフォルダ
+        self.__path: pathlib.PurePath = pathlib.Path(base_path or StageCheckpoint.default_base_path()) / run_id
+        os.makedirs(self.__path, exist_ok=True)
+        # マニフェスト
+        self.__manifest: dict = self._read_manifest()
+        # マニフェスト更新用ロック(タスクを並行実行する場合に使用)
+        self.__lock: threading.RLock = threading.RLock()
+
+    @staticmethod
+    def default_base_path() -> pathlib.PurePath:
+        '''
+        既定のチェックポイントフォルダを取得します。
+        '''
+
+        return const.APP_DATA_PATH / StageCheckpoint.CHECKPOINT_FOLDER_NAME
+
+    @staticmethod
+    def new_run_id() -> str:
+        '''
+        新しい実行IDを採番します。
+        '''
+
+        return f'{datetime.datetime.now():%Y%m%d%H%M%S%f}'
+
+    @staticmethod
+    def latest_incomplete_run_id(base_path: pathlib.PurePath = None) -> str:
+        '''
+        未完了の実行のうち、最新の実行IDを取得します。存在しない場合はNoneを返却します。
+        '''
+
+        base_path = pathlib.Path(base_path or StageCheckpoint.default_base_path())
+        if not os.path.isdir(base_path):
+            return None
+
+        for run_id in sorted(os.listdir(base_path), reverse=True):
+            manifest_path = base_path / run_id / StageCheckpoint.MANIFEST_FILE_NAME
+            if not os.path.exists(manifest_path):
+                continue
+            with open(manifest_path, 'r', encoding='utf-8') as f:
+                if not json.load(f).get('completed', False):
+                    return run_id
+
+        return None
+
+    @property
+    def run_id(self) -> str:
+        '''
+        実行ID
+        '''
+
+        return self.__run_id
+
+    @property
+    def path(self) -> pathlib.PurePath:
+        '''
+        実行ID毎のチェックポイントフォルダ
+        '''
+
+        return self.__path
+
+    @property
+    def completed(self) -> bool:
+        '''
+        実行が完了しているか
+        '''
+
+        return self.__manifest.get('completed', False)
+
+    @property
+    def chunk_size(self) -> int:
+        '''
+        マイクロバッチ件数。未保存の場合はNone
+        '''
+
+        return self.__manifest.get('chunk_size')
+
+    @property
+    def commissionid_list(self) -> list:
+        '''
+        抽出時点の対象取次GUID一覧。未保存の場合はNone
+        '''
+
+        return self.__manifest.get('commissionid_list')
+
+    def save_commissionid_list(self, commissionid_list: list, chunk_size: int) -> None:
+        '''
+        抽出時点の対象取次GUID一覧とマイクロバッチ件数を保存します。
+        再開時は保存した一覧を同じ件数で分割して処理する。
+
+        Args:
+            commissionid_list: 対象取次GUID一覧
+            chunk_size: マイクロバッチ件数
+        '''
+
+        with self.__lock:
+            self.__manifest['commissionid_list'] = [str(commissionid) for commissionid in commissionid_list]
+            self.__manifest['chunk_size'] = chunk_size
+            self._write_manifest()
+
+    def is_chunk_completed(self, chunk_key: str) -> bool:
+        '''
+        マイクロバッチの全タスクが完了しているか判定します。
+        '''
+
+        return self.__manifest['chunks'].get(chunk_key, {}).get('completed', False)
+
+    def completed_stages(self, chunk_key: str) -> dict:
+        '''
+        マイクロバッチの完了済タスクと処理結果コードを完了順に取得します。
+        '''
+
+        with self.__lock:
+            stages = self.__manifest['chunks'].get(chunk_key, {}).get('stages', {})
+
+            return {stage: info['result_code'] for stage, info in stages.items()}
+
+    def save(self, chunk_key: str, stage: str, df: pd.DataFrame, result_code: int, rank_flags: 'RankFlagMatrix' = None) -> None:
+        '''
+        タスクの出力をチェックポイントとして保存します。
+
+        Args:
+            chunk_key: マイクロバッチのキー
+            stage: タスク名
+            df: タスクの出力DataFrame
+            result_code: タスクの処理結果コード
+            rank_flags: タスク完了時点のランク判定用フラグ行列(dfの行順)。Noneの場合は保存しない
+        '''
+
+        os.makedirs(self.__path / chunk_key, exist_ok=True)
+        file_path = self.__path / chunk_key / f'{stage}{StageCheckpoint.CHECKPOINT_FILE_EXT}'
+
+        arrow_df, column_types = _to_arrow_compatible(df)
+        arrow_df.to_parquet(file_path, index=True)
+
+        if rank_flags is not None:
+            np.save(self.__path / chunk_key / f'{stage}{StageCheckpoint.RANK_FLAGS_FILE_EXT}', rank_flags.pack())
+
+        with self.__lock:
+            chunk = self.__manifest['chunks'].setdefault(chunk_key, {'stages': {}, 'completed': False})
+            chunk['stages'][stage] = {
+                'rows': len(df),
+                'result_code': result_code,
+                'column_types': column_types,
+                'rank_flags': rank_flags is not None,
+            }
+            self._write_manifest()
+
+    def load(self, chunk_key: str, stage: str) -> pd.DataFrame:
+        '''
+        タスクの出力をチェックポイントから読み込みます。
+
+        Args:
+            chunk_key: マイクロバッチのキー
+            stage: タスク名
+        Returns:
+            タスクの出力DataFrame
+        '''
+
+        file_path = self.__path / chunk_key / f'{stage}{StageCheckpoint.CHECKPOINT_FILE_EXT}'
+        with self.__lock:
+            column_types = self.__manifest['chunks'][chunk_key]['stages'][stage]['column_types']
+
+        return _from_arrow_compatible(pd.read_parquet(file_path), column_types)
+
+    def load_rank_flags(self, chunk_key: str, stage: str) -> 'RankFlagMatrix':
+        '''
+        タスク完了時点のランク判定用フラグ行列をチェックポイントから読み込みます。
+
+        Args:
+            chunk_key: マイクロバッチのキー
+            stage: タスク名
+        Returns:
+            ランク判定用フラグ行列。保存されていない場合はNone
+        '''
+
+        with self.__lock:
+            if not self.__manifest['chunks'][chunk_key]['stages'][stage].get('rank_flags', False):
+                return None
+
+        from .rank_utils import RankFlagMatrix
+
+        return RankFlagMatrix.unpack(np.load(self.__path / chunk_key / f'{stage}{StageCheckpoint.RANK_FLAGS_FILE_EXT}'))
+
+    def journal(self, chunk_key: str, stage: str) -> RowJournal:
+        '''
+        タスクの行単位のジャーナルを取得します。
+
+        Args:
+            chunk_key: マイクロバッチのキー
+            stage: タスク名
+        Returns:
+            ジャーナル
+        '''
+
+        os.makedirs(self.__path / chunk_key, exist_ok=True)
+
+        return RowJournal(self.__path / chunk_key / f'{stage}{StageCheckpoint.JOURNAL_FILE_EXT}')
+
+    def complete_chunk(self, chunk_key: str) -> None:
+        '''
+        マイクロバッチの全タスクを完了として記録します。
+        '''
+
+        with self.__lock:
+            chunk = self.__manifest['chunks'].setdefault(chunk_key, {'stages': {}, 'completed': False})
+            chunk['completed'] = True
+            self._write_manifest()
+
+    def complete(self) -> None:
+        '''
+        実行を完了として記録します。
+        '''
+
+        with self.__lock:
+            self.__manifest['completed'] = True
+            self._write_manifest()
+
+    def _read_manifest(self) -> dict:
+        '''
+        マニフェストを読み込みます。存在しない場合は新規に作成します。
+        '''
+
+        manifest_path = self.__path / StageCheckpoint.MANIFEST_FILE_NAME
+        if os.path.exists(manifest_path):
+            with open(manifest_path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+
+        return {'run_id': self.__run_id, 'completed': False, 'chunks': {}}
+
+    def _write_manifest(self) -> None:
+        '''
+        マニフェストを出力します。中断時に破損しないよう一時ファイルを経由して置換する。
+        '''
+
+        manifest_path = self.__path / StageCheckpoint.MANIFEST_FILE_NAME
+        tmp_path = self.__path / f'{StageCheckpoint.MANIFEST_FILE_NAME}.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(self.__manifest, f, ensure_ascii=False, indent=2)
+        os.replace(tmp_path, manifest_path)
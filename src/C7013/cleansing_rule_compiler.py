@@ -0,0 +1,271 @@
+# 標準ライブラリインポート
+import re
+
+# サードパーティライブラリインポート
+
+# プロジェクトライブラリインポート
+
+
+# 正規表現のメタ文字
+_REGEX_META_CHARACTERS = frozenset('.^$*+?{}[]|()\\')
+# エスケープして文字として扱える文字(英数字以外)
+_ESCAPABLE_PATTERN = re.compile(r'\\([^0-9A-Za-z])')
+
+
+def _split_alternation(patternstring: str) -> list:
+    '''
+    置換元文字列をエスケープされていない「|」で分割します。
+    '''
+
+    parts = []
+    current = []
+    escaped = False
+    for char in patternstring:
+        if escaped:
+            current.append(char)
+            escaped = False
+        elif char == '\\':
+            current.append(char)
+            escaped = True
+        elif char == '|':
+            parts.append(''.join(current))
+            current = []
+        else:
+            current.append(char)
+    parts.append(''.join(current))
+
+    return parts
+
+
+def literal_alternatives(patternstring: str) -> tuple:
+    '''
+    置換元文字列が文字列(またはその「|」区切り)のみで構成される場合、一致する文字列の一覧を返却します。
+    メタ文字を含む等、文字列として解析できない場合はNoneを返却する。
+
+    Args:
+        patternstring: 置換元文字列(正規表現)
+    Returns:
+        一致する文字列のタプル。解析できない場合はNone
+    '''
+
+    literals = []
+    for part in _split_alternation(patternstring):
+        # エスケープされた記号を除いた部分にメタ文字が無いこと
+        if _REGEX_META_CHARACTERS & set(_ESCAPABLE_PATTERN.sub('', part)):
+            return None
+        literal = _ESCAPABLE_PATTERN.sub(r'\1', part)
+        # 空文字に一致する置換は文字間に作用するため文字列として扱わない
+        if not literal:
+            return None
+        literals.append(literal)
+
+    return tuple(literals)
+
+
+def _overlaps(left: str, right: str) -> bool:
+    '''
+    2つの文字列がテキスト上で重なって出現し得るかを判定します。
+    '''
+
+    if left in right or right in left:
+        return True
+
+    for length in range(1, min(len(left), len(right))):
+        if left[-length:] == right[:length] or right[-length:] == left[:length]:
+            return True
+
+    return False
+
+
+class CleansingRule(object):
+    '''
+    クレンジング設定の置換処理1件の解析結果
+    '''
+
+    def __init__(self, index: int, patternstring: str, replacementstring: str):
+        '''
+        コンストラクタ
+
+        Args:
+            index: クレンジング設定上の位置
+            patternstring: 置換元文字列(正規表現)
+            replacementstring: 置換後文字列
+        '''
+
+        self.index: int = index
+        self.patternstring: str = patternstring
+        self.replacementstring: str = replacementstring
+        # 置換元が文字列のみで、置換後にグループ参照・エスケープを含まない場合のみ他の置換処理と統合する
+        self.literals: tuple = literal_alternatives(patternstring) if '\\' not in replacementstring else None
+
+    @property
+    def fusible(self) -> bool:
+        '''
+        他の置換処理と統合可能か
+        '''
+        return self.literals is not None
+
+    def is_independent_of(self, earlier: 'CleansingRule') -> bool:
+        '''
+        先に実施する置換処理と1回の走査に統合しても結果が変わらないかを判定します。
+
+        以下の全てを満たす場合、2つの置換処理の一致箇所は重ならず、
+        先の置換処理の置換後文字列が後の置換処理の一致箇所を生成・消去しないため、
+        順に置換した結果と1回の走査で両方を置換した結果が一致する。
+        ・置換元文字列同士がテキスト上で重なって出現し得ない
+        ・後の置換元文字列が先の置換後文字列の文字を含まない
+        ・先の置換後文字列が空文字の場合、後の置換元文字列が1文字である(削除により前後の文字が連結されるため)
+
+        Args:
+            earlier: 先に実施する置換処理
+        '''
+
+        if not self.fusible or not earlier.fusible:
+            return False
+
+        replaced_characters = set(earlier.replacementstring)
+        for literal in self.literals:
+            if replaced_characters & set(literal):
+                return False
+            if earlier.replacementstring == '' and len(literal) > 1:
+                return False
+            for earlier_literal in earlier.literals:
+                if _overlaps(literal, earlier_literal):
+                    return False
+
+        return True
+
+
+class FusedPass(object):
+    '''
+    1回の走査で実施する置換処理(統合した置換処理のグループ)
+    re.Patternのsubと同じ呼び出し方で置換する。
+    '''
+
+    def __init__(self, rules: list):
+        '''
+        コンストラクタ
+
+        Args:
+            rules: 統合する置換処理(CleansingRule)のリスト
+        '''
+
+        self.rules: list = rules
+
+        if len(rules) == 1:
+            self.pattern: re.Pattern = re.compile(rules[0].patternstring)
+            self.replacement = rules[0].replacementstring
+        else:
+            # 置換処理毎にグループを割り当て、一致したグループの置換後文字列に置換する
+            self.pattern: re.Pattern = re.compile('|'.join(f'({rule.patternstring})' for rule in rules))
+            replacements = [None] + [rule.replacementstring for rule in rules]
+            self.replacement = lambda match: replacements[match.lastindex]
+
+    def sub(self, text: str) -> str:
+        '''
+        テキストを置換します。
+        '''
+        return self.pattern.sub(self.replacement, text)
+
+
+def fuse_rules(settings: list) -> list:
+    '''
+    クレンジング設定の置換処理を解析し、互いに依存しない連続した置換処理を1回の走査に統合します。
+    依存関係のある置換処理は設定の順序で実施する。
+
+    Args:
+        settings: クレンジング設定の置換処理のリスト([{'patternstring', 'replacementstring'}])
+    Returns:
+        FusedPassのリスト
+    '''
+
+    passes = []
+    group = []
+    for index, setting in enumerate(settings):
+        rule = CleansingRule(index, setting['patternstring'], setting['replacementstring'])
+        if group and all(rule.is_independent_of(earlier) for earlier in group):
+            group.append(rule)
+            continue
+        if group:
+            passes.append(FusedPass(group))
+        group = [rule]
+    if group:
+        passes.append(FusedPass(group))
+
+    return passes
+
+
+def compile_rules(settings: list) -> list:
+    '''
+    クレンジング設定の置換処理を統合・コンパイルし、[(正規表現オブジェクト, 置換後文字列または置換関数)]を返却します。
+    返却値の順にre.Pattern.subで置換した結果は、設定の順にre.subで置換した結果と一致する。
+
+    Args:
+        settings: クレンジング設定の置換処理のリスト([{'patternstring', 'replacementstring'}])
+    Returns:
+        [(正規表現オブジェクト, 置換後文字列または置換関数)]
+    '''
+
+    return [(fused_pass.pattern, fused_pass.replacement) for fused_pass in fuse_rules(settings)]
+
+
+def apply_sequential(settings: list, text: str) -> str:
+    '''
+    クレンジング設定の置換処理を設定の順にre.subで実施します(統合前の処理、検証用)。
+    '''
+
+    for setting in settings:
+        text = re.sub(setting['patternstring'], setting['replacementstring'], text)
+    return text
+
+
+def apply_rules(rules: list, text: str) -> str:
+    '''
+    compile_rulesの返却値の置換処理を実施します。
+    '''
+
+    for pattern, replacement in rules:
+        text = pattern.sub(replacement, text)
+    return text
+
+
+def verify_rules(settings: list, texts) -> list:
+    '''
+    統合前後の置換結果を比較し、不一致のテキストを返却します。
+
+    Args:
+        settings: クレンジング設定の置換処理のリスト
+        texts: 検証するテキスト
+    Returns:
+        [(テキスト, 統合前の置換結果, 統合後の置換結果)]
+    '''
+
+    rules = compile_rules(settings)
+    mismatches = []
+    for text in texts:
+        expected = apply_sequential(settings, text)
+        actual = apply_rules(rules, text)
+        if expected != actual:
+            mismatches.append((text, expected, actual))
+
+    return mismatches
+
+
+def fusion_report(settings: list) -> dict:
+    '''
+    置換処理の統合結果を返却します。
+
+    Args:
+        settings: クレンジング設定の置換処理のリスト
+    Returns:
+        {'rules': 置換処理数, 'passes': 統合後の走査回数, 'savedPasses': 削減した走査回数, 'groups': [[統合した置換処理の位置]]}
+    '''
+
+    passes = fuse_rules(settings)
+
+    return {
+        'rules': len(settings),
+        'passes': len(passes),
+        'savedPasses': len(settings) - len(passes),
+        'groups': [[rule.index for rule in fused_pass.rules] for fused_pass in passes],
+    }
@@ -58,14 +58,30 @@ BATCH_ERROR: int = 1
 # 警告終了
 BATCH_WARNING: int = 2
 
-# 設定_データクレンジング_契約者名クレンジング
-CLENSING_CONFIG_NAMECONTRACTOR_NAME = json5.load(open(APP_CONFIG_PATH / 'contractorname_cleansing.json', 'r', encoding='utf-8'))
-
-# 設定_データクレンジング_取次内容クレンジング
-CLENSING_CONFIG_CONTENTS_COMMISSION = json5.load(open(APP_CONFIG_PATH / 'contents_commission_cleansing.json', 'r', encoding='utf-8'))
-
-# 設定_データクレンジング_住所クレンジング
-CLENSING_CONFIG_ADDRESS = json5.load(open(APP_CONFIG_PATH / 'address_cleansing.json', 'r', encoding='utf-8'))
+# 初回参照時に読み込む設定(定数名:設定ファイル名)
+# データクレンジングを行わないタスクで設定ファイルを解析しないよう、モジュール読込時には読み込まない
+LAZY_CONFIG_FILE_NAMES = {
+    # 設定_データクレンジング_契約者名クレンジング
+    'CLENSING_CONFIG_NAMECONTRACTOR_NAME': 'contractorname_cleansing.json',
+    # 設定_データクレンジング_取次内容クレンジング
+    'CLENSING_CONFIG_CONTENTS_COMMISSION': 'contents_commission_cleansing.json',
+    # 設定_データクレンジング_住所クレンジング
+    'CLENSING_CONFIG_ADDRESS': 'address_cleansing.json',
+}
+
+def __getattr__(name: str):
+    '''
+    初回参照時に設定ファイルを読み込み、以降はモジュール変数として参照させる
+    '''
+
+    if name not in LAZY_CONFIG_FILE_NAMES:
+        raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
+
+    with open(APP_CONFIG_PATH / LAZY_CONFIG_FILE_NAMES[name], 'r', encoding='utf-8') as f:
+        value = json5.load(f)
+    globals()[name] = value
+
+    return value
 
 # DataFrame読み書き設定
 DATAFRAME_COLUMN_CONFIG = {'jidou_sahai_rev' : object
@@ -1,7 +1,8 @@
 # 標準ライブラリインポート
+import threading
+from typing import TYPE_CHECKING
 
 # サードパーティライブラリインポート
-import pymssql
 import inject
 import numpy as np
 import pandas as pd
@@ -10,6 +11,8 @@ import pandas as pd
 from ..utils import get_crmdb_connection
 from .dao import BaseDao
 from ..dto.RGLT_INFO import RGLT_INFO
+if TYPE_CHECKING:
+    import pymssql
 
 class CrmDBDao(BaseDao):
     '''
@@ -21,15 +24,30 @@ class CrmDBDao(BaseDao):
     def __init__(self):
         '''
         '''
-        self._conn: pymssql.Connection = None
+        # スレッド毎のDB接続
+        self._local: threading.local = threading.local()
+        # 全スレッドのDB接続
+        self._conns: list = []
+        self._lock: threading.Lock = threading.Lock()
 
-    def conn(self) -> pymssql.Connection:
+    def conn(self) -> 'pymssql.Connection':
         """
         データベースに接続する
+        pymssqlの接続はスレッドセーフではないため、スレッド毎に接続する
         """
-        if self._conn == None:
-            self._conn = get_crmdb_connection()
-        return self._conn
+        conn = getattr(self._local, 'conn', None)
+        if conn == None:
+            conn = self._connect()
+            self._local.conn = conn
+            with self._lock:
+                self._conns.append(conn)
+        return conn
+
+    def _connect(self) -> 'pymssql.Connection':
+        '''
+        新しいDB接続を生成する
+        '''
+        return get_crmdb_connection()
 
     def cursor(self, as_dict=False):
         '''
@@ -45,18 +63,35 @@ class CrmDBDao(BaseDao):
 
     def close(self) -> None:
         '''
-        データベースを閉じる
+        全スレッドのデータベース接続を閉じる
+        他のスレッドが使用中の接続も閉じるため、常駐プロセスの終了時など処理を行っていない時のみ呼び出す
+        '''
+        with self._lock:
+            conns = self._conns
+            self._conns = []
+            self._local = threading.local()
+        for conn in conns:
+            conn.close()
+
+    def close_thread(self) -> None:
+        '''
+        呼び出し元スレッドのデータベース接続を閉じる
         '''
-        if self._conn != None:
-            self._conn.close()
-            self._conn = None
+        conn = getattr(self._local, 'conn', None)
+        if conn == None:
+            return
+        self._local.conn = None
+        with self._lock:
+            self._conns = [c for c in self._conns if c is not conn]
+        conn.close()
 
     def __enter__(self):
         self.conn()
         return self
 
     def __exit__(self, exc_type, exc_value, traceback):
-        self.close()
+        # inject.autoparamsで注入された場合も呼び出されるため、他のスレッドの接続は閉じない
+        self.close_thread()
 
     def try_get_locked_rglt_info(self, rglt_apid:str, rec_no:str) -> RGLT_INFO:
         '''
@@ -1,12 +1,14 @@
 # 標準ライブラリインポート
+from typing import TYPE_CHECKING
 
 # サードパーティライブラリインポート
-import cx_Oracle
 import inject
 
 # プロジェクトライブラリインポート
 from ..utils import get_nwmdb_connection
 from .dao import BaseDao
+if TYPE_CHECKING:
+    import cx_Oracle
 
 # エラー発生時の最大再検索回数
 MAX_RETRY = 2
@@ -21,17 +23,23 @@ class NwmDBDao(BaseDao):
     def __init__(self):
         '''
         '''
-        self._conn: cx_Oracle.Connection = None
+        self._conn: 'cx_Oracle.Connection' = None
         super().__init__()
 
-    def conn(self) -> cx_Oracle.Connection:
+    def conn(self) -> 'cx_Oracle.Connection':
         '''
         データベースに接続する
         '''
         if self._conn == None:
-            self._conn = get_nwmdb_connection()
+            self._conn = self._connect()
         return self._conn
 
+    def _connect(self) -> 'cx_Oracle.Connection':
+        '''
+        新しいDB接続を生成する
+        '''
+        return get_nwmdb_connection()
+
     def cursor(self):
         '''
         新しいカーソル生成する
@@ -1,5 +1,6 @@
 # 標準ライブラリインポート
 import sqlite3
+import threading
 
 # サードパーティライブラリインポート
 import inject
@@ -20,16 +21,20 @@ class SqliteDao(BaseDao):
     def __init__(self):
         '''
         '''
-        self._conn: sqlite3.Connection = None
+        # スレッド毎のDB接続
+        self._local: threading.local = threading.local()
         super().__init__()
 
     def conn(self) -> sqlite3.Connection:
         '''
         データベースに接続する
+        sqlite3の接続は生成したスレッドでのみ使用できるため、スレッド毎に接続する
         '''
-        if self._conn == None:
-            self._conn = get_sqlite_connection()
-        return self._conn
+        conn = getattr(self._local, 'conn', None)
+        if conn == None:
+            conn = get_sqlite_connection()
+            self._local.conn = conn
+        return conn
 
     def cursor(self):
         '''
@@ -45,11 +50,13 @@ class SqliteDao(BaseDao):
 
     def close(self) -> None:
         '''
-        データベースを閉じる
+        呼び出し元スレッドのデータベース接続を閉じる
+        (sqlite3の接続は生成したスレッド以外から閉じることができない)
         '''
-        if self._conn != None:
-            self._conn.close()
-            self._conn = None
+        conn = getattr(self._local, 'conn', None)
+        if conn != None:
+            self._local.conn = None
+            conn.close()
 
     def delete_custom_table_by_commissionid_guid(self, df) -> None:
         '''
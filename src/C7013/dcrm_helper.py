@@ -1,9 +1,14 @@
 # 標準ライブラリインポート
 import logging
 import uuid
+import threading
 
 # サードパーティライブラリインポート
-import clr
+try:
+    import clr
+except ImportError:
+    # .NET実行環境が無い場合(オフライン用の代替実装を使用する場合)
+    clr = None
 
 # プロジェクトライブラリインポート
 from . import const
@@ -27,6 +32,8 @@ class DcrmHelper(object):
         self._logger: logging.Logger = utils.getLogger()
         self.loadDlls()
         self._service = None # clr.Microsoft.Xrm.Client.Services.OrganizationService
+        # 複数スレッドから呼び出された場合にCRMへの要求を直列化するロック
+        self._lock = threading.RLock()
 
     @property
     def logger(self) -> logging.Logger:
@@ -119,7 +126,8 @@ class DcrmHelper(object):
 
         '''
         crmEntity = self.ConvertEntityToClrEntity(entity)
-        self._service.Update(crmEntity)
+        with self._lock:
+            self._service.Update(crmEntity)
 
     def CreateEntity(self, entity: Entity) -> uuid.UUID:
         '''
@@ -132,7 +140,8 @@ class DcrmHelper(object):
             作成されたEntityのGuid
         '''
         crmEntity = self.ConvertEntityToClrEntity(entity)
-        crmGuid = self._service.Create(crmEntity)
+        with self._lock:
+            crmGuid = self._service.Create(crmEntity)
         return uuid.UUID(str(crmGuid))
 
     def ConvertEntityToClrEntity(self, entity:Entity) -> object:
@@ -2,7 +2,11 @@
 import logging
 
 # サードパーティライブラリインポート
-import clr
+try:
+    import clr
+except ImportError:
+    # .NET実行環境が無い場合(オフライン用の代替実装を使用する場合)
+    clr = None
 
 # プロジェクトライブラリインポート
 from . import const
@@ -0,0 +1,454 @@
+'''
+キーワード設定ファイルのコンパイル済バンドル
+
+ランク判定用フラグ追加(C7013_03_task)が使用するキーワード設定ファイル(keyword_NN.txt、reserve_NN_*.txt)の
+キーワード一覧と、正規表現として使用するキーワードの必ず含まれる文字列(keyword_matcher.required_literal)を
+1つのバンドルにまとめ、キャッシュファイル(pickle)に保存する。
+
+キャッシュファイルにはキーワード設定ファイル毎の更新日時、サイズ、ハッシュ値(SHA-256)を記録する。
+読込時は更新日時とサイズが一致するファイルは読まずにキャッシュを使用し、
+一致しないファイルもハッシュ値が一致すればキャッシュを使用する。内容が変更されたファイルのみ読み直す。
+正規表現のコンパイル結果はプロセス内で保持し、同じバンドルを再度読み込む場合はコンパイルを省略する。
+
+設定ファイルのkeyword_bundle_configで以下を指定する。
+    enabled: バンドルを使用するか(既定値：True)
+    cache_path: キャッシュファイルパス(既定値：アプリケーションデータフォルダ配下のcache/keyword_bundle.pickle)
+
+実行例:
+    python -m C7013.keyword_bundle --rebuild
+    python -m C7013.keyword_bundle --validate
+'''
+
+# 標準ライブラリインポート
+import io
+import os
+import re
+import sys
+import time
+import pickle
+import hashlib
+import pathlib
+import argparse
+import threading
+
+# サードパーティライブラリインポート
+
+# プロジェクトライブラリインポート
+from . import const
+from . import utils
+from .keyword_matcher import required_literal
+
+# キャッシュファイルの形式のバージョン(形式を変更した場合は更新する)
+BUNDLE_FORMAT_VERSION: int = 1
+# キャッシュフォルダ名
+CACHE_FOLDER_NAME: str = 'cache'
+# キャッシュファイル名
+CACHE_FILE_NAME: str = 'keyword_bundle.pickle'
+
+# プロセス内で保持する読込済のバンドル
+__keyword_bundle__ = None
+# 読込済のバンドル更新用ロック
+__keyword_bundle_lock__ = threading.Lock()
+
+
+def get_keyword_bundle_config() -> dict:
+    '''
+    キーワードバンドルの設定を取得します。
+    '''
+
+    bundle_config = const.APP_CONFIG.get('keyword_bundle_config', {})
+
+    return {
+        'enabled': bundle_config.get('enabled', True),
+        'cache_path': pathlib.Path(bundle_config.get('cache_path') or const.APP_DATA_PATH / CACHE_FOLDER_NAME / CACHE_FILE_NAME),
+    }
+
+
+def parse_keyword_file(data: bytes) -> list:
+    '''
+    キーワード設定ファイルの内容をキーワードリストに変換します。
+    テキストモードでファイルを1行ずつ読み込み、前後の空白を除去した結果と同じとなる。
+
+    Args:
+        data: キーワード設定ファイルの内容
+    Returns:
+        キーワードリスト
+    '''
+
+    return [line.strip() for line in io.StringIO(data.decode('utf-8'), newline=None)]
+
+
+def _stat_keyword_file(file_path: pathlib.PurePath) -> tuple:
+    '''
+    キーワード設定ファイルの(更新日時, サイズ)を取得します。ファイルが存在しない場合はNoneを返却します。
+    '''
+
+    try:
+        stat = os.stat(file_path)
+    except FileNotFoundError:
+        return None
+
+    return (stat.st_mtime_ns, stat.st_size)
+
+
+def _read_keyword_file(file_path: pathlib.PurePath) -> tuple:
+    '''
+    キーワード設定ファイルを読み込みます。
+
+    Returns:
+        (ファイル情報{'stat', 'sha256'}, キーワードリスト)。ファイルが存在しない場合は({'stat': None, 'sha256': None}, [])
+    '''
+
+    stat = _stat_keyword_file(file_path)
+    if stat is None:
+        return {'stat': None, 'sha256': None}, []
+
+    with open(file_path, 'rb') as f:
+        data = f.read()
+
+    return {'stat': stat, 'sha256': hashlib.sha256(data).hexdigest()}, parse_keyword_file(data)
+
+
+class KeywordBundle(object):
+    '''
+    キーワード設定ファイルのバンドルクラス
+    '''
+
+    def __init__(self, keyword_path: pathlib.PurePath, file_names: dict, fingerprints: dict, keyword_lists: dict):
+        '''
+        コンストラクタ
+
+        Args:
+            keyword_path: キーワード設定ファイルフォルダパス
+            file_names: {キーワード設定ファイル名: キーワードを正規表現として使用するか}
+            fingerprints: {キーワード設定ファイル名: ファイル情報{'stat', 'sha256'}}
+            keyword_lists: {キーワード設定ファイル名: キーワードリスト}
+        '''
+
+        # キーワード設定ファイルフォルダパス
+        self.__keyword_path: pathlib.PurePath = pathlib.Path(keyword_path)
+        # キーワード設定ファイル名と、キーワードを正規表現として使用するか
+        self.__file_names: dict = dict(file_names)
+        # キーワード設定ファイル毎のファイル情報
+        self.__fingerprints: dict = fingerprints
+        # キーワード設定ファイル毎のキーワードリスト
+        self.__keyword_lists: dict = keyword_lists
+        # 正規表現毎の必ず含まれる文字列
+        self.__required_literals: dict = {
+            pattern: required_literal(pattern) for pattern in self.regex_patterns}
+        # 正規表現毎のコンパイル結果(初回参照時にコンパイルする)
+        self.__compiled_patterns: dict = None
+
+    @classmethod
+    def build(cls, keyword_path: pathlib.PurePath, file_names: dict) -> 'KeywordBundle':
+        '''
+        キーワード設定ファイルを全て読み込み、バンドルを作成します。
+
+        Args:
+            keyword_path: キーワード設定ファイルフォルダパス
+            file_names: {キーワード設定ファイル名: キーワードを正規表現として使用するか}
+        '''
+
+        fingerprints = {}
+        keyword_lists = {}
+        for file_name in file_names:
+            fingerprints[file_name], keyword_lists[file_name] = _read_keyword_file(pathlib.Path(keyword_path) / file_name)
+
+        return cls(keyword_path, file_names, fingerprints, keyword_lists)
+
+    @property
+    def keyword_path(self) -> pathlib.PurePath:
+        '''
+        キーワード設定ファイルフォルダパス
+        '''
+
+        return self.__keyword_path
+
+    @property
+    def file_names(self) -> dict:
+        '''
+        キーワード設定ファイル名と、キーワードを正規表現として使用するか
+        '''
+
+        return self.__file_names
+
+    @property
+    def fingerprints(self) -> dict:
+        '''
+        キーワード設定ファイル毎のファイル情報
+        '''
+
+        return self.__fingerprints
+
+    @property
+    def regex_patterns(self) -> list:
+        '''
+        正規表現として使用するキーワードの一覧(重複を除く)
+        '''
+
+        return list(dict.fromkeys(
+            keyword for file_name, is_regex in self.__file_names.items() if is_regex for keyword in self.__keyword_lists[file_name]))
+
+    @property
+    def required_literals(self) -> dict:
+        '''
+        正規表現毎の必ず含まれる文字列({正規表現: 文字列またはNone})
+        '''
+
+        return self.__required_literals
+
+    @property
+    def compiled_patterns(self) -> dict:
+        '''
+        正規表現毎のコンパイル結果({正規表現: re.Pattern})
+        コンパイルできない正規表現はre.errorを送出する。
+        '''
+
+        if self.__compiled_patterns is None:
+            self.__compiled_patterns = {pattern: re.compile(pattern) for pattern in self.regex_patterns}
+        return self.__compiled_patterns
+
+    def get(self, file_name: str) -> list:
+        '''
+        キーワード設定ファイルのキーワードリストを返却します。
+        バンドルに含まれないファイル名の場合はファイルが存在しない場合と同じく空のリストを返却する。
+        '''
+
+        return list(self.__keyword_lists.get(file_name, []))
+
+    def validate_patterns(self) -> list:
+        '''
+        正規表現として使用するキーワードのうち、コンパイルできないものを返却します。
+
+        Returns:
+            [(キーワード設定ファイル名, キーワード, エラーメッセージ)]
+        '''
+
+        errors = []
+        for file_name, is_regex in self.__file_names.items():
+            if not is_regex:
+                continue
+            for keyword in self.__keyword_lists[file_name]:
+                try:
+                    re.compile(keyword)
+                except re.error as e:
+                    errors.append((file_name, keyword, str(e)))
+
+        return errors
+
+    def refresh(self) -> tuple:
+        '''
+        キーワード設定ファイルの変更を確認し、変更されたファイルのみ読み直したバンドルを返却します。
+        更新日時とサイズが一致するファイルは読まず、一致しないファイルはハッシュ値が一致すればキーワードリストを再利用する。
+
+        Returns:
+            (バンドル, ファイル情報が変わったか, キーワードリストが変わったか)
+        '''
+
+        fingerprints = dict(self.__fingerprints)
+        keyword_lists = dict(self.__keyword_lists)
+        fingerprint_changed = False
+        keyword_changed = False
+
+        for file_name in self.__file_names:
+            file_path = self.__keyword_path / file_name
+            if _stat_keyword_file(file_path) == fingerprints[file_name]['stat']:
+                continue
+
+            fingerprint, keyword_list = _read_keyword_file(file_path)
+            fingerprint_changed = True
+            if fingerprint['sha256'] != fingerprints[file_name]['sha256']:
+                keyword_lists[file_name] = keyword_list
+                keyword_changed = True
+            fingerprints[file_name] = fingerprint
+
+        if not fingerprint_changed:
+            return self, False, False
+
+        bundle = KeywordBundle(self.__keyword_path, self.__file_names, fingerprints, keyword_lists)
+        if not keyword_changed:
+            # キーワードが変わらない場合はコンパイル結果を引き継ぐ
+            bundle.__compiled_patterns = self.__compiled_patterns
+
+        return bundle, True, keyword_changed
+
+    def save(self, cache_path: pathlib.PurePath) -> None:
+        '''
+        バンドルをキャッシュファイルに保存します。
+        書込中に中断しても既存のキャッシュファイルが壊れないよう、一時ファイルに書き込んでから置き換える。
+        '''
+
+        os.makedirs(pathlib.Path(cache_path).parent, exist_ok=True)
+        temp_path = pathlib.Path(f'{cache_path}.{os.getpid()}.tmp')
+        with open(temp_path, 'wb') as f:
+            pickle.dump({
+                'version': BUNDLE_FORMAT_VERSION,
+                'keyword_path': str(self.__keyword_path),
+                'file_names': self.__file_names,
+                'fingerprints': self.__fingerprints,
+                'keyword_lists': self.__keyword_lists,
+            }, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(temp_path, cache_path)
+
+    @classmethod
+    def load(cls, cache_path: pathlib.PurePath, keyword_path: pathlib.PurePath, file_names: dict) -> 'KeywordBundle':
+        '''
+        キャッシュファイルからバンドルを読み込みます。
+        キャッシュファイルが存在しない、形式のバージョン・キーワード設定ファイルフォルダパス・ファイル名一覧が異なる場合はNoneを返却します。
+        ファイルの変更は確認しない(refreshで確認する)。
+        '''
+
+        try:
+            with open(cache_path, 'rb') as f:
+                content = pickle.load(f)
+        except FileNotFoundError:
+            return None
+
+        if (not isinstance(content, dict)
+                or content.get('version') != BUNDLE_FORMAT_VERSION
+                or content.get('keyword_path') != str(pathlib.Path(keyword_path))
+                or content.get('file_names') != dict(file_names)):
+            return None
+
+        return cls(keyword_path, content['file_names'], content['fingerprints'], content['keyword_lists'])
+
+
+def load_keyword_bundle(keyword_path: pathlib.PurePath, file_names: dict, cache_path: pathlib.PurePath = None) -> KeywordBundle:
+    '''
+    キーワードバンドルを取得します。
+
+    プロセス内で読込済のバンドル、キャッシュファイルの順に使用し、いずれも使用できない場合はキーワード設定ファイルから作成する。
+    キーワード設定ファイルが変更されている場合は変更されたファイルのみ読み直し、キャッシュファイルを更新する。
+    キャッシュファイルの読込・保存に失敗した場合は警告を出力し、キーワード設定ファイルから作成したバンドルを使用する。
+
+    Args:
+        keyword_path: キーワード設定ファイルフォルダパス
+        file_names: {キーワード設定ファイル名: キーワードを正規表現として使用するか}
+        cache_path: キャッシュファイルパス。省略時は設定ファイルのkeyword_bundle_config.cache_path
+    Returns:
+        KeywordBundle
+    '''
+
+    global __keyword_bundle__
+
+    logger = utils.getLogger()
+    keyword_path = pathlib.Path(keyword_path)
+    cache_path = cache_path or get_keyword_bundle_config()['cache_path']
+
+    with __keyword_bundle_lock__:
+        bundle = __keyword_bundle__
+        if bundle != None and (bundle.keyword_path != keyword_path or bundle.file_names != dict(file_names)):
+            bundle = None
+
+        if bundle == None:
+            try:
+                bundle = KeywordBundle.load(cache_path, keyword_path, file_names)
+            except Exception:
+                logger.warning('キーワードバンドルのキャッシュファイルを読み込めませんでした。キーワード設定ファイルから作成します。', exc_info=True)
+                bundle = None
+
+        if bundle == None:
+            bundle = KeywordBundle.build(keyword_path, file_names)
+            modified = True
+        else:
+            bundle, modified, _ = bundle.refresh()
+
+        if modified:
+            try:
+                bundle.save(cache_path)
+            except OSError:
+                logger.warning('キーワードバンドルのキャッシュファイルを保存できませんでした。', exc_info=True)
+
+        __keyword_bundle__ = bundle
+
+    return bundle
+
+
+def clear_keyword_bundle() -> None:
+    '''
+    プロセス内で読込済のキーワードバンドルを破棄します。
+    '''
+
+    global __keyword_bundle__
+
+    with __keyword_bundle_lock__:
+        __keyword_bundle__ = None
+
+
+def validate_keyword_bundle(cache_path: pathlib.PurePath, keyword_path: pathlib.PurePath, file_names: dict) -> list:
+    '''
+    キャッシュファイルのバンドルを検証し、問題点の一覧を返却します。
+    キャッシュファイルは更新しない。
+
+    以下を検証する。
+        ・キャッシュファイルが存在し、現在のキーワード設定ファイルの構成で読み込めること
+        ・キーワードリストがキーワード設定ファイルから読み込んだ結果と一致すること
+        ・正規表現として使用するキーワードがコンパイルできること
+
+    Returns:
+        問題点のメッセージのリスト(問題が無い場合は空のリスト)
+    '''
+
+    problems = []
+    cached = KeywordBundle.load(cache_path, keyword_path, file_names)
+    built = KeywordBundle.build(keyword_path, file_names)
+
+    if cached is None:
+        problems.append(f'キャッシュファイルが存在しないか、現在のキーワード設定ファイルの構成と一致しません。({cache_path})')
+    else:
+        for file_name in file_names:
+            if cached.get(file_name) != built.get(file_name):
+                problems.append(f'{file_name}：キーワードリストがキーワード設定ファイルと一致しません。')
+            elif cached.fingerprints[file_name]['sha256'] != built.fingerprints[file_name]['sha256']:
+                problems.append(f'{file_name}：ハッシュ値がキーワード設定ファイルと一致しません。')
+
+    for file_name, keyword, error in built.validate_patterns():
+        problems.append(f'{file_name}：正規表現をコンパイルできません。{keyword!r} ({error})')
+
+    return problems
+
+
+def main():
+    parser = argparse.ArgumentParser(description='キーワード設定ファイルのコンパイル済バンドルの作成・検証')
+    parser.add_argument('--rebuild', action='store_true', help='キーワード設定ファイルからバンドルを作成し、キャッシュファイルを保存する')
+    parser.add_argument('--validate', action='store_true', help='キャッシュファイルのバンドルを検証する')
+    parser.add_argument('--keyword-path', help='キーワード設定ファイルフォルダパス(既定値：アプリケーション設定フォルダ配下のC7013_03)')
+    parser.add_argument('--cache-path', help='キャッシュファイルパス(既定値：設定ファイルのkeyword_bundle_config.cache_path)')
+    args = parser.parse_args()
+
+    from .C7013_03_task import get_keyword_file_names
+
+    keyword_path = pathlib.Path(args.keyword_path or const.APP_KEYWORD_FILE_PATH)
+    cache_path = pathlib.Path(args.cache_path or get_keyword_bundle_config()['cache_path'])
+    file_names = get_keyword_file_names()
+
+    if args.rebuild:
+        start = time.perf_counter()
+        bundle = KeywordBundle.build(keyword_path, file_names)
+        bundle.save(cache_path)
+        elapsed = time.perf_counter() - start
+        existing = sum(fingerprint['stat'] is not None for fingerprint in bundle.fingerprints.values())
+        print(f'キャッシュファイルを保存しました。({cache_path})')
+        print(f'  キーワード設定ファイル：{existing}/{len(file_names)}件 正規表現：{len(bundle.regex_patterns)}件 所要時間：{elapsed:.3f}秒')
+
+    if args.validate or not args.rebuild:
+        problems = validate_keyword_bundle(cache_path, keyword_path, file_names)
+
+        start = time.perf_counter()
+        KeywordBundle.build(keyword_path, file_names)
+        build_elapsed = time.perf_counter() - start
+        start = time.perf_counter()
+        cached = KeywordBundle.load(cache_path, keyword_path, file_names)
+        if cached is not None:
+            cached.refresh()
+        load_elapsed = time.perf_counter() - start
+
+        print(f'読込時間：キーワード設定ファイル {build_elapsed * 1000:.1f}ミリ秒 キャッシュファイル {load_elapsed * 1000:.1f}ミリ秒')
+        for problem in problems:
+            print(f'  {problem}')
+        print('検証結果：' + ('問題なし' if not problems else f'問題あり({len(problems)}件)'))
+        sys.exit(1 if problems else 0)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,356 @@
+# 標準ライブラリインポート
+import re
+import functools
+import collections
+
+# サードパーティライブラリインポート
+import numpy as np
+
+# プロジェクトライブラリインポート
+
+
+class KeywordMatcher(object):
+    '''
+    複数キーワードの文字列一致判定クラス
+
+    キーワード一覧からAho-Corasickのオートマトンを構築し、
+    1回の走査でテキストに含まれる全てのキーワードを検出する。
+    正規表現のメタ文字を含むキーワードも文字列としてそのまま判定する(`keyword in text`と同じ結果となる)。
+    '''
+
+    def __init__(self, keywords: list):
+        '''
+        コンストラクタ
+
+        Args:
+            keywords: キーワード一覧(重複、空文字を含んでもよい)
+        '''
+
+        # キーワード一覧
+        self.__keywords: tuple = tuple(keywords)
+        # キーワード毎の一覧上の位置({キーワード: [位置]})
+        self.__positions: dict = collections.defaultdict(list)
+        for position, keyword in enumerate(self.__keywords):
+            self.__positions[keyword].append(position)
+
+        # 空文字は全てのテキストに含まれる
+        self.__empty_positions: list = self.__positions.get('', [])
+
+        # 状態毎の遷移({文字: 遷移先の状態})、失敗時の遷移先、検出するキーワード
+        self.__goto: list = [{}]
+        self.__fail: list = [0]
+        self.__output: list = [()]
+
+        for keyword in self.__positions:
+            # 文字列以外(NaN等)のキーワードは判定対象外
+            if not isinstance(keyword, str) or not keyword:
+                continue
+            state = 0
+            for char in keyword:
+                next_state = self.__goto[state].get(char)
+                if next_state is None:
+                    next_state = len(self.__goto)
+                    self.__goto[state][char] = next_state
+                    self.__goto.append({})
+                    self.__fail.append(0)
+                    self.__output.append(())
+                state = next_state
+            self.__output[state] = (keyword,)
+
+        # 幅優先で失敗時の遷移先を設定し、遷移先で検出するキーワードを引き継ぐ
+        queue = collections.deque(self.__goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, next_state in self.__goto[state].items():
+                queue.append(next_state)
+                fail_state = self.__fail[state]
+                while fail_state and char not in self.__goto[fail_state]:
+                    fail_state = self.__fail[fail_state]
+                fail_state = self.__goto[fail_state].get(char, 0)
+                self.__fail[next_state] = fail_state
+                self.__output[next_state] = self.__output[next_state] + self.__output[fail_state]
+
+    @property
+    def keywords(self) -> tuple:
+        '''
+        キーワード一覧
+        '''
+
+        return self.__keywords
+
+    def find(self, text: str) -> list:
+        '''
+        テキストに含まれるキーワードの、キーワード一覧上の位置を昇順で返却します。
+
+        Args:
+            text: テキスト。文字列以外(NaN等)の場合は該当なしとする
+        Returns:
+            キーワード一覧上の位置のリスト
+        '''
+
+        if not isinstance(text, str):
+            return []
+
+        found = set()
+        goto = self.__goto
+        fail = self.__fail
+        output = self.__output
+        state = 0
+
+        for char in text:
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            if output[state]:
+                found.update(output[state])
+
+        positions = list(self.__empty_positions)
+        for keyword in found:
+            positions.extend(self.__positions[keyword])
+
+        return sorted(positions)
+
+    def find_keywords(self, text: str) -> list:
+        '''
+        テキストに含まれるキーワードを、キーワード一覧の順序で返却します。
+
+        Args:
+            text: テキスト。文字列以外(NaN等)の場合は該当なしとする
+        Returns:
+            キーワードのリスト
+        '''
+
+        return [self.__keywords[position] for position in self.find(text)]
+
+    def contains_any(self, text: str) -> bool:
+        '''
+        テキストにいずれかのキーワードが含まれるかを判定します。
+
+        Args:
+            text: テキスト。文字列以外(NaN等)の場合は該当なしとする
+        '''
+
+        if not isinstance(text, str):
+            return False
+
+        if self.__empty_positions:
+            return True
+
+        goto = self.__goto
+        fail = self.__fail
+        output = self.__output
+        state = 0
+
+        for char in text:
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            if output[state]:
+                return True
+
+        return False
+
+
+@functools.lru_cache(maxsize=256)
+def _get_keyword_matcher(keywords: tuple) -> KeywordMatcher:
+    '''
+    キーワード一覧毎にキャッシュしたKeywordMatcherを返却します。
+    '''
+
+    return KeywordMatcher(keywords)
+
+
+def get_keyword_matcher(keywords) -> KeywordMatcher:
+    '''
+    キーワード一覧のKeywordMatcherを取得します。
+    同じキーワード一覧(順序を含む)に対しては構築済のKeywordMatcherを再利用する。
+
+    Args:
+        keywords: キーワード一覧
+    Returns:
+        KeywordMatcher
+    '''
+
+    return _get_keyword_matcher(tuple(keywords))
+
+
+# 正規表現のメタ文字
+_REGEX_META_CHARACTERS = '.^$*+?{}[]|()\\'
+# 直前の文字を省略可能にする量指定子
+_OPTIONAL_QUANTIFIERS = '?*{'
+# 正規表現全体に作用するインラインフラグ
+_GLOBAL_INLINE_FLAGS_PATTERN = re.compile(r'\(\?[aiLmsux]+\)')
+
+
+def _has_top_level_alternation(pattern: str) -> bool:
+    '''
+    正規表現がグループ、文字クラスの外に選択(|)を含むかを判定します。
+    '''
+
+    depth = 0
+    index = 0
+    while index < len(pattern):
+        char = pattern[index]
+        if char == '\\':
+            index += 1
+        elif char == '[':
+            # 文字クラスの先頭の「^」「]」は文字として扱う
+            index += 1
+            if index < len(pattern) and pattern[index] == '^':
+                index += 1
+            if index < len(pattern) and pattern[index] == ']':
+                index += 1
+            while index < len(pattern) and pattern[index] != ']':
+                if pattern[index] == '\\':
+                    index += 1
+                index += 1
+        elif char == '(':
+            depth += 1
+        elif char == ')':
+            depth -= 1
+        elif char == '|' and depth == 0:
+            return True
+        index += 1
+
+    return False
+
+
+def required_literal(pattern: str) -> str:
+    '''
+    正規表現に一致する文字列に必ず含まれる文字列を返却します。
+    正規表現の先頭から連続するメタ文字以外の文字列のうち、量指定子の対象となる末尾の文字を除いた部分とする。
+    グループ外の選択(|)、正規表現全体に作用するインラインフラグを含む等、
+    必ず含まれる文字列を特定できない場合はNoneを返却する。
+
+    Args:
+        pattern: 正規表現
+    Returns:
+        必ず含まれる文字列。特定できない場合はNone
+    '''
+
+    if _has_top_level_alternation(pattern) or _GLOBAL_INLINE_FLAGS_PATTERN.search(pattern):
+        return None
+
+    length = 0
+    while length < len(pattern) and pattern[length] not in _REGEX_META_CHARACTERS:
+        length += 1
+
+    literal = pattern[:length]
+    if length < len(pattern) and pattern[length] in _OPTIONAL_QUANTIFIERS:
+        literal = literal[:-1]
+
+    return literal or None
+
+
+class KeywordRegexScanner(object):
+    '''
+    キーワード(正規表現)グループの一致判定クラス
+
+    複数のキーワードグループに含まれる正規表現を重複を除いてコンパイルし、
+    テキスト毎に一致するキーワードグループの集合を判定する。
+    正規表現毎に必ず含まれる文字列を含まないテキストは、その正規表現の判定を省略する。
+    必ず含まれる文字列はKeywordMatcherで1回の走査でまとめて検出する。
+    判定結果はキーワード毎に`re.search`(`Series.str.contains`)で判定した結果と同じとなる。
+    '''
+
+    def __init__(self, groups: dict, compiled_patterns: dict = None, required_literals: dict = None):
+        '''
+        コンストラクタ
+
+        Args:
+            groups: {キーワードグループ名: [正規表現]}
+            compiled_patterns: コンパイル済の正規表現({正規表現: re.Pattern})。含まれない正規表現はコンパイルする
+            required_literals: 正規表現毎の必ず含まれる文字列(required_literal)。含まれない正規表現は算出する
+        '''
+
+        compiled_patterns = compiled_patterns or {}
+        required_literals = required_literals or {}
+
+        # キーワードグループ名の一覧
+        self.__group_names: list = list(groups)
+
+        # 重複を除いた正規表現の一覧と、正規表現毎の該当するキーワードグループ
+        patterns = list(dict.fromkeys(keyword for keywords in groups.values() for keyword in keywords))
+        self.__regexes: list = [compiled_patterns.get(pattern) or re.compile(pattern) for pattern in patterns]
+        self.__pattern_groups: list = [
+            frozenset(name for name, keywords in groups.items() if pattern in keywords) for pattern in patterns]
+
+        # 必ず含まれる文字列毎の正規表現の位置、必ず含まれる文字列を特定できない正規表現の位置
+        literal_positions = collections.defaultdict(list)
+        self.__unconditional_positions: list = []
+        for position, pattern in enumerate(patterns):
+            literal = required_literals[pattern] if pattern in required_literals else required_literal(pattern)
+            if literal is None:
+                self.__unconditional_positions.append(position)
+            else:
+                literal_positions[literal].append(position)
+
+        # 必ず含まれる文字列の検出用オートマトンと、検出した文字列の位置毎の正規表現の位置
+        self.__literal_matcher: KeywordMatcher = KeywordMatcher(list(literal_positions))
+        self.__literal_positions: list = list(literal_positions.values())
+
+    @property
+    def group_names(self) -> list:
+        '''
+        キーワードグループ名の一覧
+        '''
+
+        return self.__group_names
+
+    def scan(self, text: str) -> set:
+        '''
+        テキストに一致するキーワードグループ名の集合を返却します。
+
+        Args:
+            text: テキスト。文字列以外(NaN等)の場合は該当なしとする
+        Returns:
+            キーワードグループ名の集合
+        '''
+
+        matched = set()
+        if not isinstance(text, str):
+            return matched
+
+        regexes = self.__regexes
+        pattern_groups = self.__pattern_groups
+
+        # テキストに含まれる必ず含まれる文字列を1回の走査で検出し、判定対象の正規表現を絞り込む
+        literal_positions = self.__literal_positions
+        candidates = [position for literal_position in self.__literal_matcher.find(text) for position in literal_positions[literal_position]]
+        candidates.extend(self.__unconditional_positions)
+
+        for position in candidates:
+            # 該当するキーワードグループが全て一致済の場合は判定を省略する
+            if pattern_groups[position] <= matched:
+                continue
+            if regexes[position].search(text):
+                matched |= pattern_groups[position]
+
+        return matched
+
+    def scan_texts(self, texts) -> dict:
+        '''
+        テキスト毎に一致するキーワードグループを判定します。
+        同じテキストは1回のみ判定する。
+
+        Args:
+            texts: テキストの一覧
+        Returns:
+            {キーワードグループ名: 一致するかのbool配列}
+        '''
+
+        texts = list(texts)
+        results = {name: np.zeros(len(texts), dtype=bool) for name in self.__group_names}
+
+        scanned = {}
+        for index, text in enumerate(texts):
+            # NaN等は同一判定できないため、文字列のみ判定結果を再利用する
+            matched = scanned.get(text) if isinstance(text, str) else None
+            if matched is None:
+                matched = self.scan(text)
+                if isinstance(text, str):
+                    scanned[text] = matched
+            for name in matched:
+                results[name][index] = True
+
+        return results
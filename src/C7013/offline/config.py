@@ -0,0 +1,33 @@
+# 標準ライブラリインポート
+import pathlib
+
+# サードパーティライブラリインポート
+
+# プロジェクトライブラリインポート
+from .. import const
+
+# オフライン用DBファイル名
+OFFLINE_DB_FILE_NAME: str = 'offline.sqlite3'
+
+
+def get_offline_config() -> dict:
+    '''
+    オフライン用の代替実装の設定を取得します。
+
+    設定ファイルのoffline_configで以下を指定する。
+        db_path: オフライン用DBファイルパス(既定値：アプリケーションデータフォルダ配下のoffline.sqlite3)
+        crmdb_latency: CRMDBの1クエリ毎の遅延(秒)
+        nwmdb_latency: NWMDBの1クエリ毎の遅延(秒)
+        dcrm_latency: Dynamics CRMの1要求毎の遅延(秒)
+        fastsearch_latency: FastSearchの1検索毎の遅延(秒)
+    '''
+
+    offline_config = const.APP_CONFIG.get('offline_config', {})
+
+    return {
+        'db_path': pathlib.Path(offline_config.get('db_path') or const.APP_DATA_PATH / OFFLINE_DB_FILE_NAME),
+        'crmdb_latency': offline_config.get('crmdb_latency', 0.0),
+        'nwmdb_latency': offline_config.get('nwmdb_latency', 0.0),
+        'dcrm_latency': offline_config.get('dcrm_latency', 0.0),
+        'fastsearch_latency': offline_config.get('fastsearch_latency', 0.0),
+    }
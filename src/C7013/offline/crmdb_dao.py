@@ -0,0 +1,213 @@
+# 標準ライブラリインポート
+
+# サードパーティライブラリインポート
+
+# プロジェクトライブラリインポート
+from ..dao.crmdb_dao import CrmDBDao
+from . import tsql
+from .config import get_offline_config
+
+# GUID列の型(SQL Serverと同様に大文字小文字を区別せずに比較する)
+GUID: str = f'{tsql.UNIQUEIDENTIFIER} COLLATE NOCASE'
+
+# ランク毎の設定列の接尾辞
+RANK_SUFFIXES = ['a', 'b', 'c', 'd', 'none']
+
+# CRMDBのテーブル定義(本アプリケーションで参照する列のみ)
+CRMDB_TABLES = {
+    'new_commission': [
+        ('new_commissionid', GUID),
+        ('new_comprehensivecompany_to', GUID),
+        ('new_division_to', GUID),
+        ('new_section_to', GUID),
+        ('new_unit_to', GUID),
+        ('new_commissionclassification', 'INTEGER'),
+        ('new_sourcecompany', 'TEXT'),
+        ('new_contractorname', 'TEXT'),
+        ('new_next_account', 'TEXT'),
+        ('new_third_person_application', 'INTEGER'),
+        ('new_ordertelephonenumber', 'TEXT'),
+        ('new_contract_id', 'TEXT'),
+        ('new_colab_line', 'INTEGER'),
+        ('new_contents_commission', 'TEXT'),
+        ('new_primarycorrespondenceway', 'INTEGER'),
+        ('new_personincharge', 'TEXT'),
+        ('new_connectiontelephonenumber1', 'TEXT'),
+        ('new_ordercontents', 'INTEGER'),
+        ('new_rank', 'INTEGER'),
+        ('new_rank_system', 'INTEGER'),
+        ('new_draft', 'INTEGER'),
+        ('statecode', 'INTEGER'),
+        ('modifiedon', 'TEXT'),
+    ],
+    'new_commissionhistory': [
+        ('new_commission', GUID),
+        ('new_unit_from', GUID),
+        ('new_unit_to', GUID),
+        ('statecode', 'INTEGER'),
+        ('createdon', 'TEXT'),
+    ],
+    'new_autoagent': [
+        ('new_autoagentid', GUID),
+        ('new_autoagent_unit', GUID),
+        ('new_agent_window_unit', GUID),
+        ('statecode', 'INTEGER'),
+    ],
+    'businessunit': [
+        ('businessunitid', GUID),
+        ('new_busho_code', 'TEXT'),
+    ],
+    'systemuser': [
+        ('systemuserid', GUID),
+        ('new_section', GUID),
+    ],
+    'team': [
+        ('teamid', GUID),
+        ('name', 'TEXT'),
+    ],
+    'new_autoagent_thru_brnc_commission': [
+        ('new_autoagent_thru_brnc_commissionid', GUID),
+        ('new_autoagent', GUID),
+        ('new_unit', GUID),
+        ('statecode', 'INTEGER'),
+    ] + [(f'new_rank_{kind}_{suffix}', 'INTEGER') for kind in ('account', 'appoint', 'priority') for suffix in RANK_SUFFIXES],
+    'new_autoagent_handle_area': [
+        ('new_autoagent_thru_brnc_commission', GUID),
+        ('new_addresscode', 'TEXT'),
+        ('statecode', 'INTEGER'),
+    ],
+    'new_autoagent_branch_account': [
+        ('new_autoagent_branch_accountid', GUID),
+        ('new_autoagent_thru_brnc_commission', GUID),
+        ('new_section', GUID),
+        ('statecode', 'INTEGER'),
+    ],
+    'new_autoagent_notouch_commission': [
+        ('new_autoagent_notouch_commissionid', GUID),
+        ('new_autoagent', GUID),
+        ('new_commission_unit', GUID),
+        ('new_centeraccount', GUID),
+        ('statecode', 'INTEGER'),
+    ] + [(f'new_rank_notouch_{suffix}', 'INTEGER') for suffix in RANK_SUFFIXES],
+    'new_autoagent_normal_agent': [
+        ('new_autoagent', GUID),
+        ('new_unit', GUID),
+        ('new_third_person_application', 'INTEGER'),
+        ('new_colab_line', 'INTEGER'),
+        ('new_agentrate_instant', 'REAL'),
+        ('new_agentrate_instant_a', 'REAL'),
+        ('statecode', 'INTEGER'),
+    ] + [(f'new_rank_normal_{suffix}', 'INTEGER') for suffix in RANK_SUFFIXES],
+    'new_autoagent_untargeted_keyword': [
+        ('new_autoagent', GUID),
+        ('new_autoagent_untargeted_keyword', 'TEXT'),
+        ('statecode', 'INTEGER'),
+    ],
+    'new_autoagent_policy_keyword': [
+        ('new_autoagent', GUID),
+        ('new_autoagent_policy_keyword', 'TEXT'),
+        ('new_policy_word', 'TEXT'),
+        ('statecode', 'INTEGER'),
+    ],
+    'new_autoagent_specific_vendor': [
+        ('new_autoagent', GUID),
+        ('new_autoagent_specific_vendor', 'TEXT'),
+        ('statecode', 'INTEGER'),
+    ],
+    'new_telephonenumber': [
+        ('new_account', GUID),
+        ('new_telephonenumberhynophenate', 'TEXT'),
+        ('statecode', 'INTEGER'),
+    ],
+    'Account': [
+        ('AccountId', GUID),
+        ('new_accountpersonincharge', GUID),
+        ('new_accountpersoninchargeName', 'TEXT'),
+        ('new_customerid_accountaddresscode', 'TEXT'),
+        ('StateCode', 'INTEGER'),
+    ],
+    'new_addresscode': [
+        ('new_new_addressname', 'TEXT'),
+        ('new_addresscode', 'TEXT'),
+        ('new_prefecturename', 'TEXT'),
+        ('new_municipalityname', 'TEXT'),
+        ('new_largersectionalias', 'TEXT'),
+        ('new_sectioncityblock', 'TEXT'),
+        ('new_zipcode', 'TEXT'),
+    ],
+    'RGLT_INFO': [
+        ('RGLT_APID', 'TEXT'),
+        ('REC_NO', 'TEXT'),
+        ('RGLT_KIKAN_STRT', 'TEXT'),
+        ('RGLT_KIKAN_END', 'TEXT'),
+        ('RGLT_TIME_STRT', 'TEXT'),
+        ('RGLT_TIME_END', 'TEXT'),
+    ] + [(f'SPR{i}', 'TEXT') for i in range(1, 11)],
+}
+
+# 検索条件に使用する列の索引(テーブル名, 列名リスト)
+CRMDB_INDEXES = [
+    ('new_commission', ['new_commissionid']),
+    ('new_commission', ['statecode', 'new_draft']),
+    ('new_commissionhistory', ['new_unit_to', 'createdon']),
+    ('new_autoagent', ['new_autoagent_unit']),
+    ('businessunit', ['businessunitid']),
+    ('businessunit', ['new_busho_code']),
+    ('new_autoagent_thru_brnc_commission', ['new_autoagent']),
+    ('new_autoagent_handle_area', ['new_autoagent_thru_brnc_commission', 'new_addresscode']),
+    ('new_autoagent_normal_agent', ['new_autoagent']),
+    ('new_autoagent_normal_agent', ['new_unit']),
+    ('new_telephonenumber', ['new_telephonenumberhynophenate']),
+    ('Account', ['new_customerid_accountaddresscode']),
+]
+
+
+def create_tables(conn, tables: dict, indexes: list = ()) -> None:
+    '''
+    テーブルと索引が存在しない場合に作成します。
+
+    Args:
+        conn: SQLite接続
+        tables: テーブル定義({テーブル名: [(列名, 型)]})
+        indexes: 索引定義([(テーブル名, 列名リスト)])
+    '''
+
+    for table_name, columns in tables.items():
+        column_definitions = ', '.join(f'{column} {column_type}' for column, column_type in columns)
+        conn.execute(f'CREATE TABLE IF NOT EXISTS {table_name} ({column_definitions})')
+
+    for table_name, columns in indexes:
+        index_name = f'ix_{table_name}_{"_".join(columns)}'
+        conn.execute(f'CREATE INDEX IF NOT EXISTS {index_name} ON {table_name} ({", ".join(columns)})')
+
+    conn.commit()
+
+
+class OfflineCrmDBDao(CrmDBDao):
+    '''
+    CRMDBのオフライン用Data Access Object
+    CRMDBに替えてSQLiteに接続し、T-SQLを変換して実行する。
+    '''
+
+    def __init__(self, db_path=None, latency: float = None):
+        '''
+        Args:
+            db_path: オフライン用DBファイルパス。省略時は設定ファイルのoffline_config.db_path
+            latency: 1クエリ毎の遅延(秒)。省略時は設定ファイルのoffline_config.crmdb_latency
+        '''
+        offline_config = get_offline_config()
+        self._db_path = db_path or offline_config['db_path']
+        self._latency: float = offline_config['crmdb_latency'] if latency is None else latency
+        super().__init__()
+
+    def _connect(self) -> tsql.TsqlConnection:
+        '''
+        新しいDB接続を生成する
+        '''
+        return tsql.connect(self._db_path, self._latency)
+
+    def create_tables(self) -> None:
+        '''
+        CRMDBのテーブルが存在しない場合に作成する
+        '''
+        create_tables(self.conn(), CRMDB_TABLES, CRMDB_INDEXES)
@@ -0,0 +1,112 @@
+# 標準ライブラリインポート
+import copy
+import time
+import uuid
+import logging
+import threading
+
+# サードパーティライブラリインポート
+
+# プロジェクトライブラリインポート
+from .. import utils
+from ..dcrm_helper import DcrmHelper
+from ..dto.dcrm_sdk import Entity
+from .config import get_offline_config
+
+
+class OfflineDcrmHelper(DcrmHelper):
+    '''
+    Dynamics CRMのオフライン用Helperクラス
+    Dynamics CRMに替えて、作成・更新されたエンティティをメモリ上に保持する。
+    作成時のGUIDは作成順の連番とし、同じ入力に対して同じ結果となるようにする。
+    '''
+
+    def __init__(self, latency: float = None):
+        '''
+        Args:
+            latency: 1要求毎の遅延(秒)。省略時は設定ファイルのoffline_config.dcrm_latency
+        '''
+        self._logger: logging.Logger = utils.getLogger()
+        self._service = None
+        self._lock = threading.RLock()
+        # 1要求毎の遅延(秒)
+        self._latency: float = get_offline_config()['dcrm_latency'] if latency is None else latency
+        # エンティティ({エンティティの物理名: {GUID: 属性}})
+        self._entities: dict = {}
+        # 作成したエンティティ数
+        self._created_count: int = 0
+        # 更新要求数
+        self._updated_count: int = 0
+
+    def loadDlls(self) -> None:
+        '''
+        .NET ライブラリは使用しないため、何もしない
+        '''
+
+    def Conn(self) -> None:
+        '''
+        Dynamics CRMに接続します(接続の遅延のみ再現する)
+        '''
+        time.sleep(self._latency)
+
+    def Close(self) -> None:
+        '''
+        Dynamics CRMを閉じます(何もしない)
+        '''
+
+    def UpdateEntity(self, entity: Entity) -> None:
+        '''
+        エンティティを更新します
+
+        Args:
+            entity: Entity python wrapper object
+        '''
+        time.sleep(self._latency)
+        with self._lock:
+            attributes = self._entities.setdefault(entity.LogicalName, {}).setdefault(uuid.UUID(str(entity.Id)), {})
+            attributes.update(copy.deepcopy(entity.Attributes))
+            self._updated_count += 1
+
+    def CreateEntity(self, entity: Entity) -> uuid.UUID:
+        '''
+        エンティティを作成します
+
+        Args:
+            entity: Entity python wrapper object
+
+        Returns:
+            作成されたEntityのGuid
+        '''
+        time.sleep(self._latency)
+        with self._lock:
+            self._created_count += 1
+            entity_id = uuid.UUID(int=self._created_count)
+            self._entities.setdefault(entity.LogicalName, {})[entity_id] = copy.deepcopy(entity.Attributes)
+        return entity_id
+
+    @property
+    def created_count(self) -> int:
+        '''
+        作成したエンティティ数
+        '''
+        return self._created_count
+
+    @property
+    def updated_count(self) -> int:
+        '''
+        更新要求数
+        '''
+        return self._updated_count
+
+    def entities(self, logicalName: str) -> dict:
+        '''
+        保持しているエンティティを取得します
+
+        Args:
+            logicalName: エンティティの物理名
+
+        Returns:
+            {GUID: 属性}
+        '''
+        with self._lock:
+            return copy.deepcopy(self._entities.get(logicalName, {}))
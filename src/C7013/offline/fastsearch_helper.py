@@ -0,0 +1,92 @@
+# 標準ライブラリインポート
+import time
+import logging
+
+# サードパーティライブラリインポート
+
+# プロジェクトライブラリインポート
+from .. import utils
+from ..fastsearch_helper import FastSearchHelper
+from . import tsql
+from .config import get_offline_config
+from .crmdb_dao import create_tables
+
+# FastSearchの検索対象(顧客事業所)のテーブル定義
+FASTSEARCH_TABLES = {
+    'fastsearch_account': [
+        ('customerid', 'TEXT'),
+        ('customername', 'TEXT'),
+        ('customernamesort', 'TEXT'),
+        ('accountaddresscode', 'TEXT'),
+        ('accountaddress', 'TEXT'),
+    ],
+}
+
+
+class OfflineFastSearchHelper(FastSearchHelper):
+    '''
+    SharepointのFast検索のオフライン用Helperクラス
+    接続時にオフライン用DBの顧客事業所をメモリ上の索引に読み込み、お客様名と住所コードの完全一致で検索する。
+    '''
+
+    def __init__(self, db_path=None, latency: float = None):
+        '''
+        Args:
+            db_path: オフライン用DBファイルパス。省略時は設定ファイルのoffline_config.db_path
+            latency: 1検索毎の遅延(秒)。省略時は設定ファイルのoffline_config.fastsearch_latency
+        '''
+        offline_config = get_offline_config()
+        self._logger: logging.Logger = utils.getLogger()
+        self._service = None
+        self._db_path = db_path or offline_config['db_path']
+        # 1検索毎の遅延(秒)
+        self._latency: float = offline_config['fastsearch_latency'] if latency is None else latency
+        # 検索索引({(お客様名, 住所コード): 顧客事業所})
+        self._index: dict = None
+
+    def loadDlls(self) -> None:
+        '''
+        .NET ライブラリは使用しないため、何もしない
+        '''
+
+    def Conn(self) -> None:
+        '''
+        検索索引を読み込みます(読込済の場合は何もしない)
+        '''
+        if self._index is not None:
+            return
+
+        self._index = {}
+        conn = tsql.connect(self._db_path)
+        try:
+            create_tables(conn, FASTSEARCH_TABLES)
+            with conn.cursor(as_dict=True) as cursor:
+                # 検索結果と同様にお客様名ソート順、住所コード順で最初の顧客事業所を検索結果とする
+                cursor.execute('SELECT * FROM fastsearch_account ORDER BY customernamesort DESC, accountaddresscode DESC')
+                for row in cursor:
+                    self._index[(row['customername'], row['accountaddresscode'])] = row
+        finally:
+            conn.close()
+
+        self.logger.debug(f'FastSearch検索索引を読み込みました。件数：{len(self._index)}')
+
+    def Close(self) -> None:
+        '''
+        検索索引は次回の接続時にも使用するため、何もしない
+        '''
+
+    def FindAccount(self, customername, addresscode) -> dict:
+        '''
+        顧客事業所を検索する
+
+        Args:
+            customername: お客様名
+            addresscode: 住所コード
+        Returns:
+            検索結果が存在しない場合、Noneを返却する
+            検索結果が存在する場合、最初のレコードdictで返却する
+        '''
+        time.sleep(self._latency)
+        row = self._index.get((customername, addresscode))
+
+        return dict(row) if row is not None else None
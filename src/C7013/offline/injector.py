@@ -0,0 +1,58 @@
+'''
+オフライン用の代替実装のinject設定
+
+CRMDB、NWMDB、Dynamics CRM、FastSearchをオフライン用の代替実装に差し替え、
+外部接続の無い環境で自動差配処理(C7013_task)を実行できるようにする。
+各代替実装の遅延は設定ファイルのoffline_configで指定する。
+
+使用例:
+    import inject
+    from C7013.offline import injector
+    inject.configure(injector.configure)
+    injector.create_database()
+'''
+
+# 標準ライブラリインポート
+
+# サードパーティライブラリインポート
+import inject
+
+# プロジェクトライブラリインポート
+from ..dao.crmdb_dao import CrmDBDao
+from ..dao.nwmdb_dao import NwmDBDao
+from ..dcrm_helper import DcrmHelper
+from ..fastsearch_helper import FastSearchHelper
+from . import tsql
+from .config import get_offline_config
+from .crmdb_dao import OfflineCrmDBDao, create_tables, CRMDB_TABLES, CRMDB_INDEXES
+from .nwmdb_dao import OfflineNwmDBDao, NWMDB_TABLES, NWMDB_INDEXES
+from .dcrm_helper import OfflineDcrmHelper
+from .fastsearch_helper import OfflineFastSearchHelper, FASTSEARCH_TABLES
+
+
+def configure(binder: inject.Binder) -> None:
+    '''
+    外部接続をオフライン用の代替実装に差し替えるinject設定
+    '''
+
+    binder.bind_to_constructor(CrmDBDao, OfflineCrmDBDao)
+    binder.bind_to_constructor(NwmDBDao, OfflineNwmDBDao)
+    binder.bind_to_constructor(DcrmHelper, OfflineDcrmHelper)
+    binder.bind_to_constructor(FastSearchHelper, OfflineFastSearchHelper)
+
+
+def create_database(db_path=None) -> None:
+    '''
+    オフライン用DBのテーブルが存在しない場合に作成します。
+
+    Args:
+        db_path: オフライン用DBファイルパス。省略時は設定ファイルのoffline_config.db_path
+    '''
+
+    conn = tsql.connect(db_path or get_offline_config()['db_path'])
+    try:
+        create_tables(conn, CRMDB_TABLES, CRMDB_INDEXES)
+        create_tables(conn, NWMDB_TABLES, NWMDB_INDEXES)
+        create_tables(conn, FASTSEARCH_TABLES)
+    finally:
+        conn.close()
@@ -0,0 +1,55 @@
+# 標準ライブラリインポート
+
+# サードパーティライブラリインポート
+
+# プロジェクトライブラリインポート
+from ..dao.nwmdb_dao import NwmDBDao
+from . import tsql
+from .config import get_offline_config
+from .crmdb_dao import create_tables
+
+# NWMDBのテーブル定義(本アプリケーションで参照する列のみ)
+NWMDB_TABLES = {
+    'LIST_SRCH_NO': [
+        ('SRCH_KEY_KBN', 'INTEGER'),
+        ('NO_CLAS_CD', 'INTEGER'),
+        ('VARI_NO', 'TEXT'),
+        ('CUST_ID', 'TEXT'),
+        ('SETLOC_ADDR_CD', 'TEXT'),
+    ],
+}
+
+# 検索条件に使用する列の索引(テーブル名, 列名リスト)
+NWMDB_INDEXES = [
+    ('LIST_SRCH_NO', ['VARI_NO']),
+]
+
+
+class OfflineNwmDBDao(NwmDBDao):
+    '''
+    NWMDBのオフライン用Data Access Object
+    NWMDBに替えてSQLiteに接続する。
+    '''
+
+    def __init__(self, db_path=None, latency: float = None):
+        '''
+        Args:
+            db_path: オフライン用DBファイルパス。省略時は設定ファイルのoffline_config.db_path
+            latency: 1クエリ毎の遅延(秒)。省略時は設定ファイルのoffline_config.nwmdb_latency
+        '''
+        offline_config = get_offline_config()
+        self._db_path = db_path or offline_config['db_path']
+        self._latency: float = offline_config['nwmdb_latency'] if latency is None else latency
+        super().__init__()
+
+    def _connect(self) -> tsql.TsqlConnection:
+        '''
+        新しいDB接続を生成する
+        '''
+        return tsql.connect(self._db_path, self._latency)
+
+    def create_tables(self) -> None:
+        '''
+        NWMDBのテーブルが存在しない場合に作成する
+        '''
+        create_tables(self.conn(), NWMDB_TABLES, NWMDB_INDEXES)
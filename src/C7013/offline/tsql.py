@@ -0,0 +1,286 @@
+'''
+SQL Server向けのSQL(T-SQL)をSQLiteで実行するための変換処理
+
+本アプリケーションで使用している構文のみを対象とする。
+    NTTEAST_MSCRM.dbo.テーブル名 → テーブル名
+    WITH(NOLOCK) → 削除
+    SELECT TOP n / SELECT TOP(n) → SELECT ... LIMIT n
+    ISNULL → IFNULL、LEN → LENGTH、SUBSTRING → SUBSTR、LEFT(x, n) → SUBSTR(x, 1, n)
+    文字列の + 演算子 → ||
+    CONVERT、DATEADD、GETUTCDATE → 同名のユーザー定義関数
+    %s(pymssqlのパラメータ) → ?
+'''
+
+# 標準ライブラリインポート
+import re
+import time
+import uuid
+import sqlite3
+import datetime
+import calendar
+
+# GUID列の型名(この型で定義した列はUUIDに変換して返却する)
+UNIQUEIDENTIFIER: str = 'UNIQUEIDENTIFIER'
+
+# データベース名.スキーマ名
+_DATABASE_SCHEMA_PATTERN = re.compile(r'\b(?:NTTEAST_MSCRM|CrmCustomDB)\.dbo\.', re.IGNORECASE)
+# テーブルヒント
+_NOLOCK_PATTERN = re.compile(r'\bWITH\s*\(\s*NOLOCK\s*\)', re.IGNORECASE)
+# TOP句
+_TOP_PATTERN = re.compile(r'\bSELECT\s+TOP\s*(?:\(\s*(\d+)\s*\)|(\d+))', re.IGNORECASE)
+# 文字列リテラルの前後の + 演算子
+_CONCAT_BEFORE_PATTERN = re.compile(r"\+(?=\s*')")
+_CONCAT_AFTER_PATTERN = re.compile(r"(?<=')(\s*)\+")
+# 単純に置換する関数名
+_FUNCTION_NAMES = {
+    'ISNULL': 'IFNULL',
+    'LEN': 'LENGTH',
+    'SUBSTRING': 'SUBSTR',
+}
+# 日時の書式
+_DATETIME_FORMAT: str = '%Y-%m-%d %H:%M:%S'
+
+
+def _split_call(sql: str, start: int) -> tuple:
+    '''
+    関数呼出しの引数を分割します。
+
+    Args:
+        sql: SQL
+        start: 開き括弧の位置
+    Returns:
+        (引数リスト, 閉じ括弧の次の位置)
+    '''
+
+    args = []
+    depth = 0
+    in_string = False
+    arg_start = start + 1
+
+    for pos in range(start, len(sql)):
+        char = sql[pos]
+        if in_string:
+            if char == "'":
+                in_string = False
+        elif char == "'":
+            in_string = True
+        elif char == '(':
+            depth += 1
+        elif char == ')':
+            depth -= 1
+            if depth == 0:
+                args.append(sql[arg_start:pos].strip())
+                return args, pos + 1
+        elif char == ',' and depth == 1:
+            args.append(sql[arg_start:pos].strip())
+            arg_start = pos + 1
+
+    raise ValueError(f'括弧が閉じていません。{sql[start:start + 50]}')
+
+
+def _replace_call(sql: str, name: str, build) -> str:
+    '''
+    関数呼出しを変換します。
+
+    Args:
+        sql: SQL
+        name: 関数名
+        build: 引数リストから変換後の関数呼出しを生成する関数
+    Returns:
+        変換後SQL
+    '''
+
+    pattern = re.compile(r'\b' + name + r'\s*\(', re.IGNORECASE)
+    pos = 0
+
+    while True:
+        match = pattern.search(sql, pos)
+        if match is None:
+            return sql
+
+        args, end = _split_call(sql, match.end() - 1)
+        replaced = build([_replace_call(arg, name, build) for arg in args])
+        sql = sql[:match.start()] + replaced + sql[end:]
+        pos = match.start() + len(replaced)
+
+
+def rewrite(sql: str, has_parameters: bool = False) -> str:
+    '''
+    T-SQLをSQLiteで実行可能なSQLに変換します。
+
+    Args:
+        sql: T-SQL
+        has_parameters: パラメータ(%s)を使用しているか
+    Returns:
+        SQLite用SQL
+    '''
+
+    sql = _DATABASE_SCHEMA_PATTERN.sub('', sql)
+    sql = _NOLOCK_PATTERN.sub('', sql)
+
+    limit = None
+    match = _TOP_PATTERN.search(sql)
+    if match is not None:
+        limit = match.group(1) or match.group(2)
+        sql = sql[:match.start()] + 'SELECT' + sql[match.end():]
+
+    for name, sqlite_name in _FUNCTION_NAMES.items():
+        sql = re.sub(r'\b' + name + r'\s*\(', sqlite_name + '(', sql, flags=re.IGNORECASE)
+
+    sql = _replace_call(sql, 'LEFT', lambda args: f'SUBSTR({args[0]}, 1, {args[1]})')
+    # データ型、日付部分の指定は文字列として関数に渡す
+    sql = _replace_call(sql, 'CONVERT', lambda args: f"CONVERT('{args[0]}', {', '.join(args[1:])})")
+    sql = _replace_call(sql, 'DATEADD', lambda args: f"DATEADD('{args[0]}', {', '.join(args[1:])})")
+
+    sql = _CONCAT_BEFORE_PATTERN.sub('||', sql)
+    sql = _CONCAT_AFTER_PATTERN.sub(r'\1||', sql)
+
+    if has_parameters:
+        sql = sql.replace('%s', '?')
+
+    if limit is not None:
+        sql = sql.rstrip().rstrip(';') + f'\nLIMIT {limit}'
+
+    return sql
+
+
+def _parse_datetime(value) -> datetime.datetime:
+    '''
+    日時文字列を日時に変換します。
+    '''
+
+    if value is None:
+        return None
+
+    value = str(value).replace('/', '-').replace('T', ' ')
+    for fmt in (_DATETIME_FORMAT, '%Y-%m-%d %H:%M:%S.%f', '%Y-%m-%d %H:%M', '%Y-%m-%d'):
+        try:
+            return datetime.datetime.strptime(value, fmt)
+        except ValueError:
+            continue
+
+    raise ValueError(f'日時に変換できません。{value}')
+
+
+def _convert(data_type: str, value, style: int = None):
+    '''
+    CONVERT関数(DATETIME、VARCHARのみ対応)
+    '''
+
+    if value is None:
+        return None
+
+    data_type = data_type.upper()
+    if data_type.startswith('DATETIME'):
+        return _parse_datetime(value).strftime(_DATETIME_FORMAT)
+
+    if data_type.startswith('VARCHAR'):
+        if style == 111:
+            return _parse_datetime(value).strftime('%Y/%m/%d')
+        if style in (20, 120):
+            return _parse_datetime(value).strftime(_DATETIME_FORMAT)
+        return str(value)
+
+    raise ValueError(f'未対応のデータ型です。{data_type}')
+
+
+def _dateadd(part: str, number: int, value) -> str:
+    '''
+    DATEADD関数(YEAR、MONTH、DAY、HOUR、MINUTE、SECONDのみ対応)
+    '''
+
+    if value is None:
+        return None
+
+    value = _parse_datetime(value)
+    part = part.upper()
+
+    if part in ('YEAR', 'MONTH'):
+        months = value.month - 1 + (number * 12 if part == 'YEAR' else number)
+        year = value.year + months // 12
+        month = months % 12 + 1
+        day = min(value.day, calendar.monthrange(year, month)[1])
+        value = value.replace(year=year, month=month, day=day)
+    else:
+        value = value + datetime.timedelta(**{part.lower() + 's': number})
+
+    return value.strftime(_DATETIME_FORMAT)
+
+
+def _getutcdate() -> str:
+    '''
+    GETUTCDATE関数
+    '''
+
+    return datetime.datetime.utcnow().strftime(_DATETIME_FORMAT)
+
+
+sqlite3.register_converter(UNIQUEIDENTIFIER, lambda value: uuid.UUID(value.decode('utf-8')))
+
+
+class TsqlCursor(sqlite3.Cursor):
+    '''
+    T-SQLを変換して実行するカーソルクラス
+    pymssql、cx_Oracleのカーソルと同様にwith文で使用できる。
+    '''
+
+    def execute(self, sql: str, parameters=()):
+        time.sleep(self.connection.latency)
+        return super().execute(rewrite(sql, bool(parameters)), parameters)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+
+def _dict_factory(cursor: sqlite3.Cursor, row: tuple) -> dict:
+    '''
+    行を列名をキーとするdictで返却します。
+    '''
+
+    return {description[0]: value for description, value in zip(cursor.description, row)}
+
+
+class TsqlConnection(sqlite3.Connection):
+    '''
+    T-SQLを変換して実行するSQLite接続クラス
+    '''
+
+    # 1クエリ毎の遅延(秒)
+    latency: float = 0.0
+
+    def cursor(self, as_dict: bool = False) -> TsqlCursor:
+        '''
+        カーソルを生成します。
+
+        Args:
+            as_dict: 行をdictで返却するか(pymssqlと同様)
+        '''
+
+        cursor = super().cursor(TsqlCursor)
+        if as_dict:
+            cursor.row_factory = _dict_factory
+        return cursor
+
+
+def connect(db_path, latency: float = 0.0) -> TsqlConnection:
+    '''
+    T-SQLを変換して実行するSQLite接続を生成します。
+
+    Args:
+        db_path: DBファイルパス
+        latency: 1クエリ毎の遅延(秒)
+    Returns:
+        SQLite接続
+    '''
+
+    conn = sqlite3.connect(str(db_path), factory=TsqlConnection, detect_types=sqlite3.PARSE_DECLTYPES, check_same_thread=False)
+    conn.latency = latency
+    conn.create_function('CONVERT', 2, _convert)
+    conn.create_function('CONVERT', 3, _convert)
+    conn.create_function('DATEADD', 3, _dateadd)
+    conn.create_function('GETUTCDATE', 0, _getutcdate)
+
+    return conn
@@ -13,6 +13,78 @@ from sklearn.preprocessing import OneHotEncoder
 from . import const
 from . import utils
 
+
+def _create_one_hot_index(keys: List[int]) -> np.ndarray:
+    '''
+    値→One-Hotの列位置のルックアップテーブルを作成する
+    キーに含まれない値の位置は-1とする
+
+    Args:
+        keys: One-Hotの列順のキー
+    Returns:
+        値をインデックスとする列位置の配列
+    '''
+
+    index = np.full(max(keys) + 1, -1, dtype=np.int64)
+    index[keys] = np.arange(len(keys))
+    return index
+
+
+def _one_hot_encode_array(values: np.ndarray, index: np.ndarray, width: int, out: np.ndarray = None) -> np.ndarray:
+    '''
+    値の配列をルックアップテーブルでまとめてOne-Hotエンコードする
+    ルックアップテーブルにない値(欠損値、小数、数値以外を含む)は該当なし(全て0)とする
+
+    Args:
+        values: 値の配列
+        index: 値→One-Hotの列位置のルックアップテーブル
+        width: One-Hotの列数
+        out: 結果を書き込む配列(件数×列数)、指定しない場合は新しいint32の配列を作成する
+    Returns:
+        One-Hotエンコードされた値の配列(件数×列数)
+    '''
+
+    values = np.asarray(values).reshape(-1)
+    if values.dtype.kind not in 'iuf':
+        # 数値以外(None、文字列等)は該当なしとする
+        values = np.array([value if isinstance(value, (int, float, np.integer, np.floating)) else np.nan for value in values],
+                          dtype=np.float64)
+
+    if out is None:
+        out = np.zeros((len(values), width), dtype=np.int32)
+    else:
+        out[...] = 0
+
+    # ルックアップテーブルの範囲内の整数値のみ列位置を求める
+    valid = (values >= 0) & (values < len(index))
+    if values.dtype.kind == 'f':
+        valid &= values == np.floor(values)
+    positions = np.full(len(values), -1, dtype=np.int64)
+    positions[valid] = index[values[valid].astype(np.int64)]
+
+    rows = np.flatnonzero(positions >= 0)
+    out[rows, positions[rows]] = 1
+
+    return out
+
+
+def _one_hot_decode_array(one_hot: np.ndarray, keys: np.ndarray) -> np.ndarray:
+    '''
+    One-Hotされた値の配列をargmaxでまとめてデコードする
+    1つの列のみ1、それ以外が0の行以外は0とする
+
+    Args:
+        one_hot: One-Hotされた値の配列(件数×列数)
+        keys: One-Hotの列順のキー
+    Returns:
+        デコードした値の配列
+    '''
+
+    one_hot = np.asarray(one_hot)
+    valid = ((one_hot == 1).sum(axis=1) == 1) & ((one_hot == 0) | (one_hot == 1)).all(axis=1)
+
+    return np.where(valid, keys[np.argmax(one_hot, axis=1)], 0)
+
 ordercontents_onehot_dict: Dict[int, np.array] = {
     1: np.array([1, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0], dtype=np.int32),  # 新設
     2: np.array([0, 1, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0], dtype=np.int32),  # 移転
@@ -29,6 +101,9 @@ ordercontents_onehot_dict: Dict[int, np.array] = {
 }
 ordercontents_onehot_zero: np.ndarray = np.array(
     [0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0], dtype=np.int32)  # 該当なし
+# One-Hotの列順の当初注文内容、当初注文内容→列位置のルックアップテーブル
+ordercontents_onehot_keys: np.ndarray = np.array(list(ordercontents_onehot_dict.keys()), dtype=np.int32)
+ordercontents_onehot_index: np.ndarray = _create_one_hot_index(list(ordercontents_onehot_dict.keys()))
 
 
 def ordercontents_one_hot_encode(ordercontents: int) -> np.ndarray:
@@ -58,10 +133,38 @@ def ordercontents_one_hot_decode(ordercontents_onehot: np.ndarray) -> int:
         当初注文内容
     '''
 
-    for key, value in ordercontents_onehot_dict.items():
-        if np.all(value == ordercontents_onehot):
-            return key
-    return 0
+    if np.shape(ordercontents_onehot) != ordercontents_onehot_zero.shape:
+        return 0
+    return int(ordercontents_one_hot_decode_array(np.reshape(ordercontents_onehot, (1, -1)))[0])
+
+
+def ordercontents_one_hot_encode_array(ordercontents: np.ndarray, out: np.ndarray = None) -> np.ndarray:
+    '''
+    当初注文内容の配列をまとめてOne-Hotエンコードする
+    存在しない当初注文内容の場合、該当なしとする
+
+    Args:
+        ordercontents: 当初注文内容の配列
+        out: 結果を書き込む配列(件数×12)、指定しない場合は新しい配列を作成する
+    Returns:
+        One-Hotエンコードされた当初注文内容の配列(件数×12)
+    '''
+
+    return _one_hot_encode_array(ordercontents, ordercontents_onehot_index, len(ordercontents_onehot_zero), out)
+
+
+def ordercontents_one_hot_decode_array(ordercontents_onehot: np.ndarray) -> np.ndarray:
+    '''
+    One-Hotされた当初注文内容の配列をまとめてデコードする
+    存在しない当初注文内容の場合、0とする
+
+    Args:
+        ordercontents_onehot: One-Hotされた当初注文内容の配列(件数×12)
+    Returns:
+        当初注文内容の配列
+    '''
+
+    return _one_hot_decode_array(ordercontents_onehot, ordercontents_onehot_keys)
 
 
 rank_onehot_dict: Dict[int, np.array] = {
@@ -72,6 +175,9 @@ rank_onehot_dict: Dict[int, np.array] = {
     500: np.array([0, 0, 0, 0, 1], dtype=np.int32),  # -
 }
 rank_onehot_zero: np.ndarray = np.array([0, 0, 0, 0, 0], dtype=np.int32)  # 該当なし
+# One-Hotの列順のランク、ランク→列位置のルックアップテーブル
+rank_onehot_keys: np.ndarray = np.array(list(rank_onehot_dict.keys()), dtype=np.int32)
+rank_onehot_index: np.ndarray = _create_one_hot_index(list(rank_onehot_dict.keys()))
 
 
 def rank_one_hot_encode(rank: int) -> np.ndarray:
@@ -100,10 +206,38 @@ def rank_one_hot_decode(rank_onehot: np.ndarray) -> int:
         ランク
     '''
 
-    for key, value in rank_onehot_dict.items():
-        if np.all(value == rank_onehot):
-            return key
-    return 0
+    if np.shape(rank_onehot) != rank_onehot_zero.shape:
+        return 0
+    return int(rank_one_hot_decode_array(np.reshape(rank_onehot, (1, -1)))[0])
+
+
+def rank_one_hot_encode_array(rank: np.ndarray, out: np.ndarray = None) -> np.ndarray:
+    '''
+    ランクの配列をまとめてOne-Hotエンコードする
+    存在しないランクの場合、該当なしとする
+
+    Args:
+        rank: ランクの配列
+        out: 結果を書き込む配列(件数×5)、指定しない場合は新しい配列を作成する
+    Returns:
+        One-Hotエンコードされたランクの配列(件数×5)
+    '''
+
+    return _one_hot_encode_array(rank, rank_onehot_index, len(rank_onehot_zero), out)
+
+
+def rank_one_hot_decode_array(rank_onehot: np.ndarray) -> np.ndarray:
+    '''
+    One-Hotされたランクの配列をまとめてデコードする
+    存在しないランクの場合、0とする
+
+    Args:
+        rank_onehot: One-Hotされたランクの配列(件数×5)
+    Returns:
+        ランクの配列
+    '''
+
+    return _one_hot_decode_array(rank_onehot, rank_onehot_keys)
 
 
 class AddresscodeOneHotEncoder(object):
@@ -0,0 +1,128 @@
+# 標準ライブラリインポート
+import logging
+from typing import TYPE_CHECKING
+
+# サードパーティライブラリインポート
+import pandas as pd
+
+# プロジェクトライブラリインポート
+from . import utils
+from .task import TaskResult
+if TYPE_CHECKING:
+    from .rank_utils import RankFlagMatrix
+
+class PipelineContext(object):
+    '''
+    パイプライン共有コンテキストクラス
+
+    各タスク間で1つのDataFrameを持ち回り、タスクは自身が追加した列のみを追加・置換する。
+    列毎にどのタスクが追加したかを保持する。
+    ランク判定用フラグはDataFrameの列とせず、タスク結果のフラグ行列(TaskResult.rankFlags)を持ち回る。
+    '''
+
+    # 抽出元の列の所有者
+    SOURCE_OWNER: str = 'source'
+
+    def __init__(self, data: pd.DataFrame, owner: str = SOURCE_OWNER, rank_flags: 'RankFlagMatrix' = None):
+        '''
+        コンストラクタ
+
+        Args:
+            data: 持ち回り用DataFrame
+            owner: 初期列の所有者
+            rank_flags: ランク判定用フラグ行列(チェックポイントから再開する場合に指定する)
+        '''
+
+        # ロガー
+        self._logger: logging.Logger = utils.getLogger()
+        # 持ち回り用DataFrame
+        self.__data: pd.DataFrame = data
+        # 列の所有者
+        self.__column_owner: dict = {column: owner for column in data.columns}
+        # ランク判定用フラグ行列(持ち回り用DataFrameの行順)
+        self.__rank_flags: 'RankFlagMatrix' = rank_flags
+
+    @property
+    def data(self) -> pd.DataFrame:
+        '''
+        持ち回り用DataFrame
+        '''
+
+        return self.__data
+
+    @property
+    def rank_flags(self) -> 'RankFlagMatrix':
+        '''
+        ランク判定用フラグ行列。ランク判定用フラグ追加前はNone
+        '''
+
+        return self.__rank_flags
+
+    @property
+    def column_owner(self) -> dict:
+        '''
+        列の所有者
+        '''
+
+        return dict(self.__column_owner)
+
+    def owned_columns(self, owner: str) -> list:
+        '''
+        所有者が追加した列を取得します。
+
+        Args:
+            owner: 所有者
+        Returns:
+            列名リスト
+        '''
+
+        return [column for column, column_owner in self.__column_owner.items() if column_owner == owner]
+
+    def execute(self, task, **kwargs) -> TaskResult:
+        '''
+        持ち回り用DataFrameを入力にタスクを実行し、タスクが追加した列をタスクの所有として登録します。
+        ランク判定用フラグ行列を使用するタスク(USES_RANK_FLAGS)には、持ち回り中のフラグ行列を引数rank_flagsで渡す。
+        タスク結果にフラグ行列が設定されている場合は、以降はそのフラグ行列を持ち回る。
+
+        Args:
+            task: 実行するタスク
+            kwargs: タスクに渡す追加の引数
+        Returns:
+            タスク結果
+        '''
+
+        owner = type(task).__name__
+        if getattr(task, 'USES_RANK_FLAGS', False):
+            kwargs.setdefault('rank_flags', self.__rank_flags)
+        task_result = task.execute(self.__data, **kwargs)
+        data = task_result.resultData if isinstance(task_result, TaskResult) else task_result
+
+        if data is None:
+            return task_result
+
+        if isinstance(task_result, TaskResult) and task_result.rankFlags is not None:
+            self.__rank_flags = task_result.rankFlags
+        elif self.__rank_flags is not None and not data.index.equals(self.__data.index):
+            # 行の並びが変わった場合は、フラグ行列の行を返却されたDataFrameの行順に合わせる
+            positions = self.__data.index.get_indexer(data.index) if self.__data.index.is_unique else None
+            if positions is None or (positions < 0).any():
+                self._logger.warning('%s で行を対応付けられないため、ランク判定用フラグ行列を破棄します。', owner)
+                self.__rank_flags = None
+            else:
+                self.__rank_flags = type(self.__rank_flags)(self.__rank_flags.values[positions])
+
+        if data is not self.__data:
+            # 行を複製して返却したタスクの場合、返却されたDataFrameを以降の持ち回り用とする
+            self._logger.debug('%s は新しいDataFrameを返却しました。', owner)
+
+        removed_columns = [column for column in self.__column_owner if column not in data.columns]
+        if removed_columns:
+            self._logger.warning('%s で列が削除されました。%s', owner, removed_columns)
+
+        for column in data.columns:
+            if column not in self.__column_owner:
+                self.__column_owner[column] = owner
+
+        self.__data = data
+
+        return task_result
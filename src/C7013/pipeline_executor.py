@@ -0,0 +1,130 @@
+# 標準ライブラリインポート
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+# プロジェクトライブラリインポート
+from . import utils
+from .task import current_task_metrics, task_metrics_scope
+
+class PipelinedExecutor(object):
+    '''
+    パイプライン実行クラス
+
+    前段処理(CPU処理)と後段処理(I/O処理)を別スレッドで実行し、
+    マイクロバッチNの後段処理中にマイクロバッチN+1の前段処理を行う。
+    前段処理と後段処理の間は上限付きのキューで受け渡し、
+    後段処理待ちのマイクロバッチ数(処理中の件数)を制限する。
+    '''
+
+    # キュー投入待ちの確認間隔(秒)
+    PUT_TIMEOUT: float = 0.5
+
+    # 前段処理の終了を表す値
+    _END = object()
+
+    def __init__(self, depth: int):
+        '''
+        コンストラクタ
+
+        Args:
+            depth: 後段処理待ちのマイクロバッチの上限数
+        '''
+
+        self._logger = utils.getLogger()
+        # 後段処理待ちのマイクロバッチの上限数
+        self.__depth: int = max(depth, 1)
+
+    def run(self, items, produce, consume) -> list:
+        '''
+        前段処理と後段処理をパイプラインで実行します。
+
+        前段処理はproduce(item)で(後段処理への入力, 継続可否)を返却し、
+        後段処理はconsume(後段処理への入力)で(処理結果, 継続可否)を返却する。
+        いずれかが継続不可を返却した場合、以降のマイクロバッチの前段処理は行わない。
+        前段処理が継続不可を返却した場合、それまでに前段処理済のマイクロバッチは後段処理まで行い、
+        後段処理が継続不可を返却した場合、後段処理待ちのマイクロバッチは破棄する。
+
+        Args:
+            items: マイクロバッチのイテラブル
+            produce: 前段処理
+            consume: 後段処理
+        Returns:
+            後段処理の戻り値((処理結果, 継続可否))のリスト(マイクロバッチ順)
+        '''
+
+        work_queue = queue.Queue(maxsize=self.__depth)
+        stop_event = threading.Event()
+        # 呼出し元タスクの計測情報(各スレッドで実行したタスクをサブタスクとして記録する)
+        metrics = current_task_metrics()
+
+        with ThreadPoolExecutor(max_workers=2, thread_name_prefix='C7013_pipeline') as executor:
+            producer = executor.submit(self._produce, items, produce, work_queue, stop_event, metrics)
+            consumer = executor.submit(self._consume, consume, work_queue, stop_event, metrics)
+
+            try:
+                results = consumer.result()
+            finally:
+                # 後段処理が異常終了した場合も前段処理を停止させる
+                stop_event.set()
+            producer.result()
+
+        return results
+
+    def _produce(self, items, produce, work_queue: queue.Queue, stop_event: threading.Event, metrics) -> None:
+        '''
+        前段処理を実行し、結果をキューに投入します。
+        '''
+
+        try:
+            with task_metrics_scope(metrics):
+                for item in items:
+                    if stop_event.is_set():
+                        break
+
+                    product, is_continue = produce(item)
+                    if not self._put(work_queue, product, stop_event):
+                        break
+
+                    if not is_continue:
+                        break
+        finally:
+            self._put(work_queue, PipelinedExecutor._END, stop_event)
+
+    def _consume(self, consume, work_queue: queue.Queue, stop_event: threading.Event, metrics) -> list:
+        '''
+        キューから取り出した前段処理の結果に対して後段処理を実行します。
+        '''
+
+        results = []
+
+        with task_metrics_scope(metrics):
+            while True:
+                product = work_queue.get()
+                if product is PipelinedExecutor._END:
+                    break
+
+                result, is_continue = consume(product)
+                results.append((result, is_continue))
+
+                if not is_continue:
+                    # 以降のマイクロバッチの前段処理を停止し、前段処理済のマイクロバッチは破棄する
+                    stop_event.set()
+                    self._logger.debug('後段処理が継続不可を返却したため、パイプラインを停止します。')
+                    break
+
+        return results
+
+    def _put(self, work_queue: queue.Queue, product, stop_event: threading.Event) -> bool:
+        '''
+        キューに空きができるまで待機して投入します。停止要求があった場合は投入せずにFalseを返却します。
+        '''
+
+        while not stop_event.is_set():
+            try:
+                work_queue.put(product, timeout=PipelinedExecutor.PUT_TIMEOUT)
+                return True
+            except queue.Full:
+                continue
+
+        return False
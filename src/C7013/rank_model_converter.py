@@ -0,0 +1,143 @@
+'''
+ランク判定モデルの統合ランク判定モデルへの変換
+
+ランク毎の2分類モデル(rank_a_model.h5、rank_b_model.h5、rank_c_model.h5、rank_d_model.h5、rank_bar_model.h5)の重みを
+統合ランク判定モデル(rank_model.h5)に設定して保存する。
+保存前に、ランダムに生成した入力に対する2分類モデルと統合ランク判定モデルの予測結果(予測確率、ランク毎の予測結果、判定したランク)を比較し、
+一致しない場合は保存しない。
+
+統合ランク判定モデルを使用するには、設定ファイルのrank_config.combined_modelにtrueを指定する。
+
+--numpyを指定した場合は、ランク判定モデルの重みをNumPy版ランク判定モデル(rank_model.npz)に出力する。
+出力後、2分類モデルとNumPy版ランク判定モデルの予測結果を同様に比較し、一致しない場合は出力したファイルを削除する。
+NumPy版ランク判定モデルを使用するには、設定ファイルのrank_config.backendにnumpyを指定する。
+
+実行例:
+    python -m C7013.rank_model_converter
+    python -m C7013.rank_model_converter --load-path model --save-path model --rows 100000
+    python -m C7013.rank_model_converter --numpy
+'''
+
+# 標準ライブラリインポート
+import sys
+import time
+import pathlib
+import argparse
+
+# サードパーティライブラリインポート
+import numpy as np
+import pandas as pd
+
+# プロジェクトライブラリインポート
+from . import const
+from . import rank_utils
+from .rank_model_helper import RankModelHelper, COMBINED_MODEL_FILE_NAME
+from .rank_numpy_model import NumpyRankModel
+
+
+def generate_input_data(rows: int, seed: int = 0) -> np.ndarray:
+    '''
+    ランク判定モデルの検証用の説明変数をランダムに生成します。
+
+    Args:
+        rows: 件数
+        seed: 乱数のシード値
+    Returns:
+        説明変数
+    '''
+
+    rng = np.random.default_rng(seed)
+    input_data = pd.DataFrame({'ordercontents': rng.choice(list(rank_utils.ordercontents_dict.values()), size=rows)})
+    # フラグが1となる割合を行毎に変え、フラグの少ない行・多い行を含める
+    density = rng.uniform(0.0, 0.5, size=(rows, 1))
+    rank_flags = rank_utils.RankFlagMatrix(rng.random((rows, len(rank_utils.rank_flag_columns))) < density)
+
+    return rank_utils.input_data_transform(input_data, rank_flags)
+
+
+def compare_predictions(rank_model_helper: RankModelHelper, input_data: np.ndarray, batch_size: int,
+                        numpy_model: NumpyRankModel = None) -> dict:
+    '''
+    2分類モデルと統合ランク判定モデル(numpy_modelを指定した場合はNumPy版ランク判定モデル)の予測結果を比較します。
+
+    Returns:
+        {'maxDiff': 予測確率の最大差, 'rankMismatches': ランク毎の予測結果の不一致件数, 'decisionMismatches': 判定したランクの不一致件数,
+         'binaryElapsed': 2分類モデルの予測時間, 'combinedElapsed': 比較対象のモデルの予測時間}
+    '''
+
+    start = time.perf_counter()
+    binary_probabilities = rank_model_helper.predict_probabilities(input_data, batch_size, verbose=0, combined=False)
+    binary_elapsed = time.perf_counter() - start
+
+    start = time.perf_counter()
+    if numpy_model is not None:
+        combined_probabilities = numpy_model.predict_probabilities(input_data)
+    else:
+        combined_probabilities = rank_model_helper.predict_probabilities(input_data, batch_size, verbose=0, combined=True)
+    combined_elapsed = time.perf_counter() - start
+
+    binary_predict = np.round(binary_probabilities).astype(np.int32)
+    combined_predict = np.round(combined_probabilities).astype(np.int32)
+    binary_rank = rank_utils.decide_rank(*[binary_predict[:, index:index + 1] for index in range(5)])
+    combined_rank = rank_utils.decide_rank(*[combined_predict[:, index:index + 1] for index in range(5)])
+
+    return {
+        'maxDiff': float(np.max(np.abs(binary_probabilities - combined_probabilities))) if len(input_data) else 0.0,
+        'rankMismatches': int((binary_predict != combined_predict).sum()),
+        'decisionMismatches': int((binary_rank != combined_rank).sum()),
+        'binaryElapsed': binary_elapsed,
+        'combinedElapsed': combined_elapsed,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='ランク判定モデルの統合ランク判定モデルへの変換')
+    parser.add_argument('--load-path', help='2分類モデルのフォルダ(既定値：アプリケーションモデルデータフォルダ)')
+    parser.add_argument('--save-path', help='統合ランク判定モデルの保存先フォルダ(既定値：2分類モデルのフォルダ)')
+    parser.add_argument('--rows', type=int, default=10000, help='予測結果を比較する件数')
+    parser.add_argument('--seed', type=int, default=0, help='乱数のシード値')
+    parser.add_argument('--numpy', action='store_true', help='NumPy版ランク判定モデル(rank_model.npz)に出力する')
+    args = parser.parse_args()
+
+    load_path = pathlib.Path(args.load_path) if args.load_path else const.APP_MODEL_PATH
+    save_path = pathlib.Path(args.save_path) if args.save_path else load_path
+    batch_size = const.APP_CONFIG['rank_config']['batch_size']
+
+    rank_model_helper = RankModelHelper()
+    rank_model_helper.load_models(load_path, combined=False)
+
+    if args.numpy:
+        file_path = rank_model_helper.export_numpy_model(save_path)
+        result = compare_predictions(rank_model_helper, generate_input_data(args.rows, args.seed), batch_size,
+                                     NumpyRankModel.load(file_path))
+        print(f'予測結果の比較：{args.rows:,}件')
+        print(f'  予測確率の最大差：{result["maxDiff"]:.3e}')
+        print(f'  ランク毎の予測結果の不一致：{result["rankMismatches"]}件 判定したランクの不一致：{result["decisionMismatches"]}件')
+        print(f'  予測時間：2分類モデル {result["binaryElapsed"]:.3f}秒 NumPy版ランク判定モデル {result["combinedElapsed"]:.3f}秒')
+
+        if result['rankMismatches'] or result['decisionMismatches']:
+            pathlib.Path(file_path).unlink()
+            print('予測結果が一致しないため、NumPy版ランク判定モデルを削除しました。')
+            sys.exit(1)
+
+        print(f'NumPy版ランク判定モデルを保存しました。({file_path})')
+        return
+
+    rank_model_helper.combine_models()
+
+    result = compare_predictions(rank_model_helper, generate_input_data(args.rows, args.seed), batch_size)
+    print(f'予測結果の比較：{args.rows:,}件')
+    print(f'  予測確率の最大差：{result["maxDiff"]:.3e}')
+    print(f'  ランク毎の予測結果の不一致：{result["rankMismatches"]}件 判定したランクの不一致：{result["decisionMismatches"]}件')
+    print(f'  予測時間：2分類モデル {result["binaryElapsed"]:.3f}秒 統合ランク判定モデル {result["combinedElapsed"]:.3f}秒')
+
+    if result['rankMismatches'] or result['decisionMismatches']:
+        print('予測結果が一致しないため、統合ランク判定モデルを保存しません。')
+        sys.exit(1)
+
+    rank_model_helper.save_combined_model(save_path)
+    print(f'統合ランク判定モデルを保存しました。({save_path / COMBINED_MODEL_FILE_NAME})')
+
+
+if __name__ == '__main__':
+    main()
@@ -4,7 +4,6 @@ import pathlib
 
 # サードパーティライブラリインポート
 import numpy as np
-import pandas as pd
 from tensorflow.keras import layers
 from tensorflow.keras import models
 from tensorflow.keras import utils
@@ -17,7 +16,13 @@ from . import const
 from . import message
 from . import utils
 from . import rank_utils
-from .C7013_04_rank_flag_forced_correction_task import C7013_04_rank_flag_forced_correction_task 
+from .rank_numpy_model import NumpyRankModel, NUMPY_MODEL_FILE_NAME
+from . import rank_training_cache
+
+# ランク判定モデルのランク名(ランクの判定順、統合ランク判定モデルの出力順)
+RANK_MODEL_NAMES: list = rank_utils.rank_model_names
+# 統合ランク判定モデルのファイル名
+COMBINED_MODEL_FILE_NAME: str = 'rank_model.h5'
 
 class RankModelHelper(object):
     '''
@@ -40,6 +45,11 @@ class RankModelHelper(object):
         self._history_c: callbacks.History = None
         self._history_d: callbacks.History = None
         self._history_bar: callbacks.History = None
+        # 統合ランク判定モデル(入力を共有し、ランク毎の2分類モデルを1つのモデルにまとめたもの)
+        self._rank_model: models.Model = None
+        self._history: callbacks.History = None
+        # 統合ランク判定モデルのランク毎の評価用モデル
+        self._head_models: dict = {}
 
     @property
     def logger(self) -> logging.Logger:
@@ -49,6 +59,14 @@ class RankModelHelper(object):
 
         return self._logger
 
+    @staticmethod
+    def use_combined_model() -> bool:
+        '''
+        統合ランク判定モデルを使用するかを取得します(設定ファイルのrank_config.combined_model、既定値：False)。
+        '''
+
+        return const.APP_CONFIG.get('rank_config', {}).get('combined_model', False)
+
     def _create_binary_crossentropy_model(self, model_name: str) -> models.Model:
         '''
         ランク判定用2分類モデルを構築します。
@@ -65,6 +83,53 @@ class RankModelHelper(object):
         output_layer = layers.Dense(name='rank_output', units=1, activation="sigmoid")(middle_layer)
         return models.Model(name = model_name, inputs = rank_input_layer, outputs = output_layer)
 
+    def _create_combined_model(self, model_name: str) -> models.Model:
+        '''
+        統合ランク判定モデルを構築します。
+
+        入力層を共有し、ランク毎に2分類モデルと同じ構成の中間層・出力層(sigmoid)を持つ。
+        出力はランク判定順(A、B、C、D、-)の5列とする。
+        ランク毎の層は独立しているため、2分類モデルの重みをそのまま設定すると2分類モデルと同じ予測結果となる。
+
+        Args:
+            model_name: モデル名称
+        Return:
+            統合ランク判定モデル
+        '''
+
+        rank_input_layer = layers.Input(name='rank_input', shape=(83, ), dtype='int32')
+        output_layers = []
+        for rank_name in RANK_MODEL_NAMES:
+            middle_layer = layers.Dense(name=f'{rank_name}_middle_layer1', units=55, activation='relu')(rank_input_layer)
+            output_layers.append(layers.Dense(name=f'{rank_name}_rank_output', units=1, activation="sigmoid")(middle_layer))
+        output_layer = layers.Concatenate(name='rank_output')(output_layers)
+        return models.Model(name = model_name, inputs = rank_input_layer, outputs = output_layer)
+
+    def assembly_combined_model(self) -> None:
+        '''
+        統合ランク判定モデルを構築します。
+        '''
+
+        self._rank_model = self._create_combined_model('rank_model')
+        self._rank_model.compile(optimizer='adam', loss='binary_crossentropy', metrics=['accuracy'])
+        self._rank_model.summary()
+        self._head_models = {}
+
+    def combine_models(self) -> None:
+        '''
+        読込済のランク毎の2分類モデルの重みを設定した統合ランク判定モデルを構築します。
+        '''
+
+        rank_model = self._create_combined_model('rank_model')
+        for rank_name in RANK_MODEL_NAMES:
+            binary_model: models.Model = getattr(self, f'_rank_{rank_name}_model')
+            rank_model.get_layer(f'{rank_name}_middle_layer1').set_weights(binary_model.get_layer('middle_layer1').get_weights())
+            rank_model.get_layer(f'{rank_name}_rank_output').set_weights(binary_model.get_layer('rank_output').get_weights())
+        rank_model.compile(optimizer='adam', loss='binary_crossentropy', metrics=['accuracy'])
+
+        self._rank_model = rank_model
+        self._head_models = {}
+
     def assembly_model(self) -> None:
         '''
         ランク判定用モデルを構築します。
@@ -119,6 +184,29 @@ class RankModelHelper(object):
         self._fit_d_model_from_file(train_file_path, val_file_path, batch_size, epochs, workers)
         self._fit_bar_model_from_file(train_file_path, val_file_path, batch_size, epochs, workers)
 
+    def fit_combined_model_from_file(self, train_file_path: pathlib.PurePath, val_file_path: pathlib.PurePath, batch_size: int, epochs: int, workers: int = 0) -> None:
+        '''
+        ファイルから統合ランク判定モデルを訓練します。全ランクを1回の学習で訓練する。
+
+        Args:
+            train_file_path: 学習用ファイルのパス
+            val_file_path: 検証用ファイルのパス
+            batch_size: batch_size
+            epochs: 学習回数
+            workers: workers
+        '''
+        self.logger.debug(f'統合ランク判定用モデルを学習します。')
+        train_gen = RankTrainingGenerator(None, train_file_path, batch_size=batch_size, shuffle=True)
+        val_gen = RankTrainingGenerator(None, val_file_path, batch_size=batch_size)
+        self._history = self._rank_model.fit(
+            train_gen,
+            steps_per_epoch=train_gen.num_batches_per_epoch,
+            validation_data=val_gen,
+            validation_steps=val_gen.num_batches_per_epoch,
+            epochs=epochs,
+            callbacks=self.training_callbacks(),
+            workers=workers)
+
     def _fit_a_model_from_file(self, train_file_path: pathlib.PurePath, val_file_path: pathlib.PurePath, batch_size: int, epochs: int, workers: int = 0) -> None:
         '''
         ファイルからAランク判定モデルを訓練します。
@@ -131,7 +219,7 @@ class RankModelHelper(object):
             workers: workers
         '''
         self.logger.debug(f'Aランク判定用モデルを学習します。')
-        train_gen_a = RankTrainingGenerator('A', train_file_path, batch_size=batch_size)
+        train_gen_a = RankTrainingGenerator('A', train_file_path, batch_size=batch_size, shuffle=True)
         val_gen_a = RankTrainingGenerator('A', val_file_path, batch_size=batch_size)
         self._history_a = self._rank_a_model.fit(
             train_gen_a,
@@ -154,7 +242,7 @@ class RankModelHelper(object):
             workers: workers
         '''
         self.logger.debug(f'Bランク判定用モデルを学習します。')
-        train_gen_b = RankTrainingGenerator('B', train_file_path, batch_size=batch_size)
+        train_gen_b = RankTrainingGenerator('B', train_file_path, batch_size=batch_size, shuffle=True)
         val_gen_b = RankTrainingGenerator('B', val_file_path, batch_size=batch_size)
         self._history_b = self._rank_b_model.fit(
             train_gen_b,
@@ -177,7 +265,7 @@ class RankModelHelper(object):
             workers: workers
         '''
         self.logger.debug(f'Cランク判定用モデルを学習します。')
-        train_gen_c = RankTrainingGenerator('C', train_file_path, batch_size=batch_size)
+        train_gen_c = RankTrainingGenerator('C', train_file_path, batch_size=batch_size, shuffle=True)
         val_gen_c = RankTrainingGenerator('C', val_file_path, batch_size=batch_size)
         self._history_c = self._rank_c_model.fit(
             train_gen_c,
@@ -200,7 +288,7 @@ class RankModelHelper(object):
             workers: workers
         '''
         self.logger.debug(f'Dランク判定用モデルを学習します。')
-        train_gen_d = RankTrainingGenerator('D', train_file_path, batch_size=batch_size)
+        train_gen_d = RankTrainingGenerator('D', train_file_path, batch_size=batch_size, shuffle=True)
         val_gen_d = RankTrainingGenerator('D', val_file_path, batch_size=batch_size)
         self._history_d = self._rank_d_model.fit(
             train_gen_d,
@@ -223,7 +311,7 @@ class RankModelHelper(object):
             workers: workers
         '''
         self.logger.debug(f'-ランク判定用モデルを学習します。')
-        train_gen_bar = RankTrainingGenerator('-', train_file_path, batch_size=batch_size)
+        train_gen_bar = RankTrainingGenerator('-', train_file_path, batch_size=batch_size, shuffle=True)
         val_gen_bar = RankTrainingGenerator('-', val_file_path, batch_size=batch_size)
         self._history_bar = self._rank_bar_model.fit(
             train_gen_bar,
@@ -234,15 +322,29 @@ class RankModelHelper(object):
             callbacks=self.training_callbacks(),
             workers=workers)
 
-    def load_models(self, load_path: pathlib.PurePath = None) -> None:
+    def load_models(self, load_path: pathlib.PurePath = None, combined: bool = None) -> None:
         '''
         ランク判定用モデルをロードします。
 
+        統合ランク判定モデルを使用する場合、統合ランク判定モデルのファイルが存在すればそれを読み込む。
+        存在しない場合はランク毎の2分類モデルを読み込み、重みを設定した統合ランク判定モデルを構築する。
+
         Args:
             load_path: ロードするフォルダのパス、指定しない場合はモデルパスからロードします。
+            combined: 統合ランク判定モデルを使用するか、指定しない場合は設定ファイルのrank_config.combined_model
         '''
         if not load_path:
             load_path = const.APP_MODEL_PATH
+        if combined is None:
+            combined = self.use_combined_model()
+
+        self._rank_model = None
+        self._head_models = {}
+
+        if combined and (load_path / COMBINED_MODEL_FILE_NAME).exists():
+            self.logger.info(f'統合ランク判定用モデルを読み込みます load_path={load_path}')
+            self._rank_model = models.load_model(load_path / COMBINED_MODEL_FILE_NAME, compile=True)
+            return
 
         self.logger.info(f'ランク判定用モデルを読み込みます load_path={load_path}')
 
@@ -256,6 +358,10 @@ class RankModelHelper(object):
 
         self._rank_bar_model = models.load_model(load_path / "rank_bar_model.h5", compile=True)
 
+        if combined:
+            self.logger.info(f'ランク判定用モデルから統合ランク判定用モデルを構築します。')
+            self.combine_models()
+
     def save_models(self, save_path: pathlib.PurePath = None) -> None:
         '''
         ランク判定用モデルを保存します。
@@ -269,6 +375,13 @@ class RankModelHelper(object):
 
         self.logger.debug(f'ランク判定用モデルを保存します save_path={save_path}')
 
+        if self._rank_model is not None:
+            self.save_combined_model(save_path)
+
+        # 統合ランク判定モデルのみ学習した場合、ランク毎の2分類モデルは保存しない
+        if self._rank_a_model is None:
+            return
+
         self._rank_a_model.save(save_path / "rank_a_model.h5", include_optimizer=True)
         plot_model(self._rank_a_model, to_file=save_path / 'rank_a_model.png', show_shapes=True, show_layer_names=True)
 
@@ -287,10 +400,64 @@ class RankModelHelper(object):
         # モデルファイルを保存しました。保存先＝%s
         self.logger.info(message.MSG['MSG0010'], save_path)
 
+    def save_combined_model(self, save_path: pathlib.PurePath = None) -> None:
+        '''
+        統合ランク判定用モデルを保存します。
+
+        Args:
+            save_path: 保存するフォルダのパス、指定しない場合はデータパスに保存します。
+        '''
+
+        if not save_path:
+            save_path = const.APP_DATA_PATH
+
+        self._rank_model.save(save_path / COMBINED_MODEL_FILE_NAME, include_optimizer=True)
+        plot_model(self._rank_model, to_file=save_path / 'rank_model.png', show_shapes=True, show_layer_names=True)
+
+        # モデルファイルを保存しました。保存先＝%s
+        self.logger.info(message.MSG['MSG0010'], save_path / COMBINED_MODEL_FILE_NAME)
+
+    def export_numpy_model(self, save_path: pathlib.PurePath = None) -> pathlib.PurePath:
+        '''
+        ランク判定用モデルの重みをNumPy版ランク判定モデル(NumpyRankModel)のnpzファイルに出力します。
+        統合ランク判定モデルを構築済の場合は統合ランク判定モデル、それ以外はランク毎の2分類モデルの重みを出力する。
+
+        Args:
+            save_path: 保存するフォルダのパス、指定しない場合はデータパスに保存します。
+        Returns:
+            npzファイルのパス
+        '''
+
+        if not save_path:
+            save_path = const.APP_DATA_PATH
+
+        weights = {}
+        for rank_name in RANK_MODEL_NAMES:
+            if self._rank_model is not None:
+                middle_layer = self._rank_model.get_layer(f'{rank_name}_middle_layer1')
+                output_layer = self._rank_model.get_layer(f'{rank_name}_rank_output')
+            else:
+                binary_model: models.Model = getattr(self, f'_rank_{rank_name}_model')
+                middle_layer = binary_model.get_layer('middle_layer1')
+                output_layer = binary_model.get_layer('rank_output')
+            weights[rank_name] = tuple(middle_layer.get_weights()) + tuple(output_layer.get_weights())
+
+        file_path = save_path / NUMPY_MODEL_FILE_NAME
+        NumpyRankModel.save_weights(file_path, weights)
+
+        # モデルファイルを保存しました。保存先＝%s
+        self.logger.info(message.MSG['MSG0010'], file_path)
+
+        return file_path
+
     def save_training_accuracies_and_losses(self) -> None:
         '''
         訓練と検証正確度をイメージで保存します。
         '''
+        if self._history is not None:
+            utils.save_training_accuracy_and_loss(self._history, 'rankmodel_training_accuracy_and_loss.png')
+        if self._history_a is None:
+            return
         utils.save_training_accuracy_and_loss(self._history_a, 'a_rankmodel_training_accuracy_and_loss.png')
         utils.save_training_accuracy_and_loss(self._history_b, 'b_rankmodel_training_accuracy_and_loss.png')
         utils.save_training_accuracy_and_loss(self._history_c, 'c_rankmodel_training_accuracy_and_loss.png')
@@ -301,6 +468,10 @@ class RankModelHelper(object):
         '''
         訓練と検証損失をイメージで保存します。
         '''
+        if self._history is not None:
+            utils.save_training_and_validation_loss(self._history, 'rankmodel_training_and_validation_loss.png')
+        if self._history_a is None:
+            return
         utils.save_training_and_validation_loss(self._history_a, 'a_rankmodel_training_and_validation_loss.png')
         utils.save_training_and_validation_loss(self._history_b, 'b_rankmodel_training_and_validation_loss.png')
         utils.save_training_and_validation_loss(self._history_c, 'c_rankmodel_training_and_validation_loss.png')
@@ -320,6 +491,11 @@ class RankModelHelper(object):
             ランク予測データ
         '''
 
+        if self._rank_model is not None:
+            # 統合ランク判定モデルは1回の予測で全ランクを予測する
+            rank_predict = np.round(self.predict_probabilities(input_data, batch_size, verbose)).astype(np.int32)
+            return rank_utils.decide_rank(rank_predict[:, 0:1], rank_predict[:, 1:2], rank_predict[:, 2:3], rank_predict[:, 3:4], rank_predict[:, 4:5])
+
         rank_a_predict = self.predict_a(input_data, batch_size, verbose)
         rank_b_predict = self.predict_b(input_data, batch_size, verbose)
         rank_c_predict = self.predict_c(input_data, batch_size, verbose)
@@ -330,6 +506,55 @@ class RankModelHelper(object):
         
         return result
 
+    def predict_probabilities(self, input_data: np.array, batch_size: int = 1, verbose: int = 1, combined: bool = None) -> np.array:
+        '''
+        ランク毎の予測確率を取得します。
+
+        Args:
+            input_data: 検証データ
+            batch_size: バッチサイズ
+            verbose: 詳細ログを出力する場合、1
+            combined: 統合ランク判定モデルで予測するか、指定しない場合は統合ランク判定モデルを構築済であれば使用する
+
+        Returns:
+            ランク判定順(A、B、C、D、-)の5列の予測確率
+        '''
+        if combined is None:
+            combined = self._rank_model is not None
+
+        if combined:
+            return self._rank_model.predict(input_data, batch_size=batch_size, verbose=verbose)
+
+        return np.concatenate([
+            getattr(self, f'_rank_{rank_name}_model').predict(input_data, batch_size=batch_size, verbose=verbose)
+            for rank_name in RANK_MODEL_NAMES], axis=1)
+
+    def _predict_rank(self, rank_name: str, input_data: np.array, batch_size: int, verbose: int) -> np.array:
+        '''
+        ランクの予測結果を取得します。統合ランク判定モデルを構築済の場合は該当するランクの列を返却します。
+        '''
+        if self._rank_model is not None:
+            index = RANK_MODEL_NAMES.index(rank_name)
+            return np.round(self._rank_model.predict(input_data, batch_size=batch_size, verbose=verbose)[:, index:index + 1]).astype(np.int32)
+
+        return np.round(getattr(self, f'_rank_{rank_name}_model').predict(input_data, batch_size=batch_size, verbose=verbose)).astype(np.int32)
+
+    def _evaluation_model(self, rank_name: str) -> models.Model:
+        '''
+        ランクの評価用モデルを取得します。
+        統合ランク判定モデルを構築済の場合は、該当するランクの出力層までを2分類モデルとして切り出す。
+        '''
+        if self._rank_model is None:
+            return getattr(self, f'_rank_{rank_name}_model')
+
+        if rank_name not in self._head_models:
+            head_model = models.Model(name=f'rank_{rank_name}_model', inputs=self._rank_model.input,
+                                      outputs=self._rank_model.get_layer(f'{rank_name}_rank_output').output)
+            head_model.compile(optimizer='adam', loss='binary_crossentropy', metrics=['accuracy'])
+            self._head_models[rank_name] = head_model
+
+        return self._head_models[rank_name]
+
     def predict_a(self, input_data: np.array, batch_size: int = 1, verbose: int = 1) -> np.array:
         '''
         Aランク判定モデルの検証を実行します。
@@ -342,7 +567,7 @@ class RankModelHelper(object):
         Returns:
             Aランク予測結果
         '''
-        return np.round(self._rank_a_model.predict(input_data, batch_size=batch_size, verbose=verbose)).astype(np.int32)
+        return self._predict_rank('a', input_data, batch_size, verbose)
 
     def evaluate_a(self, input_data: np.array, target_data: np.array, batch_size: int = 1, verbose: int = 1) -> tuple:
         '''
@@ -358,7 +583,7 @@ class RankModelHelper(object):
             loss, acc
         '''
 
-        test_loss, test_acc = self._rank_a_model.evaluate(input_data, target_data, batch_size=batch_size, verbose=verbose)
+        test_loss, test_acc = self._evaluation_model('a').evaluate(input_data, target_data, batch_size=batch_size, verbose=verbose)
         return (test_loss, test_acc)
 
     def predict_b(self, input_data: np.array, batch_size: int = 1, verbose: int = 1) -> np.array:
@@ -373,7 +598,7 @@ class RankModelHelper(object):
         Returns:
             Bランク予測結果
         '''
-        return np.round(self._rank_b_model.predict(input_data, batch_size=batch_size, verbose=verbose)).astype(np.int32)
+        return self._predict_rank('b', input_data, batch_size, verbose)
 
     def evaluate_b(self, input_data: np.array, target_data: np.array, batch_size: int = 1, verbose: int = 1) -> tuple:
         '''
@@ -389,7 +614,7 @@ class RankModelHelper(object):
             loss, acc
         '''
 
-        test_loss, test_acc = self._rank_b_model.evaluate(input_data, target_data, batch_size=batch_size, verbose=verbose)
+        test_loss, test_acc = self._evaluation_model('b').evaluate(input_data, target_data, batch_size=batch_size, verbose=verbose)
         return (test_loss, test_acc)
 
     def predict_c(self, input_data: np.array, batch_size: int = 1, verbose: int = 1) -> np.array:
@@ -404,7 +629,7 @@ class RankModelHelper(object):
         Returns:
             Cランク予測結果
         '''
-        return np.round(self._rank_c_model.predict(input_data, batch_size=batch_size, verbose=verbose)).astype(np.int32)
+        return self._predict_rank('c', input_data, batch_size, verbose)
 
     def evaluate_c(self, input_data: np.array, target_data: np.array, batch_size: int = 1, verbose: int = 1) -> tuple:
         '''
@@ -420,7 +645,7 @@ class RankModelHelper(object):
             loss, acc
         '''
 
-        test_loss, test_acc = self._rank_c_model.evaluate(input_data, target_data, batch_size=batch_size, verbose=verbose)
+        test_loss, test_acc = self._evaluation_model('c').evaluate(input_data, target_data, batch_size=batch_size, verbose=verbose)
         return (test_loss, test_acc)
 
     def predict_d(self, input_data: np.array, batch_size: int = 1, verbose: int = 1) -> np.array:
@@ -435,7 +660,7 @@ class RankModelHelper(object):
         Returns:
             Dランク予測結果
         '''
-        return np.round(self._rank_d_model.predict(input_data, batch_size=batch_size, verbose=verbose)).astype(np.int32)
+        return self._predict_rank('d', input_data, batch_size, verbose)
 
     def evaluate_d(self, input_data: np.array, target_data: np.array, batch_size: int = 1, verbose: int = 1) -> tuple:
         '''
@@ -451,7 +676,7 @@ class RankModelHelper(object):
             loss, acc
         '''
 
-        test_loss, test_acc = self._rank_d_model.evaluate(input_data, target_data, batch_size=batch_size, verbose=verbose)
+        test_loss, test_acc = self._evaluation_model('d').evaluate(input_data, target_data, batch_size=batch_size, verbose=verbose)
         return (test_loss, test_acc)
 
     def predict_bar(self, input_data: np.array, batch_size: int = 1, verbose: int = 1) -> np.array:
@@ -466,7 +691,7 @@ class RankModelHelper(object):
         Returns:
             -ランク予測結果
         '''
-        return np.round(self._rank_bar_model.predict(input_data, batch_size=batch_size, verbose=verbose)).astype(np.int32)
+        return self._predict_rank('bar', input_data, batch_size, verbose)
 
     def evaluate_bar(self, input_data: np.array, target_data: np.array, batch_size: int = 1, verbose: int = 1) -> tuple:
         '''
@@ -482,7 +707,7 @@ class RankModelHelper(object):
             loss, acc
         '''
 
-        test_loss, test_acc = self._rank_bar_model.evaluate(input_data, target_data, batch_size=batch_size, verbose=verbose)
+        test_loss, test_acc = self._evaluation_model('bar').evaluate(input_data, target_data, batch_size=batch_size, verbose=verbose)
         return (test_loss, test_acc)
 
 
@@ -491,14 +716,20 @@ class RankTrainingGenerator(Sequence):
     ランク training generatorクラスV2
     '''
 
-    def __init__(self, rank_type: str, file_path: str, batch_size: int = 1):
+    # ランク(A、B、C、D、-)毎の目的変数の列位置
+    target_columns: dict = {'A': 0, 'B': 1, 'C': 2, 'D': 3, '-': 4}
+
+    def __init__(self, rank_type: str, file_path: str, batch_size: int = 1, shuffle: bool = False):
         '''
         初期化関数
+        説明変数と目的変数は前処理済のキャッシュファイル(rank_training_cache)をメモリマップで読み込み、
+        バッチ毎にインデックスで取り出す。
 
         Args:
-            rank_type: rank_type
+            rank_type: rank_type(A、B、C、D、-)。Noneの場合は統合ランク判定モデル用に全ランクを目的変数とする
             file_path: rank training filepath
             batch_size: Batch size
+            shuffle: エポック毎に行の順序をシャッフルするか
         '''
 
         # ロガー
@@ -506,13 +737,20 @@ class RankTrainingGenerator(Sequence):
         self._rank_type: str = rank_type
         self._file_path: str = file_path
         self._batch_size: int = batch_size
-        input_data = pd.read_csv(file_path, sep=',', encoding='utf-8')
-        if input_data.empty:
-            raise RuntimeError(f"データが存在しません。file_path={file_path}")
-        flag_forced_correction = C7013_04_rank_flag_forced_correction_task()
-        self._input_data: pd.DataFrame = flag_forced_correction.execute(input_data)
+        self._shuffle: bool = shuffle
+        input_one_hot, target = rank_training_cache.load_training_data(file_path)
+        self._input_one_hot: np.ndarray = input_one_hot
+        if rank_type is None:
+            self._target: np.ndarray = target
+        else:
+            column = self.target_columns.get(rank_type, self.target_columns['-'])
+            self._target: np.ndarray = target[:, column:column + 1]
 
-        self._length: int = len(self._input_data)
+        self._length: int = len(self._input_one_hot)
+        # バッチで取り出す行のインデックス
+        self._indexes: np.ndarray = np.arange(self._length)
+        if self._shuffle:
+            np.random.shuffle(self._indexes)
 
         self._num_batches_per_epoch: int = int((self._length - 1) / batch_size) + 1
 
@@ -545,20 +783,14 @@ class RankTrainingGenerator(Sequence):
 
         #self.logger.info('idx:%07d start_pos:%07d end_pos:%07d' % (idx, start_pos, end_pos))
 
-        rows = self._input_data[start_pos:end_pos]
-
-        input_one_hot = rank_utils.input_data_transform(rows)
-        target = rank_utils.target_data_transform(rows)
-        if self._rank_type == 'A':
-            target_one_hot = target[:, 0:1]
-        elif self._rank_type == 'B':
-            target_one_hot = target[:, 1:2]
-        elif self._rank_type == 'C':
-            target_one_hot = target[:, 2:3]
-        elif self._rank_type == 'D':
-            target_one_hot = target[:, 3:4]
+        if self._shuffle:
+            # メモリマップを前から順に読むよう、バッチ内のインデックスは昇順とする
+            indexes = np.sort(self._indexes[start_pos:end_pos])
+            input_one_hot = self._input_one_hot[indexes].astype(np.int32)
+            target_one_hot = self._target[indexes].astype(np.int32)
         else:
-            target_one_hot = target[:, 4:5]
+            input_one_hot = self._input_one_hot[start_pos:end_pos].astype(np.int32)
+            target_one_hot = self._target[start_pos:end_pos].astype(np.int32)
 
         return {
             'rank_input': input_one_hot
@@ -576,4 +808,6 @@ class RankTrainingGenerator(Sequence):
         '''
         Task when end of epoch
         '''
+        if self._shuffle:
+            np.random.shuffle(self._indexes)
         #self.logger.info('on_epoch_end batch_size:%d,length:%d,num_batches_per_epoch:%d' % (self._batch_size, self._length, self._num_batches_per_epoch))
@@ -0,0 +1,124 @@
+# 標準ライブラリインポート
+import pathlib
+
+# サードパーティライブラリインポート
+import numpy as np
+
+# プロジェクトライブラリインポート
+from . import const
+from . import rank_utils
+
+# NumPy版ランク判定モデルのファイル名
+NUMPY_MODEL_FILE_NAME: str = 'rank_model.npz'
+# 1回の行列演算で処理する最大件数(中間層の出力のメモリ使用量を抑える)
+MAX_CHUNK_ROWS: int = 65536
+
+
+class NumpyRankModel(object):
+    '''
+    NumPy版ランク判定モデルクラス
+
+    ランク判定モデル(ランク毎の83→55(relu)→1(sigmoid)の2分類モデル)の推論を、tensorflowを使用せずNumPyで行う。
+    重みはRankModelHelper.export_numpy_modelで出力したnpzファイルから読み込む。
+    5ランク分の中間層は1つの行列(83×275)にまとめ、1回の行列積で計算する。
+    '''
+
+    def __init__(self, middle_kernels: list, middle_biases: list, output_kernels: list, output_biases: list):
+        '''
+        コンストラクタ
+
+        Args:
+            middle_kernels: ランク判定順(A、B、C、D、-)の中間層の重み(83×55)のリスト
+            middle_biases: ランク判定順の中間層のバイアス(55)のリスト
+            output_kernels: ランク判定順の出力層の重み(55×1)のリスト
+            output_biases: ランク判定順の出力層のバイアス(1)のリスト
+        '''
+
+        # 中間層の重み(83×(55×5))、バイアス(55×5)
+        self.__middle_kernel: np.ndarray = np.ascontiguousarray(np.concatenate(middle_kernels, axis=1), dtype=np.float32)
+        self.__middle_bias: np.ndarray = np.concatenate(middle_biases).astype(np.float32)
+        # 出力層の重み(5×55)、バイアス(5)
+        self.__output_kernel: np.ndarray = np.stack([np.reshape(kernel, -1) for kernel in output_kernels]).astype(np.float32)
+        self.__output_bias: np.ndarray = np.concatenate([np.reshape(bias, -1) for bias in output_biases]).astype(np.float32)
+
+        # ランク数、ランク毎の中間層のユニット数
+        self.__ranks: int = len(middle_kernels)
+        self.__units: int = self.__output_kernel.shape[1]
+
+    @classmethod
+    def load(cls, file_path: pathlib.PurePath = None) -> 'NumpyRankModel':
+        '''
+        npzファイルからNumPy版ランク判定モデルを読み込みます。
+
+        Args:
+            file_path: npzファイルのパス、指定しない場合はモデルパスのrank_model.npz
+        '''
+
+        file_path = file_path or const.APP_MODEL_PATH / NUMPY_MODEL_FILE_NAME
+        with np.load(file_path) as weights:
+            return cls(*[[weights[f'{rank_name}_{key}'] for rank_name in rank_utils.rank_model_names]
+                         for key in ('middle_kernel', 'middle_bias', 'output_kernel', 'output_bias')])
+
+    @staticmethod
+    def save_weights(file_path: pathlib.PurePath, weights: dict) -> None:
+        '''
+        ランク毎の重みをnpzファイルに保存します。
+
+        Args:
+            file_path: npzファイルのパス
+            weights: {ランク名: (中間層の重み, 中間層のバイアス, 出力層の重み, 出力層のバイアス)}
+        '''
+
+        arrays = {}
+        for rank_name in rank_utils.rank_model_names:
+            for key, value in zip(('middle_kernel', 'middle_bias', 'output_kernel', 'output_bias'), weights[rank_name]):
+                arrays[f'{rank_name}_{key}'] = np.asarray(value, dtype=np.float32)
+        np.savez(file_path, **arrays)
+
+    def predict_probabilities(self, input_data: np.array, chunk_rows: int = MAX_CHUNK_ROWS) -> np.array:
+        '''
+        ランク毎の予測確率を取得します。
+
+        Args:
+            input_data: 説明変数(件数×83)
+            chunk_rows: 1回の行列演算で処理する件数
+
+        Returns:
+            ランク判定順(A、B、C、D、-)の5列の予測確率(float32)
+        '''
+
+        input_data = np.asarray(input_data)
+        chunk_rows = max(chunk_rows, 1)
+        result = np.empty((len(input_data), self.__ranks), dtype=np.float32)
+
+        for start in range(0, len(input_data), chunk_rows):
+            x = input_data[start:start + chunk_rows].astype(np.float32, copy=False)
+            # 中間層(relu)
+            middle = x @ self.__middle_kernel
+            middle += self.__middle_bias
+            np.maximum(middle, 0, out=middle)
+            # 出力層(ランク毎に対応する中間層の出力との内積)
+            logits = np.einsum('nkj,kj->nk', middle.reshape(len(x), self.__ranks, self.__units), self.__output_kernel)
+            logits += self.__output_bias
+            # sigmoid(大きな負の値でexpがオーバーフローした場合は0となる)
+            with np.errstate(over='ignore'):
+                result[start:start + chunk_rows] = 1 / (1 + np.exp(-logits))
+
+        return result
+
+    def predict(self, input_data: np.array, batch_size: int = None, verbose: int = 0) -> np.array:
+        '''
+        ランクを予測します(RankModelHelper.predictと同じ呼び出し方とする)。
+
+        Args:
+            input_data: 説明変数
+            batch_size: 未使用(RankModelHelper.predictとの互換のため。行列演算はMAX_CHUNK_ROWS件毎に行う)
+            verbose: 未使用(RankModelHelper.predictとの互換のため)
+
+        Returns:
+            ランク予測データ
+        '''
+
+        rank_predict = np.round(self.predict_probabilities(input_data)).astype(np.int32)
+
+        return rank_utils.decide_rank(rank_predict[:, 0:1], rank_predict[:, 1:2], rank_predict[:, 2:3], rank_predict[:, 3:4], rank_predict[:, 4:5])
@@ -0,0 +1,222 @@
+'''
+ランク判定学習データの前処理済キャッシュ
+
+ランク判定学習データ(CSV)にフラグ強制補正(C7013_04_rank_flag_forced_correction_task)を適用し、
+説明変数(rank_utils.input_data_transform)と目的変数(rank_utils.target_data_transform)を
+npyファイル(uint8)に保存する。キャッシュファイル名には学習データのハッシュ値(SHA-256)と
+前処理の実装(フラグ強制補正、説明変数・目的変数への変換)のソースのハッシュ値を含め、
+学習データまたは前処理の実装が変更された場合は新しいキャッシュファイルを作成する。
+
+RankTrainingGeneratorはキャッシュファイルをメモリマップで読み込み、インデックスでバッチを取り出す。
+5つのランク判定モデル(学習用・検証用)の学習で、学習データの読込と変換は1回のみとなる。
+ハッシュ値はプロセス内で(更新日時, サイズ)毎に保持し、同じ学習データのハッシュ値の再計算を省略する。
+
+設定ファイルのrank_training_cache_configで以下を指定する。
+    enabled: キャッシュファイルを使用するか(既定値：True)。Falseの場合はメモリ上で前処理する
+    cache_path: キャッシュフォルダパス(既定値：アプリケーションデータフォルダ配下のcache/rank_training)
+
+実行例:
+    python -m C7013.rank_training_cache data/rank_training.csv data/rank_validation.csv
+    python -m C7013.rank_training_cache data/rank_training.csv --rebuild
+'''
+
+# 標準ライブラリインポート
+import os
+import sys
+import time
+import inspect
+import hashlib
+import pathlib
+import argparse
+import threading
+
+# サードパーティライブラリインポート
+import numpy as np
+import pandas as pd
+
+# プロジェクトライブラリインポート
+from . import const
+from . import utils
+from . import rank_utils
+from . import onehot_utils
+from .C7013_04_rank_flag_forced_correction_task import C7013_04_rank_flag_forced_correction_task
+
+# キャッシュファイルの形式のバージョン(形式を変更した場合は更新する)
+CACHE_FORMAT_VERSION: int = 1
+# キャッシュフォルダ名
+CACHE_FOLDER_NAME: str = 'cache'
+# ランク判定学習データのキャッシュフォルダ名
+TRAINING_CACHE_FOLDER_NAME: str = 'rank_training'
+# ハッシュ値計算時の読込単位
+HASH_CHUNK_SIZE: int = 1024 * 1024
+
+# プロセス内で保持する学習データのハッシュ値({ファイルパス: ((更新日時, サイズ), ハッシュ値)})
+__training_file_hashes__ = {}
+# キャッシュファイル作成用ロック
+__training_cache_lock__ = threading.Lock()
+# 前処理の実装のソースのハッシュ値(プロセス内で1回のみ計算する)
+__transform_source_hash__ = None
+
+
+def get_rank_training_cache_config() -> dict:
+    '''
+    ランク判定学習データのキャッシュの設定を取得します。
+    '''
+
+    cache_config = const.APP_CONFIG.get('rank_training_cache_config', {})
+
+    return {
+        'enabled': cache_config.get('enabled', True),
+        'cache_path': pathlib.Path(cache_config.get('cache_path') or const.APP_DATA_PATH / CACHE_FOLDER_NAME / TRAINING_CACHE_FOLDER_NAME),
+    }
+
+
+def training_file_hash(file_path: pathlib.PurePath) -> str:
+    '''
+    学習データのハッシュ値(SHA-256)を取得します。
+    更新日時とサイズが前回と一致する場合は、プロセス内で保持したハッシュ値を返却する。
+    '''
+
+    stat = os.stat(file_path)
+    stat_key = (stat.st_mtime_ns, stat.st_size)
+    key = str(pathlib.Path(file_path).resolve())
+
+    cached = __training_file_hashes__.get(key)
+    if cached is not None and cached[0] == stat_key:
+        return cached[1]
+
+    sha256 = hashlib.sha256()
+    with open(file_path, 'rb') as f:
+        for chunk in iter(lambda: f.read(HASH_CHUNK_SIZE), b''):
+            sha256.update(chunk)
+    file_hash = sha256.hexdigest()
+    __training_file_hashes__[key] = (stat_key, file_hash)
+
+    return file_hash
+
+
+def transform_source_hash() -> str:
+    '''
+    前処理の実装のソースのハッシュ値(SHA-256の先頭16文字)を取得します。
+    transform_training_fileと、フラグ強制補正・説明変数/目的変数への変換を実装したモジュールのソースを対象とする。
+    '''
+
+    global __transform_source_hash__
+
+    if __transform_source_hash__ is None:
+        sha256 = hashlib.sha256(inspect.getsource(transform_training_file).encode('utf-8'))
+        for module in (rank_utils, onehot_utils, sys.modules[C7013_04_rank_flag_forced_correction_task.__module__]):
+            with open(module.__file__, 'rb') as f:
+                sha256.update(f.read())
+        __transform_source_hash__ = sha256.hexdigest()[:16]
+
+    return __transform_source_hash__
+
+
+def transform_training_file(file_path: pathlib.PurePath) -> tuple:
+    '''
+    学習データを読み込み、フラグ強制補正を適用して説明変数と目的変数に変換します。
+
+    Returns:
+        (説明変数(件数×83)、目的変数(件数×5))、いずれもuint8
+    '''
+
+    input_data = pd.read_csv(file_path, sep=',', encoding='utf-8')
+    if input_data.empty:
+        raise RuntimeError(f"データが存在しません。file_path={file_path}")
+    flag_forced_correction = C7013_04_rank_flag_forced_correction_task()
+    input_data = flag_forced_correction.execute(input_data)
+
+    input_one_hot = rank_utils.input_data_transform(input_data).astype(np.uint8)
+    target = rank_utils.target_data_transform(input_data).astype(np.uint8)
+
+    return input_one_hot, target
+
+
+def _cache_file_paths(file_path: pathlib.PurePath, cache_path: pathlib.PurePath) -> tuple:
+    '''
+    学習データのキャッシュファイル(説明変数、目的変数)のパスを取得します。
+    '''
+
+    prefix = f'{pathlib.Path(file_path).stem}_v{CACHE_FORMAT_VERSION}_{transform_source_hash()}_{training_file_hash(file_path)}'
+
+    return cache_path / f'{prefix}_input.npy', cache_path / f'{prefix}_target.npy'
+
+
+def _save_array(file_path: pathlib.PurePath, array: np.ndarray) -> None:
+    '''
+    配列をnpyファイルに保存します。
+    書込中に中断しても不完全なファイルが残らないよう、一時ファイルに書き込んでから置き換える。
+    '''
+
+    temp_path = pathlib.Path(f'{file_path}.{os.getpid()}.tmp')
+    with open(temp_path, 'wb') as f:
+        np.save(f, array)
+    os.replace(temp_path, file_path)
+
+
+def build_training_cache(file_path: pathlib.PurePath, cache_path: pathlib.PurePath = None, rebuild: bool = False) -> tuple:
+    '''
+    学習データのキャッシュファイルを作成します。作成済の場合は作成しません。
+
+    Args:
+        file_path: 学習データのパス
+        cache_path: キャッシュフォルダパス、指定しない場合は設定ファイルのキャッシュフォルダパス
+        rebuild: 作成済の場合も作成し直すか
+    Returns:
+        (説明変数のキャッシュファイルパス、目的変数のキャッシュファイルパス)
+    '''
+
+    cache_path = pathlib.Path(cache_path or get_rank_training_cache_config()['cache_path'])
+    input_path, target_path = _cache_file_paths(file_path, cache_path)
+
+    with __training_cache_lock__:
+        if rebuild or not (input_path.exists() and target_path.exists()):
+            utils.getLogger().info(f'ランク判定学習データのキャッシュファイルを作成します。file_path={file_path}')
+            input_one_hot, target = transform_training_file(file_path)
+            os.makedirs(cache_path, exist_ok=True)
+            _save_array(target_path, target)
+            _save_array(input_path, input_one_hot)
+
+    return input_path, target_path
+
+
+def load_training_data(file_path: pathlib.PurePath, cache_path: pathlib.PurePath = None) -> tuple:
+    '''
+    学習データの説明変数と目的変数を取得します。
+    キャッシュファイルを使用する場合はメモリマップで読み込み、キャッシュファイルがない場合は作成する。
+
+    Args:
+        file_path: 学習データのパス
+        cache_path: キャッシュフォルダパス、指定しない場合は設定ファイルのキャッシュフォルダパス
+    Returns:
+        (説明変数(件数×83)、目的変数(件数×5))、いずれもuint8
+    '''
+
+    if not get_rank_training_cache_config()['enabled']:
+        return transform_training_file(file_path)
+
+    input_path, target_path = build_training_cache(file_path, cache_path)
+
+    return np.load(input_path, mmap_mode='r'), np.load(target_path, mmap_mode='r')
+
+
+def main():
+    parser = argparse.ArgumentParser(description='ランク判定学習データの前処理済キャッシュの作成')
+    parser.add_argument('file_paths', nargs='+', help='学習データのパス(複数指定可)')
+    parser.add_argument('--cache-path', help='キャッシュフォルダパス(既定値：設定ファイルのキャッシュフォルダパス)')
+    parser.add_argument('--rebuild', action='store_true', help='作成済の場合も作成し直す')
+    args = parser.parse_args()
+
+    for file_path in args.file_paths:
+        start = time.perf_counter()
+        input_path, target_path = build_training_cache(pathlib.Path(file_path), args.cache_path, args.rebuild)
+        elapsed = time.perf_counter() - start
+        input_one_hot = np.load(input_path, mmap_mode='r')
+        print(f'{file_path}：{len(input_one_hot):,}件 所要時間：{elapsed:.3f}秒')
+        print(f'  説明変数：{input_path}')
+        print(f'  目的変数：{target_path}')
+
+
+if __name__ == '__main__':
+    main()
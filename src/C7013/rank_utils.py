@@ -37,6 +37,11 @@ rank_dict: Dict[str, int] = {
     ,'X': 0    # 該当なしランク
 }
 
+# ランク判定モデルのランク名(ランクの判定順)
+rank_model_names: List[str] = ['a', 'b', 'c', 'd', 'bar']
+# ランクの判定順のランク(末尾は該当なし)
+decide_rank_values: np.ndarray = np.array([rank_dict['A'], rank_dict['B'], rank_dict['C'], rank_dict['D'], rank_dict['-'], rank_dict['X']], dtype=np.int32)
+
 # ランク判定用フラグ一覧
 rank_flag_columns: List[str] = [
      "rank_flag01"
@@ -112,24 +117,176 @@ rank_flag_columns: List[str] = [
     ,"rank_flag71"
 ]
 
-def input_data_transform(input_data: pd.DataFrame) -> np.array:
+# ランク判定用フラグの列位置
+rank_flag_positions: Dict[str, int] = {column: position for position, column in enumerate(rank_flag_columns)}
+
+
+class RankFlagMatrix(object):
+    '''
+    ランク判定用フラグ行列クラス
+
+    71個のランク判定用フラグ(rank_flag01～rank_flag71)を、DataFrameの列毎のint64ではなく
+    1つのuint8行列(行数×71)で保持し、フラグ名で列を参照・更新する。
+    保存用に1行9バイトにビット圧縮した形式との相互変換を行う。
+    '''
+
+    def __init__(self, values: np.ndarray):
+        '''
+        コンストラクタ
+
+        Args:
+            values: フラグ行列(行数×71)。欠損値(NaN)は0、0以外の値は1とする(uint8の2や255も1とする)
+        '''
+
+        values = np.asarray(values)
+        if values.ndim != 2 or values.shape[1] != len(rank_flag_columns):
+            raise ValueError(f'フラグ行列の形状が不正です。shape={values.shape}')
+
+        # 0/1のuint8行列(zeros、unpackで作成した行列)はそのまま保持し、それ以外は0/1に変換する
+        if values.dtype != np.uint8 or (values.size != 0 and values.max() > 1):
+            notna = ~pd.isna(values)
+            flags = np.zeros(values.shape, dtype=bool)
+            flags[notna] = values[notna] != 0
+            values = flags
+
+        # フラグ行列(行数×71、uint8)
+        # フラグ名毎の参照・更新、DataFrameへの変換が連続した領域への操作となるよう列優先で保持する
+        self.__values: np.ndarray = np.asfortranarray(values, dtype=np.uint8)
+
+    @classmethod
+    def zeros(cls, rows: int) -> 'RankFlagMatrix':
+        '''
+        全てのフラグが0のフラグ行列を作成します。
+        '''
+
+        return cls(np.zeros((rows, len(rank_flag_columns)), dtype=np.uint8, order='F'))
+
+    @classmethod
+    def from_dataframe(cls, df: pd.DataFrame) -> 'RankFlagMatrix':
+        '''
+        DataFrameのランク判定用フラグ列からフラグ行列を作成します。
+        欠損値(NaN)は0とする。
+
+        Args:
+            df: ランク判定用フラグ列を含むDataFrame
+        '''
+
+        return cls(df[rank_flag_columns].to_numpy())
+
+    @classmethod
+    def unpack(cls, packed: np.ndarray) -> 'RankFlagMatrix':
+        '''
+        ビット圧縮したフラグ行列(pack)からフラグ行列を作成します。
+        '''
+
+        return cls(np.unpackbits(np.asarray(packed, dtype=np.uint8), axis=1, count=len(rank_flag_columns)))
+
+    @property
+    def values(self) -> np.ndarray:
+        '''
+        フラグ行列(行数×71、uint8)
+        '''
+
+        return self.__values
+
+    @property
+    def columns(self) -> List[str]:
+        '''
+        フラグ名一覧
+        '''
+
+        return rank_flag_columns
+
+    @property
+    def nbytes(self) -> int:
+        '''
+        フラグ行列のバイト数
+        '''
+
+        return self.__values.nbytes
+
+    def __len__(self) -> int:
+        return self.__values.shape[0]
+
+    def __getitem__(self, column: str) -> np.ndarray:
+        '''
+        フラグ名の列(ビュー)を返却します。
+        '''
+
+        return self.__values[:, rank_flag_positions[column]]
+
+    def __setitem__(self, column: str, values) -> None:
+        '''
+        フラグ名の列を更新します。0以外の値は1とする。
+        '''
+
+        self.__values[:, rank_flag_positions[column]] = np.asarray(values) != 0
+
+    def copy(self) -> 'RankFlagMatrix':
+        '''
+        フラグ行列を複製します。
+        '''
+
+        return RankFlagMatrix(self.__values.copy())
+
+    def pack(self) -> np.ndarray:
+        '''
+        フラグ行列を1行9バイトにビット圧縮します。
+        '''
+
+        return np.packbits(self.__values, axis=1)
+
+    def to_dataframe(self, index=None) -> pd.DataFrame:
+        '''
+        ランク判定用フラグ列のDataFrameに変換します。
+        '''
+
+        return pd.DataFrame(self.__values, index=index, columns=rank_flag_columns)
+
+    def assign_to(self, df: pd.DataFrame) -> None:
+        '''
+        DataFrameのランク判定用フラグ列を、フラグ行列の値(uint8)で置き換えます。
+        ランク判定用フラグ列が無い場合は末尾に追加する。
+
+        Args:
+            df: 更新するDataFrame(行数はフラグ行列と同じであること)
+        '''
+
+        if len(df) != len(self):
+            raise ValueError(f'行数が一致しません。DataFrame={len(df)} フラグ行列={len(self)}')
+
+        # 列毎に追加するとDataFrameの内部ブロックが断片化するため、既存の列、存在しない列毎にまとめて代入する
+        existing_columns = [column for column in rank_flag_columns if column in df.columns]
+        missing_columns = [column for column in rank_flag_columns if column not in df.columns]
+        for columns in (existing_columns, missing_columns):
+            if columns:
+                df[columns] = pd.DataFrame(self.__values[:, [rank_flag_positions[column] for column in columns]],
+                                           index=df.index, columns=columns)
+
+
+def input_data_transform(input_data: pd.DataFrame, rank_flags: RankFlagMatrix = None) -> np.array:
     '''
     説明変数データを作成します。
 
     Args:
         input_data: ランク判定学習データ
+        rank_flags: ランク判定用フラグ行列。省略時はinput_dataのランク判定用フラグ列から作成する
 
     Returns:
         説明変数
     '''
-    rank_flag_data = input_data[rank_flag_columns].values
-    # 欠損値NaNを0に置換する
-    np.nan_to_num(rank_flag_data, copy=False)
+    if rank_flags is None:
+        # 欠損値NaNは0とする
+        rank_flags = RankFlagMatrix.from_dataframe(input_data)
+    ordercontents_width = len(onehot_utils.ordercontents_onehot_zero)
 
+    # 説明変数(当初注文内容のone-hot＋ランク判定用フラグ)の行列を確保し、直接書き込む
+    result = np.empty((len(input_data), ordercontents_width + len(rank_flag_columns)), dtype=np.int32)
     # 当初注文内容をone-hot-encodingする
-    ordercontents_one_hot = [onehot_utils.ordercontents_one_hot_encode(o) for o in input_data['ordercontents'].values]
+    onehot_utils.ordercontents_one_hot_encode_array(input_data['ordercontents'].to_numpy(), out=result[:, :ordercontents_width])
+    result[:, ordercontents_width:] = rank_flags.values
 
-    return np.concatenate((ordercontents_one_hot, rank_flag_data), axis=1)
+    return result
 
 def target_data_transform(input_data: pd.DataFrame) -> np.array:
     '''
@@ -142,33 +299,22 @@ def target_data_transform(input_data: pd.DataFrame) -> np.array:
         目的変数
     '''
 
-    rank_one_hot = np.zeros((len(input_data), len(onehot_utils.rank_onehot_zero)), dtype=np.int32)
-    for idx, rank in enumerate(input_data['rank_system']):
-        rank_one_hot[idx] = onehot_utils.rank_one_hot_encode(rank)
-
-    return rank_one_hot
+    return onehot_utils.rank_one_hot_encode_array(input_data['rank_system'].to_numpy())
 
 def decide_rank(rank_a_predict: np.array, rank_b_predict: np.array, rank_c_predict: np.array, rank_d_predict: np.array, rank_bar_predict: np.array) -> np.array:
     '''
     予測したランクを判定します。
+    A→B→C→D→-の順に予測結果が1の最初のランクとし、全て1以外の場合は該当なしとする。
     '''
-    result = np.zeros(len(rank_a_predict), dtype=np.int32)
-
-    for idx in range(len(rank_a_predict)):
-        if rank_a_predict[idx][0] == 1:
-            result[idx] = rank_dict['A'] # A
-        elif rank_b_predict[idx][0] == 1:
-            result[idx] = rank_dict['B'] # B
-        elif rank_c_predict[idx][0] == 1:
-            result[idx] = rank_dict['C'] # C
-        elif rank_d_predict[idx][0] == 1:
-            result[idx] = rank_dict['D'] # D
-        elif rank_bar_predict[idx][0] == 1:
-            result[idx] = rank_dict['-'] # bar
-        else:
-            result[idx] = rank_dict['X'] # 該当なし
+    rows = len(rank_a_predict)
 
-    return result
+    # 末尾に常に該当する該当なしの列を追加し、argmaxで最初に該当する列を求める
+    hits = np.ones((rows, len(decide_rank_values)), dtype=bool)
+    for index, rank_predict in enumerate((rank_a_predict, rank_b_predict, rank_c_predict, rank_d_predict, rank_bar_predict)):
+        rank_predict = np.asarray(rank_predict)
+        hits[:, index] = (rank_predict[:, 0] if rank_predict.ndim > 1 else rank_predict) == 1
+
+    return decide_rank_values[np.argmax(hits, axis=1)]
 
 def clear_all_rank_flag(row: pd.Series) -> pd.Series:
     '''
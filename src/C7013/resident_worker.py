@@ -0,0 +1,275 @@
+'''
+自動差配処理の常駐ワーカー
+
+住所コード特定モデル、ランク判定モデル等を一度だけ読み込んで常駐し、
+ローカルソケット経由で受け付けた実行要求毎に自動差配処理(C7013_task)を実行する。
+実行要求の受付時にモデルフォルダ内のファイルの更新を検知した場合、モデルを読み直す。
+
+設定ファイルのworker_configで以下を指定する。
+    address: 待受アドレス(既定値：localhost)
+    port: 待受ポート(既定値：50013)
+    authkey: 認証キー(必須)
+
+実行例:
+    python -m C7013.resident_worker
+'''
+
+# 標準ライブラリインポート
+import os
+import logging
+import pathlib
+import argparse
+from multiprocessing.connection import Listener, Client
+
+# サードパーティライブラリインポート
+import inject
+
+# プロジェクトライブラリインポート
+from . import const
+from . import utils
+from .dao.crmdb_dao import CrmDBDao
+from .C7013_task import C7013_task
+from .C7013_batch import C7013_batch
+
+# 実行要求
+COMMAND_RUN: str = 'run'
+# モデル読直し要求
+COMMAND_RELOAD: str = 'reload'
+# 死活確認要求
+COMMAND_PING: str = 'ping'
+# 停止要求
+COMMAND_SHUTDOWN: str = 'shutdown'
+
+
+def _worker_config() -> dict:
+    '''
+    常駐ワーカーの設定を取得します。
+    '''
+
+    worker_config = const.APP_CONFIG.get('worker_config', {})
+    authkey = worker_config.get('authkey')
+    if not authkey:
+        raise RuntimeError('worker_config.authkeyが設定されていません。')
+
+    return {
+        'address': (worker_config.get('address', 'localhost'), worker_config.get('port', 50013)),
+        'authkey': authkey.encode('utf-8'),
+    }
+
+
+def snapshot_model_files(model_path: pathlib.PurePath = None) -> dict:
+    '''
+    モデルフォルダ内のファイルの更新日時とサイズを取得します。
+
+    Args:
+        model_path: モデルフォルダ。省略時はアプリケーションモデルデータフォルダ
+    Returns:
+        {ファイルパス: (更新日時, サイズ)}
+    '''
+
+    model_path = model_path or const.APP_MODEL_PATH
+    snapshot = {}
+
+    for dir_path, _, file_names in os.walk(model_path):
+        for file_name in file_names:
+            file_path = os.path.join(dir_path, file_name)
+            try:
+                stat = os.stat(file_path)
+            except FileNotFoundError:
+                # 走査中に削除されたファイルは対象外とする
+                continue
+            snapshot[file_path] = (stat.st_mtime_ns, stat.st_size)
+
+    return snapshot
+
+
+class ResidentWorker(object):
+    '''
+    自動差配処理の常駐ワーカークラス
+
+    実行要求は受け付けた順に1件ずつ処理する。
+    '''
+
+    def __init__(self):
+        '''
+        コンストラクタ
+        '''
+
+        # ロガー
+        self._logger: logging.Logger = utils.getLogger()
+        # 自動差配タスク(モデルを読込済の状態で常駐させる)
+        self.__task: C7013_task = C7013_task()
+        # 読込済のモデルファイル
+        self.__model_snapshot: dict = {}
+
+    @property
+    def logger(self) -> logging.Logger:
+        '''
+        ロガー
+        '''
+
+        return self._logger
+
+    def load_models(self) -> bool:
+        '''
+        モデルを読み込みます。
+        読込に失敗した場合は読込済のモデルを引き続き使用し、次の実行要求の受付時に再度読み込む。
+
+        Returns:
+            読込に成功した場合True
+        '''
+
+        snapshot = snapshot_model_files()
+        try:
+            self.__task.load_models()
+        except Exception:
+            self.logger.exception('モデルの読込に失敗しました。読込済のモデルを引き続き使用します。')
+            return False
+
+        self.__model_snapshot = snapshot
+        self.logger.info('モデルを読み込みました。')
+
+        return True
+
+    def reload_models_if_modified(self) -> bool:
+        '''
+        モデルフォルダ内のファイルが更新されている場合、モデルを読み直します。
+
+        Returns:
+            読み直した場合True
+        '''
+
+        if snapshot_model_files() == self.__model_snapshot:
+            return False
+
+        self.logger.info('モデルファイルの更新を検知しました。モデルを読み直します。')
+
+        return self.load_models()
+
+    def run(self, run_id: str = None, resume: bool = False) -> int:
+        '''
+        自動差配処理を1回実行します。
+        バッチ(C7013_batch)と同じ規制情報による排他制御を行い、他のバッチが実行中の場合は実行せずに警告終了します。
+
+        Args:
+            run_id: チェックポイントの実行ID
+            resume: 前回の実行を未完了のタスクから再開するか
+        Returns:
+            処理結果コード
+        '''
+
+        self.reload_models_if_modified()
+
+        try:
+            args = argparse.Namespace(run_id=run_id, resume=resume)
+            return C7013_batch(self.__task).execute(args)
+        finally:
+            # 実行毎に生成されるスレッドのDB接続が残らないよう、全てのDB接続を閉じる
+            inject.instance(CrmDBDao).close()
+
+    def handle(self, request: dict) -> dict:
+        '''
+        要求を処理します。
+
+        Args:
+            request: 要求({'command': 要求種別, ...})
+        Returns:
+            応答({'result_code': 処理結果コード, ...})
+        '''
+
+        if not isinstance(request, dict):
+            return {'result_code': const.BATCH_ERROR, 'message': f'不正な要求です。request={request!r}'}
+
+        command = request.get('command')
+
+        if command == COMMAND_RUN:
+            try:
+                result_code = self.run(request.get('run_id'), request.get('resume', False))
+            except Exception as ex:
+                self.logger.exception('自動差配処理で例外が発生しました。')
+                return {'result_code': const.BATCH_ERROR, 'message': str(ex)}
+            return {'result_code': result_code}
+
+        if command == COMMAND_RELOAD:
+            result_code = const.BATCH_SUCCESS if self.load_models() else const.BATCH_ERROR
+            return {'result_code': result_code}
+
+        if command in (COMMAND_PING, COMMAND_SHUTDOWN):
+            return {'result_code': const.BATCH_SUCCESS}
+
+        return {'result_code': const.BATCH_ERROR, 'message': f'不明な要求です。command={command}'}
+
+    def serve_forever(self) -> None:
+        '''
+        モデルを読み込み、停止要求を受け付けるまで実行要求を待ち受けます。
+        '''
+
+        config = _worker_config()
+        self.load_models()
+
+        with Listener(config['address'], authkey=config['authkey']) as listener:
+            self.logger.info('常駐ワーカーを開始しました。address=%s', config['address'])
+
+            while True:
+                try:
+                    conn = listener.accept()
+                except Exception:
+                    # 認証に失敗した接続は破棄して待受を継続する
+                    self.logger.exception('接続の受付に失敗しました。')
+                    continue
+
+                with conn:
+                    try:
+                        request_data = conn.recv()
+                    except EOFError:
+                        continue
+                    except Exception:
+                        # 復元できない要求は破棄して待受を継続する
+                        self.logger.exception('要求の受信に失敗しました。')
+                        continue
+
+                    self.logger.info('要求を受け付けました。%s', request_data)
+                    response = self.handle(request_data)
+                    try:
+                        conn.send(response)
+                    except OSError:
+                        self.logger.warning('要求元が切断されたため、応答を返却できませんでした。%s', response)
+
+                if isinstance(request_data, dict) and request_data.get('command') == COMMAND_SHUTDOWN:
+                    break
+
+        self.logger.info('常駐ワーカーを停止しました。')
+
+
+def request(command: str, **kwargs) -> dict:
+    '''
+    常駐ワーカーに要求を送信し、応答を待ちます。
+
+    Args:
+        command: 要求種別
+        kwargs: 要求の引数
+    Returns:
+        応答
+    '''
+
+    config = _worker_config()
+    with Client(config['address'], authkey=config['authkey']) as conn:
+        conn.send({'command': command, **kwargs})
+        return conn.recv()
+
+
+def request_run(run_id: str = None, resume: bool = False) -> int:
+    '''
+    常駐ワーカーに自動差配処理の実行を要求し、処理結果コードを返却します。
+    '''
+
+    return request(COMMAND_RUN, run_id=run_id, resume=resume)['result_code']
+
+
+def main():
+    inject.configure_once()
+    ResidentWorker().serve_forever()
+
+
+if __name__ == '__main__':
+    main()
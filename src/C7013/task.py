@@ -1,6 +1,22 @@
 # 標準ライブラリインポート
 import logging
+import contextlib
 import dataclasses
+import functools
+import json
+import threading
+import time
+from typing import TYPE_CHECKING
+
+try:
+    import psutil
+except ImportError:
+    psutil = None
+
+try:
+    import resource
+except ImportError:
+    resource = None
 
 # サードパーティライブラリインポート
 import numpy as np
@@ -9,12 +25,192 @@ import pandas as pd
 # プロジェクトライブラリインポート
 from . import const
 from . import utils
+if TYPE_CHECKING:
+    from .rank_utils import RankFlagMatrix
+
+# 実行中タスクの計測情報スタック(スレッド毎)
+_metrics_local = threading.local()
+
+
+def _get_peak_rss() -> int:
+    '''
+    プロセスのピークRSS(バイト)を取得します。取得できない環境ではNoneを返却します。
+    '''
+
+    memory_info = psutil.Process().memory_info() if psutil is not None else None
+
+    # Windowsではピークワーキングセットを使用する
+    if hasattr(memory_info, 'peak_wset'):
+        return memory_info.peak_wset
+
+    # Linuxのru_maxrssはKB単位
+    if resource is not None:
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+    # ピーク値が取得できない場合は現在のRSSを使用する
+    if memory_info is not None:
+        return memory_info.rss
+
+    return None
+
+
+def _count_rows(data) -> int:
+    '''
+    DataFrameまたはタスク結果の件数を取得します。件数を持たない場合はNoneを返却します。
+    '''
+
+    if isinstance(data, TaskResult):
+        data = data.resultData
+
+    if isinstance(data, pd.DataFrame):
+        return len(data)
+
+    return None
+
+
+@dataclasses.dataclass
+class TaskMetrics(object):
+    '''
+    タスク計測情報クラス
+    '''
+
+    # タスク名
+    taskName: str
+    # 経過時間(秒)
+    wallTime: float = 0.0
+    # CPU時間(秒)
+    cpuTime: float = 0.0
+    # 入力件数
+    rowsIn: int = None
+    # 出力件数
+    rowsOut: int = None
+    # ピークRSS増加量(バイト)
+    peakRssDelta: int = None
+    # サブタスクの計測情報
+    children: list = dataclasses.field(default_factory=list)
+
+    def to_dict(self) -> dict:
+        '''
+        計測情報を辞書に変換します。
+        '''
+
+        return dataclasses.asdict(self)
+
+    def write_json(self, file_path) -> None:
+        '''
+        計測情報をJSON形式で出力します。
+
+        Args:
+            file_path: 出力ファイルパス
+        '''
+
+        with open(file_path, 'w', encoding='utf-8') as f:
+            json.dump(self.to_dict(), f, ensure_ascii=False, indent=2)
+
+
+def current_task_metrics() -> TaskMetrics:
+    '''
+    実行中タスクの計測情報を取得します。実行中のタスクがない場合はNoneを返却します。
+    '''
+
+    stack = getattr(_metrics_local, 'stack', None)
+
+    return stack[-1] if stack else None
+
+
+@contextlib.contextmanager
+def task_metrics_scope(metrics: TaskMetrics):
+    '''
+    別スレッドで実行するタスクの計測情報を、指定した計測情報のサブタスクとして記録します。
+
+    Args:
+        metrics: 親タスクの計測情報。Noneの場合は何もしない
+    '''
+
+    if metrics is None:
+        yield
+        return
+
+    stack = getattr(_metrics_local, 'stack', None)
+    if stack is None:
+        stack = _metrics_local.stack = []
+
+    stack.append(metrics)
+    try:
+        yield
+    finally:
+        stack.pop()
+
+
+def _measure_execute(execute):
+    '''
+    executeの経過時間、CPU時間、入出力件数、ピークRSS増加量を計測するデコレータ
+    '''
+
+    @functools.wraps(execute)
+    def wrapper(self, *args, **kwargs):
+        stack = getattr(_metrics_local, 'stack', None)
+        if stack is None:
+            stack = _metrics_local.stack = []
+
+        metrics = TaskMetrics(taskName=type(self).__name__)
+        metrics.rowsIn = next((rows for rows in map(_count_rows, list(args) + list(kwargs.values())) if rows is not None), None)
+        if stack:
+            # 親タスクの計測情報に追加する
+            stack[-1].children.append(metrics)
+        stack.append(metrics)
+
+        peak_rss_start = _get_peak_rss()
+        wall_start = time.perf_counter()
+        cpu_start = time.process_time()
+        try:
+            result = execute(self, *args, **kwargs)
+        finally:
+            metrics.wallTime = time.perf_counter() - wall_start
+            metrics.cpuTime = time.process_time() - cpu_start
+            peak_rss_end = _get_peak_rss()
+            if peak_rss_start is not None and peak_rss_end is not None:
+                metrics.peakRssDelta = peak_rss_end - peak_rss_start
+            stack.pop()
+
+        metrics.rowsOut = _count_rows(result)
+        if isinstance(result, TaskResult):
+            result.metrics = metrics
+
+        self.logger.debug('タスク計測：%s 経過時間：%.3f秒 CPU時間：%.3f秒 入力件数：%s 出力件数：%s ピークRSS増加量：%s',
+            metrics.taskName, metrics.wallTime, metrics.cpuTime, metrics.rowsIn, metrics.rowsOut, metrics.peakRssDelta)
+
+        if not stack:
+            # 最上位タスクの終了時に実行レポートを出力する
+            self._write_run_report(metrics)
+
+        return result
+
+    wrapper._measured = True
+    return wrapper
+
 
 class BaseTask(object):
     '''
     タスク基底クラス
+
+    サブクラスのexecuteは自動的に計測され、計測情報はTaskResult.metricsに設定される。
     '''
 
+    # executeでランク判定用フラグ行列(引数rank_flags)を受け取るか。PipelineContextは持ち回り中のフラグ行列を渡す
+    USES_RANK_FLAGS: bool = False
+
+    def __init_subclass__(cls, **kwargs):
+        '''
+        サブクラスのexecuteに計測処理を組み込みます。
+        '''
+
+        super().__init_subclass__(**kwargs)
+
+        execute = cls.__dict__.get('execute')
+        if execute is not None and not getattr(execute, '_measured', False):
+            cls.execute = _measure_execute(execute)
+
     def __init__(self):
         '''
         コンストラクタ
@@ -30,6 +226,17 @@ class BaseTask(object):
 
         return self._logger
 
+    def _write_run_report(self, metrics: TaskMetrics) -> None:
+        '''
+        最上位タスクの計測情報を実行レポートとして出力します。
+        既定では何もしないため、実行レポートが必要なタスクでオーバーライドする。
+
+        Args:
+            metrics: 計測情報
+        '''
+
+        pass
+
 
 @dataclasses.dataclass
 class TaskResult(object):
@@ -43,8 +250,13 @@ class TaskResult(object):
     resultData: pd.DataFrame
     # エラーデータ
     errorData: pd.DataFrame
+    # 計測情報
+    metrics: TaskMetrics
+    # ランク判定用フラグ行列
+    rankFlags: 'RankFlagMatrix'
 
-    def __init__(self, resultCode: int = 0, resultData: pd.DataFrame = None, errorData: pd.DataFrame = None):
+    def __init__(self, resultCode: int = 0, resultData: pd.DataFrame = None, errorData: pd.DataFrame = None, metrics: TaskMetrics = None,
+                 rankFlags: 'RankFlagMatrix' = None):
         '''
         初期化関数
 
@@ -52,6 +264,8 @@ class TaskResult(object):
         resultCode:処理結果コード(0:正常 1:異常 2:警告)
         resultData:処理結果データ
         errorData:エラーデータ
+        metrics:計測情報
+        rankFlags:ランク判定用フラグ行列(処理結果データの行順)
         '''
 
         # 処理結果コード
@@ -60,6 +274,10 @@ class TaskResult(object):
         self.resultData = resultData
         # エラーデータ
         self.errorData = errorData
+        # 計測情報
+        self.metrics = metrics
+        # ランク判定用フラグ行列
+        self.rankFlags = rankFlags
 
     def __str__(self):
         return "resultCode:{0}\r\nresultData:{1}\r\nerrorData:{2}".format(self.resultCode, self.resultData, self.errorData)
\ No newline at end of file
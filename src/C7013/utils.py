@@ -6,14 +6,19 @@ import decimal
 import sqlite3
 import tempfile
 import shelve
+import sys
+import threading
+import collections
+from typing import TYPE_CHECKING
 
 # サードパーティライブラリインポート
-import cx_Oracle
-import pymssql
+# cx_Oracle、pymssql、matplotlib、tensorflowは読込に時間がかかるため、使用する関数内で読み込む
 import jaconv as jc
 import json5
-import matplotlib.pyplot as plt
-from tensorflow.keras import callbacks
+if TYPE_CHECKING:
+    import cx_Oracle
+    import pymssql
+    from tensorflow.keras import callbacks
 
 # プロジェクトライブラリインポート
 from . import const
@@ -35,10 +40,124 @@ def getLogger() -> logging.Logger:
             __logger__ = logging.getLogger('bizmerge')
     return __logger__
 
+class TextCache(object):
+    '''
+    文字列変換結果のLRUキャッシュクラス
+
+    キャッシュの上限を件数ではなく推定使用メモリ(バイト数)で指定し、
+    上限を超えた場合は最も長く参照されていない変換結果から破棄する。
+    常駐ワーカーでは実行を跨いで変換結果を再利用する。
+    '''
+
+    # 1件あたりの管理領域の推定バイト数(OrderedDictの要素)
+    ENTRY_OVERHEAD: int = 100
+
+    def __init__(self, max_bytes: int):
+        '''
+        コンストラクタ
+
+        Args:
+            max_bytes: キャッシュの推定使用メモリの上限(バイト数)。0以下の場合はキャッシュしない
+        '''
+
+        self.__max_bytes: int = max_bytes
+        self.__entries: collections.OrderedDict = collections.OrderedDict()
+        self.__current_bytes: int = 0
+        self.__hits: int = 0
+        self.__misses: int = 0
+        self.__lock: threading.Lock = threading.Lock()
+
+    def get_or_convert(self, key: str, convert) -> str:
+        '''
+        キャッシュ済の変換結果を返却します。
+        キャッシュに存在しない場合は変換してキャッシュに格納する。
+
+        Args:
+            key: 変換前の文字列
+            convert: 変換関数
+        Returns:
+            変換後の文字列
+        '''
+
+        with self.__lock:
+            value = self.__entries.get(key)
+            if value is not None:
+                self.__entries.move_to_end(key)
+                self.__hits += 1
+                return value
+            self.__misses += 1
+
+        value = convert(key)
+
+        size = sys.getsizeof(key) + sys.getsizeof(value) + TextCache.ENTRY_OVERHEAD
+        if size > self.__max_bytes:
+            return value
+
+        with self.__lock:
+            if key not in self.__entries:
+                self.__entries[key] = value
+                self.__current_bytes += size
+                while self.__current_bytes > self.__max_bytes:
+                    old_key, old_value = self.__entries.popitem(last=False)
+                    self.__current_bytes -= sys.getsizeof(old_key) + sys.getsizeof(old_value) + TextCache.ENTRY_OVERHEAD
+
+        return value
+
+    def clear(self) -> None:
+        '''
+        キャッシュと参照回数を初期化します。
+        '''
+
+        with self.__lock:
+            self.__entries.clear()
+            self.__current_bytes = 0
+            self.__hits = 0
+            self.__misses = 0
+
+    def stats(self) -> dict:
+        '''
+        キャッシュの参照状況を返却します。
+
+        Returns:
+            {'hits', 'misses', 'hitRate', 'entries', 'currentBytes', 'maxBytes'}
+        '''
+
+        with self.__lock:
+            total = self.__hits + self.__misses
+            return {
+                'hits': self.__hits,
+                'misses': self.__misses,
+                'hitRate': self.__hits / total if total else None,
+                'entries': len(self.__entries),
+                'currentBytes': self.__current_bytes,
+                'maxBytes': self.__max_bytes,
+            }
+
+
+__upper_wide_cache__: TextCache = None
+
+def get_upper_wide_cache() -> TextCache:
+    '''
+    全角大文字変換のキャッシュを取得する
+    キャッシュの上限は設定ファイルのtext_cache_config.max_bytes(既定値：64MB)で指定する
+    '''
+    global __upper_wide_cache__
+    if __upper_wide_cache__ == None:
+        __upper_wide_cache__ = TextCache(const.APP_CONFIG.get('text_cache_config', {}).get('max_bytes', 64 * 1024 * 1024))
+    return __upper_wide_cache__
+
+def _to_upper_wide_charactor(inStr: str) -> str:
+    '''
+    文字列を全角大文字に変換する(キャッシュ無し)
+    '''
+
+    return jc.h2z(inStr.upper(), digit=True, ascii=True)
+
 def to_upper_wide_charactor(inStr: str) -> str:
     '''
     文字列を全角大文字に変換する
     引数のタイプが文字列以外の場合、空文字を返却する
+    同じ文字列の変換結果はキャッシュ(get_upper_wide_cache)から返却する
 
     Args:
         inStr: 変換対象文字列
@@ -50,7 +169,10 @@ def to_upper_wide_charactor(inStr: str) -> str:
     if inStr == None:
         return ''
 
-    return jc.h2z(inStr.upper(), digit=True, ascii=True)
+    if type(inStr) is not str:
+        return _to_upper_wide_charactor(inStr)
+
+    return get_upper_wide_cache().get_or_convert(inStr, _to_upper_wide_charactor)
 
 def get_sqlite_connection() -> sqlite3.Connection:
     '''
@@ -59,24 +181,29 @@ def get_sqlite_connection() -> sqlite3.Connection:
 
     return sqlite3.connect(const.SQLITE_DB_PATH)
 
-def get_crmdb_connection() -> pymssql.Connection:
+def get_crmdb_connection() -> 'pymssql.Connection':
     '''
     CRMDBに接続する
     '''
+    import pymssql
+
     if const.CRMDB_CONN_USE_ID_PASSWORD_AUTHENTICATION:
         return pymssql.connect(server=const.CRMDB_CONN_SERVER, database=const.CRMDB_CONN_DATABASE, user=const.CRMDB_CONN_ID, password=const.CRMDB_CONN_PW)
     else:
         return pymssql.connect(server=const.CRMDB_CONN_SERVER, database=const.CRMDB_CONN_DATABASE)
 
-def get_nwmdb_connection() -> cx_Oracle.Connection:
+def get_nwmdb_connection() -> 'cx_Oracle.Connection':
     '''
     NWMDBに接続する
     '''
+    import cx_Oracle
 
     #DBに接続
     return cx_Oracle.connect(const.NWMDB_CONN_ID, const.NWMDB_CONN_PW, const.NWMDB_CONN_SID)
 
-def save_training_accuracy_and_loss(history: callbacks.History, output_filename: str, figure: bool = True) -> None:
+def save_training_accuracy_and_loss(history: 'callbacks.History', output_filename: str, figure: bool = True) -> None:
+    import matplotlib.pyplot as plt
+
     history_dict = history.history
     acc = history_dict['accuracy']
     loss = history_dict['loss']
@@ -94,7 +221,9 @@ def save_training_accuracy_and_loss(history: callbacks.History, output_filename:
     if figure:
         plt.figure()
 
-def save_training_and_validation_loss(history: callbacks.History, output_filename: str, figure: bool = True) -> None:
+def save_training_and_validation_loss(history: 'callbacks.History', output_filename: str, figure: bool = True) -> None:
+    import matplotlib.pyplot as plt
+
     history_dict = history.history
     loss = history_dict['loss']
     val_loss = history_dict['val_loss']
@@ -0,0 +1,178 @@
+'''
+テスト共通設定
+
+アプリケーション設定ファイル(config/app_config.json)を読み込むため、設定ファイルを配置した環境で実行する。
+自動差配処理(C7013_task)を実行するテストは、外部接続をオフライン用の代替実装に差し替え、
+合成データ(synthetic_data_generator)を一時フォルダのオフライン用DBに生成して実行する。
+ランク判定モデル・住所コード予測モデルを読み込めない環境ではスキップする。
+
+実行例:
+    python -m pytest src/tests
+'''
+
+# 標準ライブラリインポート
+import sys
+import sqlite3
+import pathlib
+import threading
+import collections
+
+# サードパーティライブラリインポート
+import pytest
+
+# プロジェクトライブラリインポート
+
+# ソースフォルダ(C7013パッケージの親フォルダ)
+SRC_PATH: pathlib.Path = pathlib.Path(__file__).resolve().parents[1]
+if str(SRC_PATH) not in sys.path:
+    sys.path.insert(0, str(SRC_PATH))
+
+# 設定ファイルが無い環境ではテストを収集しない
+if not (SRC_PATH / 'config' / 'app_config.json').exists():
+    collect_ignore_glob = ['test_*.py']
+
+# 合成データの取次件数
+OFFLINE_ROWS: int = 120
+# マイクロバッチ件数(合成データが複数のマイクロバッチに分割される件数)
+OFFLINE_CHUNK_SIZE: int = 40
+
+
+class OfflineEnvironment(object):
+    '''
+    オフライン実行環境
+    '''
+
+    def __init__(self, monkeypatch, tmp_path: pathlib.Path):
+        '''
+        Args:
+            monkeypatch: pytestのmonkeypatch
+            tmp_path: 一時フォルダ
+        '''
+
+        self._monkeypatch = monkeypatch
+        self._tmp_path: pathlib.Path = tmp_path
+        # オフライン用DBファイルパス
+        self.db_path: pathlib.Path = tmp_path / 'offline.sqlite3'
+        # Dynamics CRMのオフライン用Helper(実行間で共有し、作成・更新したエンティティを引き継ぐ)
+        self.dcrm_helper = None
+        # 更新要求数({(エンティティの物理名, GUID): 要求数})
+        self.update_counts: collections.Counter = collections.Counter()
+        # 設定を差し替えるconstモジュール
+        self._consts: list = []
+
+    def setup(self) -> None:
+        '''
+        設定を一時フォルダ向けに差し替え、合成データを生成して外部接続をオフライン用の代替実装に差し替えます。
+        '''
+
+        import inject
+        C7013_task_module = pytest.importorskip('C7013.C7013_task')
+        from C7013 import const
+        from C7013.dao.crmdb_dao import CrmDBDao
+        from C7013.dao.nwmdb_dao import NwmDBDao
+        from C7013.dcrm_helper import DcrmHelper
+        from C7013.fastsearch_helper import FastSearchHelper
+        from C7013.offline.crmdb_dao import OfflineCrmDBDao
+        from C7013.offline.nwmdb_dao import OfflineNwmDBDao
+        from C7013.offline.dcrm_helper import OfflineDcrmHelper
+        from C7013.offline.fastsearch_helper import OfflineFastSearchHelper
+        from C7013.benchmark import synthetic_data_generator
+
+        # C7013_taskが参照するconstモジュールがパッケージ外の場合は両方を差し替える
+        self._consts = [const] if C7013_task_module.const is const else [const, C7013_task_module.const]
+        for module in self._consts:
+            self._monkeypatch.setattr(module, 'APP_DATA_PATH', self._tmp_path)
+            self._monkeypatch.setattr(module, 'SQLITE_DB_PATH', self._tmp_path / 'local.sqlite3')
+            self._monkeypatch.setitem(module.APP_CONFIG, 'offline_config', {'db_path': str(self.db_path)})
+        self.set_pipeline_config(chunk_size=0)
+
+        synthetic_data_generator.generate(OFFLINE_ROWS, self.db_path)
+        # バッチの排他制御用の規制情報(未実行)
+        self.execute_sql("INSERT INTO RGLT_INFO (RGLT_APID, REC_NO, SPR1) VALUES ('C7013', '100', '0')")
+
+        # 取次E等の更新要求数をエンティティ毎に記録する
+        self.dcrm_helper = OfflineDcrmHelper(0.0)
+        update_entity = self.dcrm_helper.UpdateEntity
+        lock = threading.Lock()
+
+        def record_update_entity(entity) -> None:
+            update_entity(entity)
+            with lock:
+                self.update_counts[(entity.LogicalName, str(entity.Id).lower())] += 1
+
+        self.dcrm_helper.UpdateEntity = record_update_entity
+
+        def configure(binder: inject.Binder) -> None:
+            binder.bind_to_constructor(CrmDBDao, lambda: OfflineCrmDBDao(self.db_path))
+            binder.bind_to_constructor(NwmDBDao, lambda: OfflineNwmDBDao(self.db_path))
+            binder.bind(DcrmHelper, self.dcrm_helper)
+            binder.bind_to_constructor(FastSearchHelper, lambda: OfflineFastSearchHelper(self.db_path))
+
+        inject.clear_and_configure(configure)
+
+    def teardown(self) -> None:
+        '''
+        DB接続を閉じ、inject設定をクリアします。
+        '''
+
+        import inject
+        from C7013.dao.crmdb_dao import CrmDBDao
+
+        if inject.is_configured():
+            inject.instance(CrmDBDao).close()
+            inject.clear()
+
+    def set_pipeline_config(self, chunk_size: int = OFFLINE_CHUNK_SIZE, pipeline_depth: int = 0, checkpoint_enabled: bool = False) -> None:
+        '''
+        設定ファイルのpipeline_configを差し替えます。
+        '''
+
+        for module in self._consts:
+            self._monkeypatch.setitem(module.APP_CONFIG, 'pipeline_config', {
+                'chunk_size': chunk_size,
+                'pipeline_depth': pipeline_depth,
+                'checkpoint_enabled': checkpoint_enabled,
+            })
+
+    def execute_sql(self, sql: str, parameters: tuple = ()) -> list:
+        '''
+        オフライン用DBにSQLを実行し、結果を返却します。
+        '''
+
+        conn = sqlite3.connect(self.db_path)
+        try:
+            rows = conn.execute(sql, parameters).fetchall()
+            conn.commit()
+        finally:
+            conn.close()
+
+        return rows
+
+    def create_task(self):
+        '''
+        モデルを読込済の自動差配タスクを生成します。モデルを読み込めない場合はスキップします。
+        '''
+
+        from C7013.C7013_task import C7013_task
+
+        task = C7013_task()
+        try:
+            task.load_models()
+        except Exception as ex:
+            pytest.skip(f'モデルを読み込めないためスキップします。{ex!r}')
+
+        return task
+
+
+@pytest.fixture
+def offline_env(monkeypatch, tmp_path):
+    '''
+    外部接続をオフライン用の代替実装に差し替えた実行環境
+    '''
+
+    env = OfflineEnvironment(monkeypatch, tmp_path)
+    env.setup()
+    try:
+        yield env
+    finally:
+        env.teardown()
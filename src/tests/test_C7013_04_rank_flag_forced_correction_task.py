@@ -0,0 +1,93 @@
+'''
+フラグ強制補正(C7013_04_rank_flag_forced_correction_task)のテスト
+
+列単位のフラグ強制補正の結果が、従来の行単位のフラグ強制補正
+(benchmark.forced_correction_benchmark.set_force_flag_row)と一致することを、シード値を固定したランダムな入力で検証する。
+'''
+
+# 標準ライブラリインポート
+
+# サードパーティライブラリインポート
+import numpy as np
+import pandas as pd
+import pytest
+
+# プロジェクトライブラリインポート
+from C7013 import rank_utils
+from C7013.rank_utils import rank_flag_columns
+from C7013.benchmark.forced_correction_benchmark import set_force_flag_row, generate_input, count_mismatches
+from C7013.C7013_04_rank_flag_forced_correction_task import C7013_04_rank_flag_forced_correction_task, apply_forced_correction
+
+# ランダムな入力による検証の回数
+TRIALS: int = 60
+# 1回の検証の最大件数
+MAX_ROWS: int = 200
+
+
+def _generate_inputs(seed: int, dtype: str):
+    '''
+    シード値を固定したランダムな入力を生成します(0件、1件を含む)。
+    '''
+
+    rng = np.random.default_rng(seed)
+    for trial in range(TRIALS):
+        rows = [0, 1][trial] if trial < 2 else int(rng.integers(1, MAX_ROWS))
+        yield generate_input(rng, rows, dtype)
+
+
+def _expected(input_data: pd.DataFrame) -> pd.DataFrame:
+    '''
+    行単位のフラグ強制補正の結果(正解値)
+    '''
+
+    return input_data.apply(set_force_flag_row, axis=1) if len(input_data) > 0 else input_data.copy()
+
+
+@pytest.mark.parametrize('dtype', ['uint8', 'int64', 'float64'])
+def test_execute_matches_row_wise_reference(dtype):
+    '''
+    DataFrameに対するフラグ強制補正が行単位の結果と一致し、入力DataFrameを変更しないこと
+    '''
+
+    task = C7013_04_rank_flag_forced_correction_task()
+
+    for input_data in _generate_inputs(0, dtype):
+        original = input_data.copy()
+        expected = _expected(input_data)
+
+        assert count_mismatches(expected, task.execute(input_data)) == 0
+        assert count_mismatches(original, input_data) == 0
+
+
+@pytest.mark.parametrize('dtype', ['uint8', 'int64', 'float64'])
+def test_apply_forced_correction_matches_row_wise_reference(dtype):
+    '''
+    ランク判定用フラグ行列に対するフラグ強制補正が行単位の結果と一致すること
+    '''
+
+    for input_data in _generate_inputs(1, dtype):
+        expected = _expected(input_data)
+
+        flag_values = input_data[rank_flag_columns].to_numpy(copy=True)
+        apply_forced_correction(flag_values, input_data['ordercontents'].to_numpy())
+
+        assert count_mismatches(expected[rank_flag_columns], pd.DataFrame(flag_values, columns=rank_flag_columns)) == 0
+
+
+@pytest.mark.parametrize('dtype', ['uint8', 'int64'])
+def test_correct_matches_row_wise_reference(dtype):
+    '''
+    RankFlagMatrixに対するフラグ強制補正が行単位の結果と一致し、入力のフラグ行列を変更しないこと
+    '''
+
+    task = C7013_04_rank_flag_forced_correction_task()
+
+    for input_data in _generate_inputs(2, dtype):
+        expected = _expected(input_data)
+
+        rank_flags = rank_utils.RankFlagMatrix.from_dataframe(input_data)
+        original_values = rank_flags.values.copy()
+        corrected = task.correct(rank_flags, input_data['ordercontents'].to_numpy())
+
+        np.testing.assert_array_equal(corrected.values, expected[rank_flag_columns].to_numpy(dtype=np.uint8))
+        np.testing.assert_array_equal(rank_flags.values, original_values)
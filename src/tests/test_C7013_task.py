@@ -0,0 +1,109 @@
+'''
+自動差配処理(C7013_task)のマイクロバッチ実行のテスト
+'''
+
+# 標準ライブラリインポート
+
+# サードパーティライブラリインポート
+import pytest
+
+# プロジェクトライブラリインポート
+from conftest import OFFLINE_CHUNK_SIZE
+
+
+@pytest.mark.parametrize('pipeline_depth', [0, 1])
+def test_execute_multiple_chunks(offline_env, pipeline_depth):
+    '''
+    複数のマイクロバッチに分割して実行した場合も、全件一括で実行した場合と同じ処理結果コードとなること
+    '''
+
+    from C7013 import const
+
+    task = offline_env.create_task()
+
+    # 全件一括で実行
+    expected = task.execute().resultCode
+    assert expected != const.BATCH_ERROR
+    commissionid_list = task._task_01.extract_commissionid_list()
+    assert len(commissionid_list) > OFFLINE_CHUNK_SIZE
+
+    # マイクロバッチ毎に実行(学習データ蓄積をマイクロバッチ毎に行う)
+    offline_env.set_pipeline_config(chunk_size=OFFLINE_CHUNK_SIZE, pipeline_depth=pipeline_depth)
+    offline_env.update_counts.clear()
+    assert task.execute().resultCode == expected
+
+    # 全ての対象取次が1回ずつ更新されていること
+    commission_counts = {key: count for key, count in offline_env.update_counts.items() if key[0] == 'new_commission'}
+    assert sorted(commission_counts) == sorted(('new_commission', str(commissionid).lower()) for commissionid in commissionid_list)
+    assert set(commission_counts.values()) == {1}
+
+
+class SimulatedInterruption(BaseException):
+    '''
+    プロセスの強制終了を模擬する例外(タスクの例外処理で捕捉されないようBaseExceptionを継承する)
+    '''
+
+
+@pytest.mark.parametrize('pipeline_depth', [0, 1])
+def test_resume_after_interruption(offline_env, monkeypatch, pipeline_depth):
+    '''
+    マイクロバッチの途中で中断した実行を再開した場合、処理済のマイクロバッチはスキップされ、
+    全ての対象取次が1回ずつ差配されること
+    '''
+
+    from C7013 import const
+    from C7013.checkpoint import StageCheckpoint
+    from C7013.C7013_task import C7013_task
+    from C7013.C7013_01_task import C7013_01_task
+
+    offline_env.set_pipeline_config(chunk_size=OFFLINE_CHUNK_SIZE, pipeline_depth=pipeline_depth, checkpoint_enabled=True)
+    task = offline_env.create_task()
+    commissionid_list = task._task_01.extract_commissionid_list()
+    assert len(commissionid_list) > OFFLINE_CHUNK_SIZE
+
+    # 2つ目のマイクロバッチの自動差配の途中(3件目の取次Eの差配結果の更新)で中断する
+    record_update_entity = offline_env.dcrm_helper.UpdateEntity
+    second_chunk = set(str(commissionid).lower() for commissionid in commissionid_list[OFFLINE_CHUNK_SIZE:OFFLINE_CHUNK_SIZE * 2])
+    assigned = []
+
+    def interrupt_update_entity(entity) -> None:
+        if entity.LogicalName == 'new_commission' and 'new_agent_category' in entity.Attributes and str(entity.Id).lower() in second_chunk:
+            if len(assigned) == 2:
+                raise SimulatedInterruption()
+            assigned.append(entity.Id)
+        record_update_entity(entity)
+
+    monkeypatch.setattr(offline_env.dcrm_helper, 'UpdateEntity', interrupt_update_entity)
+
+    with pytest.raises(SimulatedInterruption):
+        task.execute()
+
+    run_id = StageCheckpoint.latest_incomplete_run_id()
+    checkpoint = StageCheckpoint(run_id)
+    assert checkpoint.is_chunk_completed(task._chunk_key(0))
+    assert not checkpoint.is_chunk_completed(task._chunk_key(1))
+    assert not checkpoint.completed
+
+    # 再開時に抽出した取次を記録する
+    extracted = []
+    extract_commissions = C7013_01_task.extract_commissions
+
+    def record_extract_commissions(self, commissionid_list):
+        extracted.extend(commissionid_list)
+        return extract_commissions(self, commissionid_list)
+
+    monkeypatch.setattr(C7013_01_task, 'extract_commissions', record_extract_commissions)
+    monkeypatch.setattr(offline_env.dcrm_helper, 'UpdateEntity', record_update_entity)
+
+    # プロセスの再起動を模擬し、新しいタスクで再開する
+    resumed = C7013_task().execute(resume=True)
+    assert resumed.resultCode != const.BATCH_ERROR
+    assert StageCheckpoint(run_id).completed
+
+    # 処理済のマイクロバッチは再抽出されないこと
+    assert not set(extracted) & set(commissionid_list[:OFFLINE_CHUNK_SIZE])
+
+    # 中断前後を通して、全ての対象取次が1回ずつ更新されていること
+    commission_counts = {key: count for key, count in offline_env.update_counts.items() if key[0] == 'new_commission'}
+    assert sorted(commission_counts) == sorted(('new_commission', str(commissionid).lower()) for commissionid in commissionid_list)
+    assert set(commission_counts.values()) == {1}
@@ -0,0 +1,94 @@
+'''
+統合ランク判定モデル(rank_model_helper、rank_model_converter)のテスト
+
+シード値を固定した重みのランク毎の2分類モデルから統合ランク判定モデル・NumPy版ランク判定モデルを構築し、
+予測確率と判定したランクが2分類モデルと一致することを検証する。予測時間は標準出力に出力する(pytest -sで表示)。
+tensorflowがインストールされていない環境ではスキップする。
+'''
+
+# 標準ライブラリインポート
+
+# サードパーティライブラリインポート
+import numpy as np
+import pytest
+
+# プロジェクトライブラリインポート
+
+pytest.importorskip('tensorflow')
+rank_model_helper = pytest.importorskip('C7013.rank_model_helper')
+rank_model_converter = pytest.importorskip('C7013.rank_model_converter')
+
+from C7013 import rank_utils
+from C7013.rank_numpy_model import NumpyRankModel
+
+# 比較する件数
+ROWS: int = 5000
+# バッチサイズ
+BATCH_SIZE: int = 256
+
+
+@pytest.fixture(scope='module')
+def binary_models() -> 'rank_model_helper.RankModelHelper':
+    '''
+    シード値を固定した重みのランク毎の2分類モデル
+    '''
+
+    helper = rank_model_helper.RankModelHelper()
+    helper.assembly_model()
+
+    rng = np.random.default_rng(0)
+    for rank_name in rank_model_helper.RANK_MODEL_NAMES:
+        model = getattr(helper, f'_rank_{rank_name}_model')
+        for layer_name in ('middle_layer1', 'rank_output'):
+            layer = model.get_layer(layer_name)
+            layer.set_weights([rng.normal(0.0, 0.5, weight.shape).astype(np.float32) for weight in layer.get_weights()])
+
+    return helper
+
+
+def _print_latency(name: str, result: dict) -> None:
+    print(f'\n{name}：{ROWS:,}件 2分類モデル {result["binaryElapsed"] * 1000:.1f}ミリ秒 '
+          f'比較対象 {result["combinedElapsed"] * 1000:.1f}ミリ秒 予測確率の最大差 {result["maxDiff"]:.3e}')
+
+
+def test_combined_model_matches_binary_models(binary_models, record_property):
+    '''
+    統合ランク判定モデルの予測結果が2分類モデルと一致すること
+    '''
+
+    binary_models.combine_models()
+    input_data = rank_model_converter.generate_input_data(ROWS, seed=1)
+
+    # 初回の予測(グラフ構築)を計測に含めない
+    rank_model_converter.compare_predictions(binary_models, input_data[:BATCH_SIZE], BATCH_SIZE)
+    result = rank_model_converter.compare_predictions(binary_models, input_data, BATCH_SIZE)
+    _print_latency('統合ランク判定モデル', result)
+    record_property('binary_elapsed', result['binaryElapsed'])
+    record_property('combined_elapsed', result['combinedElapsed'])
+
+    assert result['maxDiff'] < 1e-5
+    assert result['rankMismatches'] == 0
+    assert result['decisionMismatches'] == 0
+    # 統合ランク判定モデルで判定したランクが、2分類モデルの予測結果から判定したランクと一致すること
+    binary_predict = np.round(binary_models.predict_probabilities(input_data, BATCH_SIZE, verbose=0, combined=False)).astype(np.int32)
+    expected = rank_utils.decide_rank(*[binary_predict[:, index:index + 1] for index in range(binary_predict.shape[1])])
+    np.testing.assert_array_equal(binary_models.predict(input_data, BATCH_SIZE, verbose=0), expected)
+
+
+def test_numpy_model_matches_binary_models(binary_models, tmp_path, record_property):
+    '''
+    NumPy版ランク判定モデルの予測結果が2分類モデルと一致すること
+    '''
+
+    numpy_model = NumpyRankModel.load(binary_models.export_numpy_model(tmp_path))
+    input_data = rank_model_converter.generate_input_data(ROWS, seed=2)
+
+    rank_model_converter.compare_predictions(binary_models, input_data[:BATCH_SIZE], BATCH_SIZE, numpy_model)
+    result = rank_model_converter.compare_predictions(binary_models, input_data, BATCH_SIZE, numpy_model)
+    _print_latency('NumPy版ランク判定モデル', result)
+    record_property('binary_elapsed', result['binaryElapsed'])
+    record_property('numpy_elapsed', result['combinedElapsed'])
+
+    assert result['maxDiff'] < 1e-5
+    assert result['rankMismatches'] == 0
+    assert result['decisionMismatches'] == 0
@@ -0,0 +1,108 @@
+'''
+NumPy版ランク判定モデル(rank_numpy_model.NumpyRankModel)のテスト
+
+5ランク分の中間層をまとめて行列演算する推論(MAX_CHUNK_ROWS件毎)の結果が、
+ランク毎の2分類モデルを1件ずつ計算した結果と一致することを、シード値を固定した重み・入力で検証する。
+'''
+
+# 標準ライブラリインポート
+
+# サードパーティライブラリインポート
+import numpy as np
+import pytest
+
+# プロジェクトライブラリインポート
+from C7013 import rank_utils
+from C7013.rank_numpy_model import NumpyRankModel
+
+# 説明変数の列数
+INPUT_COLUMNS: int = 83
+# ランク毎の中間層のユニット数
+MIDDLE_UNITS: int = 55
+# 検証する件数
+ROWS: int = 500
+
+
+def _fixed_weights(seed: int = 0) -> dict:
+    '''
+    シード値を固定したランク毎の重み({ランク名: (中間層の重み, 中間層のバイアス, 出力層の重み, 出力層のバイアス)})
+    '''
+
+    rng = np.random.default_rng(seed)
+    return {
+        rank_name: (
+            rng.normal(0.0, 0.5, (INPUT_COLUMNS, MIDDLE_UNITS)).astype(np.float32),
+            rng.normal(0.0, 0.1, MIDDLE_UNITS).astype(np.float32),
+            rng.normal(0.0, 0.5, (MIDDLE_UNITS, 1)).astype(np.float32),
+            rng.normal(0.0, 0.1, 1).astype(np.float32),
+        )
+        for rank_name in rank_utils.rank_model_names
+    }
+
+
+def _fixed_input(seed: int = 1) -> np.ndarray:
+    '''
+    シード値を固定した説明変数(0/1、件数×83)
+    '''
+
+    rng = np.random.default_rng(seed)
+    density = rng.uniform(0.0, 0.5, size=(ROWS, 1))
+    return (rng.random((ROWS, INPUT_COLUMNS)) < density).astype(np.int32)
+
+
+def _unbatched_probabilities(weights: dict, input_data: np.ndarray) -> np.ndarray:
+    '''
+    ランク毎の2分類モデルを1件ずつ計算した予測確率(比較の基準)
+    '''
+
+    result = np.empty((len(input_data), len(rank_utils.rank_model_names)), dtype=np.float64)
+    for row_index, row in enumerate(input_data.astype(np.float64)):
+        for rank_index, rank_name in enumerate(rank_utils.rank_model_names):
+            middle_kernel, middle_bias, output_kernel, output_bias = [np.asarray(value, dtype=np.float64) for value in weights[rank_name]]
+            middle = np.maximum(row @ middle_kernel + middle_bias, 0.0)
+            logit = middle @ output_kernel[:, 0] + output_bias[0]
+            result[row_index, rank_index] = 1.0 / (1.0 + np.exp(-logit))
+
+    return result
+
+
+def _decide_rank(probabilities: np.ndarray) -> np.ndarray:
+    rank_predict = np.round(probabilities).astype(np.int32)
+    return rank_utils.decide_rank(*[rank_predict[:, index:index + 1] for index in range(rank_predict.shape[1])])
+
+
+@pytest.mark.parametrize('chunk_rows', [1, 7, 64, ROWS, 65536])
+def test_predict_probabilities_matches_unbatched(chunk_rows):
+    '''
+    マイクロバッチ件数に関わらず、予測確率が1件ずつ計算した結果と一致すること
+    '''
+
+    weights = _fixed_weights()
+    input_data = _fixed_input()
+    model = NumpyRankModel(*[[weights[rank_name][index] for rank_name in rank_utils.rank_model_names] for index in range(4)])
+
+    expected = _unbatched_probabilities(weights, input_data)
+    actual = model.predict_probabilities(input_data, chunk_rows=chunk_rows)
+
+    assert actual.shape == expected.shape
+    np.testing.assert_allclose(actual, expected, rtol=0, atol=1e-5)
+    # 予測確率が0.5付近の行が無く、判定したランクは一致すること
+    assert np.abs(expected - 0.5).min() > 1e-4
+    np.testing.assert_array_equal(_decide_rank(actual), _decide_rank(expected))
+
+
+def test_saved_model_predicts_same_ranks(tmp_path):
+    '''
+    npzファイルに保存して読み込んだモデルの判定したランクが、1件ずつ計算した結果と一致すること
+    '''
+
+    weights = _fixed_weights()
+    input_data = _fixed_input()
+    file_path = tmp_path / 'rank_model.npz'
+    NumpyRankModel.save_weights(file_path, weights)
+
+    model = NumpyRankModel.load(file_path)
+
+    np.testing.assert_array_equal(model.predict(input_data), _decide_rank(_unbatched_probabilities(weights, input_data)))
+    # 0件の場合は空の結果を返却すること
+    assert len(model.predict(input_data[:0])) == 0
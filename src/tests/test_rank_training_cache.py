@@ -0,0 +1,66 @@
+'''
+ランク判定学習データの前処理済キャッシュ(rank_training_cache)のテスト
+'''
+
+# 標準ライブラリインポート
+import shutil
+
+# サードパーティライブラリインポート
+import numpy as np
+
+# プロジェクトライブラリインポート
+from C7013 import rank_utils
+from C7013 import rank_training_cache
+
+
+def test_transform_source_change_changes_cache_key(monkeypatch, tmp_path):
+    '''
+    前処理の実装のソースが変更された場合、キャッシュファイル名が変わること
+    '''
+
+    file_path = tmp_path / 'rank_training.csv'
+    file_path.write_text('dummy', encoding='utf-8')
+
+    monkeypatch.setattr(rank_training_cache, '__transform_source_hash__', None)
+    before = rank_training_cache._cache_file_paths(file_path, tmp_path)
+    # 同じソースの場合は同じキャッシュファイル名となること
+    assert rank_training_cache._cache_file_paths(file_path, tmp_path) == before
+
+    # ランク判定用フラグの変換を実装したモジュールのソースを変更する
+    changed_source_path = tmp_path / 'rank_utils.py'
+    shutil.copyfile(rank_utils.__file__, changed_source_path)
+    with open(changed_source_path, 'a', encoding='utf-8') as f:
+        f.write('\n# changed\n')
+    monkeypatch.setattr(rank_utils, '__file__', str(changed_source_path))
+    monkeypatch.setattr(rank_training_cache, '__transform_source_hash__', None)
+
+    after = rank_training_cache._cache_file_paths(file_path, tmp_path)
+    assert after[0] != before[0]
+    assert after[1] != before[1]
+
+
+def test_cache_is_rebuilt_when_transform_source_changes(monkeypatch, tmp_path):
+    '''
+    前処理の実装のソースが変更された場合、作成済のキャッシュファイルを使用せずに作成し直すこと
+    '''
+
+    file_path = tmp_path / 'rank_training.csv'
+    file_path.write_text('dummy', encoding='utf-8')
+
+    transformed = []
+
+    def transform_training_file(path):
+        transformed.append(path)
+        return np.ones((2, 83), dtype=np.uint8), np.zeros((2, 5), dtype=np.uint8)
+
+    monkeypatch.setattr(rank_training_cache, 'transform_training_file', transform_training_file)
+
+    monkeypatch.setattr(rank_training_cache, '__transform_source_hash__', 'source1')
+    rank_training_cache.build_training_cache(file_path, tmp_path)
+    rank_training_cache.build_training_cache(file_path, tmp_path)
+    assert len(transformed) == 1
+
+    monkeypatch.setattr(rank_training_cache, '__transform_source_hash__', 'source2')
+    input_path, _ = rank_training_cache.build_training_cache(file_path, tmp_path)
+    assert len(transformed) == 2
+    assert 'source2' in input_path.name
@@ -0,0 +1,68 @@
+'''
+ランク判定用フラグ行列(rank_utils.RankFlagMatrix)のテスト
+'''
+
+# 標準ライブラリインポート
+
+# サードパーティライブラリインポート
+import numpy as np
+import pandas as pd
+
+# プロジェクトライブラリインポート
+from C7013 import rank_utils
+
+
+def _flag_count() -> int:
+    return len(rank_utils.rank_flag_columns)
+
+
+def test_uint8_values_are_normalized():
+    '''
+    uint8の0/1以外の値(2、255)は1とすること
+    '''
+
+    values = np.zeros((3, _flag_count()), dtype=np.uint8)
+    values[0, 0] = 2
+    values[1, 1] = 255
+    values[2, 2] = 1
+
+    rank_flags = rank_utils.RankFlagMatrix(values)
+
+    assert rank_flags.values.dtype == np.uint8
+    np.testing.assert_array_equal(rank_flags.values[:, :3], np.eye(3, dtype=np.uint8))
+    assert rank_flags.values.max() == 1
+    # ビット圧縮・展開しても値が変わらないこと
+    np.testing.assert_array_equal(rank_utils.RankFlagMatrix.unpack(rank_flags.pack()).values, rank_flags.values)
+
+
+def test_float_nan_values_are_zero():
+    '''
+    浮動小数点の欠損値(NaN)は0、0以外の値は1とすること
+    '''
+
+    values = np.zeros((4, _flag_count()), dtype=np.float64)
+    values[0, 0] = np.nan
+    values[1, 0] = 0.5
+    values[2, 0] = -1.0
+
+    rank_flags = rank_utils.RankFlagMatrix(values)
+
+    assert rank_flags.values.dtype == np.uint8
+    np.testing.assert_array_equal(rank_flags['rank_flag01'], [0, 1, 1, 0])
+    assert rank_flags.values[:, 1:].max() == 0
+
+
+def test_from_dataframe_missing_values_are_zero():
+    '''
+    DataFrameのランク判定用フラグ列の欠損値(NaN、pd.NA)は0とすること
+    '''
+
+    df = pd.DataFrame(np.zeros((3, _flag_count()), dtype=np.int64), columns=rank_utils.rank_flag_columns).astype('Int64')
+    df.loc[0, 'rank_flag01'] = pd.NA
+    df.loc[1, 'rank_flag01'] = 2
+    df['rank_flag02'] = [np.nan, 1.0, 0.0]
+
+    rank_flags = rank_utils.RankFlagMatrix.from_dataframe(df)
+
+    np.testing.assert_array_equal(rank_flags['rank_flag01'], [0, 1, 0])
+    np.testing.assert_array_equal(rank_flags['rank_flag02'], [0, 1, 0])
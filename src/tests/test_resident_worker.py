@@ -0,0 +1,59 @@
+'''
+自動差配処理の常駐ワーカー(resident_worker)のテスト
+'''
+
+# 標準ライブラリインポート
+
+# サードパーティライブラリインポート
+import pytest
+
+# プロジェクトライブラリインポート
+from conftest import OFFLINE_CHUNK_SIZE
+
+
+def _create_worker():
+    '''
+    モデルを読込済の常駐ワーカーを生成します。モデルを読み込めない場合はスキップします。
+    '''
+
+    from C7013.resident_worker import ResidentWorker
+
+    worker = ResidentWorker()
+    if not worker.load_models():
+        pytest.skip('モデルを読み込めないためスキップします。')
+
+    return worker
+
+
+@pytest.mark.parametrize('pipeline_depth', [0, 1])
+def test_run_twice(offline_env, pipeline_depth):
+    '''
+    同じ常駐ワーカーで続けて実行した場合も、2回目が1回目と同じ処理結果コードとなり、排他制御が解除されること
+    '''
+
+    from C7013 import const
+
+    offline_env.set_pipeline_config(chunk_size=OFFLINE_CHUNK_SIZE, pipeline_depth=pipeline_depth)
+    worker = _create_worker()
+
+    first = worker.run()
+    assert first != const.BATCH_ERROR
+    assert offline_env.execute_sql("SELECT SPR1, SPR2 FROM RGLT_INFO WHERE RGLT_APID = 'C7013'") == [('0', str(first))]
+
+    second = worker.run()
+    assert second == first
+    assert offline_env.execute_sql("SELECT SPR1, SPR2 FROM RGLT_INFO WHERE RGLT_APID = 'C7013'") == [('0', str(second))]
+
+
+def test_run_locked(offline_env):
+    '''
+    他のバッチが実行中の場合は、自動差配処理を実行せずに警告終了すること
+    '''
+
+    from C7013 import const
+
+    worker = _create_worker()
+    offline_env.execute_sql("UPDATE RGLT_INFO SET SPR1 = '1' WHERE RGLT_APID = 'C7013'")
+
+    assert worker.run() == const.BATCH_WARNING
+    assert not offline_env.update_counts